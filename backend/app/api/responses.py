@@ -0,0 +1,152 @@
+"""Response encoding fast path
+
+FastAPI validates every returned object against ``response_model`` again,
+walks it with ``jsonable_encoder`` and then runs stdlib ``json.dumps``.
+Endpoints that return a ``Response`` skip all of that, so:
+
+- ``FastJSONResponse`` encodes models straight to bytes with pydantic-core
+  (``TypeAdapter.dump_json``), and plain data with orjson when installed.
+- ``EncodedCache`` keeps the encoded body and ETag of responses that only
+  change with a data version (catalog, tier lists), so repeat requests
+  are a dict lookup, and a matching ``If-None-Match`` gets a 304.
+
+``response_model`` stays on the routes for the OpenAPI schema.
+"""
+import hashlib
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.metrics import CACHE_HIT_RATIO, current_route, stage
+from app.services.cache import _MISSING, LocalCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(annotation: Any) -> TypeAdapter:
+    adapter = _adapters.get(annotation)
+    if adapter is None:
+        adapter = _adapters[annotation] = TypeAdapter(annotation)
+    return adapter
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode(value: Any, annotation: Any = None) -> bytes:
+    """JSON bytes without validation: pydantic-core for models, orjson for plain data"""
+    with stage(current_route(), "serialize"):
+        return _encode(value, annotation)
+
+
+def _encode(value: Any, annotation: Any) -> bytes:
+    if annotation is None:
+        if isinstance(value, BaseModel):
+            annotation = type(value)
+        elif isinstance(value, list) and value and isinstance(value[0], BaseModel):
+            annotation = List[type(value[0])]
+    if annotation is not None:
+        return _adapter(annotation).dump_json(value)
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``encode``; pass ``annotation`` for nested containers"""
+
+    def __init__(self, content: Any, annotation: Any = None, **kwargs: Any):
+        self.annotation = annotation
+        super().__init__(content, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return encode(content, self.annotation)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` already names ``etag`` (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+class Encoded(NamedTuple):
+    body: bytes
+    etag: str
+
+    def response(self, request: Request, max_age: int = 0) -> Response:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age}" if max_age else "no-cache",
+        }
+        if not_modified(request, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class EncodedCache:
+    """Encoded bodies keyed by endpoint, arguments and data version
+
+    Keys must include whatever version identifies the underlying data
+    (patch, catalog version, ...) so entries never need invalidating;
+    old versions simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400.0):
+        self.local = LocalCache(max_entries, ttl)
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def get_or_encode(
+        self,
+        key: str,
+        produce: Callable[[], Awaitable[Any]],
+        annotation: Any = None,
+    ) -> Encoded:
+        encoded = self.local.get(key)
+        if encoded is not _MISSING:
+            self.stats["hits"] += 1
+            return encoded
+        self.stats["misses"] += 1
+        body = encode(await produce(), annotation)
+        encoded = Encoded(body, make_etag(body))
+        self.local.set(key, encoded)
+        return encoded
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+encoded_cache = EncodedCache()
+CACHE_HIT_RATIO.add(lambda: {"encoded_response": encoded_cache.hit_ratio})
@@ -0,0 +1,134 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import logging
+
+from app.api.responses import FastJSONResponse, encoded_cache
+from app.core.config import settings
+from app.models.champion import ChampionTierList, ChampionTrend, MatchupTrend, Role
+from app.services import rollups
+from app.services.champion_catalog import champion_catalog
+from app.services.rollups import ALL_RANKS, Cube, matchup_trend, rollup_store
+from app.services.tier_list import tier_list_engine
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/tier-list", response_model=List[ChampionTierList])
+async def get_tier_lists(
+    request: Request,
+    patch: Optional[str] = Query(None, description="Game patch version (default: current)"),
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description="Rank tier")
+):
+    """Precomputed tier lists for every role"""
+    patch = patch or champion_catalog.patch
+    version, tier_lists = tier_list_engine.all(patch, rank)
+    if not tier_lists:
+        raise HTTPException(status_code=404, detail="No tier lists for this patch and rank")
+
+    async def produce():
+        return tier_lists
+
+    key = f"tier_lists:{patch}:{rank}:{version}"
+    encoded = await encoded_cache.get_or_encode(key, produce, List[ChampionTierList])
+    return encoded.response(request, max_age=300)
+
+@router.get("/tier-list/{role}", response_model=ChampionTierList)
+async def get_tier_list(
+    request: Request,
+    role: Role,
+    patch: Optional[str] = Query(None, description="Game patch version (default: current)"),
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description="Rank tier")
+):
+    """Precomputed tier list for one role"""
+    patch = patch or champion_catalog.patch
+    entry = tier_list_engine.get(patch, rank, role.value)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No tier list for this patch, rank and role")
+    version, tier_list = entry
+
+    async def produce():
+        return tier_list
+
+    key = f"tier_list:{patch}:{rank}:{role.value}:{version}"
+    encoded = await encoded_cache.get_or_encode(key, produce, ChampionTierList)
+    return encoded.response(request, max_age=300)
+
+async def _cube(rank: str) -> Cube:
+    cube = await rollup_store.current(rank)
+    if cube is None:
+        raise HTTPException(status_code=404, detail="No stats for this rank")
+    return cube
+
+@router.get("/trends/champions/{champion_id}", response_model=ChampionTrend)
+async def get_champion_trend(
+    request: Request,
+    champion_id: int,
+    role: Optional[Role] = Query(None, description="Role (default: every role)"),
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description=f"Rank tier, or {ALL_RANKS}")
+):
+    """Win, pick and ban rate of a champion across patches"""
+    cube = await _cube(rank)
+    role_value = role.value if role else None
+    trend = cube.trend(champion_id, role_value)
+    if trend is None:
+        raise HTTPException(status_code=404, detail="No stats for this champion")
+
+    async def produce():
+        return trend
+
+    key = f"trend:{rank}:{champion_id}:{role_value}:{rollup_store.version}"
+    encoded = await encoded_cache.get_or_encode(key, produce, ChampionTrend)
+    return encoded.response(request, max_age=300)
+
+@router.get("/trends/roles/{role}", response_model=List[ChampionTrend])
+async def get_role_trends(
+    request: Request,
+    role: Role,
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description=f"Rank tier, or {ALL_RANKS}"),
+    limit: int = Query(20, ge=1, le=200, description="Champions, by pick + ban presence"),
+    patches: int = Query(3, ge=1, description="Recent patches that rank the champions")
+):
+    """Pick and ban trends of the most present champions in a role"""
+    cube = await _cube(rank)
+
+    async def produce():
+        return [cube.trend(c, role.value) for c in cube.top_champions(role.value, limit, patches)]
+
+    key = f"role_trends:{rank}:{role.value}:{limit}:{patches}:{rollup_store.version}"
+    encoded = await encoded_cache.get_or_encode(key, produce, List[ChampionTrend])
+    return encoded.response(request, max_age=300)
+
+@router.get("/trends/matchups/{champion_id}/{opponent_id}", response_model=MatchupTrend)
+async def get_matchup_trend(
+    champion_id: int,
+    opponent_id: int,
+    role: Optional[Role] = Query(None, description="Role (default: all-roles matrices)"),
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description="Rank tier")
+):
+    """How a matchup evolved across patches"""
+    trend = matchup_trend(champion_id, opponent_id, rank, role.value if role else None)
+    if not trend.points:
+        raise HTTPException(status_code=404, detail="No games for this matchup")
+    return FastJSONResponse(trend)
+
+@router.get("/rollups/export")
+async def export_rollups(
+    rank: str = Query(settings.DEFAULT_RANK_TIER, description=f"Rank tier, or {ALL_RANKS}"),
+    role: Optional[str] = Query(None, description="Role, 'all' for the role-less rollup (default: every row)"),
+    patch: Optional[List[str]] = Query(None, description="Patches to include (default: all)"),
+    champion_id: Optional[List[int]] = Query(None, description="Champions to include (default: all)"),
+    format: str = Query("ndjson", pattern="^(ndjson|arrow)$", description="ndjson or arrow")
+):
+    """Stream (patch, rank, role, champion) rollup rows as NDJSON or an Arrow IPC stream"""
+    if role is not None and role not in rollups.ROLE_LABELS:
+        raise HTTPException(status_code=422, detail=f"Unknown role: {role}")
+    cube = await _cube(rank)
+    chunks = cube.export_chunks(role, patch, champion_id)
+    if format == "arrow":
+        if not rollups.pyarrow.available:
+            raise HTTPException(status_code=406, detail="Arrow export needs pyarrow installed")
+        return StreamingResponse(
+            rollups.arrow_stream(chunks), media_type="application/vnd.apache.arrow.stream"
+        )
+    return StreamingResponse(rollups.ndjson_stream(chunks), media_type="application/x-ndjson")
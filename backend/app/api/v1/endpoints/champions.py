@@ -1,30 +1,58 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import List, Optional
 import logging
 
-from app.models.champion import Champion, ChampionStats
+from app.api.responses import FastJSONResponse, encoded_cache
+from app.models.champion import CatalogRefreshJob, Champion, ChampionCounters, ChampionStats
+from app.services.catalog_refresh import catalog_refresh_jobs
+from app.services.champion_catalog import champion_catalog
+from app.services.champion_search import get_search_index
+from app.services.draft_service import DraftService
+from app.services.draft_state import SLOT_FIELDS
 from app.services.champion_service import ChampionService
-from app.services.riot_service import RiotService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/", response_model=List[Champion])
 async def get_champions(
+    request: Request,
     role: Optional[str] = Query(None, description="Filter by role"),
-    search: Optional[str] = Query(None, description="Search by name"),
-    champion_service: ChampionService = Depends()
+    search: Optional[str] = Query(None, description="Search by name (prefix, typo tolerant)"),
+    tag: Optional[List[str]] = Query(None, description="Filter by tag, repeatable"),
+    session_id: Optional[str] = Query(None, description="Hide champions picked or banned in this draft"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Maximum results"),
+    champion_service: ChampionService = Depends(),
+    draft_service: DraftService = Depends()
 ):
-    """Get all champions with optional filtering"""
+    """Get champions with optional filtering, most picked first"""
+    tags = tag or []
     try:
-        champions = await champion_service.get_champions(role=role, search=search)
-        return champions
+        if session_id:
+            session = await draft_service.get_session(session_id)
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+            taken = [c for field in SLOT_FIELDS for c in getattr(session, field)]
+            champions = await champion_service.get_champions(
+                role=role, search=search, tags=tags, exclude=taken, limit=limit
+            )
+            return FastJSONResponse(champions, List[Champion])
+        key = f"champions:{get_search_index().version}:{role}:{tags}:{search}:{limit}"
+        encoded = await encoded_cache.get_or_encode(
+            key,
+            lambda: champion_service.get_champions(role=role, search=search, tags=tags, limit=limit),
+            List[Champion],
+        )
+        return encoded.response(request)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get champions: {e}")
         raise HTTPException(status_code=500, detail="Failed to get champions")
 
 @router.get("/{champion_id}", response_model=Champion)
 async def get_champion(
+    request: Request,
     champion_id: int,
     champion_service: ChampionService = Depends()
 ):
@@ -32,7 +60,13 @@ async def get_champion(
     champion = await champion_service.get_champion(champion_id)
     if not champion:
         raise HTTPException(status_code=404, detail="Champion not found")
-    return champion
+
+    async def produce():
+        return champion
+
+    key = f"champion:{champion_catalog.patch}:{champion_catalog.version}:{champion_id}"
+    encoded = await encoded_cache.get_or_encode(key, produce, Champion)
+    return encoded.response(request)
 
 @router.get("/{champion_id}/stats", response_model=ChampionStats)
 async def get_champion_stats(
@@ -46,33 +80,46 @@ async def get_champion_stats(
         stats = await champion_service.get_champion_stats(
             champion_id, patch=patch, rank=rank
         )
+        if stats is None:
+            raise HTTPException(status_code=404, detail="No stats for this champion, patch and rank")
         return stats
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get champion stats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get stats")
 
-@router.get("/{champion_id}/counters")
+@router.get("/{champion_id}/counters", response_model=ChampionCounters)
 async def get_champion_counters(
     champion_id: int,
     role: Optional[str] = Query(None, description="Role context"),
+    patch: Optional[str] = Query(None, description="Game patch version"),
+    rank: Optional[str] = Query("PLATINUM", description="Rank tier"),
     champion_service: ChampionService = Depends()
 ):
     """Get champion counters and synergies"""
     try:
-        counters = await champion_service.get_counters(champion_id, role=role)
+        counters = await champion_service.get_counters(
+            champion_id, role=role, patch=patch, rank=rank
+        )
+        if counters is None:
+            raise HTTPException(status_code=404, detail="No matchups for this champion, patch and rank")
         return counters
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get counters: {e}")
         raise HTTPException(status_code=500, detail="Failed to get counters")
 
-@router.post("/update-data")
-async def update_champion_data(
-    riot_service: RiotService = Depends()
-):
-    """Update champion data from Riot API (admin endpoint)"""
-    try:
-        await riot_service.update_champion_data()
-        return {"message": "Champion data updated successfully"}
-    except Exception as e:
-        logger.error(f"Failed to update champion data: {e}")
-        raise HTTPException(status_code=500, detail="Failed to update data")
\ No newline at end of file
+@router.post("/update-data", response_model=CatalogRefreshJob, status_code=202)
+async def update_champion_data():
+    """Start a background champion data refresh (admin endpoint); poll the returned job"""
+    return catalog_refresh_jobs.start()
+
+@router.get("/update-data/{job_id}", response_model=CatalogRefreshJob)
+async def get_update_job(job_id: str):
+    """Status of a champion data refresh"""
+    job = catalog_refresh_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job
\ No newline at end of file
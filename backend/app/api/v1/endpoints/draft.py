@@ -1,9 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, WebSocket, WebSocketDisconnect
 from typing import List
 import logging
 
-from app.models.draft import DraftSession, DraftAction, TeamComposition
+from app.models.draft import (
+    DraftSession, DraftAction, TeamComposition, DraftSuggestion, BatchSuggestionRequest,
+    DraftSearchRequest, DraftSearchResult
+)
+from app.api.responses import FastJSONResponse, not_modified
+from app.ml.win_predictor import WinPredictionService
+from app.services.draft_search import lookahead
 from app.services.draft_service import DraftService
+from app.services.suggestion_engine import get_suggestion_engine
 from app.services.websocket_service import WebSocketService
 
 router = APIRouter()
@@ -26,14 +33,18 @@ async def create_draft_session(
 
 @router.get("/session/{session_id}", response_model=DraftSession)
 async def get_draft_session(
+    request: Request,
     session_id: str,
     draft_service: DraftService = Depends()
 ):
-    """Get draft session by ID"""
+    """Get draft session by ID; pollers get a 304 until the next action"""
     session = await draft_service.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    return session
+    etag = f'W/"{session.id}-{len(session.actions)}-{session.updated_at.timestamp()}"'
+    if not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return FastJSONResponse(session, headers={"ETag": etag})
 
 @router.post("/session/{session_id}/action", response_model=DraftAction)
 async def add_draft_action(
@@ -56,7 +67,29 @@ async def add_draft_action(
         logger.error(f"Failed to add draft action: {e}")
         raise HTTPException(status_code=500, detail="Failed to add action")
 
-@router.get("/session/{session_id}/suggestions")
+@router.websocket("/session/{session_id}/ws")
+async def draft_session_socket(
+    websocket: WebSocket,
+    session_id: str,
+    draft_service: DraftService = Depends()
+):
+    """Live draft updates: a snapshot, then one delta per action"""
+    session = await draft_service.get_session(session_id)
+    if not session:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    subscriber = WebSocketService.connect(session, websocket)
+    try:
+        # Client messages are only keepalives
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscriber.close()
+
+@router.get("/session/{session_id}/suggestions", response_model=List[DraftSuggestion])
 async def get_draft_suggestions(
     session_id: str,
     team: str,
@@ -65,11 +98,49 @@ async def get_draft_suggestions(
     """Get AI suggestions for next pick/ban"""
     try:
         suggestions = await draft_service.get_suggestions(session_id, team)
-        return suggestions
+        return FastJSONResponse(suggestions, List[DraftSuggestion])
     except Exception as e:
         logger.error(f"Failed to get suggestions: {e}")
         raise HTTPException(status_code=500, detail="Failed to get suggestions")
 
+@router.post("/suggestions:batch", response_model=List[List[DraftSuggestion]])
+async def get_batch_suggestions(request: BatchSuggestionRequest):
+    """Score many draft states in one vectorized pass"""
+    try:
+        engine = get_suggestion_engine(request.patch, request.rank_tier)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        return FastJSONResponse(
+            engine.suggest_states(request.states, limit=request.limit),
+            List[List[DraftSuggestion]],
+        )
+    except Exception as e:
+        logger.error(f"Failed to get batch suggestions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get suggestions")
+
+@router.post("/search", response_model=DraftSearchResult)
+async def search_draft(request: DraftSearchRequest):
+    """Rank suggestions by lookahead search over the rest of the draft"""
+    try:
+        engine = get_suggestion_engine(request.patch, request.rank_tier)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        predictor = await WinPredictionService.predictor()
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        return await lookahead(
+            request.state, engine, predictor,
+            session_id=request.session_id, budget_ms=request.budget_ms, limit=request.limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Draft search failed: {e}")
+        raise HTTPException(status_code=500, detail="Draft search failed")
+
 @router.get("/session/{session_id}/analysis", response_model=TeamComposition)
 async def analyze_team_composition(
     session_id: str,
@@ -79,7 +150,7 @@ async def analyze_team_composition(
     """Analyze current team composition"""
     try:
         analysis = await draft_service.analyze_composition(session_id, team)
-        return analysis
+        return FastJSONResponse(analysis)
     except Exception as e:
         logger.error(f"Failed to analyze composition: {e}")
         raise HTTPException(status_code=500, detail="Failed to analyze composition")
\ No newline at end of file
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+import logging
+
+from app.api.responses import FastJSONResponse
+from app.ml.matchup_predictor import MatchupPredictionService
+from app.ml.win_predictor import WinPredictionService
+from app.models.draft import DraftState, MatchupPrediction, WinPrediction
+from app.services.draft_service import DraftService
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/win", response_model=WinPrediction)
+async def predict_win(state: DraftState):
+    """Win probability for a draft state (micro-batched, cached per state)"""
+    try:
+        prediction = await WinPredictionService.predict(state)
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return FastJSONResponse(prediction)
+
+@router.get("/session/{session_id}", response_model=WinPrediction)
+async def predict_session(
+    session_id: str,
+    draft_service: DraftService = Depends()
+):
+    """Win probability for the current state of a draft session"""
+    session = await draft_service.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    try:
+        prediction = await WinPredictionService.predict(session)
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return FastJSONResponse(prediction)
+
+@router.get("/matchup", response_model=MatchupPrediction)
+async def predict_matchup(
+    champion_id: int = Query(..., description="Champion ID"),
+    opponent_id: int = Query(..., description="Opponent champion ID")
+):
+    """Head-to-head win probability; the matchup model loads on the first call"""
+    try:
+        prediction = await MatchupPredictionService.predict(champion_id, opponent_id)
+    except KeyError as e:
+        # Before LookupError, which KeyError subclasses
+        raise HTTPException(status_code=404, detail=f"Champion {e.args[0]} not known to the model")
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return FastJSONResponse(prediction)
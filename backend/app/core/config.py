@@ -24,6 +24,16 @@ class Settings(BaseSettings):
     RIOT_API_KEY: str = os.getenv("RIOT_API_KEY", "")
     RIOT_BASE_URL: str = "https://americas.api.riotgames.com"
     RIOT_RATE_LIMIT: int = 100  # requests per 2 minutes
+    RIOT_RATE_LIMIT_WINDOW: int = 120  # seconds
+    RIOT_BURST_RATE_LIMIT: int = 20  # requests per second
+    RIOT_REGION_URL: str = "https://{region}.api.riotgames.com"
+    RIOT_PLATFORM: str = "na1"  # platform routing for platform-scoped APIs (champion mastery)
+    RIOT_DEFAULT_TAG_LINE: str = "NA1"  # for player names given without "#tag"
+    RIOT_MAX_CONNECTIONS: int = 20
+    RIOT_REQUEST_TIMEOUT: float = 10.0
+    RIOT_MAX_ATTEMPTS: int = 5
+    DDRAGON_BASE_URL: str = "https://ddragon.leagueoflegends.com"
+    DDRAGON_REALM: str = "na"  # realm manifest giving the current champion data version
     
     # Google Cloud Platform
     GCP_PROJECT_ID: str = os.getenv("GCP_PROJECT_ID", "lol-draft-ai-tool")
@@ -36,18 +46,63 @@ class Settings(BaseSettings):
     DB_USER: str = os.getenv("DB_USER", "postgres")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
     DB_NAME: str = os.getenv("DB_NAME", "lol_draft_ai")
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection
+    DB_UPSERT_BATCH_ROWS: int = 5000  # rows per executemany batch (non-COPY path)
     
     # ML/AI Settings
     VERTEX_AI_REGION: str = os.getenv("VERTEX_AI_REGION", "us-central1")
     MODEL_BUCKET: str = os.getenv("MODEL_BUCKET", "lol-draft-ai-models")
+    MODEL_DIR: str = os.getenv("MODEL_DIR", "models")
+    MODEL_LOAD_WORKERS: int = 4
+    WIN_PREDICTION_MAX_BATCH: int = 64
+    WIN_PREDICTION_MAX_WAIT_MS: float = 5.0
+    
+    # Lookahead draft search (services.draft_search)
+    DRAFT_SEARCH_WORKERS: int = 2
+    DRAFT_SEARCH_BUDGET_MS: float = 200.0
+    DRAFT_SEARCH_BRANCHING: int = 8
+    DRAFT_SEARCH_SESSIONS: int = 256  # search trees kept per worker
+    
+    # Stats snapshot (services.snapshot), mapped at startup
+    SNAPSHOT_DIR: str = os.getenv("SNAPSHOT_DIR", "snapshots")
+    
+    # Draft sessions (services.session_store): hot in memory, write-behind to the backend
+    SESSION_STORE_BACKEND: str = os.getenv("SESSION_STORE_BACKEND", "memory")  # memory | sqlite
+    SESSION_DB_PATH: str = os.getenv("SESSION_DB_PATH", "sessions.db")
+    SESSION_FLUSH_INTERVAL_MS: float = 250.0  # durability window
+    SESSION_FLUSH_MAX_ACTIONS: int = 500
+    SESSION_HOT_MAX: int = 10000
+    
+    # WebSocket fan-out (services.websocket_service)
+    WS_SEND_QUEUE_SIZE: int = 64  # per connection
+    WS_SLOW_CONSUMER_POLICY: str = "disconnect"  # disconnect | drop
+    WS_BACKPLANE_URL: Optional[str] = os.getenv("WS_BACKPLANE_URL")  # Redis pub/sub across instances
+    
+    # Draft analysis
+    DEFAULT_RANK_TIER: str = "PLATINUM"
+    
+    # Player champion pools (services.player_pools), prefetched when a session is created
+    PLAYER_PREFETCH_ENABLED: bool = True
+    PLAYER_PREFETCH_MATCHES: int = 5  # recent matches per player
+    PLAYER_PREFETCH_MASTERY: int = 10  # top mastery champions per player
+    PLAYER_POOL_TTL: int = 900  # seconds a fetched pool is reused across sessions
+    PLAYER_POOL_BONUS: float = 5.0  # priority points for a suggestion in a player's pool
     
     # Cache Settings
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
     CACHE_TTL: int = 300  # 5 minutes
+    CACHE_MAX_ENTRIES: int = 10000
+    TRANSPOSITION_CACHE_SIZE: int = 50000
     
     # Monitoring
     ENABLE_METRICS: bool = True
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_QUEUE_SIZE: int = 10000  # records buffered before the listener; overflow is dropped
+    LOG_INFO_SAMPLE_RATE: float = 1.0  # fraction of DEBUG/INFO records kept per logger
     
     @validator("RIOT_API_KEY")
     def validate_riot_api_key(cls, v):
@@ -0,0 +1,92 @@
+"""Async SQLAlchemy engine with a sized, health-checked connection pool
+
+``settings.database_url`` is a synchronous ``postgresql://`` URL;
+``async_url`` maps it (and ``sqlite:///`` URLs, for local runs) onto the
+asyncpg and aiosqlite drivers. The engine is created on first use and
+shared by the whole process:
+
+- ``DB_POOL_SIZE`` + ``DB_MAX_OVERFLOW`` connections, checked with a
+  ping on checkout and recycled after ``DB_POOL_RECYCLE`` seconds;
+- asyncpg statements are prepared once per connection and reused from a
+  ``DB_STATEMENT_CACHE_SIZE`` LRU, on top of SQLAlchemy's compiled cache.
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_engine: Optional[AsyncEngine] = None
+
+
+def async_url(url: str) -> str:
+    """The async-driver form of a database URL; async URLs pass through"""
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def create_engine(url: Optional[str] = None, **overrides: Any) -> AsyncEngine:
+    """Engine for ``url`` (default: the configured database) with the pool settings applied"""
+    parsed = make_url(async_url(url or settings.database_url))
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+        )
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    # SQLite keeps SQLAlchemy's default pool (a single static connection for :memory:)
+    kwargs.update(overrides)
+    return create_async_engine(parsed, **kwargs)
+
+
+def get_engine() -> AsyncEngine:
+    """The shared engine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine()
+        logger.info(f"Database engine created for {_engine.url.render_as_string(hide_password=True)}")
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection, e.g. on shutdown"""
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+async def health_check(engine: Optional[AsyncEngine] = None) -> Dict[str, Any]:
+    """Round trip through the pool: ``{"ok", "latency_ms", "pool"}``"""
+    engine = engine or get_engine()
+    start = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        ok = True
+    except Exception as e:
+        logger.warning(f"Database health check failed: {e}")
+        ok = False
+    return {
+        "ok": ok,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "pool": engine.pool.status(),
+    }
@@ -0,0 +1,55 @@
+"""Deferred imports for heavy or optional dependencies
+
+``lazy_import(name)`` returns a stand-in that imports the module on first
+attribute access, so importing the application does not pay for backends
+a process may never use (Cloud Logging client, Arrow, the SQL engine).
+``available`` checks that a module is installed without importing it, and
+``loaded`` whether something already imported it.
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Module proxy; the first attribute lookup imports ``name``"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        if self._available is None:
+            try:
+                self._available = importlib.util.find_spec(self._name) is not None
+            except (ImportError, ValueError):
+                self._available = False
+        return self._available
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
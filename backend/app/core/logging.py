@@ -1,13 +1,57 @@
+"""Structured logging off the request path
+
+Request code only pays for a ``QueueHandler``: the sampling filter, a
+cheap ``prepare`` and a non-blocking ``put``. A ``QueueListener`` thread
+does the JSON formatting and all I/O (stdout and, in production, Google
+Cloud Logging, whose client is built on that thread when the first
+record reaches it rather than at setup). DEBUG/INFO records can be sampled per logger with
+``LOG_INFO_SAMPLE_RATE``; warnings and errors are always kept. When the
+queue is full, records are dropped and counted rather than blocking.
+"""
+import atexit
+import json
 import logging
+import queue
 import sys
-from typing import Dict, Any
-import json
-from google.cloud import logging as gcp_logging
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, List, Optional
+
 from app.core.config import settings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "taskName",
+}
+
+
+def _dumps(entry: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(entry, default=str).decode()
+    return json.dumps(entry, default=str)
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
-    
+
+    def __init__(self):
+        super().__init__()
+        # Timestamps are rendered once per second, then only milliseconds change
+        self._second: Optional[int] = None
+        self._prefix = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._second:
+            self._second = second
+            self._prefix = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(second))
+        return f"{self._prefix},{int(record.msecs):03d}"
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
             "timestamp": self.formatTime(record),
@@ -15,49 +59,181 @@ class JSONFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
-        
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
-        
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
+
         # Add extra fields
         for key, value in record.__dict__.items():
-            if key not in [
-                "name", "msg", "args", "levelname", "levelno", "pathname",
-                "filename", "module", "exc_info", "exc_text", "stack_info",
-                "lineno", "funcName", "created", "msecs", "relativeCreated",
-                "thread", "threadName", "processName", "process", "message"
-            ]:
+            if key not in RESERVED_ATTRS:
                 log_entry[key] = value
-        
-        return json.dumps(log_entry)
+
+        return _dumps(log_entry)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep ``rate`` of each logger's records at or below ``max_level``
+
+    Deterministic: a per-logger credit grows by ``rate`` per record and a
+    record is kept whenever it reaches 1, so 0.1 keeps every tenth. Kept
+    records carry ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rate: float, max_level: int = logging.INFO):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+        self._credit: Dict[str, float] = {}
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.rate >= 1.0:
+            return True
+        credit = self._credit.get(record.name, 0.0) + self.rate
+        if credit < 1.0:
+            self._credit[record.name] = credit
+            self.dropped += 1
+            return False
+        self._credit[record.name] = credit - 1.0
+        record.sample_rate = self.rate
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener and never blocks
+
+    The stock ``prepare`` formats the record on the calling thread; here
+    only the message arguments are merged (so later mutation of ``args``
+    cannot change the log line). Exception info stays on the record for
+    the listener to format, which is safe because the queue is in-process.
+
+    The queue is a lock-free ``SimpleQueue`` bounded by ``maxsize``
+    (checked approximately); the handler lock is skipped as the queue is
+    already thread-safe.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, maxsize: int = 0):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+        self.dropped = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.maxsize and self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class DeferredHandler(logging.Handler):
+    """Builds the wrapped handler from ``factory`` when the first record arrives
+
+    Attached to the listener, so the build (imports, credentials lookup,
+    client construction) runs on the listener thread instead of during
+    ``setup_logging``. A failed build is reported once and the handler
+    then drops records.
+    """
+
+    def __init__(self, factory: Callable[[], logging.Handler], name: str):
+        super().__init__()
+        self.factory = factory
+        self.name = name
+        self._handler: Optional[logging.Handler] = None
+        self._failed = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            if self._failed:
+                return
+            try:
+                self._handler = self.factory()
+            except Exception as e:
+                self._failed = True
+                logging.getLogger(__name__).warning(f"Failed to setup {self.name}: {e}")
+                return
+        self._handler.handle(record)
+
+    def flush(self) -> None:
+        if self._handler is not None:
+            self._handler.flush()
+
+    def close(self) -> None:
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+def _gcp_handler() -> logging.Handler:
+    from google.cloud import logging as gcp_logging
+
+    return gcp_logging.Client().get_default_handler()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def _output_handlers() -> List[logging.Handler]:
+    # Console handler with JSON formatting
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(JSONFormatter())
+    handlers: List[logging.Handler] = [console_handler]
+
+    # Google Cloud Logging in production
+    if not settings.DEBUG:
+        handlers.append(DeferredHandler(_gcp_handler, "Google Cloud Logging"))
+    return handlers
+
 
 def setup_logging():
-    """Setup application logging"""
-    
+    """Setup application logging: queue handler on the root, formatting on a listener thread"""
+    global _listener
+    shutdown_logging()
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
-    
+
     # Remove default handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
-    # Console handler with JSON formatting
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(console_handler)
-    
-    # Google Cloud Logging in production
-    if not settings.DEBUG:
-        try:
-            client = gcp_logging.Client()
-            client.setup_logging()
-        except Exception as e:
-            logging.warning(f"Failed to setup Google Cloud Logging: {e}")
-    
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = NonBlockingQueueHandler(log_queue, settings.LOG_QUEUE_SIZE)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE))
+    root_logger.addHandler(queue_handler)
+
+    handlers = _output_handlers()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.error").setLevel(logging.INFO) 
+    logging.getLogger("uvicorn.error").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    
-logger = logging.getLogger(__name__)
\ No newline at end of file
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+logger = logging.getLogger(__name__)
@@ -0,0 +1,220 @@
+"""Prometheus metrics
+
+- ``MetricsMiddleware`` records a latency histogram per route template
+  (``/api/v1/draft/session/{session_id}``, never the raw path) and status.
+- ``stage(operation, name)`` times one stage of a request (queue wait,
+  cache lookup, compute, serialize) into ``lol_stage_duration_seconds``,
+  so a slow p99 can be attributed to the stage that causes it.
+- ``CallbackGauge`` families are read from live objects at scrape time
+  (cache hit ratios, Riot rate-limit headroom), costing nothing between
+  scrapes.
+
+With ``ENABLE_METRICS`` off, ``stage`` is a no-op and nothing is mounted.
+"""
+import contextvars
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sub-millisecond resolution: most stages are tens of microseconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+SNAPSHOT_LOAD_SECONDS = Gauge(
+    "lol_snapshot_load_seconds",
+    "Time to memory-map and install the stats snapshot",
+    ["patch"],
+)
+SNAPSHOT_BYTES = Gauge(
+    "lol_snapshot_bytes",
+    "Size of the mapped stats snapshot",
+    ["patch"],
+)
+STARTUP_SECONDS = Gauge(
+    "lol_startup_seconds",
+    "Cold start: each lifespan step, the whole lifespan, and process start to ready",
+    ["step"],
+)
+REQUEST_SECONDS = Histogram(
+    "lol_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "lol_http_requests_in_flight",
+    "HTTP requests being handled",
+)
+STAGE_SECONDS = Histogram(
+    "lol_stage_duration_seconds",
+    "Time spent in one stage of an operation",
+    ["operation", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "lol_cache_lookups_total",
+    "Cache lookups made by an operation",
+    ["operation", "result"],
+)
+RIOT_QUEUE_DEPTH = Gauge(
+    "lol_riot_queue_depth",
+    "Riot API requests waiting on the rate-limit scheduler",
+)
+
+_request_scope: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "request_scope", default=None
+)
+
+
+class CallbackGauge:
+    """Gauge family computed at scrape time from ``{label value: value}`` sources"""
+
+    def __init__(self, name: str, documentation: str, label: str, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.sources: List[Callable[[], Dict[str, float]]] = []
+        registry.register(self)
+
+    def add(self, source: Callable[[], Dict[str, float]]) -> None:
+        self.sources.append(source)
+
+    def describe(self):
+        return [GaugeMetricFamily(self.name, self.documentation, labels=[self.label])]
+
+    def collect(self):
+        family = GaugeMetricFamily(self.name, self.documentation, labels=[self.label])
+        for source in self.sources:
+            try:
+                values = source()
+            except Exception as e:
+                logger.debug(f"Metric source for {self.name} failed: {e}")
+                continue
+            for key, value in values.items():
+                family.add_metric([key], float(value))
+        yield family
+
+
+CACHE_HIT_RATIO = CallbackGauge(
+    "lol_cache_hit_ratio", "Hits over lookups since start, per cache", "cache"
+)
+RIOT_RATE_LIMIT_HEADROOM = CallbackGauge(
+    "lol_riot_rate_limit_headroom",
+    "Fraction of each Riot rate-limit layer (app, region, method) still available",
+    "layer",
+)
+
+
+class _Stage:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: Any):
+        self.child = child
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NO_STAGE = _NoStage()
+# Bound histogram children; labels() is a locked dict lookup per call otherwise
+_stage_children: Dict[tuple, Any] = {}
+
+
+def _stage_child(operation: str, name: str) -> Any:
+    child = _stage_children.get((operation, name))
+    if child is None:
+        child = _stage_children[(operation, name)] = STAGE_SECONDS.labels(operation, name)
+    return child
+
+
+def stage(operation: str, name: str):
+    """Context manager timing a stage: ``with stage("draft.suggestions", "compute"):``"""
+    if not settings.ENABLE_METRICS:
+        return _NO_STAGE
+    return _Stage(_stage_child(operation, name))
+
+
+def observe_stage(operation: str, name: str, seconds: float) -> None:
+    """Record a stage timed elsewhere, e.g. queue wait measured from an enqueue timestamp"""
+    if settings.ENABLE_METRICS:
+        _stage_child(operation, name).observe(seconds)
+
+
+def count_cache(operation: str, hit: bool, count: int = 1) -> None:
+    if settings.ENABLE_METRICS and count:
+        CACHE_LOOKUPS.labels(operation, "hit" if hit else "miss").inc(count)
+
+
+def current_route() -> str:
+    """Route template of the request being handled, "none" outside requests"""
+    scope = _request_scope.get()
+    if scope is None:
+        return "none"
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency histogram and in-flight gauge"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = _request_scope.set(scope)
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _request_scope.reset(token)
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                scope["method"], getattr(route, "path", "unmatched"), str(status)
+            ).observe(elapsed)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus text exposition of the default registry"""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
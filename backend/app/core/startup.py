@@ -0,0 +1,146 @@
+"""Cold-start profiling: lifespan step durations and, on demand, import times
+
+Lifespan steps are always timed (a ``perf_counter`` pair each) and, once
+startup finishes, logged as one structured record and exported as
+``lol_startup_seconds{step}``. With the ``STARTUP_PROFILE`` environment
+variable set, a meta path finder installed before the application
+imports also times every module import, and the record lists the
+``STARTUP_PROFILE_TOP`` slowest modules by self time (their own body,
+excluding nested imports) and inclusive time.
+
+This module only uses the standard library and reads its switches from
+the environment, so ``app.main`` can import it before anything else,
+settings included.
+"""
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Close enough to process start: app.main imports this module first
+PROCESS_START = time.perf_counter()
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Wraps the loader of every module found by the other finders to time ``exec_module``"""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            spec = find_spec(name, path, target) if find_spec is not None else None
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Class loaders (builtins, frozen) are shared; only per-module instances are wrapped
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self.profiler._timed(name, loader.exec_module)
+        return spec
+
+
+class StartupProfiler:
+    """Collects lifespan step and import timings until ``finish``"""
+
+    def __init__(self, top: int = 25):
+        self.top = top
+        self.steps: List[Tuple[str, float]] = []
+        # module -> (self seconds, inclusive seconds)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self._finder: Optional[_ImportTimer] = None
+        self._local = threading.local()
+        self.report: Optional[Dict[str, Any]] = None
+
+    @property
+    def profiling_imports(self) -> bool:
+        return self._finder is not None
+
+    def install(self) -> None:
+        """Start timing imports (call before the heavy imports)"""
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    def _timed(self, name: str, exec_module):
+        def exec_module_timed(module):
+            stack = self._local.__dict__.setdefault("stack", [])
+            nested = [0.0]
+            stack.append(nested)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                total = time.perf_counter() - start
+                stack.pop()
+                if stack:
+                    stack[-1][0] += total
+                self.imports[name] = (total - nested[0], total)
+        return exec_module_timed
+
+    @contextmanager
+    def step(self, name: str):
+        """Time one lifespan step"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start))
+
+    def slowest_imports(self, top: Optional[int] = None) -> List[Dict[str, Any]]:
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {"module": name, "self_ms": round(own * 1000, 2), "total_ms": round(total * 1000, 2)}
+            for name, (own, total) in ranked[:top or self.top]
+        ]
+
+    def finish(self) -> Dict[str, Any]:
+        """Stop profiling, log the report and export the step gauges"""
+        from app.core.metrics import STARTUP_SECONDS
+
+        ready = time.perf_counter() - PROCESS_START
+        lifespan = sum(seconds for _, seconds in self.steps)
+        report: Dict[str, Any] = {
+            "ready_ms": round(ready * 1000, 2),
+            "lifespan_ms": round(lifespan * 1000, 2),
+            "steps": {name: round(seconds * 1000, 2) for name, seconds in self.steps},
+        }
+        if self.profiling_imports:
+            report["imports_ms"] = round(sum(own for own, _ in self.imports.values()) * 1000, 2)
+            report["modules_imported"] = len(self.imports)
+            report["slowest_imports"] = self.slowest_imports()
+        self.uninstall()
+
+        for name, seconds in self.steps:
+            STARTUP_SECONDS.labels(step=name).set(seconds)
+        STARTUP_SECONDS.labels(step="lifespan").set(lifespan)
+        STARTUP_SECONDS.labels(step="ready").set(ready)
+        logger.info(
+            f"Startup ready in {report['ready_ms']:.0f} ms (lifespan {report['lifespan_ms']:.0f} ms)",
+            extra={"startup": report},
+        )
+        self.report = report
+        return report
+
+
+startup_profiler = StartupProfiler(top=int(os.getenv("STARTUP_PROFILE_TOP", "25")))
+if os.getenv("STARTUP_PROFILE", "").lower() in ("1", "true", "yes"):
+    startup_profiler.install()
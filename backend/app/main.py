@@ -1,28 +1,56 @@
+# First, so STARTUP_PROFILE can time every import below
+from app.core.startup import startup_profiler
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
-import uvicorn
 
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.lazy import lazy_import
 from app.core.logging import setup_logging
+from app.core.metrics import MetricsMiddleware, metrics_endpoint
 from app.services.riot_service import RiotService
 from app.ml.model_manager import ModelManager
+from app.services.snapshot import load_snapshot
+from app.services.draft_search import draft_search
+from app.services.session_store import session_store
+from app.services.websocket_service import websocket_hub
 
 # Setup logging
 setup_logging()
 
+# Only used once the stats repository has opened the engine
+database = lazy_import("app.core.database")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
-    await RiotService.initialize()
-    await ModelManager.load_models()
+    with startup_profiler.step("load_snapshot"):
+        load_snapshot()
+    with startup_profiler.step("session_store"):
+        await session_store.start()
+    with startup_profiler.step("websocket_hub"):
+        await websocket_hub.start()
+    with startup_profiler.step("riot_service"):
+        await RiotService.initialize()
+    with startup_profiler.step("load_models"):
+        await ModelManager.load_models()
+    with startup_profiler.step("draft_search"):
+        draft_search.start()
+    startup_profiler.finish()
     yield
     # Shutdown
     await RiotService.cleanup()
     await ModelManager.cleanup()
+    draft_search.shutdown()
+    await websocket_hub.close()
+    await session_store.close()
+    if database.loaded:
+        await database.dispose_engine()
 
 app = FastAPI(
     title="LoL Draft AI Tool API",
@@ -47,6 +75,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics, outermost so they include every other middleware
+if settings.ENABLE_METRICS:
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 # API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -55,7 +88,18 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "version": "1.0.0"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until every model needed at startup is loaded"""
+    ready = ModelManager.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "loading", "models": ModelManager.status()},
+    )
+
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
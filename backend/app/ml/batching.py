@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from app.core.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Coalesces concurrent single-item calls into one vectorized call
+
+    The first queued item opens a batch; it is dispatched once ``max_batch``
+    items are waiting or ``max_wait`` seconds have passed, whichever comes
+    first. With ``dispatch_when_idle`` a call arriving while no batch is
+    running goes out at once, so a lone caller never pays ``max_wait`` and
+    batches form from the calls that queue up behind a running one.
+
+    ``fn`` maps a list of items to a list of results in the same order and
+    runs on ``executor`` (default thread pool) so inference never blocks
+    the event loop. An exception fails every call in its batch. Queue wait
+    and compute time are recorded as stages of operation ``name``.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[T]], Sequence[R]],
+        max_batch: int = 64,
+        max_wait: float = 0.005,
+        executor: Optional[Executor] = None,
+        dispatch_when_idle: bool = True,
+        name: str = "batch",
+    ):
+        self.fn = fn
+        self.name = name
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.executor = executor
+        self.dispatch_when_idle = dispatch_when_idle
+        self._pending: List[Tuple[T, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        self._running = 0
+        self.stats = {"batches": 0, "items": 0, "batch_seconds": 0.0}
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.stats["items"] / self.stats["batches"] if self.stats["batches"] else 0.0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        idle = self.dispatch_when_idle and not self._running
+        if len(self._pending) >= self.max_batch or idle:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            # Overflow opens the next batch straight away
+            self._timer = asyncio.get_running_loop().call_later(0, self._dispatch)
+        if batch:
+            self._running += 1
+            task = asyncio.create_task(self._run(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future, float]]) -> None:
+        items = [item for item, _, _ in batch]
+        start = time.perf_counter()
+        for _, _, enqueued in batch:
+            observe_stage(self.name, "queue_wait", start - enqueued)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.fn, items
+            )
+        except Exception as e:
+            self._running -= 1
+            logger.error(f"Batch of {len(items)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._running -= 1
+        if self._pending and self.dispatch_when_idle and not self._running:
+            # Whatever queued up behind this batch is the next batch
+            self._dispatch()
+        self.stats["batches"] += 1
+        self.stats["items"] += len(items)
+        elapsed = time.perf_counter() - start
+        self.stats["batch_seconds"] += elapsed
+        observe_stage(self.name, "compute", elapsed)
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,66 @@
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from app.ml.model_manager import ModelManager
+from app.models.draft import MatchupPrediction
+from app.services.matchup_store import ChampionIndex
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "matchup_predictor"
+
+
+class MatchupPredictor:
+    """Head-to-head win probability for one champion against another
+
+    The ``matchup_predictor`` artifact has the same shape as
+    ``win_predictor``: ``estimator`` (a classifier with ``predict_proba``),
+    ``champion_ids`` (the feature order) and ``version``. Features are +1
+    for the champion and -1 for the opponent.
+    """
+
+    def __init__(self, estimator: Any, champion_ids: Sequence[int], version: str):
+        self.estimator = estimator
+        self.index = ChampionIndex(champion_ids)
+        self.version = version
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, Any]) -> "MatchupPredictor":
+        return cls(artifact["estimator"], artifact["champion_ids"], artifact["version"])
+
+    def predict(self, champion_id: int, opponent_id: int) -> MatchupPrediction:
+        for cid in (champion_id, opponent_id):
+            if cid not in self.index:
+                raise KeyError(cid)
+        x = np.zeros((1, len(self.index)), dtype=np.float32)
+        x[0, self.index.position(champion_id)] = 1.0
+        x[0, self.index.position(opponent_id)] = -1.0
+        return MatchupPrediction(
+            champion_id=champion_id,
+            opponent_id=opponent_id,
+            win_rate=float(self.estimator.predict_proba(x)[0, 1]),
+            model_version=self.version,
+        )
+
+
+class MatchupPredictionService:
+    """Loads the matchup model on the first request (it is not eager)"""
+
+    _predictor: Optional[MatchupPredictor] = None
+
+    @classmethod
+    async def predictor(cls) -> MatchupPredictor:
+        """The current MatchupPredictor, LookupError if the model is missing"""
+        artifact = await ModelManager.get(MODEL_NAME)
+        if artifact is None:
+            raise LookupError("Matchup prediction model is not available")
+        if cls._predictor is None or cls._predictor.estimator is not artifact["estimator"]:
+            cls._predictor = MatchupPredictor.from_artifact(artifact)
+        return cls._predictor
+
+    @classmethod
+    async def predict(cls, champion_id: int, opponent_id: int) -> MatchupPrediction:
+        predictor = await cls.predictor()
+        return predictor.predict(champion_id, opponent_id)
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+
+class ModelSpec(NamedTuple):
+    filename: str
+    # Loaded at startup; everything else loads on first use
+    eager: bool = False
+    # joblib mmap_mode for estimators dominated by large arrays
+    mmap_mode: Optional[str] = None
+
+
+MODELS: Dict[str, ModelSpec] = {
+    # Live draft win probability, needed by /draft
+    "win_predictor": ModelSpec("win_predictor.joblib", eager=True),
+    # /predictions
+    "matchup_predictor": ModelSpec("matchup_predictor.joblib", mmap_mode="r"),
+    # /analytics
+    "meta_trends": ModelSpec("meta_trends.joblib", mmap_mode="r"),
+}
+
+
+class LoadStatus(str, Enum):
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+    MISSING = "missing"
+
+
+class ModelState:
+    """Load progress for one model, reported by /ready"""
+
+    def __init__(self, name: str, spec: ModelSpec):
+        self.name = name
+        self.spec = spec
+        self.status = LoadStatus.PENDING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status.value,
+            "eager": self.spec.eager,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+class ModelManager:
+    """Loads joblib models concurrently in a thread pool
+
+    ``load_models`` only schedules the eager models and returns, so the app
+    starts accepting traffic (``/champions``, ``/health``) while they load;
+    ``/ready`` turns green once every eager model is in memory. Other
+    models load on the first ``get``; concurrent callers share one load.
+    """
+
+    _models: Dict[str, Any] = {}
+    _states: Dict[str, ModelState] = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    async def load_models(cls):
+        """Start loading every eager model in the background"""
+        cls._executor = ThreadPoolExecutor(
+            max_workers=settings.MODEL_LOAD_WORKERS, thread_name_prefix="model-load"
+        )
+        cls._states = {name: ModelState(name, spec) for name, spec in MODELS.items()}
+        for state in cls._states.values():
+            if state.spec.eager:
+                cls._start(state)
+
+    @classmethod
+    def _start(cls, state: ModelState) -> asyncio.Task:
+        if state.task is None:
+            state.task = asyncio.create_task(cls._load(state))
+        return state.task
+
+    @classmethod
+    async def _load(cls, state: ModelState) -> Any:
+        path = Path(settings.MODEL_DIR) / state.spec.filename
+        if not path.exists():
+            state.status = LoadStatus.MISSING
+            state.error = f"{path} not found"
+            logger.warning(f"Model {state.name} not found at {path}")
+            return None
+        state.status = LoadStatus.LOADING
+        start = time.perf_counter()
+        try:
+            model = await asyncio.get_running_loop().run_in_executor(
+                cls._executor, _load_file, path, state.spec.mmap_mode
+            )
+        except Exception as e:
+            state.status = LoadStatus.FAILED
+            state.error = str(e)
+            logger.error(f"Failed to load model {state.name}: {e}")
+            return None
+        state.load_seconds = time.perf_counter() - start
+        observe_stage(f"model.{state.name}", "load", state.load_seconds)
+        state.status = LoadStatus.READY
+        cls._models[state.name] = model
+        logger.info(f"Loaded model {state.name} in {state.load_seconds:.2f}s")
+        return model
+
+    @classmethod
+    async def get(cls, name: str) -> Optional[Any]:
+        """The model, loading it first if needed; None if missing or broken"""
+        if name in cls._models:
+            return cls._models[name]
+        if name not in MODELS:
+            raise KeyError(name)
+        if cls._executor is None:
+            await cls.load_models()
+        return await asyncio.shield(cls._start(cls._states[name]))
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Every eager model is loaded"""
+        eager = [s for s in cls._states.values() if s.spec.eager]
+        return bool(cls._states) and all(s.status == LoadStatus.READY for s in eager)
+
+    @classmethod
+    def status(cls) -> Dict[str, Dict[str, Any]]:
+        return {name: state.to_dict() for name, state in cls._states.items()}
+
+    @classmethod
+    async def cleanup(cls):
+        for state in cls._states.values():
+            if state.task is not None and not state.task.done():
+                state.task.cancel()
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+        cls._executor = None
+        cls._models = {}
+        cls._states = {}
+
+
+def _load_file(path: Path, mmap_mode: Optional[str]) -> Any:
+    import joblib
+
+    return joblib.load(path, mmap_mode=mmap_mode)
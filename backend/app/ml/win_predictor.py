@@ -0,0 +1,133 @@
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import count_cache, stage
+from app.ml.batching import MicroBatcher
+from app.ml.model_manager import ModelManager
+from app.models.draft import DraftState, WinPrediction
+from app.services.cache import _MISSING
+from app.services.draft_state import BLUE_PICKS, RED_PICKS, DraftKey, transposition_cache
+from app.services.matchup_store import ChampionIndex
+from app.services.suggestion_engine import TEAM_SIZE, DraftStateBatch
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "win_predictor"
+
+_predictor_versions = itertools.count(1)
+
+
+class WinPredictor:
+    """Blue-side win probability from picks, one vectorized call per batch
+
+    The ``win_predictor`` artifact is a dict with ``estimator`` (any
+    scikit-learn classifier with ``predict_proba``), ``champion_ids`` (the
+    feature order) and ``version``. Features are one column per champion:
+    +1 picked by blue, -1 picked by red. Feature rows are cached per draft
+    state in the transposition cache.
+    """
+
+    def __init__(self, estimator: Any, champion_ids: Sequence[int], version: str):
+        self.estimator = estimator
+        self.index = ChampionIndex(champion_ids)
+        self.version = version
+        # Transposition cache context: a reloaded artifact never reads old entries
+        self.context = f"{version}:{next(_predictor_versions)}"
+
+    @classmethod
+    def from_artifact(cls, artifact: Dict[str, Any]) -> "WinPredictor":
+        return cls(artifact["estimator"], artifact["champion_ids"], artifact["version"])
+
+    def features(self, batch: DraftStateBatch) -> np.ndarray:
+        n = len(batch)
+        x = np.zeros((n, len(self.index) + 1), dtype=np.float32)
+        rows = np.repeat(np.arange(n), TEAM_SIZE)
+        for team, sign in ((0, 1.0), (1, -1.0)):
+            # Unknown champions (-1) land in the spare last column and are dropped
+            cols = batch.picks[:, team, :].ravel()
+            x[rows, cols] += np.where(cols >= 0, sign, 0.0)
+        return x[:, :-1]
+
+    def blue_win_proba(self, batch: DraftStateBatch) -> np.ndarray:
+        """Raw blue win probabilities, uncached: (N,)"""
+        return self.estimator.predict_proba(self.features(batch))[:, 1]
+
+    def predict(self, states: List[DraftState]) -> List[WinPrediction]:
+        keys = [DraftKey.from_state(state) for state in states]
+
+        def compute(missing: List[int]) -> np.ndarray:
+            batch = DraftStateBatch.from_states([states[i] for i in missing], self.index)
+            return self.features(batch)
+
+        rows = transposition_cache.get_many("features", self.context, keys, compute)
+        blue = self.estimator.predict_proba(np.stack(rows))[:, 1]
+        # Confidence grows with the margin and with how much of the draft is known
+        picked = [(k.bits[BLUE_PICKS] | k.bits[RED_PICKS]).bit_count() for k in keys]
+        filled = np.minimum(np.array(picked) / (2 * TEAM_SIZE), 1.0)
+        confidence = np.abs(blue - 0.5) * 2.0 * filled
+        return [
+            WinPrediction(
+                blue_team_win_rate=float(p),
+                red_team_win_rate=float(1.0 - p),
+                confidence=float(c),
+                key_factors=self._factors(float(p), float(f)),
+                model_version=self.version,
+            )
+            for p, c, f in zip(blue, confidence, filled)
+        ]
+
+    @staticmethod
+    def _factors(blue: float, filled: float) -> List[str]:
+        factors = []
+        if filled < 1.0:
+            factors.append(f"Draft {filled:.0%} complete")
+        if abs(blue - 0.5) >= 0.05:
+            side = "Blue" if blue > 0.5 else "Red"
+            factors.append(f"{side} team favored by the model")
+        return factors
+
+
+class WinPredictionService:
+    """Routes single-draft predictions through a shared micro-batcher"""
+
+    _batcher: Optional[MicroBatcher] = None
+    _predictor: Optional[WinPredictor] = None
+
+    @classmethod
+    async def _get_batcher(cls) -> MicroBatcher:
+        artifact = await ModelManager.get(MODEL_NAME)
+        if artifact is None:
+            raise LookupError("Win prediction model is not available")
+        if cls._predictor is None or cls._predictor.estimator is not artifact["estimator"]:
+            cls._predictor = WinPredictor.from_artifact(artifact)
+            cls._batcher = MicroBatcher(
+                cls._predictor.predict,
+                max_batch=settings.WIN_PREDICTION_MAX_BATCH,
+                max_wait=settings.WIN_PREDICTION_MAX_WAIT_MS / 1000.0,
+                name="win_prediction",
+            )
+        return cls._batcher
+
+    @classmethod
+    async def predictor(cls) -> WinPredictor:
+        """The current WinPredictor, LookupError if the model is missing"""
+        await cls._get_batcher()
+        return cls._predictor
+
+    @classmethod
+    async def predict(cls, state: DraftState) -> WinPrediction:
+        """Win prediction for a DraftState or DraftSession, cached per draft state"""
+        batcher = await cls._get_batcher()
+        context = cls._predictor.context
+        with stage("win_prediction", "cache"):
+            key = DraftKey.from_state(state)
+            prediction = transposition_cache.get("prediction", context, key)
+        count_cache("win_prediction", prediction is not _MISSING)
+        if prediction is _MISSING:
+            prediction = await batcher.submit(state)
+            transposition_cache.set("prediction", context, key, prediction)
+        return prediction
@@ -156,4 +156,68 @@ class ChampionTierList(BaseModel):
     algorithm_version: str = Field(..., description="Tier calculation version")
     
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+
+class TrendPoint(BaseModel):
+    """One patch of a champion trend"""
+    patch: str = Field(..., description="Patch version")
+    games: int = Field(..., description="Games in the slice")
+    win_rate: float = Field(..., description="Win rate percentage")
+    pick_rate: float = Field(..., description="Pick rate percentage")
+    ban_rate: float = Field(..., description="Ban rate percentage")
+
+class ChampionTrend(BaseModel):
+    """Win, pick and ban rates of a champion across patches"""
+    champion_id: int = Field(..., description="Champion ID")
+    rank_tier: str = Field(..., description="Rank context (ALL for every tier)")
+    role: Optional[Role] = Field(None, description="Role context")
+    points: List[TrendPoint] = Field(default=[], description="One point per patch, oldest first")
+    
+    class Config:
+        use_enum_values = True
+
+class MatchupTrendPoint(BaseModel):
+    """One patch of a matchup trend"""
+    patch: str = Field(..., description="Patch version")
+    win_rate: float = Field(..., description="Champion win rate against the opponent")
+    counter_strength: float = Field(..., description="Counter strength 0-100")
+    games_analyzed: int = Field(..., description="Games in this matchup")
+
+class MatchupTrend(BaseModel):
+    """A matchup across patches"""
+    champion_id: int = Field(..., description="Champion ID")
+    opponent_id: int = Field(..., description="Opponent champion ID")
+    rank_tier: str = Field(..., description="Rank context")
+    role: Optional[Role] = Field(None, description="Role context")
+    points: List[MatchupTrendPoint] = Field(default=[], description="One point per patch, oldest first")
+    
+    class Config:
+        use_enum_values = True
+
+class ChampionCounters(BaseModel):
+    """Counters and synergy partners for a champion"""
+    champion_id: int = Field(..., description="Champion ID")
+    patch: str = Field(..., description="Patch version")
+    role: Optional[Role] = Field(None, description="Role context")
+    counters: List[ChampionMatchup] = Field(default=[], description="Champions that counter it")
+    synergies: List[ChampionSynergy] = Field(default=[], description="Best synergy partners")
+    
+    class Config:
+        use_enum_values = True
+
+class CatalogRefreshJob(BaseModel):
+    """Background champion data refresh (POST /champions/update-data)"""
+    id: str = Field(..., description="Job ID")
+    status: str = Field("pending", description="pending, running, succeeded or failed")
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = Field(None, description="When the job ended")
+    
+    # Outcome
+    version: Optional[str] = Field(None, description="Data Dragon champion data version")
+    not_modified: bool = Field(False, description="Nothing changed upstream; catalog untouched")
+    requests: int = Field(0, description="HTTP requests made")
+    added: List[int] = Field(default=[], description="New champion IDs")
+    removed: List[int] = Field(default=[], description="Champion IDs no longer listed")
+    changed: List[int] = Field(default=[], description="Champion IDs whose data changed")
+    unchanged: int = Field(0, description="Champions kept as they were")
+    error: Optional[str] = Field(None, description="Failure reason")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, conint
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -71,6 +71,13 @@ class WinPrediction(BaseModel):
     model_version: str = Field(..., description="ML model version used")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+class MatchupPrediction(BaseModel):
+    """Lane matchup win probability from the matchup model"""
+    champion_id: int = Field(..., description="Champion ID")
+    opponent_id: int = Field(..., description="Opponent champion ID")
+    win_rate: float = Field(..., description="Champion win probability 0-1")
+    model_version: str = Field(..., description="ML model version used")
+
 class DraftSession(BaseModel):
     """Complete draft session"""
     id: str = Field(..., description="Unique session ID")
@@ -104,6 +111,9 @@ class DraftSession(BaseModel):
     is_tournament_draft: bool = Field(default=False, description="Tournament mode (10 bans)")
     patch_version: str = Field(default="14.19", description="Game patch")
     
+    # Incremental composition state (services.composition), never serialized
+    _composition: Optional[Any] = PrivateAttr(default=None)
+    
     class Config:
         use_enum_values = True
 
@@ -127,4 +137,48 @@ class DraftSuggestion(BaseModel):
     ban_rate: float = Field(..., description="Current ban rate in meta")
     
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+
+# Exclusive upper bound on champion IDs in a draft state; they become bit
+# positions in DraftKey, so an unbounded ID would allocate an unbounded int
+CHAMPION_ID_LIMIT = 4096
+ChampionId = conint(ge=0, lt=CHAMPION_ID_LIMIT)
+
+class DraftState(BaseModel):
+    """Minimal draft state for batch scoring"""
+    blue_picks: List[ChampionId] = Field(default=[], description="Blue team champion IDs")
+    red_picks: List[ChampionId] = Field(default=[], description="Red team champion IDs")
+    blue_bans: List[ChampionId] = Field(default=[], description="Blue team banned champions")
+    red_bans: List[ChampionId] = Field(default=[], description="Red team banned champions")
+    current_phase: DraftPhase = Field(..., description="Current draft phase")
+    current_team: Team = Field(..., description="Team to act")
+    
+    class Config:
+        use_enum_values = True
+
+class BatchSuggestionRequest(BaseModel):
+    """Batch of draft states to score in one pass"""
+    states: List[DraftState] = Field(..., description="Draft states to score")
+    patch: str = Field(default="14.19", description="Game patch")
+    rank_tier: str = Field(default="PLATINUM", description="Rank tier for stats")
+    limit: int = Field(default=5, ge=1, le=50, description="Suggestions per state")
+
+class DraftSearchRequest(BaseModel):
+    """Lookahead search from one draft state"""
+    state: DraftState = Field(..., description="Draft state to search from")
+    session_id: Optional[str] = Field(None, description="Reuse the search tree across this session's actions")
+    patch: str = Field(default="14.19", description="Game patch")
+    rank_tier: str = Field(default="PLATINUM", description="Rank tier for stats")
+    budget_ms: Optional[float] = Field(None, gt=0, le=2000, description="Search time budget in ms")
+    limit: int = Field(default=5, ge=1, le=20, description="Suggestions to return")
+
+class DraftSearchResult(BaseModel):
+    """Suggestions ranked by lookahead search"""
+    suggestions: List[DraftSuggestion] = Field(..., description="Suggestions, most searched first")
+    win_rate: float = Field(..., description="Acting team win probability with best play found")
+    baseline_win_rate: float = Field(..., description="Model win probability for the current state")
+    principal_variation: List[int] = Field(default=[], description="Expected continuation (champion IDs)")
+    iterations: int = Field(..., description="Search iterations run for this request")
+    visits: int = Field(..., description="Visits at the root, including reused ones")
+    reused_visits: int = Field(0, description="Visits carried over from the session's previous search")
+    model_version: str = Field(..., description="ML model version used")
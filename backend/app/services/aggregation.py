@@ -0,0 +1,520 @@
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.services.ingestion import ParsedMatch
+from app.services.matchup_store import ROLES, ChampionIndex, MatchupMatrices, matchup_store
+from app.services.stats_store import ALL_ROLES, KDA_FIELDS, ChampionStatsTable, stats_store
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANTS = 10
+TEAM_SIZE = 5
+
+# Accumulator column for participants without a teamPosition
+NO_ROLE = len(ROLES)
+
+# Games ending before 25 min count toward early_game_wr, 25-35 toward mid,
+# 35+ toward late; Match-v5 has no per-minute win state without timelines
+PHASE_BOUNDS = np.array([25 * 60, 35 * 60], dtype=np.float32)
+PHASES = len(PHASE_BOUNDS) + 1
+
+# Per-participant columns, shape (matches, PARTICIPANTS)
+PARTICIPANT_COLUMNS: Dict[str, type] = {
+    "champion": np.int16,
+    "role": np.int8,
+    "team": np.int8,
+    "win": np.bool_,
+    "kills": np.int16,
+    "deaths": np.int16,
+    "assists": np.int16,
+    "cs": np.int32,
+    "gold": np.int32,
+    "damage": np.int32,
+}
+
+# Per-match columns; ``bans`` is (matches, PARTICIPANTS) padded with -1
+MATCH_COLUMNS: Dict[str, type] = {
+    "patch": np.int16,
+    "rank_tier": np.int16,
+    "duration": np.float32,
+    "bans": np.int16,
+}
+
+# Summed per (champion, role column); role column NO_ROLE holds unknown positions
+SUM_FIELDS = ("games", "wins", "kills", "deaths", "assists", "cs", "gold", "damage", "minutes")
+
+GroupKey = Tuple[str, str]
+
+CAPACITY_STEP = 64
+
+
+class MatchChunk:
+    """Parsed matches as fixed-width columns, one row per match
+
+    Participant columns are ``(matches, 10)`` so pairwise reductions are
+    plain array slicing. Patch and rank tier are dictionary-encoded against
+    the chunk's own ``patches``/``rank_tiers`` lists. On disk a chunk is a
+    directory of ``.npy`` files plus ``meta.json`` and is loaded memory-mapped.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        patches: List[str],
+        rank_tiers: List[str],
+        match_ids: Optional[np.ndarray] = None,
+    ):
+        self.columns = columns
+        self.patches = patches
+        self.rank_tiers = rank_tiers
+        self.match_ids = match_ids
+
+    def __len__(self) -> int:
+        return int(self.columns["patch"].shape[0])
+
+    @property
+    def rows(self) -> int:
+        """Participant rows"""
+        return len(self) * PARTICIPANTS
+
+    @classmethod
+    def from_matches(cls, matches: Sequence[ParsedMatch]) -> "MatchChunk":
+        n = len(matches)
+        columns = {
+            name: np.zeros((n, PARTICIPANTS), dtype=dtype)
+            for name, dtype in PARTICIPANT_COLUMNS.items()
+        }
+        columns["champion"][:] = -1
+        columns["role"][:] = -1
+        columns["bans"] = np.full((n, PARTICIPANTS), -1, dtype=np.int16)
+        patches: Dict[str, int] = {}
+        rank_tiers: Dict[str, int] = {}
+        patch = np.empty(n, dtype=np.int16)
+        rank_tier = np.empty(n, dtype=np.int16)
+        duration = np.empty(n, dtype=np.float32)
+
+        for i, match in enumerate(matches):
+            patch[i] = patches.setdefault(match.patch, len(patches))
+            rank_tier[i] = rank_tiers.setdefault(match.rank_tier, len(rank_tiers))
+            duration[i] = match.duration
+            participants = match.participants[:PARTICIPANTS]
+            k = len(participants)
+            columns["champion"][i, :k] = [p.champion_id for p in participants]
+            columns["role"][i, :k] = [
+                ROLES.index(p.role) if p.role in ROLES else -1 for p in participants
+            ]
+            columns["team"][i, :k] = [0 if p.team_id == 100 else 1 for p in participants]
+            columns["win"][i, :k] = [p.win for p in participants]
+            for name in ("kills", "deaths", "assists", "cs", "gold", "damage"):
+                columns[name][i, :k] = [getattr(p, name) for p in participants]
+            bans = match.bans[:PARTICIPANTS]
+            columns["bans"][i, :len(bans)] = bans
+
+        columns.update(patch=patch, rank_tier=rank_tier, duration=duration)
+        match_ids = np.array([m.match_id for m in matches], dtype=str)
+        return cls(columns, list(patches), list(rank_tiers), match_ids)
+
+    def save(self, path: Path) -> None:
+        """Write atomically: build in a temp directory, then rename into place"""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name, array in self.columns.items():
+            np.save(tmp / f"{name}.npy", array)
+        if self.match_ids is not None:
+            np.save(tmp / "match_ids.npy", self.match_ids)
+        (tmp / "meta.json").write_text(
+            json.dumps(
+                {"patches": self.patches, "rank_tiers": self.rank_tiers, "matches": len(self)}
+            )
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "MatchChunk":
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        columns = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in (*PARTICIPANT_COLUMNS, *MATCH_COLUMNS)
+        }
+        ids_path = path / "match_ids.npy"
+        match_ids = np.load(ids_path, mmap_mode="r") if ids_path.exists() else None
+        return cls(columns, meta["patches"], meta["rank_tiers"], match_ids)
+
+
+class GroupTotals:
+    """Additive sums for one (patch, rank_tier); merging a chunk only adds to them
+
+    Champion axes are indexed by the engine's slot numbers and grow on
+    demand in steps of ``CAPACITY_STEP``.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = 0
+        self.matches = 0
+        self.sums: Dict[str, np.ndarray] = {}
+        self.phase_games = np.zeros((PHASES, 0, NO_ROLE + 1))
+        self.phase_wins = np.zeros_like(self.phase_games)
+        self.bans = np.zeros(0)
+        self.matchup_games = np.zeros((len(ROLES), 0, 0))
+        self.matchup_wins = np.zeros_like(self.matchup_games)
+        self.synergy_games = np.zeros((0, 0))
+        self.synergy_wins = np.zeros_like(self.synergy_games)
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        if capacity <= self.capacity:
+            return
+        old = self.capacity
+        capacity = -(-capacity // CAPACITY_STEP) * CAPACITY_STEP
+
+        def pad(array: np.ndarray, axes: Sequence[int]) -> np.ndarray:
+            shape = list(array.shape)
+            for axis in axes:
+                shape[axis] = capacity
+            grown = np.zeros(shape, dtype=np.float64)
+            region = tuple(slice(0, old) if a in axes else slice(None) for a in range(len(shape)))
+            grown[region] = array
+            return grown
+
+        self.sums = {
+            name: pad(self.sums.get(name, np.zeros((0, NO_ROLE + 1))), [0]) for name in SUM_FIELDS
+        }
+        self.phase_games = pad(self.phase_games, [1])
+        self.phase_wins = pad(self.phase_wins, [1])
+        self.bans = pad(self.bans, [0])
+        self.matchup_games = pad(self.matchup_games, [1, 2])
+        self.matchup_wins = pad(self.matchup_wins, [1, 2])
+        self.synergy_games = pad(self.synergy_games, [0, 1])
+        self.synergy_wins = pad(self.synergy_wins, [0, 1])
+        self.capacity = capacity
+
+    def merge(
+        self,
+        slots: np.ndarray,
+        ban_slots: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        rows: np.ndarray,
+    ) -> None:
+        """Add the matches at ``rows``; champion and ban IDs already resolved to slots"""
+        cap = self.capacity
+        slots = slots[rows]
+        role = columns["role"][rows].astype(np.int64)
+        team = columns["team"][rows]
+        win = columns["win"][rows]
+        duration = columns["duration"][rows]
+        self.matches += len(rows)
+
+        # Per champion x role sums
+        valid = slots >= 0
+        role_col = np.where(role >= 0, role, NO_ROLE)
+        key = (slots * (NO_ROLE + 1) + role_col)[valid]
+        size = cap * (NO_ROLE + 1)
+        weights = {
+            "games": None,
+            "wins": win[valid],
+            "minutes": np.broadcast_to(duration[:, None] / 60.0, slots.shape)[valid],
+        }
+        for name in ("kills", "deaths", "assists", "cs", "gold", "damage"):
+            weights[name] = columns[name][rows][valid]
+        for name, w in weights.items():
+            self.sums[name] += np.bincount(key, weights=w, minlength=size).reshape(cap, -1)
+
+        phase = np.searchsorted(PHASE_BOUNDS, duration, side="right")
+        phase_key = np.broadcast_to(phase[:, None], slots.shape)[valid] * size + key
+        self.phase_games += np.bincount(phase_key, minlength=PHASES * size).reshape(PHASES, cap, -1)
+        self.phase_wins += np.bincount(
+            phase_key, weights=win[valid], minlength=PHASES * size
+        ).reshape(PHASES, cap, -1)
+
+        # Bans, counted once per match
+        banned = np.sort(ban_slots[rows], axis=1)
+        first = np.ones(banned.shape, dtype=bool)
+        first[:, 1:] = banned[:, 1:] != banned[:, :-1]
+        banned = banned[first & (banned >= 0)]
+        self.bans += np.bincount(banned, minlength=cap)
+
+        # Team results; only regular 5v5 rosters feed the pairwise tables
+        full = (valid.sum(axis=1) == PARTICIPANTS) & (team.sum(axis=1) == TEAM_SIZE)
+        if not full.any():
+            return
+        slots, role, team, win = slots[full], role[full], team[full], win[full]
+        n = len(slots)
+        order = np.argsort(team, axis=1, kind="stable")
+        roster = np.take_along_axis(slots, order, axis=1).reshape(n, 2, TEAM_SIZE)
+        team_win = np.take_along_axis(win, order, axis=1).reshape(n, 2, TEAM_SIZE)[:, :, 0]
+
+        # Lane matchups: both teams' player in the same position
+        lane = np.full((n, 2, len(ROLES)), -1, dtype=np.int64)
+        match_idx, slot_idx = np.nonzero(role >= 0)
+        lane[match_idx, team[match_idx, slot_idx], role[match_idx, slot_idx]] = slots[
+            match_idx, slot_idx
+        ]
+        blue, red = lane[:, 0], lane[:, 1]
+        paired = (blue >= 0) & (red >= 0)
+        lane_role = np.broadcast_to(np.arange(len(ROLES)), blue.shape)[paired]
+        blue, red = blue[paired], red[paired]
+        blue_won = np.broadcast_to(team_win[:, :1], paired.shape)[paired]
+        size = len(ROLES) * cap * cap
+        blue_key = (lane_role * cap + blue) * cap + red
+        red_key = (lane_role * cap + red) * cap + blue
+        shape = (len(ROLES), cap, cap)
+        self.matchup_games += (
+            np.bincount(blue_key, minlength=size) + np.bincount(red_key, minlength=size)
+        ).reshape(shape)
+        self.matchup_wins += (
+            np.bincount(blue_key, weights=blue_won, minlength=size)
+            + np.bincount(red_key, weights=~blue_won, minlength=size)
+        ).reshape(shape)
+
+        # Synergies: every ordered pair of teammates
+        first, second = np.nonzero(~np.eye(TEAM_SIZE, dtype=bool))
+        pair_key = (roster[:, :, first] * cap + roster[:, :, second]).ravel()
+        pair_won = np.broadcast_to(team_win[:, :, None], (n, 2, len(first))).ravel()
+        size = cap * cap
+        self.synergy_games += np.bincount(pair_key, minlength=size).reshape(cap, cap)
+        self.synergy_wins += np.bincount(pair_key, weights=pair_won, minlength=size).reshape(
+            cap, cap
+        )
+
+
+class AggregationEngine:
+    """Columnar store of parsed matches with incrementally merged aggregates
+
+    Matches arrive through the ingestion sink interface (``add``/``flush``) or
+    as chunk directories landing under ``directory``; each new chunk is read
+    memory-mapped and folded into per-(patch, rank_tier) sums with grouped
+    ``np.bincount`` reductions, so cost is linear in new rows and independent
+    of history. ``stats_table``/``matchup_matrices`` turn the sums into the
+    dense tables the stores serve; ``publish`` installs them.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, chunk_size: int = 10000):
+        self.directory = Path(directory) if directory else None
+        self.chunk_size = chunk_size
+        self.groups: Dict[GroupKey, GroupTotals] = {}
+        self.merged: Set[str] = set()
+        self._slot_of = np.full(1024, -1, dtype=np.int64)
+        self._champion_ids: List[int] = []
+        self._buffer: List[ParsedMatch] = []
+        self._seen: Optional[Set[str]] = None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    # Champion slots shared by every group
+
+    def _assign_slots(self, champion_ids: np.ndarray) -> None:
+        ids = np.unique(champion_ids)
+        ids = ids[ids >= 0]
+        if ids.size and ids[-1] >= self._slot_of.size:
+            grown = np.full(int(ids[-1]) * 2, -1, dtype=np.int64)
+            grown[: self._slot_of.size] = self._slot_of
+            self._slot_of = grown
+        new = ids[self._slot_of[ids] < 0]
+        if new.size:
+            start = len(self._champion_ids)
+            self._slot_of[new] = np.arange(start, start + new.size)
+            self._champion_ids.extend(int(i) for i in new)
+
+    def _resolve(self, champion_ids: np.ndarray) -> np.ndarray:
+        ids = np.asarray(champion_ids, dtype=np.int64)
+        return np.where(ids >= 0, self._slot_of[np.maximum(ids, 0)], -1)
+
+    # Ingestion sink
+
+    def add(self, match: ParsedMatch) -> None:
+        if self._seen is None:
+            self._seen = self._load_seen()
+        if match.match_id in self._seen:
+            return
+        self._seen.add(match.match_id)
+        self._buffer.append(match)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist buffered matches as a chunk and merge it"""
+        if not self._buffer:
+            return
+        chunk = MatchChunk.from_matches(self._buffer)
+        self._buffer = []
+        name = None
+        if self.directory:
+            name = f"chunk-{self._next_sequence():06d}"
+            chunk.save(self.directory / name)
+        self.merge(chunk, name)
+
+    def _next_sequence(self) -> int:
+        existing = [int(p.name.split("-")[1]) for p in self._chunk_paths()]
+        return max(existing, default=0) + 1
+
+    def _chunk_paths(self) -> List[Path]:
+        if not self.directory:
+            return []
+        return sorted(p for p in self.directory.glob("chunk-*") if p.is_dir())
+
+    def _load_seen(self) -> Set[str]:
+        seen: Set[str] = set()
+        for path in self._chunk_paths():
+            ids_path = path / "match_ids.npy"
+            if ids_path.exists():
+                seen.update(np.load(ids_path).tolist())
+        return seen
+
+    # Merging
+
+    def refresh(self) -> int:
+        """Merge chunks that landed on disk since the last call, returns matches merged"""
+        merged = 0
+        for path in self._chunk_paths():
+            if path.name not in self.merged:
+                chunk = MatchChunk.load(path)
+                self.merge(chunk, path.name)
+                merged += len(chunk)
+        return merged
+
+    def merge(self, chunk: MatchChunk, name: Optional[str] = None) -> None:
+        """Fold one chunk into the running sums"""
+        columns = chunk.columns
+        self._assign_slots(np.concatenate([
+            np.unique(columns["champion"]), np.unique(columns["bans"])
+        ]))
+        capacity = len(self._champion_ids)
+        slots = self._resolve(columns["champion"])
+        ban_slots = self._resolve(columns["bans"])
+        tiers = len(chunk.rank_tiers)
+        group_codes = columns["patch"].astype(np.int64) * tiers + columns["rank_tier"]
+        for code in np.unique(group_codes):
+            key = (chunk.patches[code // tiers], chunk.rank_tiers[code % tiers])
+            totals = self.groups.get(key)
+            if totals is None:
+                totals = self.groups[key] = GroupTotals(capacity)
+            totals.grow(capacity)
+            totals.merge(slots, ban_slots, columns, np.flatnonzero(group_codes == code))
+        if name:
+            self.merged.add(name)
+        logger.debug(f"Merged {len(chunk)} matches ({chunk.rows} participant rows)")
+
+    # Outputs
+
+    def _slice(self, key: GroupKey) -> Tuple[GroupTotals, ChampionIndex, np.ndarray]:
+        totals = self.groups.get(key)
+        if totals is None:
+            raise LookupError(f"No matches aggregated for {key}")
+        known = len(self._champion_ids)
+        totals.grow(known)
+        played = (totals.sums["games"].sum(axis=1) + totals.bans)[:known] > 0
+        ids = np.array(self._champion_ids, dtype=np.int32)[played]
+        index = ChampionIndex(ids)
+        return totals, index, self._slot_of[index.ids]
+
+    def stats_table(self, patch: str, rank_tier: str) -> ChampionStatsTable:
+        """Per champion x role stats; the last column aggregates every role"""
+        totals, index, slots = self._slice((patch, rank_tier))
+        table = ChampionStatsTable(patch, rank_tier, index)
+
+        def by_role(values: np.ndarray) -> np.ndarray:
+            # Accumulator NO_ROLE column -> table ALL_ROLES column (sum of everything)
+            values = values[..., slots, :]
+            return np.concatenate(
+                [values[..., :ALL_ROLES], values.sum(axis=-1, keepdims=True)], axis=-1
+            )
+
+        sums = {name: by_role(array) for name, array in totals.sums.items()}
+        games = sums["games"]
+        played = games > 0
+
+        def ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(denominator > 0, numerator / denominator * scale, np.nan)
+
+        matches = max(totals.matches, 1)
+        bans = totals.bans[slots][:, None] / matches * 100.0
+        phase_games, phase_wins = by_role(totals.phase_games), by_role(totals.phase_wins)
+        metrics = {
+            "pick_rate": np.where(played, games / matches * 100.0, np.nan),
+            "ban_rate": np.where(played, bans, np.nan),
+            "win_rate": ratio(sums["wins"], games, 100.0),
+            "average_cs": ratio(sums["cs"], sums["minutes"]),
+            "average_damage": ratio(sums["damage"], games),
+            "average_gold": ratio(sums["gold"], sums["minutes"]),
+            "early_game_wr": ratio(phase_wins[0], phase_games[0], 100.0),
+            "mid_game_wr": ratio(phase_wins[1], phase_games[1], 100.0),
+            "late_game_wr": ratio(phase_wins[2], phase_games[2], 100.0),
+        }
+        # Banned but never picked still has a meaningful ban rate
+        metrics["ban_rate"][:, ALL_ROLES] = bans[:, 0]
+        for name, values in metrics.items():
+            table.metrics[name][:] = values
+        table.kda[:] = np.stack([ratio(sums[f], games) for f in KDA_FIELDS], axis=-1)
+        table.games[:] = games
+        return table
+
+    def matchup_matrices(
+        self, patch: str, rank_tier: str, role: Optional[str] = None
+    ) -> MatchupMatrices:
+        """Lane matchups and teammate synergies; ``role=None`` pools every lane"""
+        totals, index, slots = self._slice((patch, rank_tier))
+        matrices = MatchupMatrices(patch, rank_tier, role, index)
+        block = np.ix_(slots, slots)
+
+        if role is None:
+            per_role = totals.matchup_games[(slice(None), *block)]
+            games = per_role.sum(axis=0)
+            wins = totals.matchup_wins[(slice(None), *block)].sum(axis=0)
+            lane = per_role.argmax(axis=0)
+        else:
+            r = ROLES.index(role)
+            games = totals.matchup_games[r][block]
+            wins = totals.matchup_wins[r][block]
+            lane = np.full(games.shape, r)
+        seen = games > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            win_rate = np.where(seen, wins / games, np.nan)
+        strength = np.clip(50.0 + (win_rate - 0.5) * 500.0, 0.0, 100.0)
+        matrices.win_rate[:] = win_rate
+        matrices.counter_strength[:] = strength
+        matrices.difficulty_score[:] = 100.0 - strength
+        matrices.matchup_games[:] = games
+        matrices.matchup_role[:] = np.where(seen, lane, -1)
+
+        games = totals.synergy_games[block]
+        wins = totals.synergy_wins[block]
+        seen = games > 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            win_rate = np.where(seen, wins / games, np.nan)
+        matrices.synergy_win_rate[:] = win_rate
+        matrices.synergy_score[:] = np.clip(50.0 + (win_rate - 0.5) * 500.0, 0.0, 100.0)
+        matrices.synergy_pick_rate[:] = np.where(
+            seen, games / max(totals.matches, 1) * 100.0, np.nan
+        )
+        matrices.synergy_games[:] = games
+        matrices.synergy_types, codes = self._synergy_types(totals, slots)
+        matrices.synergy_type[:] = np.where(seen, codes, -1)
+        return matrices
+
+    @staticmethod
+    def _synergy_types(totals: GroupTotals, slots: np.ndarray) -> Tuple[List[str], np.ndarray]:
+        """Label pairs by their main positions: bot lane duo, jungle-lane or team"""
+        types = ["bot_lane", "jungle_lane", "team"]
+        main = totals.sums["games"][slots, :NO_ROLE].argmax(axis=1)
+        a, b = main[:, None], main[None, :]
+        adc, support, jungle = ROLES.index("adc"), ROLES.index("support"), ROLES.index("jungle")
+        bot = ((a == adc) & (b == support)) | ((a == support) & (b == adc))
+        jungle_lane = (a == jungle) ^ (b == jungle)
+        return types, np.where(bot, 0, np.where(jungle_lane, 1, 2)).astype(np.int16)
+
+    def publish(self, keys: Optional[Iterable[GroupKey]] = None) -> None:
+        """Install fresh stats tables and matchup matrices in the stores"""
+        for patch, rank_tier in keys or list(self.groups):
+            stats_store.put(self.stats_table(patch, rank_tier))
+            for role in (None, *ROLES):
+                matchup_store.put(self.matchup_matrices(patch, rank_tier, role))
@@ -0,0 +1,294 @@
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.metrics import CACHE_HIT_RATIO
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry TTL
+
+    Thread-safe: the transposition cache is read from executor threads
+    (batched model inference) while the event loop uses it too.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Cached value or ``_MISSING``"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``; a ``ttl`` of 0 or less drops the key instead"""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            if ttl <= 0:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Shared Redis tier; any failure is logged and treated as a miss"""
+
+    def __init__(self, client: Any, ttl: float = 300.0):
+        self.client = client
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url: str, ttl: float = 300.0) -> Optional["RedisCache"]:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("redis package not installed, running without shared cache")
+            return None
+        return cls(redis_asyncio.from_url(url), ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        # Redis rejects a zero expiry; sub-second TTLs round up to one second
+        if ttl <= 0:
+            return
+        try:
+            await self.client.set(key, value, ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    async def get_int(self, key: str) -> int:
+        value = await self.get(key)
+        return int(value) if value else 0
+
+    async def incr(self, key: str) -> Optional[int]:
+        try:
+            return int(await self.client.incr(key))
+        except Exception as e:
+            logger.warning(f"Redis incr failed for {key}: {e}")
+            return None
+
+    async def close(self) -> None:
+        try:
+            await self.client.close()
+        except Exception:
+            pass
+
+
+class TieredCache:
+    """In-process LRU in front of an optional Redis tier
+
+    Keys are namespaced, and every namespace carries a generation number
+    that is baked into the key. ``invalidate(namespace)`` bumps the
+    generation (locally and in Redis), so stale entries simply stop being
+    addressed and age out instead of being flushed. Other instances pick
+    up a bumped generation within ``generation_ttl`` seconds.
+
+    Concurrent misses for the same key share one backend fetch.
+    """
+
+    def __init__(
+        self,
+        local: LocalCache,
+        remote: Optional[RedisCache] = None,
+        prefix: str = "lolcache",
+        generation_ttl: float = 5.0,
+    ):
+        self.local = local
+        self.remote = remote
+        self.prefix = prefix
+        self.generation_ttl = generation_ttl
+        self._generations: Dict[str, Tuple[float, int]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "coalesced": 0}
+
+    @classmethod
+    def from_settings(cls) -> "TieredCache":
+        local = LocalCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
+        remote = None
+        if settings.REDIS_URL:
+            remote = RedisCache.from_url(settings.REDIS_URL, settings.CACHE_TTL)
+        return cls(local, remote)
+
+    def _generation_key(self, namespace: str) -> str:
+        return f"{self.prefix}:ns:{namespace}"
+
+    async def generation(self, namespace: str) -> int:
+        now = time.monotonic()
+        cached = self._generations.get(namespace)
+        if cached is not None and (self.remote is None or cached[0] > now):
+            return cached[1]
+        generation = cached[1] if cached else 0
+        if self.remote is not None:
+            generation = max(generation, await self.remote.get_int(self._generation_key(namespace)))
+        self._generations[namespace] = (now + self.generation_ttl, generation)
+        return generation
+
+    async def make_key(self, endpoint: str, parts: Iterable[Any], namespaces: Iterable[str]) -> str:
+        tags = [f"{ns}@{await self.generation(ns)}" for ns in namespaces]
+        return ":".join([self.prefix, endpoint, *tags, *(str(p) for p in parts)])
+
+    async def invalidate(self, namespace: str) -> None:
+        """Retire every entry in a namespace without touching the others"""
+        generation = await self.generation(namespace) + 1
+        if self.remote is not None:
+            remote_generation = await self.remote.incr(self._generation_key(namespace))
+            generation = max(generation, remote_generation or 0)
+        self._generations[namespace] = (time.monotonic() + self.generation_ttl, generation)
+        logger.info(f"Invalidated cache namespace {namespace} (generation {generation})")
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        adapter: Optional[TypeAdapter] = None,
+        ttl: Optional[float] = None,
+    ) -> Any:
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self.stats["local_hits"] += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._fetch_through(key, fetch, adapter, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Followers get the exception; make sure it is marked retrieved
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _fetch_through(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        adapter: Optional[TypeAdapter],
+        ttl: Optional[float],
+    ) -> Any:
+        if self.remote is not None and adapter is not None:
+            raw = await self.remote.get(key)
+            if raw is not None:
+                try:
+                    value = adapter.validate_json(raw)
+                    self.stats["remote_hits"] += 1
+                    self.local.set(key, value, ttl)
+                    return value
+                except ValueError as e:
+                    logger.warning(f"Discarding undecodable cache entry {key}: {e}")
+
+        self.stats["misses"] += 1
+        value = await fetch()
+        # None means "not found"; caching it would pin a 404 until the namespace is invalidated
+        if value is None:
+            return value
+        self.local.set(key, value, ttl)
+        if self.remote is not None and adapter is not None:
+            await self.remote.set(key, adapter.dump_json(value), ttl)
+        return value
+
+    @property
+    def hit_ratio(self) -> float:
+        hits = self.stats["local_hits"] + self.stats["remote_hits"] + self.stats["coalesced"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    async def close(self) -> None:
+        if self.remote is not None:
+            await self.remote.close()
+
+
+champion_cache = TieredCache.from_settings()
+CACHE_HIT_RATIO.add(lambda: {"champion": champion_cache.hit_ratio})
+
+# Arguments that scope an entry to a patch; None means "current patch"
+PATCH_ARGUMENT = "patch"
+
+
+def cached(
+    endpoint: str,
+    namespaces: Iterable[str] = (),
+    ttl: Optional[float] = None,
+    cache: Optional[TieredCache] = None,
+) -> Callable:
+    """Cache an async service method on its bound arguments
+
+    Entries are keyed by ``endpoint`` plus every argument except ``self``
+    (champion_id, patch, rank, role, ...), tagged with the given namespaces
+    and with ``patch:<patch>`` (``patch:current`` when no patch was passed).
+    The Redis tier round-trips values through the return annotation.
+    ``None`` results are not cached.
+    """
+    namespaces = list(namespaces)
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+        return_type = signature.return_annotation
+        adapter = TypeAdapter(return_type) if return_type is not inspect.Signature.empty else None
+        argument_names = [name for name in signature.parameters if name != "self"]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            tags = list(namespaces)
+            if PATCH_ARGUMENT in arguments:
+                tags.append(f"patch:{arguments[PATCH_ARGUMENT] or 'current'}")
+            store = cache or champion_cache
+            key = await store.make_key(
+                endpoint, [f"{name}={arguments[name]}" for name in argument_names], tags
+            )
+            return await store.get_or_fetch(key, lambda: func(*args, **kwargs), adapter, ttl)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,178 @@
+"""Conditional, incremental champion catalog refresh as a background job
+
+A refresh starts from the Data Dragon realm manifest
+(``/realms/{realm}.json``), requested with the ``ETag`` /
+``Last-Modified`` validators of the previous answer. A 304, or a
+manifest whose champion data version is the one already applied, ends
+the refresh after that single round trip. Only a new version downloads
+``champion.json`` (itself conditional), and the result is diffed against
+the catalog:
+
+- unchanged champions keep their existing objects and ``last_updated``
+  (only their version-stamped asset URLs move with the patch),
+- added and changed champions are new objects with a fresh ``last_updated``,
+- the catalog is reloaded, which re-keys the search index, composition
+  profiles and encoded responses, and the catalog cache namespace is
+  invalidated, only when something actually differs.
+
+``CatalogRefreshJobs`` runs refreshes off the request path, one at a
+time, and keeps recent jobs for the status endpoint.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.models.champion import CatalogRefreshJob, Champion
+from app.services.champion_catalog import ChampionCatalog, champion_catalog
+from app.services.champion_service import ChampionService
+from app.services.riot_service import RiotService
+
+logger = logging.getLogger(__name__)
+
+# Fields that identify a champion's data; asset URLs carry the version and last_updated is ours
+ASSET_FIELDS = {"icon_url", "splash_url"}
+CONTENT_EXCLUDE = ASSET_FIELDS | {"last_updated"}
+
+
+def diff_catalog(
+    current: Dict[int, Champion], incoming: List[Champion]
+) -> Tuple[List[Champion], List[int], List[int], List[int]]:
+    """``(merged, added, removed, changed)``; unchanged champions keep their objects"""
+    merged, added, changed = [], [], []
+    for champion in incoming:
+        old = current.get(champion.id)
+        if old is None:
+            added.append(champion.id)
+            merged.append(champion)
+        elif old.model_dump(exclude=CONTENT_EXCLUDE) != champion.model_dump(exclude=CONTENT_EXCLUDE):
+            changed.append(champion.id)
+            merged.append(champion)
+        elif old.icon_url != champion.icon_url or old.splash_url != champion.splash_url:
+            merged.append(old.model_copy(update={f: getattr(champion, f) for f in ASSET_FIELDS}))
+        else:
+            merged.append(old)
+    seen = {champion.id for champion in incoming}
+    removed = sorted(champion_id for champion_id in current if champion_id not in seen)
+    return merged, added, removed, changed
+
+
+class CatalogRefresher:
+    """Remembers validators and the applied data version between refreshes"""
+
+    def __init__(self, catalog: ChampionCatalog = champion_catalog, realm: str = "na"):
+        self.catalog = catalog
+        self.realm = realm
+        self.version: Optional[str] = None
+        # url -> validators from its last 200
+        self._validators: Dict[str, Dict[str, str]] = {}
+
+    async def _get(self, client: httpx.AsyncClient, url: str, job: CatalogRefreshJob) -> Optional[Any]:
+        """Conditional GET: decoded JSON, or None when the server answers 304"""
+        headers = {}
+        validators = self._validators.get(url, {})
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            headers["If-Modified-Since"] = validators["last-modified"]
+        response = await client.get(url, headers=headers)
+        job.requests += 1
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self._validators[url] = {
+            name: response.headers[name] for name in ("etag", "last-modified") if name in response.headers
+        }
+        return response.json()
+
+    async def refresh(self, client: httpx.AsyncClient, job: CatalogRefreshJob) -> CatalogRefreshJob:
+        base = settings.DDRAGON_BASE_URL
+        manifest = await self._get(client, f"{base}/realms/{self.realm}.json", job)
+        if manifest is not None:
+            version = manifest.get("n", {}).get("champion") or manifest["v"]
+            if version != self.version or not len(self.catalog):
+                return await self._apply(client, version, job)
+        job.version = self.version
+        job.not_modified = True
+        job.unchanged = len(self.catalog)
+        return job
+
+    async def _apply(self, client: httpx.AsyncClient, version: str, job: CatalogRefreshJob) -> CatalogRefreshJob:
+        job.version = version
+        url = f"{settings.DDRAGON_BASE_URL}/cdn/{version}/data/en_US/champion.json"
+        data = await self._get(client, url, job)
+        if data is None:
+            # Same document as last time under a new manifest entry
+            self.version = version
+            job.not_modified = True
+            job.unchanged = len(self.catalog)
+            return job
+        incoming = [RiotService._parse_champion(entry, version) for entry in data["data"].values()]
+        current = {champion.id: champion for champion in self.catalog.all()}
+        merged, job.added, job.removed, job.changed = diff_catalog(current, incoming)
+        job.unchanged = len(merged) - len(job.added) - len(job.changed)
+        patch = ".".join(version.split(".")[:2])
+        replaced = any(champion is not current.get(champion.id) for champion in merged)
+        if replaced or job.removed or patch != self.catalog.patch:
+            self.catalog.load(merged, patch=patch)
+            await ChampionService.invalidate_catalog()
+        else:
+            job.not_modified = True
+        self.version = version
+        return job
+
+
+class CatalogRefreshJobs:
+    """At most one refresh in flight; the last ``keep`` jobs stay queryable"""
+
+    def __init__(self, refresher: CatalogRefresher, keep: int = 20):
+        self.refresher = refresher
+        self.keep = keep
+        self._jobs: "OrderedDict[str, CatalogRefreshJob]" = OrderedDict()
+        self._running: Optional[CatalogRefreshJob] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> CatalogRefreshJob:
+        """Start a refresh, or return the one already running"""
+        if self._running is not None:
+            return self._running
+        job = CatalogRefreshJob(id=str(uuid.uuid4()))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.keep:
+            self._jobs.popitem(last=False)
+        self._running = job
+        self._task = asyncio.create_task(self._run(job))
+        return job
+
+    def get(self, job_id: str) -> Optional[CatalogRefreshJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self) -> None:
+        """Wait for the running refresh, if any"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _run(self, job: CatalogRefreshJob) -> None:
+        job.status = "running"
+        try:
+            await self.refresher.refresh(await RiotService.http_client(), job)
+            job.status = "succeeded"
+            logger.info(
+                f"Catalog refresh {job.id}: version {job.version}, {len(job.added)} added, "
+                f"{len(job.changed)} changed, {len(job.removed)} removed, {job.requests} requests"
+            )
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Catalog refresh {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._running = None
+
+
+catalog_refresh_jobs = CatalogRefreshJobs(CatalogRefresher(realm=settings.DDRAGON_REALM))
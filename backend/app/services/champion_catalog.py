@@ -0,0 +1,49 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from app.models.champion import Champion
+
+logger = logging.getLogger(__name__)
+
+
+class ChampionCatalog:
+    """In-memory champion catalog for the current patch"""
+
+    def __init__(self):
+        self._champions: Dict[int, Champion] = {}
+        self._lock = threading.Lock()
+        self.patch: Optional[str] = None
+        # Bumped on every load so derived indexes know when to rebuild
+        self.version = 0
+
+    def load(self, champions: Iterable[Champion], patch: Optional[str] = None) -> None:
+        """Replace the catalog contents"""
+        champions = {champion.id: champion for champion in champions}
+        with self._lock:
+            self._champions = champions
+            self.patch = patch
+            self.version += 1
+        logger.info(f"Loaded {len(champions)} champions for patch {patch}")
+
+    def get(self, champion_id: int) -> Optional[Champion]:
+        return self._champions.get(champion_id)
+
+    def name(self, champion_id: int) -> str:
+        champion = self._champions.get(champion_id)
+        return champion.name if champion else str(champion_id)
+
+    def all(self) -> List[Champion]:
+        return list(self._champions.values())
+
+    def ids(self) -> List[int]:
+        return sorted(self._champions)
+
+    def __len__(self) -> int:
+        return len(self._champions)
+
+    def __contains__(self, champion_id: int) -> bool:
+        return champion_id in self._champions
+
+
+champion_catalog = ChampionCatalog()
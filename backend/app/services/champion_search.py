@@ -0,0 +1,209 @@
+import itertools
+import logging
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.champion import Champion
+from app.services.champion_catalog import ChampionCatalog, champion_catalog
+from app.services.draft_state import bits_to_ids
+from app.services.stats_store import ChampionStatsTable, stats_store
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the query's trigrams a name must share to count as a fuzzy match
+FUZZY_THRESHOLD = 0.4
+# Shortest query/prefix that single-typo matching applies to
+TYPO_MIN_LENGTH = 3
+# Above this many matches, walk the pick-rate order instead of sorting
+SORT_LIMIT = 32
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+# Distinguishes rebuilt indexes in response cache keys
+_index_versions = itertools.count(1)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation: "Kai'Sa" -> "kaisa" """
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(_NON_ALNUM.sub("", text.lower()).split())
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def deletions(text: str) -> set:
+    """``text`` and every string one deletion away from it"""
+    return {text, *(text[:i] + text[i + 1:] for i in range(len(text)))}
+
+
+class ChampionSearchIndex:
+    """Prebuilt filters over the champion catalog
+
+    Every filter is a bitset of champion IDs (bit ``c`` set = champion
+    ``c`` matches), the same encoding ``DraftKey`` uses, so role, tag and
+    picked/banned filters combine with a few integer ANDs. Names match
+    by prefix through a flattened trie (every prefix of every word of
+    name, key and title maps to a bitset). Typos are caught in two ways:
+    a delete-neighbourhood table covers one wrong, missing, extra or
+    swapped letter in any prefix, and a trigram index covers the rest.
+    Results are ordered by pick rate.
+    """
+
+    def __init__(
+        self,
+        champions: Iterable[Champion],
+        stats: Optional[ChampionStatsTable] = None,
+        catalog_version: int = 0,
+    ):
+        self.champions: Dict[int, Champion] = {c.id: c for c in champions}
+        self.stats = stats
+        self.catalog_version = catalog_version
+        self.version = next(_index_versions)
+        self.all = 0
+        self.roles: Dict[str, int] = {}
+        self.tags: Dict[str, int] = {}
+        self.prefixes: Dict[str, int] = {}
+        self.typos: Dict[str, int] = {}
+        self.trigrams: Dict[str, List[int]] = {}
+
+        for champion in self.champions.values():
+            bit = 1 << champion.id
+            self.all |= bit
+            for role in champion.roles:
+                self.roles[role] = self.roles.get(role, 0) | bit
+            for tag in champion.tags:
+                tag = tag.lower()
+                self.tags[tag] = self.tags.get(tag, 0) | bit
+            names = {normalize(text) for text in (champion.name, champion.key, champion.title)}
+            for text in names:
+                # Whole phrase and each word, with and without spaces ("lee s", "leesin")
+                for word in {text, text.replace(" ", ""), *text.split()}:
+                    for end in range(1, len(word) + 1):
+                        prefix = word[:end]
+                        self.prefixes[prefix] = self.prefixes.get(prefix, 0) | bit
+            grams = trigrams(normalize(champion.name).replace(" ", ""))
+            for gram in grams:
+                self.trigrams.setdefault(gram, []).append(champion.id)
+
+        for prefix, bits in self.prefixes.items():
+            if len(prefix) >= TYPO_MIN_LENGTH:
+                for variant in deletions(prefix):
+                    self.typos[variant] = self.typos.get(variant, 0) | bits
+
+        # Rank by pick rate (descending), then name
+        pick_rate = {}
+        if stats is not None:
+            rates = np.nan_to_num(stats.overall("pick_rate"))
+            pick_rate = dict(zip(stats.index.ids.tolist(), rates.tolist()))
+        ordered = sorted(
+            self.champions.values(), key=lambda c: (-pick_rate.get(c.id, 0.0), c.name)
+        )
+        self.rank = {c.id: r for r, c in enumerate(ordered)}
+        self.order = [c.id for c in ordered]
+
+    def __len__(self) -> int:
+        return len(self.champions)
+
+    def filter(
+        self,
+        role: Optional[str] = None,
+        tags: Sequence[str] = (),
+        exclude: int = 0,
+    ) -> int:
+        """Bitset of champions matching every filter, minus the ``exclude`` bitset"""
+        bits = self.all
+        if role:
+            bits &= self.roles.get(role.lower(), 0)
+        for tag in tags:
+            bits &= self.tags.get(tag.lower(), 0)
+        return bits & ~exclude
+
+    def _ranked(self, bits: int, limit: Optional[int]) -> List[int]:
+        """IDs in ``bits`` by pick rate, at most ``limit``"""
+        if not bits:
+            return []
+        if bits.bit_count() <= SORT_LIMIT:
+            return sorted(bits_to_ids(bits), key=self.rank.__getitem__)[:limit]
+        ids = []
+        for champion_id in self.order:
+            if bits >> champion_id & 1:
+                ids.append(champion_id)
+                if len(ids) == limit:
+                    break
+        return ids
+
+    def _typos(self, query: str) -> int:
+        if len(query) < TYPO_MIN_LENGTH:
+            return 0
+        bits = 0
+        for variant in deletions(query):
+            bits |= self.typos.get(variant, 0)
+        return bits
+
+    def _fuzzy(self, query: str, candidates: int) -> Dict[int, float]:
+        grams = trigrams(query.replace(" ", ""))
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for champion_id in self.trigrams.get(gram, ()):
+                if candidates >> champion_id & 1:
+                    shared[champion_id] = shared.get(champion_id, 0) + 1
+        needed = FUZZY_THRESHOLD * len(grams)
+        return {c: n / len(grams) for c, n in shared.items() if n >= needed}
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        role: Optional[str] = None,
+        tags: Sequence[str] = (),
+        exclude: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Champion]:
+        """Matching champions: prefix matches, then single typos, then trigram matches
+
+        Each group is ordered by pick rate, the trigram group by similarity first.
+        """
+        candidates = self.filter(role, tags, exclude)
+        query = normalize(query) if query else ""
+        if not query:
+            ids = self._ranked(candidates, limit)
+        else:
+            matched = self.prefixes.get(query, 0) & candidates
+            ids = self._ranked(matched, limit)
+            if limit is None or len(ids) < limit:
+                typos = self._typos(query) & candidates & ~matched
+                ids += self._ranked(typos, limit)
+                matched |= typos
+            if limit is None or len(ids) < limit:
+                fuzzy = self._fuzzy(query, candidates & ~matched)
+                ids += sorted(fuzzy, key=lambda c: (-fuzzy[c], self.rank[c]))
+        return [self.champions[c] for c in ids[:limit]]
+
+
+def ids_to_bits(champion_ids: Iterable[int]) -> int:
+    bits = 0
+    for champion_id in champion_ids:
+        bits |= 1 << champion_id
+    return bits
+
+
+_index: Optional[ChampionSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(catalog: ChampionCatalog = champion_catalog) -> ChampionSearchIndex:
+    """Index for the current catalog, rebuilt when the catalog or its stats table changes"""
+    global _index
+    stats = stats_store.get(catalog.patch, settings.DEFAULT_RANK_TIER)
+    with _index_lock:
+        if _index is None or _index.catalog_version != catalog.version or _index.stats is not stats:
+            _index = ChampionSearchIndex(catalog.all(), stats, catalog.version)
+            logger.info(f"Built champion search index ({len(_index)} champions)")
+        return _index
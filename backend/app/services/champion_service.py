@@ -0,0 +1,90 @@
+import logging
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+from app.models.champion import Champion, ChampionCounters, ChampionStats
+from app.services.cache import cached, champion_cache
+from app.services.champion_catalog import champion_catalog
+from app.services.champion_search import get_search_index, ids_to_bits
+from app.services.matchup_store import matchup_store
+from app.services.stats_store import stats_store
+
+logger = logging.getLogger(__name__)
+
+# Cache namespaces, invalidated independently
+CATALOG_NAMESPACE = "catalog"
+STATS_NAMESPACE = "stats"
+
+
+class ChampionService:
+    """Champion catalog, stats and matchup lookups"""
+
+    @staticmethod
+    def current_patch() -> Optional[str]:
+        if champion_catalog.patch:
+            return champion_catalog.patch
+        patches = sorted({patch for patch, _ in stats_store.keys()})
+        return patches[-1] if patches else None
+
+    async def get_champions(
+        self,
+        role: Optional[str] = None,
+        search: Optional[str] = None,
+        tags: Sequence[str] = (),
+        exclude: Sequence[int] = (),
+        limit: Optional[int] = None,
+    ) -> List[Champion]:
+        """Filtered champions, most picked first; ``exclude`` drops picked/banned IDs"""
+        return get_search_index().search(
+            search, role=role, tags=tags, exclude=ids_to_bits(exclude), limit=limit
+        )
+
+    @cached("champion", namespaces=[CATALOG_NAMESPACE])
+    async def get_champion(self, champion_id: int) -> Optional[Champion]:
+        return champion_catalog.get(champion_id)
+
+    @cached("champion_stats", namespaces=[STATS_NAMESPACE])
+    async def get_champion_stats(
+        self,
+        champion_id: int,
+        patch: Optional[str] = None,
+        rank: Optional[str] = None,
+        role: Optional[str] = None,
+    ) -> Optional[ChampionStats]:
+        patch = patch or self.current_patch()
+        table = stats_store.get(patch, rank or settings.DEFAULT_RANK_TIER)
+        if table is None or champion_id not in table.index:
+            return None
+        return table.to_stats(champion_id, role)
+
+    @cached("champion_counters", namespaces=[STATS_NAMESPACE])
+    async def get_counters(
+        self,
+        champion_id: int,
+        role: Optional[str] = None,
+        patch: Optional[str] = None,
+        rank: Optional[str] = None,
+        limit: int = 5,
+    ) -> Optional[ChampionCounters]:
+        patch = patch or self.current_patch()
+        matrices = matchup_store.get(patch, rank or settings.DEFAULT_RANK_TIER, role)
+        if matrices is None or champion_id not in matrices.index:
+            return None
+        return ChampionCounters(
+            champion_id=champion_id,
+            patch=patch,
+            role=role,
+            counters=matrices.counters(champion_id, limit),
+            synergies=matrices.synergies(champion_id, limit),
+        )
+
+    @staticmethod
+    async def invalidate_catalog() -> None:
+        """Drop cached catalog lookups, e.g. after a data refresh"""
+        await champion_cache.invalidate(CATALOG_NAMESPACE)
+        await champion_cache.invalidate("patch:current")
+
+    @staticmethod
+    async def invalidate_patch(patch: str) -> None:
+        """Drop cached lookups for one patch, e.g. after re-aggregating its stats"""
+        await champion_cache.invalidate(f"patch:{patch}")
@@ -0,0 +1,315 @@
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.champion import DamageType
+from app.models.draft import ActionType, DraftAction, DraftSession, Team, TeamComposition
+from app.services.champion_catalog import ChampionCatalog, champion_catalog
+from app.services.matchup_store import ROLES, ChampionIndex, MatchupMatrices, matchup_store
+from app.services.role_assignment import RoleAssigner
+from app.services.stats_store import ChampionStatsTable, stats_store
+
+logger = logging.getLogger(__name__)
+
+DAMAGE_KEYS = ("physical", "magical", "true")
+DAMAGE_SPLIT = {
+    DamageType.PHYSICAL.value: (1.0, 0.0, 0.0),
+    DamageType.MAGICAL.value: (0.0, 1.0, 0.0),
+    DamageType.TRUE.value: (0.0, 0.0, 1.0),
+    DamageType.MIXED.value: (0.5, 0.5, 0.0),
+}
+
+# Per-tag contributions (0-100) when no measured value exists
+CC_BY_TAG = {
+    "Tank": 80.0, "Support": 70.0, "Mage": 55.0,
+    "Fighter": 45.0, "Assassin": 25.0, "Marksman": 15.0,
+}
+TEAMFIGHT_BY_TAG = {
+    "Tank": 75.0, "Mage": 70.0, "Support": 60.0,
+    "Marksman": 60.0, "Fighter": 50.0, "Assassin": 35.0,
+}
+
+NEUTRAL_SCORE = 50.0
+STRONG_SYNERGY = 65.0
+
+
+def _phase_score(win_rate: np.ndarray) -> np.ndarray:
+    """Map a phase win rate (percent) onto 0-100 around a neutral 50"""
+    return np.clip(NEUTRAL_SCORE + (np.nan_to_num(win_rate, nan=50.0) - 50.0) * 5.0, 0.0, 100.0)
+
+
+class CompositionProfiles:
+    """Per-champion composition contributions for one patch/rank slice
+
+    Each champion maps to a fixed vector (damage split, CC, teamfight,
+    early/late power, role shares), and pairs map to a symmetrized synergy
+    score, so folding a pick into a team is a handful of additions.
+    """
+
+    def __init__(
+        self,
+        index: ChampionIndex,
+        catalog: ChampionCatalog = champion_catalog,
+        stats: Optional[ChampionStatsTable] = None,
+        matrices: Optional[MatchupMatrices] = None,
+    ):
+        n = len(index)
+        self.index = index
+        self.catalog = catalog
+        self.catalog_version = catalog.version
+        self.stats = stats
+        self.matrices = matrices
+        self.damage = np.zeros((n, len(DAMAGE_KEYS)), dtype=np.float32)
+        self.crowd_control = np.full(n, NEUTRAL_SCORE, dtype=np.float32)
+        self.teamfight = np.full(n, NEUTRAL_SCORE, dtype=np.float32)
+        self.early_game = np.full(n, NEUTRAL_SCORE, dtype=np.float32)
+        self.late_game = np.full(n, NEUTRAL_SCORE, dtype=np.float32)
+        self.role_share = np.full((n, len(ROLES)), 1.0 / len(ROLES), dtype=np.float32)
+        self.synergy = np.full((n, n), NEUTRAL_SCORE, dtype=np.float32)
+
+        champions = {c.id: c for c in catalog.all()}
+        for pos, champion_id in enumerate(index.ids.tolist()):
+            champion = champions.get(champion_id)
+            if champion is None:
+                self.damage[pos] = DAMAGE_SPLIT[DamageType.MIXED.value]
+                continue
+            self.damage[pos] = DAMAGE_SPLIT[champion.damage_type]
+            cc = [CC_BY_TAG[t] for t in champion.tags if t in CC_BY_TAG]
+            teamfight = [TEAMFIGHT_BY_TAG[t] for t in champion.tags if t in TEAMFIGHT_BY_TAG]
+            if cc:
+                self.crowd_control[pos] = max(cc)
+            if teamfight:
+                self.teamfight[pos] = max(teamfight)
+
+        if stats is not None:
+            src = stats.index.positions(index.ids)
+            found = src >= 0
+            self.role_share[found] = stats.role_share(champions)[src[found]]
+            self.early_game[found] = _phase_score(stats.overall("early_game_wr")[src[found]])
+            self.late_game[found] = _phase_score(stats.overall("late_game_wr")[src[found]])
+            # Weight the damage split by how much damage the champion actually deals
+            damage = np.nan_to_num(stats.overall("average_damage")[src[found]])
+            mean = float(damage[damage > 0].mean()) if (damage > 0).any() else 0.0
+            if mean > 0:
+                weight = np.where(damage > 0, damage / mean, 1.0)
+                self.damage[found] *= weight[:, None]
+        self.roles = RoleAssigner(self.role_share)
+
+        if matrices is not None:
+            src = matrices.index.positions(index.ids)
+            found = np.flatnonzero(src >= 0)
+            block = matrices.synergy_score[np.ix_(src[found], src[found])]
+            # Average both directions; pairs seen from one side only use that side
+            both = np.where(
+                np.isnan(block), block.T, np.where(np.isnan(block.T), block, (block + block.T) / 2)
+            )
+            self.synergy[np.ix_(found, found)] = np.nan_to_num(both, nan=NEUTRAL_SCORE)
+            self.synergy_types = matrices.synergy_types
+            self._synergy_codes = np.full((n, n), -1, dtype=np.int16)
+            codes = matrices.synergy_type[np.ix_(src[found], src[found])]
+            self._synergy_codes[np.ix_(found, found)] = codes
+        else:
+            self.synergy_types = []
+            self._synergy_codes = None
+
+    def synergy_label(self, a: int, b: int) -> Optional[str]:
+        if self._synergy_codes is None:
+            return None
+        code = int(max(self._synergy_codes[a, b], self._synergy_codes[b, a]))
+        return self.synergy_types[code] if code >= 0 else None
+
+
+class TeamAccumulator:
+    """Running composition sums for one team
+
+    ``add``/``remove`` cost O(team size) for the pairwise synergy delta; every
+    other field is a running sum, so reading the analysis never re-walks the
+    team or refetches champion stats.
+    """
+
+    def __init__(self, team: str, profiles: CompositionProfiles):
+        self.team = team
+        self.profiles = profiles
+        self.champions: List[int] = []
+        self._positions: List[int] = []
+        self.damage = np.zeros(len(DAMAGE_KEYS), dtype=np.float64)
+        self.crowd_control = 0.0
+        self.teamfight = 0.0
+        self.early_game = 0.0
+        self.late_game = 0.0
+        self.synergy_total = 0.0
+        self.strong_pairs: Dict[Tuple[int, int], str] = {}
+        self._cached: Optional[TeamComposition] = None
+
+    def __len__(self) -> int:
+        return len(self.champions)
+
+    @property
+    def pair_count(self) -> int:
+        k = len(self.champions)
+        return k * (k - 1) // 2
+
+    def _fold(self, champion_id: int, pos: int, sign: float) -> None:
+        p = self.profiles
+        self.damage += sign * p.damage[pos]
+        self.crowd_control += sign * float(p.crowd_control[pos])
+        self.teamfight += sign * float(p.teamfight[pos])
+        self.early_game += sign * float(p.early_game[pos])
+        self.late_game += sign * float(p.late_game[pos])
+        for other_id, other in zip(self.champions, self._positions):
+            if other_id == champion_id:
+                continue
+            score = float(p.synergy[pos, other])
+            self.synergy_total += sign * score
+            pair = (min(champion_id, other_id), max(champion_id, other_id))
+            if sign < 0:
+                self.strong_pairs.pop(pair, None)
+            elif score >= STRONG_SYNERGY:
+                self.strong_pairs[pair] = p.synergy_label(pos, other) or "synergy"
+        self._cached = None
+
+    def add(self, champion_id: int) -> None:
+        pos = self._position(champion_id)
+        self._fold(champion_id, pos, 1.0)
+        self.champions.append(champion_id)
+        self._positions.append(pos)
+
+    def remove(self, champion_id: int) -> None:
+        """Undo a previously added pick"""
+        i = self.champions.index(champion_id)
+        pos = self._positions[i]
+        del self.champions[i], self._positions[i]
+        self._fold(champion_id, pos, -1.0)
+
+    def _position(self, champion_id: int) -> int:
+        try:
+            return self.profiles.index.position(champion_id)
+        except KeyError:
+            raise ValueError(f"Unknown champion {champion_id}")
+
+    def roles(self) -> Dict[str, int]:
+        """Likeliest joint role assignment (flex picks resolved against the whole team)"""
+        assigned = self.profiles.roles.assign(self._positions)
+        return {ROLES[r]: champion_id for champion_id, r in zip(self.champions, assigned)}
+
+    def to_composition(self) -> TeamComposition:
+        """Current analysis; rebuilt only after the team changed"""
+        if self._cached is not None:
+            return self._cached
+        count = len(self.champions)
+        mean = (lambda total: total / count) if count else (lambda total: 0.0)
+
+        total_damage = float(self.damage.sum())
+        damage_distribution = (
+            {key: float(v) * 100.0 / total_damage for key, v in zip(DAMAGE_KEYS, self.damage)}
+            if total_damage > 0 else {}
+        )
+        synergy_score = self.synergy_total / self.pair_count if self.pair_count else NEUTRAL_SCORE
+        roles_filled = self.roles()
+        composition = TeamComposition(
+            team=self.team,
+            champions=list(self.champions),
+            roles_filled=roles_filled,
+            damage_distribution=damage_distribution,
+            crowd_control_score=mean(self.crowd_control),
+            teamfight_score=mean(self.teamfight),
+            early_game_score=mean(self.early_game),
+            late_game_score=mean(self.late_game),
+            synergy_score=synergy_score,
+            synergy_reasons=[
+                f"{self.profiles.catalog.name(a)} + {self.profiles.catalog.name(b)}: {label}"
+                for (a, b), label in self.strong_pairs.items()
+            ],
+            missing_roles=[role for role in ROLES if role not in roles_filled],
+        )
+        composition.vulnerabilities = self._vulnerabilities(composition)
+        self._cached = composition
+        return composition
+
+    @staticmethod
+    def _vulnerabilities(composition: TeamComposition) -> List[str]:
+        if not composition.champions:
+            return []
+        vulnerabilities = []
+        damage = composition.damage_distribution
+        if damage.get("physical", 0.0) >= 75.0:
+            vulnerabilities.append("Mostly physical damage (armor stacking)")
+        if damage.get("magical", 0.0) >= 75.0:
+            vulnerabilities.append("Mostly magic damage (magic resist stacking)")
+        if composition.crowd_control_score < 35.0:
+            vulnerabilities.append("Low crowd control")
+        if composition.early_game_score < 40.0:
+            vulnerabilities.append("Weak early game")
+        if composition.late_game_score < 40.0:
+            vulnerabilities.append("Falls off late game")
+        return vulnerabilities
+
+
+class SessionComposition:
+    """Blue and red accumulators for a draft session, driven by its actions"""
+
+    def __init__(self, profiles: CompositionProfiles):
+        self.profiles = profiles
+        self.teams = {
+            Team.BLUE.value: TeamAccumulator(Team.BLUE.value, profiles),
+            Team.RED.value: TeamAccumulator(Team.RED.value, profiles),
+        }
+        self.applied = 0
+
+    def apply(self, action: DraftAction) -> None:
+        """Fold a recorded action in; bans do not change compositions"""
+        if action.action_type == ActionType.PICK.value:
+            self.teams[action.team].add(action.champion_id)
+        self.applied += 1
+
+    def undo(self, action: DraftAction) -> None:
+        """Reverse a previously applied action"""
+        if action.action_type == ActionType.PICK.value:
+            self.teams[action.team].remove(action.champion_id)
+        self.applied -= 1
+
+    def analysis(self, team: str) -> TeamComposition:
+        return self.teams[team].to_composition()
+
+
+_profiles: Dict[Tuple[str, str], CompositionProfiles] = {}
+_profiles_lock = threading.Lock()
+
+
+def get_composition_profiles(patch: str, rank_tier: str) -> CompositionProfiles:
+    """Profiles for a patch/rank slice, rebuilt when the underlying stores change"""
+    matrices = matchup_store.get(patch, rank_tier)
+    stats = stats_store.get(patch, rank_tier)
+    with _profiles_lock:
+        profiles = _profiles.get((patch, rank_tier))
+        if (
+            profiles is None
+            or profiles.matrices is not matrices
+            or profiles.stats is not stats
+            or profiles.catalog_version != champion_catalog.version
+        ):
+            ids = set(champion_catalog.ids())
+            for source in (matrices, stats):
+                if source is not None:
+                    ids.update(source.index.ids.tolist())
+            profiles = CompositionProfiles(ChampionIndex(ids), champion_catalog, stats, matrices)
+            _profiles[(patch, rank_tier)] = profiles
+    return profiles
+
+
+def session_composition(session: DraftSession, rank_tier: str) -> SessionComposition:
+    """Accumulator attached to the session, replaying its actions if it is missing or stale"""
+    profiles = get_composition_profiles(session.patch_version, rank_tier)
+    composition = session._composition
+    if (
+        composition is None
+        or composition.profiles is not profiles
+        or composition.applied != len(session.actions)
+    ):
+        composition = SessionComposition(profiles)
+        for action in session.actions:
+            composition.apply(action)
+        session._composition = composition
+    return composition
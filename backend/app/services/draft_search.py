@@ -0,0 +1,360 @@
+"""Anytime lookahead search over the rest of the draft
+
+A PUCT-style tree search over ``DRAFT_ORDER``. Every node considers at
+most ``DRAFT_SEARCH_BRANCHING`` moves: the suggestion engine's best
+scores for the searching team, and the opponent's most likely responses
+by pick (or ban) rate. Those scores and rates are also the move priors.
+Expanding a node evaluates all of its children with the win prediction
+model in one batch. A frontier node backs up its best child when the
+searching team is to act and the prior-weighted expectation over the
+opponent's responses otherwise.
+
+Searches run in single-process workers so they never block the event
+loop. A session always lands on the same worker, which keeps its tree
+and re-roots it at the state of the next request: visits spent on the
+lines that were actually played carry over to the next action.
+"""
+import asyncio
+import logging
+import math
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.ml.win_predictor import WinPredictor
+from app.models.draft import ActionType, DraftSearchResult, DraftState
+from app.services.draft_state import (
+    ACTION_SLOTS, DRAFT_ORDER, TEAMS, DraftKey, bits_to_ids, turn,
+)
+from app.services.suggestion_engine import DraftStateBatch, SuggestionEngine
+
+logger = logging.getLogger(__name__)
+
+# Exploration weight of the prior in the PUCT bound
+C_PUCT = 1.5
+# Softmax temperature turning suggestion scores into priors
+PRIOR_TEMPERATURE = 0.1
+# Search models a worker keeps before evicting the least recently used
+WORKER_MODELS = 4
+
+
+class SearchModel:
+    """What a worker needs to search one patch/rank slice with one win model"""
+
+    def __init__(self, engine: SuggestionEngine, predictor: WinPredictor, branching: int):
+        self.engine = engine
+        self.predictor = predictor
+        self.branching = branching
+        self.context = f"{engine.patch}:{engine.rank_tier}:{engine.version}:{predictor.context}"
+
+    def candidates(self, key: DraftKey, side: int) -> Tuple[List[int], np.ndarray]:
+        """Champion IDs worth considering at ``key`` and their priors"""
+        _, team, action = DRAFT_ORDER[key.order]
+        engine = self.engine
+        if TEAMS.index(team) == side:
+            scores, _ = engine.score(DraftStateBatch.from_keys([key], engine.index))
+            values = scores[0]
+        else:
+            rates = engine.ban_rate if action == ActionType.BAN.value else engine.pick_rate
+            values = rates.copy()
+            taken = engine.index.positions(bits_to_ids(key.occupied))
+            values[taken[taken >= 0]] = -np.inf
+        best = engine.top(values[None, :], self.branching)[0]
+        best = best[np.isfinite(values[best])]
+        if not best.size:
+            return [], np.zeros(0)
+        if TEAMS.index(team) == side:
+            prior = np.exp((values[best] - values[best[0]]) / PRIOR_TEMPERATURE)
+        else:
+            # Never rule out a response entirely, even one nobody picks
+            prior = values[best] + 1e-3
+        return engine.index.ids[best].tolist(), prior / prior.sum()
+
+    def evaluate(self, keys: List[DraftKey]) -> np.ndarray:
+        """Blue win probability per key"""
+        return self.predictor.blue_win_proba(DraftStateBatch.from_keys(keys, self.predictor.index))
+
+
+class _Node:
+    __slots__ = ("key", "order", "prior", "estimate", "visits", "total", "children")
+
+    def __init__(self, key: DraftKey, prior: float, estimate: float):
+        self.key = key
+        self.order = key.order
+        self.prior = prior
+        # Model estimate of the blue win probability, before any search below
+        self.estimate = estimate
+        self.visits = 0
+        # Sum of backed-up blue win probabilities
+        self.total = 0.0
+        # (champion ID, child) pairs once expanded, [] for leaves
+        self.children: Optional[List[Tuple[int, "_Node"]]] = None
+
+    def value(self) -> float:
+        return self.total / self.visits if self.visits else self.estimate
+
+    def blue_to_act(self) -> bool:
+        return DRAFT_ORDER[self.order][1] == TEAMS[0]
+
+
+class DraftSearch:
+    """One search tree for one team, grown in time-boxed increments"""
+
+    def __init__(self, model: SearchModel, key: DraftKey):
+        self.model = model
+        self.side = key.team
+        self.root = _Node(key, 1.0, float(model.evaluate([key])[0]))
+
+    def reroot(self, key: DraftKey) -> bool:
+        """Make ``key`` the root if the tree already reached it"""
+        frontier = [self.root]
+        for _ in range(key.order - self.root.order):
+            frontier = [child for node in frontier for _, child in node.children or ()]
+        for node in frontier:
+            if node.key == key:
+                self.root = node
+                return True
+        return False
+
+    def run(self, budget: float) -> int:
+        """Search until ``budget`` seconds have passed, returns the iterations done"""
+        deadline = time.perf_counter() + budget
+        iterations = 0
+        while True:
+            node = self.root
+            path = [node]
+            while node.children:
+                node = self._select(node)
+                path.append(node)
+            value = self._expand(node) if node.children is None else node.estimate
+            for visited in path:
+                visited.visits += 1
+                visited.total += value
+            iterations += 1
+            if time.perf_counter() >= deadline:
+                return iterations
+
+    def _select(self, node: _Node) -> _Node:
+        blue = node.blue_to_act()
+        exploration = C_PUCT * math.sqrt(node.visits)
+        best, best_bound = None, -math.inf
+        for _, child in node.children:
+            q = child.value() if blue else 1.0 - child.value()
+            bound = q + exploration * child.prior / (1 + child.visits)
+            if bound > best_bound:
+                best, best_bound = child, bound
+        return best
+
+    def _expand(self, node: _Node) -> float:
+        """Create the children of ``node``, returns its backed-up blue win probability"""
+        node.children = []
+        if node.order >= len(DRAFT_ORDER):
+            return node.estimate
+        ids, priors = self.model.candidates(node.key, self.side)
+        if not ids:
+            return node.estimate
+        _, team, action = DRAFT_ORDER[node.order]
+        slot = ACTION_SLOTS[(action, team)]
+        phase, next_team = turn(node.order + 1)
+        keys = [node.key.apply(slot, champion_id, phase, next_team) for champion_id in ids]
+        blue = self.model.evaluate(keys)
+        node.children = [
+            (champion_id, _Node(key, prior, estimate))
+            for champion_id, key, prior, estimate in zip(ids, keys, priors.tolist(), blue.tolist())
+        ]
+        if TEAMS.index(team) == self.side:
+            own = blue if node.blue_to_act() else 1.0 - blue
+            return float(blue[int(np.argmax(own))])
+        return float(np.dot(priors, blue))
+
+    def result(self, limit: int) -> Dict[str, Any]:
+        """Root moves by visit count, values from the searching team's side"""
+        def own(value: float) -> float:
+            return value if self.side == 0 else 1.0 - value
+
+        root = self.root
+        moves = sorted(root.children or (), key=lambda item: item[1].visits, reverse=True)
+        line = []
+        node = root
+        while node.children:
+            champion_id, node = max(node.children, key=lambda item: item[1].visits)
+            if not node.visits:
+                break
+            line.append(champion_id)
+        return {
+            "moves": [
+                {"champion_id": c, "visits": child.visits, "win_rate": own(child.value())}
+                for c, child in moves[:limit]
+            ],
+            "win_rate": own(root.value()),
+            "baseline_win_rate": own(root.estimate),
+            "principal_variation": line,
+            "visits": root.visits,
+        }
+
+
+# Worker process state: search models by context, trees by (session, side) (both LRU)
+_models: "OrderedDict[str, SearchModel]" = OrderedDict()
+_trees: "OrderedDict[Tuple[str, int], DraftSearch]" = OrderedDict()
+
+
+def _search_task(
+    context: str,
+    model: Optional[SearchModel],
+    session_id: Optional[str],
+    key: DraftKey,
+    budget: float,
+    limit: int,
+) -> Optional[Dict[str, Any]]:
+    """Runs in a worker; None asks the caller to resend ``model``"""
+    if model is not None:
+        _models[context] = model
+    model = _models.get(context)
+    if model is None:
+        return None
+    _models.move_to_end(context)
+    while len(_models) > WORKER_MODELS:
+        _models.popitem(last=False)
+
+    # Blue and red search the same session from opposite sides; each keeps its own tree
+    tree_key = (session_id, key.team)
+    search = _trees.get(tree_key) if session_id else None
+    reused = 0
+    if search is not None and search.model.context == context and search.reroot(key):
+        reused = search.root.visits
+    else:
+        search = DraftSearch(model, key)
+    iterations = search.run(budget)
+    if session_id:
+        _trees[tree_key] = search
+        _trees.move_to_end(tree_key)
+        while len(_trees) > settings.DRAFT_SEARCH_SESSIONS:
+            _trees.popitem(last=False)
+
+    result = search.result(limit)
+    result.update(iterations=iterations, reused_visits=reused)
+    return result
+
+
+class DraftSearchPool:
+    """Single-process search workers with session affinity
+
+    Each worker is its own one-process pool so a session's requests (and
+    its tree) always land on the same process. Search models are pickled
+    to a worker only the first time it sees their context.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self._shipped: List[set] = [set() for _ in range(self.workers)]
+        self._next = 0
+
+    def _executor(self, worker: int) -> ProcessPoolExecutor:
+        if self._executors[worker] is None:
+            self._executors[worker] = ProcessPoolExecutor(1, mp_context=get_context("spawn"))
+            self._shipped[worker] = set()
+        return self._executors[worker]
+
+    def _worker_for(self, session_id: Optional[str]) -> int:
+        if session_id is None:
+            self._next = (self._next + 1) % self.workers
+            return self._next
+        return zlib.crc32(session_id.encode()) % self.workers
+
+    def start(self) -> None:
+        """Spawn the workers now rather than on the first search"""
+        for worker in range(self.workers):
+            self._executor(worker).submit(int)
+
+    async def search(
+        self,
+        model: SearchModel,
+        key: DraftKey,
+        session_id: Optional[str] = None,
+        budget: float = 0.2,
+        limit: int = 5,
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        worker = self._worker_for(session_id)
+        for _ in range(2):
+            executor = self._executor(worker)
+            payload = None if model.context in self._shipped[worker] else model
+            try:
+                result = await loop.run_in_executor(
+                    executor, _search_task, model.context, payload, session_id, key, budget, limit
+                )
+            except BrokenProcessPool:
+                logger.warning(f"Draft search worker {worker} died, restarting it")
+                self._executors[worker] = None
+                continue
+            if result is None:
+                # The worker evicted this model; send it again
+                self._shipped[worker].discard(model.context)
+                continue
+            self._shipped[worker].add(model.context)
+            return result
+        raise RuntimeError("Draft search worker unavailable")
+
+    def shutdown(self) -> None:
+        for worker, executor in enumerate(self._executors):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executors[worker] = None
+
+
+draft_search = DraftSearchPool(settings.DRAFT_SEARCH_WORKERS)
+
+
+async def lookahead(
+    state: DraftState,
+    engine: SuggestionEngine,
+    predictor: WinPredictor,
+    session_id: Optional[str] = None,
+    budget_ms: Optional[float] = None,
+    limit: int = 5,
+) -> DraftSearchResult:
+    """Search from ``state`` for the team to act and rank the engine's suggestions by it
+
+    ``win_rate_impact`` of each suggestion becomes the searched win rate
+    after that move minus the model's estimate for the current state.
+    """
+    key = DraftKey.from_state(state)
+    if key.order >= len(DRAFT_ORDER):
+        raise ValueError("Draft is already complete")
+    phase, team = turn(key.order)
+    if (state.current_phase, state.current_team) != (phase, team):
+        raise ValueError(f"After {key.order} actions {team} should act in {phase}")
+
+    branching = settings.DRAFT_SEARCH_BRANCHING
+    model = SearchModel(engine, predictor, branching)
+    budget = (budget_ms or settings.DRAFT_SEARCH_BUDGET_MS) / 1000.0
+    result = await draft_search.search(model, key, session_id, budget, branching)
+
+    # The root candidates are the engine's top suggestions, so these line up
+    suggestions = {s.champion_id: s for s in engine.suggest_states([state], limit=branching)[0]}
+    baseline = result["baseline_win_rate"]
+    ranked = [
+        suggestions[move["champion_id"]].model_copy(
+            update={"win_rate_impact": move["win_rate"] - baseline}
+        )
+        for move in result["moves"]
+        if move["champion_id"] in suggestions
+    ]
+    return DraftSearchResult(
+        suggestions=ranked[:limit],
+        win_rate=result["win_rate"],
+        baseline_win_rate=baseline,
+        principal_variation=result["principal_variation"],
+        iterations=result["iterations"],
+        visits=result["visits"],
+        reused_visits=result["reused_visits"],
+        model_version=predictor.version,
+    )
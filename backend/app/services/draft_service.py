@@ -0,0 +1,118 @@
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.metrics import stage
+from app.models.draft import (
+    DraftAction, DraftPhase, DraftSession, DraftState, DraftSuggestion, TeamComposition,
+)
+from app.services.champion_catalog import champion_catalog
+from app.services.composition import session_composition
+from app.services.draft_state import DRAFT_ORDER, SLOT_FIELDS, ACTION_SLOTS, TEAMS, turn
+from app.services.player_pools import PlayerPoolCache, apply_player_pools, player_pools
+from app.services.session_store import SessionStore, session_store
+from app.services.suggestion_engine import get_suggestion_engine
+
+logger = logging.getLogger(__name__)
+
+
+class DraftService:
+    """Draft session lifecycle on top of the write-behind session store"""
+
+    def __init__(self):
+        self.store: SessionStore = session_store
+        self.pools: PlayerPoolCache = player_pools
+
+    async def create_session(
+        self, blue_team: List[str], red_team: List[str], patch: Optional[str] = None
+    ) -> DraftSession:
+        session = DraftSession(
+            id=str(uuid.uuid4()),
+            blue_team_players=blue_team,
+            red_team_players=red_team,
+            patch_version=patch or champion_catalog.patch or "14.19",
+        )
+        await self.store.create(session)
+        if settings.PLAYER_PREFETCH_ENABLED:
+            # Warm player pools now so the draft itself never waits on Riot
+            self.pools.prefetch(session.id, blue_team, red_team)
+        return session
+
+    async def get_session(self, session_id: str) -> Optional[DraftSession]:
+        return await self.store.get(session_id)
+
+    async def _require(self, session_id: str) -> DraftSession:
+        session = await self.store.get(session_id)
+        if session is None:
+            raise ValueError(f"Session {session_id} not found")
+        return session
+
+    async def add_action(
+        self, session_id: str, champion_id: int, action_type: str, team: str
+    ) -> DraftAction:
+        """Validate and apply the next pick/ban; persisted on the next store flush"""
+        session = await self._require(session_id)
+        order = len(session.actions)
+        if order >= len(DRAFT_ORDER):
+            raise ValueError("Draft is already complete")
+        phase, expected_team, expected_action = DRAFT_ORDER[order]
+        if (team, action_type) != (expected_team, expected_action):
+            raise ValueError(f"Expected a {expected_team} {expected_action} in {phase}")
+        if len(champion_catalog) and champion_id not in champion_catalog:
+            raise ValueError(f"Unknown champion {champion_id}")
+        if any(champion_id in getattr(session, field) for field in SLOT_FIELDS):
+            raise ValueError(f"Champion {champion_id} is already picked or banned")
+
+        # Sync the accumulator before the new action lands, then fold it in
+        composition = session_composition(session, settings.DEFAULT_RANK_TIER)
+        action = DraftAction(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            champion_id=champion_id,
+            champion_name=champion_catalog.name(champion_id),
+            action_type=action_type,
+            team=team,
+            order=session.current_action_order,
+        )
+        # Raises for champions the profiles do not know; the session is untouched until it succeeds
+        composition.apply(action)
+        getattr(session, SLOT_FIELDS[ACTION_SLOTS[(action_type, team)]]).append(champion_id)
+        session.actions.append(action)
+        session.current_phase, session.current_team = turn(order + 1)
+        session.current_action_order += 1
+        session.updated_at = datetime.utcnow()
+        if session.current_phase == DraftPhase.COMPLETED.value:
+            session.blue_composition = composition.analysis("blue")
+            session.red_composition = composition.analysis("red")
+            self.pools.drop(session.id)
+        await self.store.append(session, action)
+        return action
+
+    async def get_suggestions(self, session_id: str, team: str) -> List[DraftSuggestion]:
+        with stage("draft.suggestions", "load"):
+            session = await self._require(session_id)
+        with stage("draft.suggestions", "engine"):
+            engine = get_suggestion_engine(session.patch_version, settings.DEFAULT_RANK_TIER)
+        with stage("draft.suggestions", "compute"):
+            state = DraftState(
+                **{field: getattr(session, field) for field in SLOT_FIELDS},
+                current_phase=session.current_phase,
+                current_team=team,
+            )
+            suggestions = engine.suggest_states([state])[0]
+        with stage("draft.suggestions", "player_pools"):
+            enemy = TEAMS[1 - TEAMS.index(team)]
+            return apply_player_pools(
+                suggestions,
+                self.pools.ready(session.id, team),
+                self.pools.ready(session.id, enemy),
+                settings.PLAYER_POOL_BONUS,
+            )
+
+    async def analyze_composition(self, session_id: str, team: str) -> TeamComposition:
+        with stage("draft.analysis", "load"):
+            session = await self._require(session_id)
+        with stage("draft.analysis", "compute"):
+            return session_composition(session, settings.DEFAULT_RANK_TIER).analysis(team)
@@ -0,0 +1,244 @@
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CACHE_HIT_RATIO
+from app.models.draft import CHAMPION_ID_LIMIT, ActionType, DraftPhase, DraftState, Team
+from app.services.cache import _MISSING, LocalCache
+
+logger = logging.getLogger(__name__)
+
+PHASES: List[str] = [phase.value for phase in DraftPhase]
+TEAMS: List[str] = [Team.BLUE.value, Team.RED.value]
+
+# Bitset slots, in DraftKey field order
+BLUE_PICKS, RED_PICKS, BLUE_BANS, RED_BANS = range(4)
+SLOT_FIELDS = ("blue_picks", "red_picks", "blue_bans", "red_bans")
+
+
+def _draft_order() -> List[Tuple[str, str, str]]:
+    # Three ban/pick rounds; picks snake B RR BB RR BB R across the rounds
+    rounds = [
+        (DraftPhase.BANS_1, ActionType.BAN, "BRBR"),
+        (DraftPhase.PICKS_1, ActionType.PICK, "BRRB"),
+        (DraftPhase.BANS_2, ActionType.BAN, "BRBR"),
+        (DraftPhase.PICKS_2, ActionType.PICK, "BRRB"),
+        (DraftPhase.BANS_3, ActionType.BAN, "BR"),
+        (DraftPhase.PICKS_3, ActionType.PICK, "BR"),
+    ]
+    teams = {"B": Team.BLUE.value, "R": Team.RED.value}
+    return [
+        (phase.value, teams[side], action.value)
+        for phase, action, sides in rounds
+        for side in sides
+    ]
+
+
+# Every pick/ban of a full draft as (phase, team, action), in turn order
+DRAFT_ORDER: List[Tuple[str, str, str]] = _draft_order()
+
+ACTION_SLOTS: Dict[Tuple[str, str], int] = {
+    (ActionType.PICK.value, Team.BLUE.value): BLUE_PICKS,
+    (ActionType.PICK.value, Team.RED.value): RED_PICKS,
+    (ActionType.BAN.value, Team.BLUE.value): BLUE_BANS,
+    (ActionType.BAN.value, Team.RED.value): RED_BANS,
+}
+
+
+def turn(order: int) -> Tuple[str, str]:
+    """Phase and team to act once ``order`` actions have been made"""
+    if order >= len(DRAFT_ORDER):
+        return DraftPhase.COMPLETED.value, Team.BLUE.value
+    phase, team, _ = DRAFT_ORDER[order]
+    return phase, team
+
+ZOBRIST_SIZE = CHAMPION_ID_LIMIT
+_MASK64 = (1 << 64) - 1
+
+
+def splitmix64(x: int) -> int:
+    """Deterministic 64-bit mixer; the same everywhere, unlike ``hash()``"""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+# Zobrist keys per (slot, champion id) and per (phase, team to act)
+_ZOBRIST = [
+    [splitmix64(slot * ZOBRIST_SIZE + c) for c in range(ZOBRIST_SIZE)] for slot in range(4)
+]
+_TURN = [[splitmix64((1 << 40) + p * 2 + t) for t in range(2)] for p in range(len(PHASES))]
+
+
+def zobrist(slot: int, champion_id: int) -> int:
+    if not 0 <= champion_id < ZOBRIST_SIZE:
+        raise ValueError(f"Champion ID {champion_id} outside [0, {ZOBRIST_SIZE})")
+    return _ZOBRIST[slot][champion_id]
+
+
+def bits_to_ids(bits: int) -> List[int]:
+    """Set bit positions (champion IDs), ascending"""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class DraftKey:
+    """Canonical draft state: four champion-ID bitsets, phase and team to act
+
+    Pick/ban order within a team is deliberately dropped, so every history
+    reaching the same sets shares one key. ``hash64`` is a Zobrist hash and
+    stable across processes, which makes it usable in shared caches;
+    ``apply`` updates it incrementally.
+    """
+
+    __slots__ = ("bits", "phase", "team", "hash64")
+
+    def __init__(self, bits: Tuple[int, int, int, int], phase: int, team: int, hash64: int):
+        self.bits = bits
+        self.phase = phase
+        self.team = team
+        self.hash64 = hash64
+
+    @classmethod
+    def from_sets(
+        cls, sets: Sequence[Iterable[int]], phase: str, team: str
+    ) -> "DraftKey":
+        bits = [0, 0, 0, 0]
+        h = 0
+        for slot, champion_ids in enumerate(sets):
+            for champion_id in champion_ids:
+                key = zobrist(slot, champion_id)
+                if not bits[slot] >> champion_id & 1:
+                    bits[slot] |= 1 << champion_id
+                    h ^= key
+        p, t = PHASES.index(phase), TEAMS.index(team)
+        return cls(tuple(bits), p, t, h ^ _TURN[p][t])
+
+    @classmethod
+    def from_state(cls, state: Any) -> "DraftKey":
+        """Key for a DraftState or DraftSession"""
+        return cls.from_sets(
+            [getattr(state, field) for field in SLOT_FIELDS],
+            state.current_phase,
+            state.current_team,
+        )
+
+    def apply(self, slot: int, champion_id: int, phase: str, team: str) -> "DraftKey":
+        """Key after adding ``champion_id`` to ``slot``, with the new turn"""
+        bits = list(self.bits)
+        h = self.hash64 ^ _TURN[self.phase][self.team]
+        key = zobrist(slot, champion_id)
+        if not bits[slot] >> champion_id & 1:
+            bits[slot] |= 1 << champion_id
+            h ^= key
+        p, t = PHASES.index(phase), TEAMS.index(team)
+        return DraftKey(tuple(bits), p, t, h ^ _TURN[p][t])
+
+    @property
+    def order(self) -> int:
+        """Actions made so far, i.e. the position in ``DRAFT_ORDER``"""
+        return self.occupied.bit_count()
+
+    @property
+    def occupied(self) -> int:
+        """Every picked or banned champion as one bitset"""
+        return self.bits[0] | self.bits[1] | self.bits[2] | self.bits[3]
+
+    def ids(self, slot: int) -> List[int]:
+        return bits_to_ids(self.bits[slot])
+
+    def to_state(self) -> DraftState:
+        return DraftState(
+            **{field: self.ids(slot) for slot, field in enumerate(SLOT_FIELDS)},
+            current_phase=PHASES[self.phase],
+            current_team=TEAMS[self.team],
+        )
+
+    def __hash__(self) -> int:
+        return self.hash64
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, DraftKey)
+            and self.hash64 == other.hash64
+            and self.bits == other.bits
+            and self.phase == other.phase
+            and self.team == other.team
+        )
+
+    def __repr__(self) -> str:
+        return f"DraftKey({self.hash64:016x})"
+
+
+class TranspositionCache:
+    """Bounded LRU of per-draft-state results keyed on ``DraftKey.hash64``
+
+    Entries are namespaced by what they hold (``features``, ``prediction``,
+    ``suggestions``) and by a context string naming everything else the
+    result depends on (model version, patch/rank slice, limit), so a
+    rebuilt engine or a new model never reads the previous one's entries.
+    """
+
+    def __init__(self, max_entries: int = 50000, ttl: float = 3600.0):
+        self.local = LocalCache(max_entries, ttl)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _key(self, namespace: str, context: str, key: DraftKey) -> str:
+        return f"{namespace}:{context}:{key.hash64:016x}"
+
+    def get(self, namespace: str, context: str, key: DraftKey) -> Any:
+        """Cached value or ``_MISSING``"""
+        counts = self.stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        value = self.local.get(self._key(namespace, context, key))
+        counts["hits" if value is not _MISSING else "misses"] += 1
+        return value
+
+    def set(self, namespace: str, context: str, key: DraftKey, value: Any) -> None:
+        self.local.set(self._key(namespace, context, key), value)
+
+    def get_many(
+        self,
+        namespace: str,
+        context: str,
+        keys: Sequence[DraftKey],
+        compute: Callable[[List[int]], Sequence[Any]],
+    ) -> List[Any]:
+        """Look up every key, computing the misses in one ``compute(positions)`` call
+
+        Repeated states within ``keys`` are computed once.
+        """
+        values = [self.get(namespace, context, key) for key in keys]
+        first: Dict[DraftKey, int] = {}
+        for i, value in enumerate(values):
+            if value is _MISSING:
+                first.setdefault(keys[i], i)
+        if first:
+            missing = list(first.values())
+            for i, value in zip(missing, compute(missing)):
+                values[i] = value
+                self.set(namespace, context, keys[i], value)
+            for i, value in enumerate(values):
+                if value is _MISSING:
+                    values[i] = values[first[keys[i]]]
+        return values
+
+    def hit_ratio(self, namespace: Optional[str] = None) -> float:
+        counts = [self.stats.get(namespace, {})] if namespace else list(self.stats.values())
+        hits = sum(c.get("hits", 0) for c in counts)
+        total = hits + sum(c.get("misses", 0) for c in counts)
+        return hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self.local.clear()
+
+
+transposition_cache = TranspositionCache(settings.TRANSPOSITION_CACHE_SIZE)
+CACHE_HIT_RATIO.add(lambda: {
+    f"transposition:{namespace}": transposition_cache.hit_ratio(namespace)
+    for namespace in list(transposition_cache.stats)
+})
@@ -0,0 +1,364 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Set
+
+from app.models.champion import Role
+from app.services.riot_service import DEFAULT_REGION, Priority, RiotAPIError, RiotService
+
+logger = logging.getLogger(__name__)
+
+RANKED_SOLO_QUEUE = 420
+
+# Match-v5 teamPosition -> Role
+POSITION_ROLES = {
+    "TOP": Role.TOP.value,
+    "JUNGLE": Role.JUNGLE.value,
+    "MIDDLE": Role.MID.value,
+    "BOTTOM": Role.ADC.value,
+    "UTILITY": Role.SUPPORT.value,
+}
+
+_DONE = object()
+
+
+class ParticipantRow(NamedTuple):
+    """One champion's line in one match"""
+    champion_id: int
+    team_id: int
+    role: Optional[str]
+    win: bool
+    kills: int
+    deaths: int
+    assists: int
+    cs: int
+    gold: int
+    damage: int
+
+
+class ParsedMatch(NamedTuple):
+    """The parts of a Match-v5 payload the aggregates need"""
+    match_id: str
+    patch: str
+    rank_tier: str
+    queue_id: int
+    duration: float  # seconds
+    participants: List[ParticipantRow]
+    bans: List[int]
+
+
+class MatchSink(Protocol):
+    """Aggregate stage target, e.g. the columnar match store"""
+
+    def add(self, match: ParsedMatch) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class ListSink:
+    """Keeps parsed matches in memory"""
+
+    def __init__(self):
+        self.matches: List[ParsedMatch] = []
+
+    def add(self, match: ParsedMatch) -> None:
+        self.matches.append(match)
+
+    def flush(self) -> None:
+        pass
+
+
+def parse_match(payload: Dict[str, Any], rank_tier: str) -> ParsedMatch:
+    """Reduce a Match-v5 payload to participant rows and bans"""
+    info = payload["info"]
+    participants = [
+        ParticipantRow(
+            champion_id=int(p["championId"]),
+            team_id=int(p["teamId"]),
+            role=POSITION_ROLES.get(p.get("teamPosition") or ""),
+            win=bool(p["win"]),
+            kills=int(p.get("kills", 0)),
+            deaths=int(p.get("deaths", 0)),
+            assists=int(p.get("assists", 0)),
+            cs=int(p.get("totalMinionsKilled", 0)) + int(p.get("neutralMinionsKilled", 0)),
+            gold=int(p.get("goldEarned", 0)),
+            damage=int(p.get("totalDamageDealtToChampions", 0)),
+        )
+        for p in info["participants"]
+    ]
+    bans = [
+        int(ban["championId"])
+        for team in info.get("teams", [])
+        for ban in team.get("bans", [])
+        if ban.get("championId", -1) > 0
+    ]
+    return ParsedMatch(
+        match_id=payload["metadata"]["matchId"],
+        patch=".".join(str(info.get("gameVersion", "")).split(".")[:2]),
+        rank_tier=rank_tier,
+        queue_id=int(info.get("queueId", 0)),
+        duration=float(info.get("gameDuration", 0)),
+        participants=participants,
+        bans=bans,
+    )
+
+
+class Checkpoint:
+    """Crash-safe crawl progress on local disk
+
+    ``discovered.log``, ``processed.log`` and ``failed.log`` are append-only
+    match-id logs and ``state.json`` holds the seed cursor (rewritten
+    atomically). Processed ids are only appended after the sink has flushed,
+    so a resumed crawl never loses matches; at most the last unflushed batch
+    is aggregated twice. Failed ids are matches that can never succeed (a
+    4xx from Match-v5, an unparseable payload) and are not retried on resume.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.discovered: Set[str] = self._read_log("discovered.log")
+        self.processed: Set[str] = self._read_log("processed.log")
+        self.failed: Set[str] = self._read_log("failed.log")
+        state_path = self.directory / "state.json"
+        self.state: Dict[str, Any] = (
+            json.loads(state_path.read_text()) if state_path.exists() else {"seed_index": 0}
+        )
+        self._discovered_log = open(self.directory / "discovered.log", "a")
+        self._processed_log = open(self.directory / "processed.log", "a")
+        self._failed_log = open(self.directory / "failed.log", "a")
+
+    def _read_log(self, name: str) -> Set[str]:
+        path = self.directory / name
+        if not path.exists():
+            return set()
+        with open(path) as f:
+            return {line.strip() for line in f if line.strip()}
+
+    @property
+    def pending(self) -> List[str]:
+        return sorted(self.discovered - self.processed - self.failed)
+
+    def add_discovered(self, match_ids: Sequence[str]) -> None:
+        self.discovered.update(match_ids)
+        self._discovered_log.write("".join(f"{m}\n" for m in match_ids))
+        self._discovered_log.flush()
+
+    def add_processed(self, match_ids: Sequence[str]) -> None:
+        self.processed.update(match_ids)
+        self._processed_log.write("".join(f"{m}\n" for m in match_ids))
+        self._processed_log.flush()
+        os.fsync(self._processed_log.fileno())
+
+    def add_failed(self, match_id: str) -> None:
+        self.failed.add(match_id)
+        self._failed_log.write(f"{match_id}\n")
+        self._failed_log.flush()
+
+    def save_state(self, **state: Any) -> None:
+        self.state.update(state)
+        tmp = self.directory / "state.json.tmp"
+        tmp.write_text(json.dumps(self.state))
+        os.replace(tmp, self.directory / "state.json")
+
+    def close(self) -> None:
+        self._discovered_log.close()
+        self._processed_log.close()
+        self._failed_log.close()
+
+
+class IngestionPipeline:
+    """Streaming crawl: match-id discovery -> fetch -> parse -> aggregate
+
+    Stages are connected by bounded queues, so a slow sink or a throttled
+    Riot API pushes back all the way to discovery instead of buffering the
+    whole crawl in memory. Match ids are deduplicated across seeds and runs.
+
+    If any stage raises, the others are cancelled and ``run`` re-raises the
+    error instead of waiting on a queue nobody drains.
+    """
+
+    def __init__(
+        self,
+        riot: RiotService,
+        sink: MatchSink,
+        checkpoint_dir: Path,
+        rank_tier: str,
+        region: str = DEFAULT_REGION,
+        queue_id: Optional[int] = RANKED_SOLO_QUEUE,
+        matches_per_player: int = 20,
+        fetch_concurrency: int = 8,
+        queue_size: int = 256,
+        checkpoint_every: int = 100,
+        report_interval: float = 10.0,
+    ):
+        self.riot = riot
+        self.sink = sink
+        self.checkpoint = Checkpoint(checkpoint_dir)
+        self.rank_tier = rank_tier
+        self.region = region
+        self.queue_id = queue_id
+        self.matches_per_player = matches_per_player
+        self.fetch_concurrency = fetch_concurrency
+        self.checkpoint_every = checkpoint_every
+        self.report_interval = report_interval
+        self.match_ids: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.payloads: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.parsed: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = {
+            "discovered": 0, "duplicates": 0, "fetched": 0,
+            "processed": 0, "failed": 0, "skipped_queue": 0,
+        }
+        self._started = 0.0
+        self._unflushed: List[str] = []
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self._started, 1e-9) if self._started else 0.0
+        return {
+            **self.stats,
+            "matches_per_sec": self.stats["processed"] / elapsed if elapsed else 0.0,
+            "queue_depths": {
+                "match_ids": self.match_ids.qsize(),
+                "payloads": self.payloads.qsize(),
+                "parsed": self.parsed.qsize(),
+                "riot_scheduler": RiotService.queue_depth(),
+            },
+        }
+
+    async def run(self, seed_puuids: Sequence[str]) -> Dict[str, Any]:
+        """Crawl until every seed's recent matches are aggregated"""
+        self._started = time.monotonic()
+        fetchers = [asyncio.create_task(self._fetch()) for _ in range(self.fetch_concurrency)]
+        parser = asyncio.create_task(self._parse())
+        aggregator = asyncio.create_task(self._aggregate())
+        driver = asyncio.create_task(self._drive(seed_puuids, fetchers, parser, aggregator))
+        reporter = asyncio.create_task(self._report())
+        stages = [driver, *fetchers, parser, aggregator]
+        try:
+            done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        except BaseException:
+            # Keep what the sink already holds, but surface the original error
+            for task in (reporter, *stages):
+                task.cancel()
+            await asyncio.gather(reporter, *stages, return_exceptions=True)
+            try:
+                self._commit()
+            except Exception as e:
+                logger.warning(f"Could not checkpoint after ingestion failure: {e}")
+            self.checkpoint.close()
+            raise
+        reporter.cancel()
+        self._commit()
+        self.checkpoint.close()
+        progress = self.progress()
+        logger.info(f"Ingestion finished: {progress}")
+        return progress
+
+    async def _drive(self, seed_puuids, fetchers, parser, aggregator) -> None:
+        """Discover, then close each stage's input once its upstream has drained"""
+        await self._discover(seed_puuids)
+        for _ in fetchers:
+            await self.match_ids.put(_DONE)
+        await asyncio.gather(*fetchers)
+        await self.payloads.put(_DONE)
+        await parser
+        await self.parsed.put(_DONE)
+        await aggregator
+
+    async def _discover(self, seed_puuids: Sequence[str]) -> None:
+        # Resume: matches discovered by a previous run but never aggregated
+        for match_id in self.checkpoint.pending:
+            await self.match_ids.put(match_id)
+        start = self.checkpoint.state.get("seed_index", 0)
+        for index in range(start, len(seed_puuids)):
+            try:
+                ids = await self.riot.get_match_ids(
+                    seed_puuids[index],
+                    count=self.matches_per_player,
+                    queue=self.queue_id,
+                    region=self.region,
+                    priority=Priority.BACKGROUND,
+                )
+            except RiotAPIError as e:
+                logger.warning(f"Match discovery failed for seed {index}: {e}")
+                ids = []
+            fresh = [m for m in dict.fromkeys(ids) if m not in self.checkpoint.discovered]
+            self.stats["duplicates"] += len(ids) - len(fresh)
+            self.stats["discovered"] += len(fresh)
+            self.checkpoint.add_discovered(fresh)
+            for match_id in fresh:
+                await self.match_ids.put(match_id)
+            self.checkpoint.save_state(seed_index=index + 1)
+
+    async def _fetch(self) -> None:
+        while True:
+            match_id = await self.match_ids.get()
+            if match_id is _DONE:
+                return
+            try:
+                payload = await self.riot.get_match(match_id, region=self.region)
+            except RiotAPIError as e:
+                # 4xx after the scheduler's retries: the match will never be served
+                self.stats["failed"] += 1
+                self.checkpoint.add_failed(match_id)
+                logger.warning(f"Failed to fetch match {match_id}: {e}")
+                continue
+            except Exception as e:
+                # Transient; stays pending and is retried on resume
+                self.stats["failed"] += 1
+                logger.warning(f"Failed to fetch match {match_id}: {e}")
+                continue
+            self.stats["fetched"] += 1
+            await self.payloads.put((match_id, payload))
+
+    async def _parse(self) -> None:
+        while True:
+            item = await self.payloads.get()
+            if item is _DONE:
+                return
+            match_id, payload = item
+            try:
+                match = parse_match(payload, self.rank_tier)
+            except (KeyError, TypeError, ValueError) as e:
+                self.stats["failed"] += 1
+                self.checkpoint.add_failed(match_id)
+                logger.warning(f"Failed to parse match {match_id}: {e}")
+                continue
+            await self.parsed.put(match)
+
+    async def _aggregate(self) -> None:
+        while True:
+            match = await self.parsed.get()
+            if match is _DONE:
+                return
+            if self.queue_id is not None and match.queue_id != self.queue_id:
+                self.stats["skipped_queue"] += 1
+            else:
+                self.sink.add(match)
+            self._unflushed.append(match.match_id)
+            self.stats["processed"] += 1
+            if len(self._unflushed) >= self.checkpoint_every:
+                self._commit()
+
+    def _commit(self) -> None:
+        """Flush the sink, then record the flushed matches as processed"""
+        if not self._unflushed:
+            return
+        self.sink.flush()
+        self.checkpoint.add_processed(self._unflushed)
+        self._unflushed = []
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            progress = self.progress()
+            logger.info(
+                f"Ingestion: {progress['processed']} matches "
+                f"({progress['matches_per_sec']:.1f}/s), queues {progress['queue_depths']}"
+            )
@@ -0,0 +1,298 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.champion import ChampionMatchup, ChampionSynergy, Role
+
+logger = logging.getLogger(__name__)
+
+# (patch, rank_tier, role); role is None for the all-roles slice
+StoreKey = Tuple[str, str, Optional[str]]
+
+ROLES: List[str] = [role.value for role in Role]
+
+
+class ChampionIndex:
+    """Dense mapping between champion IDs and matrix positions"""
+
+    def __init__(self, champion_ids: Iterable[int]):
+        self.ids = np.unique(np.fromiter(champion_ids, dtype=np.int32))
+
+    @classmethod
+    def from_sorted(cls, ids: np.ndarray) -> "ChampionIndex":
+        """Adopt an already sorted, unique int32 array without copying"""
+        index = cls.__new__(cls)
+        index.ids = ids
+        return index
+
+    def __len__(self) -> int:
+        return int(self.ids.size)
+
+    def __contains__(self, champion_id: int) -> bool:
+        pos = int(np.searchsorted(self.ids, champion_id))
+        return pos < self.ids.size and self.ids[pos] == champion_id
+
+    def position(self, champion_id: int) -> int:
+        """Matrix position for a champion ID, KeyError if unknown"""
+        pos = int(np.searchsorted(self.ids, champion_id))
+        if pos >= self.ids.size or self.ids[pos] != champion_id:
+            raise KeyError(champion_id)
+        return pos
+
+    def positions(self, champion_ids: Sequence[int]) -> np.ndarray:
+        """Vectorized lookup, -1 for unknown IDs"""
+        ids = np.asarray(champion_ids, dtype=np.int32)
+        if not self.ids.size:
+            return np.full(ids.shape, -1, dtype=np.int32)
+        pos = np.searchsorted(self.ids, ids).astype(np.int32)
+        clipped = np.minimum(pos, self.ids.size - 1)
+        return np.where(self.ids[clipped] == ids, clipped, -1).astype(np.int32)
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest finite values, best first"""
+    scores = np.where(np.isfinite(values), values, -np.inf)
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
+class MatchupMatrices:
+    """Champion x champion matchup and synergy tables for one patch/rank/role slice
+
+    Row ``i`` holds champion ``i``'s view of the pair, mirroring
+    ``ChampionMatchup.champion_id`` and ``ChampionSynergy.champion_id``.
+    Missing pairs are NaN with zero games. Free-text fields (play style tips,
+    synergy reasons) are not packed; responses carry model defaults for them.
+
+    ``arrays`` adopts pre-built arrays (e.g. read-only views into a
+    memory-mapped snapshot) instead of allocating empty ones.
+    """
+
+    ARRAYS: Tuple[str, ...] = (
+        "win_rate", "counter_strength", "difficulty_score",
+        "matchup_games", "matchup_role",
+        "synergy_score", "synergy_win_rate", "synergy_pick_rate",
+        "synergy_games", "synergy_type",
+    )
+
+    def __init__(
+        self,
+        patch: str,
+        rank_tier: str,
+        role: Optional[str],
+        index: ChampionIndex,
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+        synergy_types: Optional[List[str]] = None,
+    ):
+        n = len(index)
+        self.patch = patch
+        self.rank_tier = rank_tier
+        self.role = role
+        self.index = index
+        self.last_updated = datetime.utcnow()
+        self.synergy_types: List[str] = list(synergy_types or [])
+        self._countered_by: Optional[np.ndarray] = None
+
+        if arrays is not None:
+            for name in self.ARRAYS:
+                setattr(self, name, arrays[name])
+            return
+
+        # Matchups
+        self.win_rate = np.full((n, n), np.nan, dtype=np.float32)
+        self.counter_strength = np.full((n, n), np.nan, dtype=np.float32)
+        self.difficulty_score = np.full((n, n), np.nan, dtype=np.float32)
+        self.matchup_games = np.zeros((n, n), dtype=np.int32)
+        self.matchup_role = np.full((n, n), -1, dtype=np.int8)
+
+        # Synergies
+        self.synergy_score = np.full((n, n), np.nan, dtype=np.float32)
+        self.synergy_win_rate = np.full((n, n), np.nan, dtype=np.float32)
+        self.synergy_pick_rate = np.full((n, n), np.nan, dtype=np.float32)
+        self.synergy_games = np.zeros((n, n), dtype=np.int32)
+        self.synergy_type = np.full((n, n), -1, dtype=np.int16)
+
+    @property
+    def key(self) -> StoreKey:
+        return (self.patch, self.rank_tier, self.role)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    @classmethod
+    def from_records(
+        cls,
+        patch: str,
+        rank_tier: str,
+        role: Optional[str],
+        matchups: Iterable[ChampionMatchup] = (),
+        synergies: Iterable[ChampionSynergy] = (),
+        champion_ids: Optional[Iterable[int]] = None,
+    ) -> "MatchupMatrices":
+        """Pack pydantic rows into dense arrays"""
+        matchups = list(matchups)
+        synergies = list(synergies)
+        if champion_ids is None:
+            champion_ids = (
+                [m.champion_id for m in matchups]
+                + [m.opponent_id for m in matchups]
+                + [s.champion_id for s in synergies]
+                + [s.synergy_champion_id for s in synergies]
+            )
+        matrices = cls(patch, rank_tier, role, ChampionIndex(champion_ids))
+
+        if matchups:
+            rows = matrices.index.positions([m.champion_id for m in matchups])
+            cols = matrices.index.positions([m.opponent_id for m in matchups])
+            keep = (rows >= 0) & (cols >= 0)
+            rows, cols = rows[keep], cols[keep]
+            kept = [m for m, k in zip(matchups, keep) if k]
+            matrices.win_rate[rows, cols] = [m.win_rate for m in kept]
+            matrices.counter_strength[rows, cols] = [m.counter_strength for m in kept]
+            matrices.difficulty_score[rows, cols] = [m.difficulty_score for m in kept]
+            matrices.matchup_games[rows, cols] = [m.games_analyzed for m in kept]
+            matrices.matchup_role[rows, cols] = [ROLES.index(m.role) for m in kept]
+
+        if synergies:
+            rows = matrices.index.positions([s.champion_id for s in synergies])
+            cols = matrices.index.positions([s.synergy_champion_id for s in synergies])
+            keep = (rows >= 0) & (cols >= 0)
+            rows, cols = rows[keep], cols[keep]
+            kept = [s for s, k in zip(synergies, keep) if k]
+            types = {name: code for code, name in enumerate(sorted({s.synergy_type for s in kept}))}
+            matrices.synergy_types = list(types)
+            matrices.synergy_score[rows, cols] = [s.synergy_score for s in kept]
+            matrices.synergy_win_rate[rows, cols] = [s.win_rate_together for s in kept]
+            matrices.synergy_pick_rate[rows, cols] = [s.pick_rate_together for s in kept]
+            matrices.synergy_games[rows, cols] = [s.games_analyzed for s in kept]
+            matrices.synergy_type[rows, cols] = [types[s.synergy_type] for s in kept]
+
+        return matrices
+
+    @property
+    def countered_by(self) -> np.ndarray:
+        """Transposed counter strengths: row ``j`` is every champion's strength vs ``j``"""
+        if self._countered_by is None:
+            self._countered_by = np.ascontiguousarray(self.counter_strength.T)
+        return self._countered_by
+
+    def best_counters(
+        self, champion_id: int, limit: int = 5, min_games: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Champion IDs that counter ``champion_id`` hardest, with their strengths"""
+        col = self.index.position(champion_id)
+        row = self.countered_by[col]
+        if min_games:
+            row = np.where(self.matchup_games[:, col] >= min_games, row, np.nan)
+        best = top_k(row, limit)
+        return self.index.ids[best], row[best]
+
+    def best_synergies(
+        self, champion_id: int, limit: int = 5, min_games: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best synergy partners for ``champion_id``, with their scores"""
+        pos = self.index.position(champion_id)
+        row = self.synergy_score[pos]
+        if min_games:
+            row = np.where(self.synergy_games[pos] >= min_games, row, np.nan)
+        best = top_k(row, limit)
+        return self.index.ids[best], row[best]
+
+    def matchup(self, champion_id: int, opponent_id: int) -> Optional[ChampionMatchup]:
+        """Build a single ChampionMatchup response row"""
+        i, j = self.index.position(champion_id), self.index.position(opponent_id)
+        role = int(self.matchup_role[i, j])
+        if role < 0:
+            return None
+        return ChampionMatchup(
+            champion_id=champion_id,
+            opponent_id=opponent_id,
+            role=ROLES[role],
+            win_rate=float(self.win_rate[i, j]),
+            difficulty_score=float(self.difficulty_score[i, j]),
+            counter_strength=float(self.counter_strength[i, j]),
+            games_analyzed=int(self.matchup_games[i, j]),
+            patch=self.patch,
+            last_updated=self.last_updated,
+        )
+
+    def synergy(self, champion_id: int, partner_id: int) -> Optional[ChampionSynergy]:
+        """Build a single ChampionSynergy response row"""
+        i, j = self.index.position(champion_id), self.index.position(partner_id)
+        code = int(self.synergy_type[i, j])
+        if code < 0:
+            return None
+        return ChampionSynergy(
+            champion_id=champion_id,
+            synergy_champion_id=partner_id,
+            synergy_score=float(self.synergy_score[i, j]),
+            win_rate_together=float(self.synergy_win_rate[i, j]),
+            pick_rate_together=float(self.synergy_pick_rate[i, j]),
+            synergy_type=self.synergy_types[code],
+            games_analyzed=int(self.synergy_games[i, j]),
+            patch=self.patch,
+            last_updated=self.last_updated,
+        )
+
+    def counters(self, champion_id: int, limit: int = 5, min_games: int = 0) -> List[ChampionMatchup]:
+        """Counters to ``champion_id`` as response models"""
+        ids, _ = self.best_counters(champion_id, limit, min_games)
+        return [self.matchup(int(counter_id), champion_id) for counter_id in ids]
+
+    def synergies(self, champion_id: int, limit: int = 5, min_games: int = 0) -> List[ChampionSynergy]:
+        """Synergy partners for ``champion_id`` as response models"""
+        ids, _ = self.best_synergies(champion_id, limit, min_games)
+        return [self.synergy(champion_id, int(partner_id)) for partner_id in ids]
+
+
+class MatchupStore:
+    """In-memory registry of matchup matrices keyed by (patch, rank_tier, role)"""
+
+    def __init__(self):
+        self._matrices: Dict[StoreKey, MatchupMatrices] = {}
+        self._lock = threading.Lock()
+
+    def put(self, matrices: MatchupMatrices) -> None:
+        with self._lock:
+            self._matrices[matrices.key] = matrices
+        logger.info(
+            f"Loaded matchup matrices for {matrices.key}: "
+            f"{len(matrices.index)} champions, {matrices.nbytes / 1e6:.1f} MB"
+        )
+
+    def get(
+        self, patch: str, rank_tier: str, role: Optional[str] = None
+    ) -> Optional[MatchupMatrices]:
+        """Exact slice, falling back to the all-roles slice"""
+        matrices = self._matrices.get((patch, rank_tier, role))
+        if matrices is None and role is not None:
+            matrices = self._matrices.get((patch, rank_tier, None))
+        return matrices
+
+    def drop_patch(self, patch: str) -> int:
+        """Forget every slice for a patch, returns how many were dropped"""
+        with self._lock:
+            stale = [key for key in self._matrices if key[0] == patch]
+            for key in stale:
+                del self._matrices[key]
+        return len(stale)
+
+    def keys(self) -> List[StoreKey]:
+        return list(self._matrices)
+
+    def patches(self) -> List[str]:
+        return sorted({key[0] for key in self._matrices})
+
+    @property
+    def nbytes(self) -> int:
+        return sum(m.nbytes for m in self._matrices.values())
+
+
+matchup_store = MatchupStore()
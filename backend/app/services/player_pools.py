@@ -0,0 +1,212 @@
+"""Player champion pools, prefetched speculatively when a draft session starts
+
+Creating a session starts one background fetch per named player (Riot ID
+``name#tag``): account, top champion mastery and the champions played in
+recent ranked matches, all at ``Priority.INTERACTIVE`` so they queue
+behind live-draft calls but ahead of crawls. Fetches are shared by every
+session naming the same player and reused for ``PLAYER_POOL_TTL``.
+
+The suggestion path only reads pools that have already arrived
+(``PlayerPoolCache.ready``); a pending or failed fetch just means no
+player-aware adjustment for that player, never a wait.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import CACHE_HIT_RATIO, count_cache
+from app.models.draft import ActionType, DraftSuggestion, Team
+from app.services.ingestion import RANKED_SOLO_QUEUE
+from app.services.riot_service import Priority, RiotService
+
+logger = logging.getLogger(__name__)
+
+
+class PlayerPool(NamedTuple):
+    """What one player is likely to play"""
+    player: str
+    puuid: str
+    mastery: Dict[int, int]  # champion_id -> mastery points
+    recent: Dict[int, int]  # champion_id -> games in the fetched recent matches
+
+    def __contains__(self, champion_id: int) -> bool:
+        return champion_id in self.mastery or champion_id in self.recent
+
+
+def split_riot_id(player: str) -> Tuple[str, str]:
+    game_name, _, tag_line = player.partition("#")
+    return game_name.strip(), tag_line.strip() or settings.RIOT_DEFAULT_TAG_LINE
+
+
+class PlayerPoolCache:
+    """Per-player fetch tasks with a TTL, grouped by session and team"""
+
+    def __init__(
+        self,
+        riot: Optional[RiotService] = None,
+        matches: int = 5,
+        mastery: int = 10,
+        ttl: float = 900.0,
+        max_sessions: int = 10000,
+    ):
+        self.riot = riot
+        self.matches = matches
+        self.mastery = mastery
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._players: Dict[str, Tuple[float, asyncio.Task]] = {}
+        self._sessions: "OrderedDict[str, Dict[str, List[str]]]" = OrderedDict()
+        self.stats = {"fetched": 0, "failed": 0, "ready": 0, "pending": 0}
+
+    @classmethod
+    def from_settings(cls) -> "PlayerPoolCache":
+        return cls(
+            matches=settings.PLAYER_PREFETCH_MATCHES,
+            mastery=settings.PLAYER_PREFETCH_MASTERY,
+            ttl=settings.PLAYER_POOL_TTL,
+            max_sessions=settings.SESSION_HOT_MAX,
+        )
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of pool reads that found the fetch already finished"""
+        total = self.stats["ready"] + self.stats["pending"]
+        return self.stats["ready"] / total if total else 0.0
+
+    async def _fetch(self, player: str) -> PlayerPool:
+        riot = self.riot or RiotService()
+        priority = Priority.INTERACTIVE
+        account = await riot.get_account_by_riot_id(*split_riot_id(player), priority=priority)
+        puuid = account["puuid"]
+        masteries, match_ids = await asyncio.gather(
+            riot.get_top_masteries(puuid, self.mastery, priority=priority),
+            riot.get_match_ids(
+                puuid, count=self.matches, queue=RANKED_SOLO_QUEUE, priority=priority
+            ),
+        )
+        matches = await asyncio.gather(
+            *(riot.get_match(match_id, priority=priority) for match_id in match_ids),
+            return_exceptions=True,
+        )
+        recent: Counter = Counter()
+        for payload in matches:
+            if isinstance(payload, Exception):
+                continue
+            for participant in payload["info"]["participants"]:
+                if participant.get("puuid") == puuid:
+                    recent[int(participant["championId"])] += 1
+        return PlayerPool(
+            player=player,
+            puuid=puuid,
+            mastery={int(m["championId"]): int(m.get("championPoints", 0)) for m in masteries},
+            recent=dict(recent),
+        )
+
+    def _forget(self, player: str, task: asyncio.Task) -> None:
+        # An expired entry may already have been replaced by a newer fetch; keep that one
+        if self._players.get(player, (None, None))[1] is task:
+            del self._players[player]
+
+    def _done(self, player: str, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._forget(player, task)
+            return
+        error = task.exception()
+        if error is None:
+            self.stats["fetched"] += 1
+            return
+        self.stats["failed"] += 1
+        # Forget the failure so the next session retries
+        self._forget(player, task)
+        logger.warning(f"Player pool prefetch failed for {player}: {error}")
+
+    def _task(self, player: str) -> asyncio.Task:
+        entry = self._players.get(player)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        task = asyncio.create_task(self._fetch(player))
+        task.add_done_callback(lambda t: self._done(player, t))
+        self._players[player] = (time.monotonic() + self.ttl, task)
+        return task
+
+    def prefetch(self, session_id: str, blue_players: Sequence[str], red_players: Sequence[str]) -> int:
+        """Start (or join) fetches for every named player; returns how many were named"""
+        teams = {
+            Team.BLUE.value: [p for p in blue_players if p and p.strip()],
+            Team.RED.value: [p for p in red_players if p and p.strip()],
+        }
+        for players in teams.values():
+            for player in players:
+                self._task(player)
+        self._sessions[session_id] = teams
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        self._expire()
+        return sum(len(players) for players in teams.values())
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for player in [p for p, (expires, task) in self._players.items() if expires < now and task.done()]:
+            del self._players[player]
+
+    def ready(self, session_id: str, team: str) -> List[PlayerPool]:
+        """Pools of ``team``'s players that have already arrived; never waits"""
+        pools: List[PlayerPool] = []
+        pending = 0
+        for player in self._sessions.get(session_id, {}).get(team, []):
+            entry = self._players.get(player)
+            if entry is None or not entry[1].done():
+                pending += 1
+                continue
+            task = entry[1]
+            if not task.cancelled() and task.exception() is None:
+                pools.append(task.result())
+        self.stats["ready"] += len(pools)
+        self.stats["pending"] += pending
+        count_cache("draft.player_pools", True, len(pools))
+        count_cache("draft.player_pools", False, pending)
+        return pools
+
+    def drop(self, session_id: str) -> None:
+        """Forget a finished session; shared player fetches stay until their TTL"""
+        self._sessions.pop(session_id, None)
+
+
+def apply_player_pools(
+    suggestions: List[DraftSuggestion],
+    allies: List[PlayerPool],
+    enemies: List[PlayerPool],
+    bonus: float,
+) -> List[DraftSuggestion]:
+    """Boost picks from our players' pools and bans from theirs, re-ranked
+
+    Suggestions may be shared through the transposition cache, so adjusted
+    ones are copies.
+    """
+    if not allies and not enemies:
+        return suggestions
+    adjusted = []
+    for suggestion in suggestions:
+        is_ban = suggestion.action_type == ActionType.BAN.value
+        pools = enemies if is_ban else allies
+        owners = [pool.player for pool in pools if suggestion.champion_id in pool]
+        if not owners:
+            adjusted.append(suggestion)
+            continue
+        reason = (
+            f"Denies {', '.join(owners)}'s champion pool" if is_ban
+            else f"In {', '.join(owners)}'s champion pool"
+        )
+        adjusted.append(suggestion.model_copy(update={
+            "priority_score": min(100.0, suggestion.priority_score + bonus),
+            "reasoning": suggestion.reasoning + [reason],
+        }))
+    adjusted.sort(key=lambda s: s.priority_score, reverse=True)
+    return adjusted
+
+
+player_pools = PlayerPoolCache.from_settings()
+CACHE_HIT_RATIO.add(lambda: {"player_pools": player_pools.hit_ratio})
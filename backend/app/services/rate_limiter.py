@@ -0,0 +1,376 @@
+import asyncio
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.metrics import observe_stage
+
+logger = logging.getLogger(__name__)
+
+# "20:1,100:120" -> [(20, 1.0), (100, 120.0)]
+Limits = List[Tuple[int, float]]
+
+
+def parse_limits(header: Optional[str]) -> Limits:
+    """Parse a Riot ``X-*-Rate-Limit`` / ``X-*-Rate-Limit-Count`` header"""
+    limits = []
+    for part in (header or "").split(","):
+        if ":" in part:
+            count, window = part.split(":", 1)
+            limits.append((int(count), float(window)))
+    return limits
+
+
+class TokenBucket:
+    """Bucket of ``capacity`` tokens refilled in full every ``window`` seconds
+
+    Riot counts requests in fixed windows that start with the first request,
+    so the bucket refills all at once at the window boundary rather than
+    continuously; a continuous refill would overshoot the server's count.
+    """
+
+    def __init__(self, capacity: int, window: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        self.tokens = capacity
+        self.window_start: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        if self.window_start is not None and now - self.window_start >= self.window:
+            self.tokens = self.capacity
+            self.window_start = None
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Seconds until one token is available"""
+        now = self.clock() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1 or self.window_start is None:
+            return 0.0
+        return self.window_start + self.window - now
+
+    def consume(self, now: Optional[float] = None) -> None:
+        now = self.clock() if now is None else now
+        self._refill(now)
+        if self.window_start is None:
+            self.window_start = now
+        self.tokens -= 1
+
+    def sync(self, used: int, now: Optional[float] = None) -> None:
+        """Align with the server's count for the current window"""
+        now = self.clock() if now is None else now
+        self._refill(now)
+        if self.window_start is None and used:
+            self.window_start = now
+        self.tokens = min(self.tokens, self.capacity - used)
+
+    @property
+    def headroom(self) -> float:
+        """Fraction of the bucket currently available"""
+        self._refill(self.clock())
+        return max(self.tokens, 0) / self.capacity
+
+
+class LimitLayer:
+    """All buckets for one scope (app, method or region), e.g. 20/1s and 100/120s"""
+
+    def __init__(self, limits: Limits, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.buckets = [TokenBucket(count, window, clock) for count, window in limits]
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        wait = max((b.wait_time(now) for b in self.buckets), default=0.0)
+        return max(wait, self.blocked_until - now)
+
+    def consume(self, now: float) -> None:
+        for bucket in self.buckets:
+            bucket.consume(now)
+
+    def update(self, limits: Limits, counts: Limits) -> None:
+        """Adopt the limits the server reports, keeping state for unchanged windows"""
+        if limits and [(b.capacity, b.window) for b in self.buckets] != limits:
+            old = {(b.capacity, b.window): b for b in self.buckets}
+            self.buckets = [old.get(l) or TokenBucket(l[0], l[1], self.clock) for l in limits]
+        used = {window: count for count, window in counts}
+        for bucket in self.buckets:
+            if bucket.window in used:
+                bucket.sync(used[bucket.window])
+
+    def block(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    @property
+    def headroom(self) -> float:
+        return min((b.headroom for b in self.buckets), default=1.0)
+
+
+class RateLimiter:
+    """Layered limits: application-wide, per region and per API method
+
+    A request may go out only when every layer it touches has a token.
+    Method limits start permissive and are learned from response headers.
+    """
+
+    def __init__(
+        self,
+        app_limits: Limits,
+        region_limits: Optional[Limits] = None,
+        method_limits: Optional[Dict[str, Limits]] = None,
+        default_method_limits: Optional[Limits] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.clock = clock
+        self.app_limits = app_limits
+        self.region_limits = region_limits or app_limits
+        self.method_limits = method_limits or {}
+        self.default_method_limits = default_method_limits or []
+        self.app = LimitLayer(app_limits, clock)
+        self.regions: Dict[str, LimitLayer] = {}
+        self.methods: Dict[Tuple[str, str], LimitLayer] = {}
+
+    def region(self, region: str) -> LimitLayer:
+        if region not in self.regions:
+            self.regions[region] = LimitLayer(self.region_limits, self.clock)
+        return self.regions[region]
+
+    def method(self, region: str, method: str) -> LimitLayer:
+        key = (region, method)
+        if key not in self.methods:
+            limits = self.method_limits.get(method, self.default_method_limits)
+            self.methods[key] = LimitLayer(limits, self.clock)
+        return self.methods[key]
+
+    def layers(self, region: str, method: str) -> Sequence[LimitLayer]:
+        return (self.app, self.region(region), self.method(region, method))
+
+    def wait_time(self, region: str, method: str) -> float:
+        now = self.clock()
+        return max(layer.wait_time(now) for layer in self.layers(region, method))
+
+    def acquire_nowait(self, region: str, method: str) -> float:
+        """Consume a token from every layer if all have one, else return the wait"""
+        now = self.clock()
+        layers = self.layers(region, method)
+        wait = max(layer.wait_time(now) for layer in layers)
+        if wait <= 0:
+            for layer in layers:
+                layer.consume(now)
+        return wait
+
+    def update_from_headers(self, region: str, method: str, headers: Any) -> None:
+        app_limits = parse_limits(headers.get("X-App-Rate-Limit"))
+        app_counts = parse_limits(headers.get("X-App-Rate-Limit-Count"))
+        if app_limits or app_counts:
+            # Riot's application limit is enforced per region
+            self.region(region).update(app_limits, app_counts)
+        method_limits = parse_limits(headers.get("X-Method-Rate-Limit"))
+        method_counts = parse_limits(headers.get("X-Method-Rate-Limit-Count"))
+        if method_limits or method_counts:
+            self.method(region, method).update(method_limits, method_counts)
+
+    def block(self, region: str, method: str, limit_type: Optional[str], seconds: float) -> None:
+        """Honor a 429 Retry-After on the layer that tripped"""
+        if limit_type == "application":
+            self.region(region).block(seconds)
+        else:
+            # Method, service-level or unknown: back off only this method
+            self.method(region, method).block(seconds)
+
+    def headroom(self) -> Dict[str, float]:
+        headroom = {"app": self.app.headroom}
+        for region, layer in self.regions.items():
+            headroom[f"region:{region}"] = layer.headroom
+        for (region, method), layer in self.methods.items():
+            if layer.buckets:
+                headroom[f"method:{region}:{method}"] = layer.headroom
+        return headroom
+
+
+class RetryAfter(Exception):
+    """Raised by a send callable to have the scheduler back off and retry
+
+    ``seconds`` comes from a Retry-After header; without one the scheduler
+    backs off exponentially with jitter.
+    """
+
+    def __init__(
+        self, seconds: Optional[float] = None, limit_type: Optional[str] = None, reason: str = ""
+    ):
+        super().__init__(reason or "rate limited")
+        self.seconds = seconds
+        self.limit_type = limit_type
+
+
+class ScheduledRequest:
+    """A queued call waiting for rate-limit tokens"""
+
+    def __init__(
+        self,
+        priority: int,
+        region: str,
+        method: str,
+        send: Callable[[], Awaitable[Any]],
+        future: asyncio.Future,
+    ):
+        self.priority = priority
+        self.region = region
+        self.method = method
+        self.send = send
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.attempts = 0
+
+
+class RequestScheduler:
+    """Priority scheduler dispatching requests as soon as their buckets allow
+
+    Lower priority values go first. The dispatcher always sends the most
+    urgent request whose layers have tokens, so a throttled method or region
+    does not hold up the rest of the queue. Sends run concurrently; only the
+    token accounting is serialized. A send raising ``RetryAfter`` blocks the
+    layer that tripped and is requeued at its original priority.
+
+    Requests wait in one FIFO per (priority, region, method). Every request
+    in a FIFO needs the same tokens, so a dispatch only looks at the heads:
+    per priority, the oldest head whose layers have tokens goes out.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # priority -> (region, method) -> FIFO of (sequence, request)
+        self._queues: Dict[int, Dict[Tuple[str, str], Deque[Tuple[int, ScheduledRequest]]]] = {}
+        self._size = 0
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self.stats = {"dispatched": 0, "retried": 0, "queue_wait_total": 0.0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        for queues in self._queues.values():
+            for queue in queues.values():
+                for _, request in queue:
+                    if not request.future.done():
+                        request.future.cancel()
+        self._queues.clear()
+        self._size = 0
+
+    def submit(
+        self, priority: int, region: str, method: str, send: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        """Queue ``send``; the returned future resolves with its result"""
+        future = asyncio.get_running_loop().create_future()
+        self._push(ScheduledRequest(priority, region, method, send, future))
+        return future
+
+    def _push(self, request: ScheduledRequest) -> None:
+        queues = self._queues.setdefault(request.priority, {})
+        queue = queues.setdefault((request.region, request.method), deque())
+        queue.append((next(self._sequence), request))
+        self._size += 1
+        self.start()
+        self._wakeup.set()
+
+    def _heads(self, priority: int) -> List[Tuple[int, Tuple[str, str]]]:
+        """Oldest live request per (region, method) at ``priority``, oldest first"""
+        queues = self._queues[priority]
+        heads = []
+        for key in list(queues):
+            queue = queues[key]
+            while queue and queue[0][1].future.done():
+                queue.popleft()
+                self._size -= 1
+            if queue:
+                heads.append((queue[0][0], key))
+            else:
+                del queues[key]
+        if not queues:
+            del self._queues[priority]
+        heads.sort()
+        return heads
+
+    def _next_ready(self) -> Tuple[Optional[ScheduledRequest], float]:
+        """Take the most urgent request with tokens, else report the shortest wait"""
+        waits: Dict[Tuple[str, str], float] = {}
+        for priority in sorted(self._queues):
+            for _, key in self._heads(priority):
+                if key not in waits:
+                    waits[key] = self.limiter.acquire_nowait(*key)
+                if waits[key] <= 0:
+                    _, request = self._queues[priority][key].popleft()
+                    self._size -= 1
+                    return request, 0.0
+        return None, min(waits.values(), default=float("inf"))
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            request, wait = self._next_ready()
+            if request is not None:
+                waited = time.monotonic() - request.enqueued
+                self.stats["dispatched"] += 1
+                self.stats["queue_wait_total"] += waited
+                observe_stage(f"riot.{request.method}", "queue_wait", waited)
+                task = asyncio.create_task(self._send(request))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+                continue
+            timeout = None if wait == float("inf") else wait
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send(self, request: ScheduledRequest) -> None:
+        request.attempts += 1
+        try:
+            result = await request.send()
+        except RetryAfter as e:
+            delay = e.seconds
+            if delay is None:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (request.attempts - 1))
+                delay *= random.uniform(0.5, 1.0)
+            self.limiter.block(request.region, request.method, e.limit_type, delay)
+            if request.attempts < self.max_attempts and not request.future.done():
+                self.stats["retried"] += 1
+                logger.warning(
+                    f"Retrying {request.method} ({request.region}) in {delay:.2f}s: {e}"
+                )
+                self._push(request)
+            elif not request.future.done():
+                request.future.set_exception(e)
+            return
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+            return
+        if not request.future.done():
+            request.future.set_result(result)
@@ -0,0 +1,274 @@
+import logging
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote, urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import RIOT_QUEUE_DEPTH, RIOT_RATE_LIMIT_HEADROOM, stage
+from app.models.champion import Champion, DamageType, Role
+from app.services.champion_catalog import champion_catalog
+from app.services.rate_limiter import RateLimiter, RequestScheduler, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+# Routing value of RIOT_BASE_URL, e.g. "americas"
+DEFAULT_REGION = urlparse(settings.RIOT_BASE_URL).hostname.split(".")[0]
+
+# Data Dragon has no role data; derive likely roles from champion tags
+TAG_ROLES = {
+    "Marksman": [Role.ADC],
+    "Support": [Role.SUPPORT],
+    "Mage": [Role.MID],
+    "Assassin": [Role.MID, Role.JUNGLE],
+    "Fighter": [Role.TOP, Role.JUNGLE],
+    "Tank": [Role.TOP, Role.SUPPORT],
+}
+
+
+class Priority(IntEnum):
+    """Scheduling priority, lower goes first"""
+    LIVE_DRAFT = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+class RiotAPIError(Exception):
+    """Non-retryable Riot API failure"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Riot API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+class RiotService:
+    """Riot Games API access through one pooled client and a shared scheduler
+
+    Every Riot API call is queued on a priority scheduler that enforces the
+    application limit (RIOT_BURST_RATE_LIMIT/s and RIOT_RATE_LIMIT per
+    RIOT_RATE_LIMIT_WINDOW), the per-region app limit and per-method limits
+    learned from response headers. 429s block the layer that tripped for
+    Retry-After seconds and are retried transparently.
+    """
+
+    _client: Optional[httpx.AsyncClient] = None
+    _limiter: Optional[RateLimiter] = None
+    _scheduler: Optional[RequestScheduler] = None
+
+    @classmethod
+    async def initialize(cls, client: Optional[httpx.AsyncClient] = None):
+        """Create the pooled HTTP client and request scheduler"""
+        if cls._client is not None:
+            return
+        cls._client = client or cls._create_client()
+        cls._limiter = RateLimiter(
+            app_limits=[
+                (settings.RIOT_BURST_RATE_LIMIT, 1.0),
+                (settings.RIOT_RATE_LIMIT, float(settings.RIOT_RATE_LIMIT_WINDOW)),
+            ]
+        )
+        cls._scheduler = RequestScheduler(cls._limiter, max_attempts=settings.RIOT_MAX_ATTEMPTS)
+        logger.info("Riot API client initialized")
+
+    @classmethod
+    async def cleanup(cls):
+        if cls._scheduler is not None:
+            await cls._scheduler.stop()
+        if cls._client is not None:
+            await cls._client.aclose()
+        cls._client = cls._limiter = cls._scheduler = None
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.RIOT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.RIOT_MAX_CONNECTIONS,
+        )
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        return httpx.AsyncClient(
+            http2=http2, limits=limits, timeout=settings.RIOT_REQUEST_TIMEOUT
+        )
+
+    @classmethod
+    async def http_client(cls) -> httpx.AsyncClient:
+        """The pooled client, for unscheduled calls such as Data Dragon"""
+        if cls._client is None:
+            await cls.initialize()
+        return cls._client
+
+    @classmethod
+    def rate_limit_headroom(cls) -> Dict[str, float]:
+        return cls._limiter.headroom() if cls._limiter else {}
+
+    @classmethod
+    def queue_depth(cls) -> int:
+        return len(cls._scheduler) if cls._scheduler else 0
+
+    async def request(
+        self,
+        path: str,
+        method: str,
+        region: str = DEFAULT_REGION,
+        priority: Priority = Priority.BACKGROUND,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """Rate-limited GET against the Riot API, returns the decoded JSON
+
+        ``method`` names the API method for per-method limits, e.g.
+        ``"match-v5.getMatch"``; ``region`` is a routing value or platform.
+        """
+        if self._scheduler is None:
+            await RiotService.initialize()
+        client, limiter = RiotService._client, RiotService._limiter
+        url = settings.RIOT_REGION_URL.format(region=region) + path
+
+        operation = f"riot.{method}"
+
+        async def send():
+            try:
+                with stage(operation, "http"):
+                    response = await client.get(
+                        url, params=params, headers={"X-Riot-Token": settings.RIOT_API_KEY}
+                    )
+            except httpx.TransportError as e:
+                # Timeouts, resets and refused connections: back off like a 5xx
+                raise RetryAfter(None, "service", f"{type(e).__name__} from {method}") from e
+            limiter.update_from_headers(region, method, response.headers)
+            if response.status_code == 429:
+                retry_after = response.headers.get("Retry-After")
+                raise RetryAfter(
+                    float(retry_after) if retry_after else None,
+                    response.headers.get("X-Rate-Limit-Type"),
+                    f"429 from {method}",
+                )
+            if response.status_code >= 500:
+                raise RetryAfter(None, "service", f"{response.status_code} from {method}")
+            if response.status_code >= 400:
+                raise RiotAPIError(response.status_code, response.text[:200])
+            with stage(operation, "decode"):
+                return response.json()
+
+        return await RiotService._scheduler.submit(priority, region, method, send)
+
+    async def update_champion_data(self) -> List[Champion]:
+        """Refresh the champion catalog from Data Dragon"""
+        if self._client is None:
+            await RiotService.initialize()
+        client = RiotService._client
+        versions = await client.get(f"{settings.DDRAGON_BASE_URL}/api/versions.json")
+        versions.raise_for_status()
+        version = versions.json()[0]
+        response = await client.get(
+            f"{settings.DDRAGON_BASE_URL}/cdn/{version}/data/en_US/champion.json"
+        )
+        response.raise_for_status()
+        champions = [
+            self._parse_champion(data, version) for data in response.json()["data"].values()
+        ]
+        patch = ".".join(version.split(".")[:2])
+        champion_catalog.load(champions, patch=patch)
+        return champions
+
+    @staticmethod
+    def _parse_champion(data: Dict[str, Any], version: str) -> Champion:
+        info = data.get("info", {})
+        attack, magic = info.get("attack", 0), info.get("magic", 0)
+        if attack >= magic + 3:
+            damage_type = DamageType.PHYSICAL
+        elif magic >= attack + 3:
+            damage_type = DamageType.MAGICAL
+        else:
+            damage_type = DamageType.MIXED
+        roles: List[Role] = []
+        for tag in data.get("tags", []):
+            roles.extend(role for role in TAG_ROLES.get(tag, []) if role not in roles)
+        return Champion(
+            id=int(data["key"]),
+            key=data["id"],
+            name=data["name"],
+            title=data.get("title", ""),
+            roles=roles or [Role.MID],
+            difficulty=info.get("difficulty", 5),
+            damage_type=damage_type,
+            attack_range=int(data.get("stats", {}).get("attackrange", 0)),
+            tags=data.get("tags", []),
+            icon_url=(
+                f"{settings.DDRAGON_BASE_URL}/cdn/{version}/img/champion/{data['image']['full']}"
+            ),
+            splash_url=f"{settings.DDRAGON_BASE_URL}/cdn/img/champion/splash/{data['id']}_0.jpg",
+        )
+
+    async def get_account_by_riot_id(
+        self,
+        game_name: str,
+        tag_line: str,
+        region: str = DEFAULT_REGION,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """Account-v1 account (``puuid``, ``gameName``, ``tagLine``) for a Riot ID"""
+        return await self.request(
+            f"/riot/account/v1/accounts/by-riot-id/{quote(game_name)}/{quote(tag_line)}",
+            "account-v1.getByRiotId",
+            region=region,
+            priority=priority,
+        )
+
+    async def get_top_masteries(
+        self,
+        puuid: str,
+        count: int = 10,
+        platform: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> List[Dict[str, Any]]:
+        """Champion-mastery-v4 top entries (``championId``, ``championPoints``) for a player"""
+        return await self.request(
+            f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/top",
+            "champion-mastery-v4.getTopChampionMasteriesByPUUID",
+            region=platform or settings.RIOT_PLATFORM,
+            priority=priority,
+            params={"count": count},
+        )
+
+    async def get_match_ids(
+        self,
+        puuid: str,
+        start: int = 0,
+        count: int = 20,
+        queue: Optional[int] = None,
+        region: str = DEFAULT_REGION,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> List[str]:
+        """Match-v5 match IDs for a player, newest first"""
+        params: Dict[str, Any] = {"start": start, "count": count}
+        if queue is not None:
+            params["queue"] = queue
+        return await self.request(
+            f"/lol/match/v5/matches/by-puuid/{puuid}/ids",
+            "match-v5.getMatchIdsByPUUID",
+            region=region,
+            priority=priority,
+            params=params,
+        )
+
+    async def get_match(
+        self,
+        match_id: str,
+        region: str = DEFAULT_REGION,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> Dict[str, Any]:
+        """Full Match-v5 match payload"""
+        return await self.request(
+            f"/lol/match/v5/matches/{match_id}",
+            "match-v5.getMatch",
+            region=region,
+            priority=priority,
+        )
+
+
+RIOT_RATE_LIMIT_HEADROOM.add(RiotService.rate_limit_headroom)
+RIOT_QUEUE_DEPTH.set_function(RiotService.queue_depth)
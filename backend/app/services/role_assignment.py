@@ -0,0 +1,167 @@
+"""Optimal champion-to-role assignment by bitmask DP over the five roles
+
+A team's champions take distinct roles. With per-champion role
+probabilities ``share[c, r]`` (from ``ChampionStatsTable.role_share``),
+the likeliest assignment maximizes the sum of ``log share``. Instead of
+trying every permutation, a DP walks the team slot by slot over the 32
+subsets of roles: ``best[mask]`` is the best score with the champions so
+far placed exactly on the roles in ``mask``. Every step is a gather over
+a fixed predecessor table, restricted to the masks with as many roles as
+champions placed, and vectorized over any number of teams.
+
+From one DP per team:
+
+- ``fit`` scores every candidate champion against the team at once:
+  ``gain[r]`` (best team score leaving role ``r`` free) plus the
+  candidate's ``log share`` for ``r``, maximized over ``r``. This is
+  exact, not a greedy approximation, and costs ``O(candidates x 5)``.
+- ``assign`` backtracks the winning assignment for one team.
+- ``expected_roles`` runs the same DP in sum-product form to get each
+  champion's marginal role probabilities over all valid assignments,
+  e.g. the enemy team's expected role distribution.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.services.matchup_store import ROLES
+
+N_ROLES = len(ROLES)
+N_MASKS = 1 << N_ROLES
+FULL_MASK = N_MASKS - 1
+# Off-role probability floor so any champion can still be placed anywhere
+SHARE_FLOOR = 1e-3
+
+# PRED[mask, r]: mask without role r, or the sentinel column N_MASKS when r is not in mask
+PRED = np.array(
+    [[mask ^ (1 << r) if mask >> r & 1 else N_MASKS for r in range(N_ROLES)]
+     for mask in range(N_MASKS)],
+    dtype=np.intp,
+)
+# FREE[mask, r]: role r is not in mask
+FREE = np.array([[not mask >> r & 1 for r in range(N_ROLES)] for mask in range(N_MASKS)])
+# FREE_MASKS[r]: the 16 masks leaving role r free
+FREE_MASKS = np.array([np.flatnonzero(FREE[:, r]) for r in range(N_ROLES)])
+POPCOUNT = np.array([bin(mask).count("1") for mask in range(N_MASKS)])
+# Masks reachable after placing k champions, and their predecessor rows
+LAYERS = [np.flatnonzero(POPCOUNT == k) for k in range(N_ROLES + 1)]
+LAYER_PRED = [PRED[layer] for layer in LAYERS]
+
+
+def _max_step(best: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Place one more champion: (N, 32) scores, (N, 5) log weights -> scores, chosen roles"""
+    padded = np.concatenate([best, np.full((len(best), 1), -np.inf)], axis=1)
+    options = padded[:, PRED] + weights[:, None, :]
+    return options.max(axis=2), options.argmax(axis=2)
+
+
+def _sum_step(total: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    padded = np.concatenate([total, np.zeros((len(total), 1))], axis=1)
+    return (padded[:, PRED] * weights[:, None, :]).sum(axis=2)
+
+
+class RoleAssigner:
+    """Role assignment for teams drawn from one champion index
+
+    ``share`` is the ``(champions, roles)`` role probability matrix the
+    engines already hold; teams are given as ``(N, 5)`` arrays of
+    positions into it with -1 for empty slots.
+    """
+
+    def __init__(self, share: np.ndarray):
+        share = np.maximum(np.asarray(share, dtype=np.float64), SHARE_FLOOR)
+        self.share = share / share.sum(axis=1, keepdims=True)
+        self.log_share = np.log(self.share)
+        self.log_share_t = np.ascontiguousarray(self.log_share.T, dtype=np.float32)
+
+    def _weights(self, picks: np.ndarray, slot: int, log: bool) -> Tuple[np.ndarray, np.ndarray]:
+        valid = picks[:, slot] >= 0
+        table = self.log_share if log else self.share
+        return valid, table[np.where(valid, picks[:, slot], 0)]
+
+    def team_scores(self, picks: np.ndarray) -> np.ndarray:
+        """Best log-likelihood with the whole team placed exactly on each role mask: (N, 32)
+
+        Masks that do not match the team size are -inf. Only the layer of
+        masks reachable after each pick is computed.
+        """
+        picks = np.atleast_2d(picks)
+        # Assignment ignores pick order: move empty slots last so layer k = first k picks
+        picks = -np.sort(-picks, axis=1)
+        size = len(picks)
+        best = np.full((size, N_MASKS + 1), -np.inf)
+        best[:, 0] = 0.0
+        for slot in range(min(picks.shape[1], N_ROLES)):
+            valid, weights = self._weights(picks, slot, log=True)
+            layer = LAYERS[slot + 1]
+            placed = (best[:, LAYER_PRED[slot + 1]] + weights[:, None, :]).max(axis=2)
+            best[:, layer] = np.where(valid[:, None], placed, -np.inf)
+        team_size = (picks >= 0).sum(axis=1)
+        return np.where(POPCOUNT[None, :] == team_size[:, None], best[:, :N_MASKS], -np.inf)
+
+    def open_gain(self, picks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``(gain, best)``: best team score leaving each role free (N, 5), and overall (N,)"""
+        scores = self.team_scores(picks)
+        gain = scores[:, FREE_MASKS].max(axis=2)
+        return gain, scores.max(axis=1)
+
+    def fit(self, picks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """How well every champion joins each team, and the role it would take
+
+        Returns ``(fit, role)``, both ``(N, champions)``: ``fit`` is the
+        likelihood of the best assignment with the champion added relative
+        to the team's best assignment alone, in [0, 1] (0 for a full team).
+        """
+        gain, best = self.open_gain(picks)
+        gain = (gain - best[:, None]).astype(np.float32)
+        top = gain[:, :1] + self.log_share_t[0]
+        role = np.zeros(top.shape, dtype=np.int8)
+        for r in range(1, N_ROLES):
+            value = gain[:, r:r + 1] + self.log_share_t[r]
+            better = value > top
+            np.copyto(top, value, where=better)
+            np.copyto(role, r, where=better)
+        return np.exp(top), role
+
+    def assign(self, positions: Sequence[int]) -> List[int]:
+        """Likeliest role index for each champion of one team (at most five)"""
+        positions = list(positions)[:N_ROLES]
+        if not positions:
+            return []
+        best = np.full((1, N_MASKS), -np.inf)
+        best[0, 0] = 0.0
+        choices = []
+        for pos in positions:
+            best, chosen = _max_step(best, self.log_share[[pos]])
+            choices.append(chosen[0])
+        mask = int(best[0].argmax())
+        roles = []
+        for chosen in reversed(choices):
+            role = int(chosen[mask])
+            roles.append(role)
+            mask ^= 1 << role
+        return roles[::-1]
+
+    def expected_roles(self, picks: np.ndarray) -> np.ndarray:
+        """Marginal role probabilities of each slot over all valid assignments: (N, 5, roles)
+
+        Empty slots are all zeros. Summing over slots gives the chance each
+        role is taken by the team.
+        """
+        picks = np.atleast_2d(picks)
+        size, slots = picks.shape
+        weights = [self._weights(picks, slot, log=False) for slot in range(slots)]
+        marginals = np.zeros((size, slots, N_ROLES))
+        for skip in range(slots):
+            # Assignments of every other champion, by the roles they occupy
+            total = np.zeros((size, N_MASKS))
+            total[:, 0] = 1.0
+            for slot, (valid, w) in enumerate(weights):
+                if slot != skip:
+                    total = np.where(valid[:, None], _sum_step(total, w), total)
+            others = total[:, FREE_MASKS].sum(axis=2)
+            valid, w = weights[skip]
+            joint = w * others * valid[:, None]
+            norm = joint.sum(axis=1, keepdims=True)
+            marginals[:, skip] = np.divide(joint, norm, out=np.zeros_like(joint), where=norm > 0)
+        return marginals
@@ -0,0 +1,341 @@
+"""Pre-aggregated analytics cubes over (patch, rank_tier, role, champion)
+
+Every stats table is reduced to additive measures per (champion, role
+column) — games, wins, bans — plus the slice's match count, so any
+dimension can be rolled up by summing and rates are derived at the end:
+``win_rate = wins / games``, ``pick_rate = games / matches``,
+``ban_rate = bans / matches``. Per rank tier (and for ``ALL_RANKS``, the
+sum over tiers) the slabs are stacked into a cube of shape
+``(patches, champions, roles + 1)``, patches in version order, so a
+trend is one fancy-indexed read instead of a scan over stats tables.
+
+``refresh`` follows the stats store the way the tier list engine does:
+only tables whose object or ``last_updated`` changed are reduced again,
+and only the cubes of their rank tier and ``ALL_RANKS`` are restacked.
+
+``export_chunks`` walks a cube in fixed-size column chunks for the
+streaming NDJSON / Arrow export; ``ndjson_stream`` and ``arrow_stream``
+encode them without building the whole body in memory.
+"""
+import asyncio
+import io
+import itertools
+import json
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.core.lazy import lazy_import
+from app.models.champion import ChampionTrend, MatchupTrend, MatchupTrendPoint, TrendPoint
+from app.services.matchup_store import ROLES, ChampionIndex, matchup_store
+from app.services.stats_store import ALL_ROLES, ChampionStatsTable, stats_store
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Arrow export only; imported on its first use
+pyarrow = lazy_import("pyarrow")
+pyarrow_ipc = lazy_import("pyarrow.ipc")
+
+logger = logging.getLogger(__name__)
+
+ALL_RANKS = "ALL"
+# Role column labels; the last one is every role together
+ROLE_LABELS = [*ROLES, "all"]
+EXPORT_COLUMNS = ("patch", "rank_tier", "role", "champion_id", "games", "win_rate", "pick_rate", "ban_rate")
+EXPORT_CHUNK_ROWS = 4096
+PARTICIPANTS = 10
+
+
+def patch_order(patch: str) -> Tuple:
+    """Sort key for patch strings, numeric where possible ("14.9" < "14.10")"""
+    return tuple(int(part) if part.isdigit() else part for part in patch.split("."))
+
+
+class Slab(NamedTuple):
+    """One stats table reduced to additive measures, shape (champions, roles + 1)"""
+
+    ids: np.ndarray
+    games: np.ndarray
+    wins: np.ndarray
+    bans: np.ndarray
+    matches: float
+
+
+def reduce_table(table: ChampionStatsTable) -> Slab:
+    games = table.games.astype(np.float64)
+    win_rate = np.nan_to_num(table.metrics["win_rate"].astype(np.float64))
+    pick_rate = table.metrics["pick_rate"].astype(np.float64)
+    ban_rate = table.metrics["ban_rate"].astype(np.float64)
+
+    # Tables built from per-role rows only have no role-less column: sum the roles
+    role_games = games[:, :ALL_ROLES]
+    missing = games[:, ALL_ROLES] == 0
+    games[:, ALL_ROLES] = np.where(missing, role_games.sum(axis=1), games[:, ALL_ROLES])
+    wins = games * win_rate / 100.0
+    wins[:, ALL_ROLES] = np.where(
+        missing, (role_games * win_rate[:, :ALL_ROLES]).sum(axis=1) / 100.0, wins[:, ALL_ROLES]
+    )
+
+    # pick_rate = games / matches * 100 in every cell; take the slice's consensus
+    sampled = (games > 0) & (pick_rate > 0)
+    if sampled.any():
+        matches = float(np.median(games[sampled] * 100.0 / pick_rate[sampled]))
+    else:
+        matches = float(games[:, ALL_ROLES].sum()) / PARTICIPANTS
+    # Bans are per champion, repeated in every role column
+    with np.errstate(all="ignore"):
+        champion_bans = np.nan_to_num(np.nanmax(ban_rate, axis=1)) * matches / 100.0
+    bans = np.zeros_like(games)
+    bans[:] = champion_bans[:, None]
+    return Slab(table.index.ids, games, wins, bans, matches)
+
+
+class Cube:
+    """Stacked measures for one rank tier, shape (patches, champions, roles + 1)"""
+
+    def __init__(self, rank_tier: str, slabs: Dict[str, List[Slab]]):
+        self.rank_tier = rank_tier
+        self.patches = sorted(slabs, key=patch_order)
+        ids = [slab.ids for group in slabs.values() for slab in group]
+        self.index = ChampionIndex(np.concatenate(ids) if ids else [])
+        shape = (len(self.patches), len(self.index), len(ROLE_LABELS))
+        self.games = np.zeros(shape)
+        self.wins = np.zeros(shape)
+        self.bans = np.zeros(shape)
+        self.matches = np.zeros(len(self.patches))
+        for p, patch in enumerate(self.patches):
+            for slab in slabs[patch]:
+                rows = self.index.positions(slab.ids)
+                self.games[p, rows] += slab.games
+                self.wins[p, rows] += slab.wins
+                self.bans[p, rows] += slab.bans
+                self.matches[p] += slab.matches
+
+    def rates(self, p: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> Dict[str, np.ndarray]:
+        """Derived rates for cells ``(p, rows, cols)``, NaN where undefined"""
+        games = self.games[p, rows, cols]
+        matches = self.matches[p]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "games": games,
+                "win_rate": np.where(games > 0, self.wins[p, rows, cols] / games * 100.0, np.nan),
+                "pick_rate": np.where(matches > 0, games / matches * 100.0, np.nan),
+                "ban_rate": np.where(matches > 0, self.bans[p, rows, cols] / matches * 100.0, np.nan),
+            }
+
+    def trend(self, champion_id: int, role: Optional[str] = None) -> Optional[ChampionTrend]:
+        if champion_id not in self.index:
+            return None
+        row = self.index.position(champion_id)
+        col = ROLE_LABELS.index(role or "all")
+        p = np.flatnonzero(self.games[:, row, col] > 0)
+        values = self.rates(p, np.full(p.size, row), np.full(p.size, col))
+        points = [
+            TrendPoint(
+                patch=self.patches[i],
+                games=int(values["games"][k]),
+                win_rate=float(values["win_rate"][k]),
+                pick_rate=float(np.nan_to_num(values["pick_rate"][k])),
+                ban_rate=float(np.nan_to_num(values["ban_rate"][k])),
+            )
+            for k, i in enumerate(p)
+        ]
+        return ChampionTrend(champion_id=champion_id, rank_tier=self.rank_tier, role=role, points=points)
+
+    def top_champions(self, role: Optional[str], limit: int, patches: int) -> List[int]:
+        """Champions with the highest pick + ban presence over the last ``patches`` patches
+
+        Bans are per champion, not per role, so only champions with games in
+        ``role`` are ranked; a banned champion is not placed in roles it never plays.
+        """
+        col = ROLE_LABELS.index(role or "all")
+        window = slice(max(len(self.patches) - patches, 0), None)
+        games = self.games[window, :, col].sum(axis=0)
+        presence = np.where(games > 0, games + self.bans[window, :, col].sum(axis=0), 0.0)
+        ranked = np.argsort(-presence, kind="stable")[:limit]
+        return [int(self.index.ids[r]) for r in ranked if presence[r] > 0]
+
+    def export_chunks(
+        self,
+        role: Optional[str] = None,
+        patches: Optional[Sequence[str]] = None,
+        champion_ids: Optional[Sequence[int]] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Column chunks of every filled cell; ``role=None`` exports all role columns"""
+        mask = self.games > 0
+        if role is not None:
+            keep = np.zeros(len(ROLE_LABELS), dtype=bool)
+            keep[ROLE_LABELS.index(role)] = True
+            mask &= keep
+        if patches:
+            mask &= np.isin(self.patches, list(patches))[:, None, None]
+        if champion_ids:
+            mask &= np.isin(self.index.ids, list(champion_ids))[None, :, None]
+        p, rows, cols = np.nonzero(mask)
+        patch_labels = np.array(self.patches, dtype=object)
+        role_labels = np.array(ROLE_LABELS, dtype=object)
+        for start in range(0, p.size, chunk_rows):
+            chunk = slice(start, start + chunk_rows)
+            values = self.rates(p[chunk], rows[chunk], cols[chunk])
+            yield {
+                "patch": patch_labels[p[chunk]],
+                "rank_tier": np.full(values["games"].size, self.rank_tier, dtype=object),
+                "role": role_labels[cols[chunk]],
+                "champion_id": self.index.ids[rows[chunk]],
+                "games": values["games"].astype(np.int64),
+                "win_rate": values["win_rate"],
+                "pick_rate": values["pick_rate"],
+                "ban_rate": values["ban_rate"],
+            }
+
+
+def ndjson_stream(chunks: Iterable[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+    """One JSON object per line, one body part per chunk; NaN becomes null"""
+    for chunk in chunks:
+        columns = [
+            np.where(np.isnan(values), None, values).tolist() if values.dtype.kind == "f" else values.tolist()
+            for values in (chunk[name] for name in EXPORT_COLUMNS)
+        ]
+        records = [dict(zip(EXPORT_COLUMNS, row)) for row in zip(*columns)]
+        if orjson is not None:
+            yield b"".join(orjson.dumps(record) + b"\n" for record in records)
+        else:
+            yield "".join(json.dumps(record) + "\n" for record in records).encode()
+
+
+def arrow_stream(chunks: Iterable[Dict[str, np.ndarray]]) -> Iterator[bytes]:
+    """Arrow IPC stream, one record batch per chunk (requires pyarrow)"""
+    schema = pyarrow.schema([
+        ("patch", pyarrow.string()),
+        ("rank_tier", pyarrow.string()),
+        ("role", pyarrow.string()),
+        ("champion_id", pyarrow.int32()),
+        ("games", pyarrow.int64()),
+        ("win_rate", pyarrow.float64()),
+        ("pick_rate", pyarrow.float64()),
+        ("ban_rate", pyarrow.float64()),
+    ])
+    sink = io.BytesIO()
+    writer = pyarrow_ipc.new_stream(sink, schema)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    for chunk in chunks:
+        arrays = [
+            pyarrow.array(chunk[field.name], type=field.type, from_pandas=True) for field in schema
+        ]
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+        yield drain()
+    writer.close()
+    yield drain()
+
+
+def matchup_trend(
+    champion_id: int, opponent_id: int, rank_tier: str, role: Optional[str] = None
+) -> MatchupTrend:
+    """A matchup read from each patch's matrices (one cell per patch, no scan)"""
+    points = []
+    for patch in sorted({key[0] for key in matchup_store.keys()}, key=patch_order):
+        matrices = matchup_store.get(patch, rank_tier, role)
+        if matrices is None or champion_id not in matrices.index or opponent_id not in matrices.index:
+            continue
+        i, j = matrices.index.position(champion_id), matrices.index.position(opponent_id)
+        games = int(matrices.matchup_games[i, j])
+        if games:
+            points.append(MatchupTrendPoint(
+                patch=patch,
+                win_rate=float(matrices.win_rate[i, j]),
+                counter_strength=float(np.nan_to_num(matrices.counter_strength[i, j])),
+                games_analyzed=games,
+            ))
+    return MatchupTrend(
+        champion_id=champion_id, opponent_id=opponent_id, rank_tier=rank_tier, role=role, points=points
+    )
+
+
+class RollupStore:
+    """Cubes kept current with the stats store
+
+    Readers go through ``current``: an identity check per table on the
+    event loop, and only when something changed, ``refresh`` on a worker
+    thread so reducing tables and restacking cubes never blocks the loop.
+    ``version`` moves whenever any cube is rebuilt and keys response caches.
+    """
+
+    def __init__(self):
+        self._slabs: Dict[Tuple[str, str], Slab] = {}
+        self._seen: Dict[Tuple[str, str], Tuple[ChampionStatsTable, object]] = {}
+        self._cubes: Dict[str, Cube] = {}
+        self._versions = itertools.count(1)
+        self.version = 0
+        self._lock = threading.Lock()
+        self.stats = {"refreshes": 0, "slabs_reduced": 0, "cubes_built": 0}
+
+    def refresh(self) -> int:
+        """Reduce changed stats tables and restack their cubes; returns tables reduced"""
+        tables = [t for t in (stats_store.get(*key) for key in stats_store.keys()) if t is not None]
+        with self._lock:
+            dirty: Set[str] = set()
+            live = {t.key for t in tables}
+            for key in [k for k in self._slabs if k not in live]:
+                del self._slabs[key]
+                self._seen.pop(key, None)
+                dirty.add(key[1])
+            reduced = 0
+            for table in tables:
+                if self._seen.get(table.key) == (table, table.last_updated):
+                    continue
+                self._seen[table.key] = (table, table.last_updated)
+                self._slabs[table.key] = reduce_table(table)
+                dirty.add(table.rank_tier)
+                reduced += 1
+            if not dirty:
+                return 0
+            for rank_tier in dirty | {ALL_RANKS}:
+                self._build(rank_tier)
+            self.version = next(self._versions)
+            self.stats["refreshes"] += 1
+            self.stats["slabs_reduced"] += reduced
+        logger.info(f"Rolled up {reduced} stats tables into {len(dirty) + 1} cubes")
+        return reduced
+
+    def _build(self, rank_tier: str) -> None:
+        slabs: Dict[str, List[Slab]] = {}
+        for (patch, rank), slab in self._slabs.items():
+            if rank_tier in (rank, ALL_RANKS):
+                slabs.setdefault(patch, []).append(slab)
+        if slabs:
+            self._cubes[rank_tier] = Cube(rank_tier, slabs)
+            self.stats["cubes_built"] += 1
+        else:
+            self._cubes.pop(rank_tier, None)
+
+    def stale(self) -> bool:
+        """Whether a stats table was added, replaced, updated or dropped since the last refresh"""
+        tables = [t for t in (stats_store.get(*key) for key in stats_store.keys()) if t is not None]
+        if len(tables) != len(self._seen):
+            return True
+        return any(self._seen.get(t.key) != (t, t.last_updated) for t in tables)
+
+    def cube(self, rank_tier: str) -> Optional[Cube]:
+        """Cube as of the last refresh"""
+        return self._cubes.get(rank_tier)
+
+    async def current(self, rank_tier: str) -> Optional[Cube]:
+        """Cube for a rank tier, refreshed off the event loop if the stats changed"""
+        if self.stale():
+            await asyncio.to_thread(self.refresh)
+        return self.cube(rank_tier)
+
+
+rollup_store = RollupStore()
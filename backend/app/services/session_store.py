@@ -0,0 +1,343 @@
+"""Draft session persistence with an in-memory hot set and write-behind flushes
+
+``SessionStore`` keeps live sessions in memory and answers reads from
+there. Creations and actions are only buffered; a background task writes
+them to the backend in batches at most ``SESSION_FLUSH_INTERVAL_MS``
+later (sooner once ``SESSION_FLUSH_MAX_ACTIONS`` are pending), so a
+crash loses at most that window. Completed sessions are archived in bulk
+and leave the hot set.
+
+Backends implement ``SessionBackend``; ``MemoryBackend`` and
+``SQLiteBackend`` are for local runs and tests.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Protocol, Set
+
+from app.core.config import settings
+from app.core.metrics import CACHE_HIT_RATIO
+from app.models.draft import DraftAction, DraftPhase, DraftSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionBackend(Protocol):
+    """Durable session storage; every method takes a whole batch"""
+
+    async def save_sessions(self, sessions: List[DraftSession]) -> None:
+        """Upsert session state, without the action history"""
+
+    async def append_actions(self, actions: List[DraftAction]) -> None:
+        """Append actions; re-appending an (session, order) pair is a no-op"""
+
+    async def archive_sessions(self, sessions: List[DraftSession]) -> None:
+        """Store completed sessions with their actions and drop them from live storage"""
+
+    async def load_session(self, session_id: str) -> Optional[DraftSession]:
+        """Live or archived session with its actions, None if unknown"""
+
+    async def close(self) -> None:
+        ...
+
+
+class MemoryBackend:
+    """Dict-backed backend for tests and single-process runs"""
+
+    def __init__(self):
+        self.sessions: Dict[str, str] = {}
+        self.actions: Dict[str, Dict[int, str]] = {}
+        self.archive: Dict[str, str] = {}
+        self.writes = 0
+
+    async def save_sessions(self, sessions: List[DraftSession]) -> None:
+        self.writes += 1
+        for session in sessions:
+            self.sessions[session.id] = session.model_dump_json(exclude={"actions"})
+
+    async def append_actions(self, actions: List[DraftAction]) -> None:
+        self.writes += 1
+        for action in actions:
+            self.actions.setdefault(action.session_id, {}).setdefault(
+                action.order, action.model_dump_json()
+            )
+
+    async def archive_sessions(self, sessions: List[DraftSession]) -> None:
+        self.writes += 1
+        for session in sessions:
+            self.archive[session.id] = session.model_dump_json()
+            self.sessions.pop(session.id, None)
+            self.actions.pop(session.id, None)
+
+    async def load_session(self, session_id: str) -> Optional[DraftSession]:
+        if session_id in self.archive:
+            return DraftSession.model_validate_json(self.archive[session_id])
+        if session_id not in self.sessions:
+            return None
+        session = DraftSession.model_validate_json(self.sessions[session_id])
+        actions = self.actions.get(session_id, {})
+        session.actions = [DraftAction.model_validate_json(actions[o]) for o in sorted(actions)]
+        return session
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """SQLite backend; one connection on one dedicated thread, one transaction per batch"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS actions (
+            session_id TEXT NOT NULL, action_order INTEGER NOT NULL, data TEXT NOT NULL,
+            PRIMARY KEY (session_id, action_order)
+        );
+        CREATE TABLE IF NOT EXISTS archived_sessions (
+            id TEXT PRIMARY KEY, data TEXT NOT NULL, archived_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="session-sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+        self.writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _write(self, statements: List[tuple]) -> None:
+        conn = self._connection()
+        with conn:
+            for sql, rows in statements:
+                conn.executemany(sql, rows)
+        self.writes += 1
+
+    async def save_sessions(self, sessions: List[DraftSession]) -> None:
+        now = time.time()
+        rows = [(s.id, s.model_dump_json(exclude={"actions"}), now) for s in sessions]
+        await self._run(self._write, [
+            ("INSERT OR REPLACE INTO sessions (id, data, updated_at) VALUES (?, ?, ?)", rows),
+        ])
+
+    async def append_actions(self, actions: List[DraftAction]) -> None:
+        rows = [(a.session_id, a.order, a.model_dump_json()) for a in actions]
+        await self._run(self._write, [
+            ("INSERT OR IGNORE INTO actions (session_id, action_order, data) VALUES (?, ?, ?)", rows),
+        ])
+
+    async def archive_sessions(self, sessions: List[DraftSession]) -> None:
+        now = time.time()
+        ids = [(s.id,) for s in sessions]
+        await self._run(self._write, [
+            (
+                "INSERT OR REPLACE INTO archived_sessions (id, data, archived_at) VALUES (?, ?, ?)",
+                [(s.id, s.model_dump_json(), now) for s in sessions],
+            ),
+            ("DELETE FROM sessions WHERE id = ?", ids),
+            ("DELETE FROM actions WHERE session_id = ?", ids),
+        ])
+
+    def _load(self, session_id: str) -> Optional[DraftSession]:
+        conn = self._connection()
+        row = conn.execute("SELECT data FROM archived_sessions WHERE id = ?", (session_id,)).fetchone()
+        if row:
+            return DraftSession.model_validate_json(row[0])
+        row = conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        data["actions"] = [
+            json.loads(action)
+            for (action,) in conn.execute(
+                "SELECT data FROM actions WHERE session_id = ? ORDER BY action_order", (session_id,)
+            )
+        ]
+        return DraftSession.model_validate(data)
+
+    async def load_session(self, session_id: str) -> Optional[DraftSession]:
+        return await self._run(self._load, session_id)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+
+class SessionStore:
+    """Hot sessions in memory, writes coalesced into periodic backend batches"""
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        flush_interval: float = 0.25,
+        max_pending: int = 500,
+        max_hot: int = 10000,
+    ):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_hot = max_hot
+        self._hot: "OrderedDict[str, DraftSession]" = OrderedDict()
+        self._dirty: Dict[str, DraftSession] = {}
+        self._actions: List[DraftAction] = []
+        self._completed: Dict[str, DraftSession] = {}
+        # Sessions of the batch being written; requeued if the write fails
+        self._flushing: Set[str] = set()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"flushes": 0, "actions_written": 0, "sessions_written": 0,
+                      "archived": 0, "failed_flushes": 0, "hot_hits": 0, "backend_loads": 0}
+
+    @classmethod
+    def from_settings(cls) -> "SessionStore":
+        if settings.SESSION_STORE_BACKEND == "sqlite":
+            backend = SQLiteBackend(settings.SESSION_DB_PATH)
+        else:
+            backend = MemoryBackend()
+        return cls(
+            backend,
+            flush_interval=settings.SESSION_FLUSH_INTERVAL_MS / 1000.0,
+            max_pending=settings.SESSION_FLUSH_MAX_ACTIONS,
+            max_hot=settings.SESSION_HOT_MAX,
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._actions) + len(self._dirty) + len(self._completed)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of reads served from the hot set"""
+        total = self.stats["hot_hits"] + self.stats["backend_loads"]
+        return self.stats["hot_hits"] / total if total else 0.0
+
+    def _touch(self, session: DraftSession) -> None:
+        self._hot[session.id] = session
+        self._hot.move_to_end(session.id)
+        if len(self._hot) <= self.max_hot:
+            return
+        # Only evict sessions with nothing left to write, in flight included
+        for session_id in list(self._hot):
+            if len(self._hot) <= self.max_hot:
+                break
+            if (
+                session_id not in self._dirty
+                and session_id not in self._completed
+                and session_id not in self._flushing
+            ):
+                del self._hot[session_id]
+
+    def _mark(self, session: DraftSession) -> None:
+        if session.current_phase == DraftPhase.COMPLETED.value:
+            self._dirty.pop(session.id, None)
+            self._completed[session.id] = session
+        else:
+            self._dirty[session.id] = session
+        if len(self._actions) >= self.max_pending:
+            self._wake.set()
+
+    async def create(self, session: DraftSession) -> None:
+        self._touch(session)
+        self._mark(session)
+
+    async def get(self, session_id: str) -> Optional[DraftSession]:
+        session = self._hot.get(session_id)
+        if session is not None:
+            self.stats["hot_hits"] += 1
+            self._hot.move_to_end(session_id)
+            return session
+        self.stats["backend_loads"] += 1
+        session = await self.backend.load_session(session_id)
+        if session is not None and session.current_phase != DraftPhase.COMPLETED.value:
+            self._touch(session)
+        return session
+
+    async def append(self, session: DraftSession, action: DraftAction) -> None:
+        """Record an action already applied to ``session``"""
+        self._actions.append(action)
+        self._touch(session)
+        self._mark(session)
+
+    async def flush(self) -> None:
+        """Write everything buffered so far in one batch per kind"""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            actions, self._actions = self._actions, []
+            dirty, self._dirty = self._dirty, {}
+            completed, self._completed = self._completed, {}
+            # Archived sessions carry their own actions
+            actions = [a for a in actions if a.session_id not in completed]
+            self._flushing = set(dirty) | set(completed)
+            try:
+                if dirty:
+                    await self.backend.save_sessions(list(dirty.values()))
+                if actions:
+                    await self.backend.append_actions(actions)
+                if completed:
+                    await self.backend.archive_sessions(list(completed.values()))
+            except Exception as e:
+                self.stats["failed_flushes"] += 1
+                logger.error(f"Session flush failed, retrying next interval: {e}")
+                # Re-queue behind anything buffered meanwhile; every write is idempotent
+                self._actions[:0] = actions
+                for session_id, session in dirty.items():
+                    self._dirty.setdefault(session_id, session)
+                for session_id, session in completed.items():
+                    self._completed.setdefault(session_id, session)
+                return
+            finally:
+                self._flushing = set()
+            for session_id in completed:
+                self._hot.pop(session_id, None)
+            self.stats["flushes"] += 1
+            self.stats["actions_written"] += len(actions)
+            self.stats["sessions_written"] += len(dirty)
+            self.stats["archived"] += len(completed)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            # Shielded: cancelling mid-write in close() would drop the batch in flight
+            await asyncio.shield(self.flush())
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the flusher and write out whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await self.backend.close()
+
+
+session_store = SessionStore.from_settings()
+CACHE_HIT_RATIO.add(lambda: {"session_hot": session_store.hit_ratio})
@@ -0,0 +1,277 @@
+"""Versioned, memory-mapped snapshot of everything the draft endpoints read
+
+Layout of ``snapshot-<patch>.lolsnap``::
+
+    8 bytes   magic b"LOLSNAP\\0"
+    4 bytes   format version (uint32, little endian)
+    4 bytes   reserved
+    8 bytes   header length (uint64)
+    header    JSON: patch, champions, tier lists, and for every stats table
+              and matchup slice the offset/dtype/shape of its arrays
+    arrays    raw little-endian array data, each 64-byte aligned
+
+Loading maps the file read-only and wraps each array as a NumPy view, so
+nothing is parsed or copied beyond the small JSON header and the pages are
+shared by every worker process mapping the same file. Snapshots are
+replaced atomically; running workers keep the inode they mapped.
+
+Build one with::
+
+    python -m app.services.snapshot --chunks <aggregation dir> --patch 14.19
+"""
+import argparse
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import SNAPSHOT_BYTES, SNAPSHOT_LOAD_SECONDS
+from app.models.champion import Champion, ChampionTierList
+from app.services.champion_catalog import champion_catalog
+from app.services.matchup_store import ChampionIndex, MatchupMatrices, matchup_store
+from app.services.stats_store import METRICS, ChampionStatsTable, stats_store
+from app.services.tier_list import compute_tier_lists, tier_list_engine
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LOLSNAP\0"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<8sI4xQ")
+ALIGNMENT = 64
+
+
+class SnapshotError(Exception):
+    """Unreadable or incompatible snapshot file"""
+
+
+def snapshot_path(directory: Path, patch: str) -> Path:
+    return Path(directory) / f"snapshot-{patch}.lolsnap"
+
+
+def _patch_key(path: Path) -> tuple:
+    patch = path.stem[len("snapshot-"):]
+    return tuple(int(p) if p.isdigit() else 0 for p in patch.split("."))
+
+
+def latest_snapshot(directory: Path) -> Optional[Path]:
+    """Snapshot for the newest patch in ``directory``"""
+    paths = list(Path(directory).glob("snapshot-*.lolsnap")) if Path(directory).is_dir() else []
+    return max(paths, key=_patch_key, default=None)
+
+
+class _Writer:
+    """Lays arrays out after the header, recording where each one lands"""
+
+    def __init__(self):
+        self.arrays: List[Tuple[int, np.ndarray]] = []
+        self.offset = 0
+
+    def add(self, array: np.ndarray) -> Dict[str, Any]:
+        array = np.ascontiguousarray(array)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        self.offset = -(-self.offset // ALIGNMENT) * ALIGNMENT
+        ref = {"offset": self.offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        self.arrays.append((self.offset, array))
+        self.offset += array.nbytes
+        return ref
+
+
+def write_snapshot(
+    path: Path,
+    patch: str,
+    champions: Iterable[Champion],
+    stats_tables: Iterable[ChampionStatsTable] = (),
+    matrices: Iterable[MatchupMatrices] = (),
+    tier_lists: Iterable[ChampionTierList] = (),
+) -> int:
+    """Write a snapshot atomically, returns its size in bytes"""
+    writer = _Writer()
+    header: Dict[str, Any] = {
+        "patch": patch,
+        "created_at": datetime.utcnow().isoformat(),
+        "champions": [c.model_dump(mode="json") for c in champions],
+        "tier_lists": [t.model_dump(mode="json") for t in tier_lists],
+        "stats": [],
+        "matrices": [],
+    }
+    for table in stats_tables:
+        arrays = {name: writer.add(table.metrics[name]) for name in METRICS}
+        arrays["kda"] = writer.add(table.kda)
+        arrays["games"] = writer.add(table.games)
+        header["stats"].append({
+            "rank_tier": table.rank_tier,
+            "ids": writer.add(table.index.ids),
+            "last_updated": table.last_updated.isoformat(),
+            "arrays": arrays,
+        })
+    for m in matrices:
+        header["matrices"].append({
+            "rank_tier": m.rank_tier,
+            "role": m.role,
+            "ids": writer.add(m.index.ids),
+            "synergy_types": m.synergy_types,
+            "last_updated": m.last_updated.isoformat(),
+            "arrays": {name: writer.add(getattr(m, name)) for name in m.ARRAYS},
+        })
+
+    encoded = json.dumps(header).encode()
+    data_start = -(-(PREAMBLE.size + len(encoded)) // ALIGNMENT) * ALIGNMENT
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        for offset, array in writer.arrays:
+            f.seek(data_start + offset)
+            f.write(array.tobytes())
+        f.truncate(data_start + writer.offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return data_start + writer.offset
+
+
+class Snapshot:
+    """A mapped snapshot; arrays stay valid for as long as this object lives"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, header_length = PREAMBLE.unpack_from(self._mmap, 0)
+        except struct.error as e:
+            raise SnapshotError(f"{self.path}: truncated preamble") from e
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path}: not a snapshot file")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(f"{self.path}: format {version}, expected {FORMAT_VERSION}")
+        end = PREAMBLE.size + header_length
+        self.header: Dict[str, Any] = json.loads(self._mmap[PREAMBLE.size:end])
+        self._data_start = -(-end // ALIGNMENT) * ALIGNMENT
+        self.patch: str = self.header["patch"]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mmap)
+
+    def _array(self, ref: Dict[str, Any]) -> np.ndarray:
+        dtype = np.dtype(ref["dtype"])
+        count = int(np.prod(ref["shape"], dtype=np.int64))
+        return np.frombuffer(
+            self._mmap, dtype=dtype, count=count, offset=self._data_start + ref["offset"]
+        ).reshape(ref["shape"])
+
+    def champions(self) -> List[Champion]:
+        return [Champion.model_validate(c) for c in self.header["champions"]]
+
+    def tier_lists(self) -> List[ChampionTierList]:
+        return [ChampionTierList.model_validate(t) for t in self.header["tier_lists"]]
+
+    def stats_tables(self) -> List[ChampionStatsTable]:
+        tables = []
+        for entry in self.header["stats"]:
+            index = ChampionIndex.from_sorted(self._array(entry["ids"]))
+            arrays = {name: self._array(ref) for name, ref in entry["arrays"].items()}
+            table = ChampionStatsTable(self.patch, entry["rank_tier"], index, arrays)
+            table.last_updated = datetime.fromisoformat(entry["last_updated"])
+            tables.append(table)
+        return tables
+
+    def matrices(self) -> List[MatchupMatrices]:
+        slices = []
+        for entry in self.header["matrices"]:
+            index = ChampionIndex.from_sorted(self._array(entry["ids"]))
+            arrays = {name: self._array(ref) for name, ref in entry["arrays"].items()}
+            m = MatchupMatrices(
+                self.patch, entry["rank_tier"], entry["role"], index, arrays,
+                entry["synergy_types"],
+            )
+            m.last_updated = datetime.fromisoformat(entry["last_updated"])
+            slices.append(m)
+        return slices
+
+    def install(self) -> None:
+        """Serve this snapshot: load the catalog and register every table"""
+        champion_catalog.load(self.champions(), patch=self.patch)
+        for table in self.stats_tables():
+            stats_store.put(table)
+        for m in self.matrices():
+            matchup_store.put(m)
+        tier_list_engine.install(self.tier_lists())
+
+
+# Keeps the installed snapshot (and therefore its mapping) alive
+_installed: Dict[str, Snapshot] = {}
+
+
+def load_snapshot(path: Optional[Path] = None) -> Optional[Snapshot]:
+    """Map and install a snapshot, by default the newest in SNAPSHOT_DIR"""
+    path = path or latest_snapshot(Path(settings.SNAPSHOT_DIR))
+    if path is None:
+        logger.info(f"No snapshot found in {settings.SNAPSHOT_DIR}")
+        return None
+    start = time.perf_counter()
+    snapshot = Snapshot(path)
+    snapshot.install()
+    elapsed = time.perf_counter() - start
+    _installed[snapshot.patch] = snapshot
+    SNAPSHOT_LOAD_SECONDS.labels(patch=snapshot.patch).set(elapsed)
+    SNAPSHOT_BYTES.labels(patch=snapshot.patch).set(snapshot.nbytes)
+    logger.info(
+        f"Loaded snapshot {path.name} ({snapshot.nbytes / 1e6:.1f} MB) in {elapsed * 1000:.1f} ms"
+    )
+    return snapshot
+
+
+async def build_snapshot(chunks: Path, patch: Optional[str], output: Path) -> Path:
+    """Aggregate match chunks and write the snapshot for one patch"""
+    from app.services.aggregation import AggregationEngine
+    from app.services.matchup_store import ROLES
+    from app.services.riot_service import RiotService
+
+    if not len(champion_catalog):
+        service = RiotService()
+        await service.update_champion_data()
+        await RiotService.cleanup()
+    patch = patch or champion_catalog.patch
+    engine = AggregationEngine(chunks)
+    engine.refresh()
+    rank_tiers = sorted(rank for p, rank in engine.groups if p == patch)
+    tables = [engine.stats_table(patch, rank) for rank in rank_tiers]
+    slices = [
+        engine.matchup_matrices(patch, rank, role)
+        for rank in rank_tiers
+        for role in (None, *ROLES)
+    ]
+    tier_lists = compute_tier_lists(tables).values()
+    path = snapshot_path(output, patch)
+    size = write_snapshot(path, patch, champion_catalog.all(), tables, slices, tier_lists)
+    logger.info(f"Wrote {path} ({size / 1e6:.1f} MB, {len(rank_tiers)} rank tiers)")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a stats snapshot")
+    parser.add_argument("--chunks", type=Path, required=True, help="Aggregation chunk directory")
+    parser.add_argument("--patch", help="Patch to snapshot (default: current Data Dragon patch)")
+    parser.add_argument("--output", type=Path, default=Path(settings.SNAPSHOT_DIR))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    path = asyncio.run(build_snapshot(args.chunks, args.patch, args.output))
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
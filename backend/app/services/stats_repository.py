@@ -0,0 +1,274 @@
+"""Stats tables in SQL, written as whole patch x rank slices
+
+``StatsRepository`` persists ``ChampionStatsTable`` and
+``MatchupMatrices`` slices through the shared async engine. Rows are
+built column-wise from the arrays (no pydantic objects) and upserted in
+one transaction per slice:
+
+- PostgreSQL (asyncpg): ``COPY`` into a per-connection temporary staging
+  table, then one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``;
+- anything else (SQLite for local runs): a prepared
+  ``INSERT ... ON CONFLICT DO UPDATE`` executed for batches of
+  ``DB_UPSERT_BATCH_ROWS`` rows.
+
+Every write tags its rows with a fresh ``write_id``; rows of the slice
+carrying any other id (cells the new arrays no longer contain) are
+deleted in the same transaction, so a slice in the database always
+matches the last one written. ``load_stats`` / ``load_matchups`` read slices back into
+arrays.
+"""
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Integer, MetaData, SmallInteger, String, Table, and_, delete, select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.services.matchup_store import ROLES, ChampionIndex, MatchupMatrices
+from app.services.stats_store import KDA_FIELDS, METRICS, ChampionStatsTable
+
+logger = logging.getLogger(__name__)
+
+# Role key of role-less rows and of the all-roles matchup slice
+ANY_ROLE = "all"
+STAT_ROLES = [*ROLES, ANY_ROLE]
+MATCHUP_FLOATS = (
+    "win_rate", "counter_strength", "difficulty_score",
+    "synergy_score", "synergy_win_rate", "synergy_pick_rate",
+)
+
+metadata = MetaData()
+
+champion_stats = Table(
+    "champion_stats",
+    metadata,
+    Column("patch", String(16), primary_key=True),
+    Column("rank_tier", String(16), primary_key=True),
+    Column("champion_id", Integer, primary_key=True),
+    Column("role", String(8), primary_key=True),
+    Column("games", Integer, nullable=False),
+    *[Column(name, Float) for name in METRICS],
+    *[Column(f"kda_{field}", Float) for field in KDA_FIELDS],
+    Column("last_updated", DateTime, nullable=False),
+    Column("write_id", BigInteger, nullable=False),
+)
+
+champion_matchups = Table(
+    "champion_matchups",
+    metadata,
+    Column("patch", String(16), primary_key=True),
+    Column("rank_tier", String(16), primary_key=True),
+    Column("role", String(8), primary_key=True),
+    Column("champion_id", Integer, primary_key=True),
+    Column("opponent_id", Integer, primary_key=True),
+    *[Column(name, Float) for name in MATCHUP_FLOATS],
+    Column("matchup_games", Integer, nullable=False),
+    Column("matchup_role", SmallInteger),
+    Column("synergy_games", Integer, nullable=False),
+    Column("synergy_type", String(32)),
+    Column("last_updated", DateTime, nullable=False),
+    Column("write_id", BigInteger, nullable=False),
+)
+
+
+def _nullable(values: np.ndarray) -> List[Any]:
+    """Float column as Python values with NaN as NULL"""
+    column = values.astype(np.float64).astype(object)
+    column[np.isnan(values)] = None
+    return column.tolist()
+
+
+def stats_columns(table: ChampionStatsTable) -> Dict[str, List[Any]]:
+    """Column-wise rows of every filled (champion, role) cell"""
+    filled = (table.games > 0) | ~np.isnan(table.metrics["win_rate"])
+    rows, cols = np.nonzero(filled)
+    n = len(rows)
+    columns: Dict[str, List[Any]] = {
+        "patch": [table.patch] * n,
+        "rank_tier": [table.rank_tier] * n,
+        "champion_id": table.index.ids[rows].tolist(),
+        "role": np.array(STAT_ROLES, dtype=object)[cols].tolist(),
+        "games": table.games[rows, cols].tolist(),
+    }
+    for name in METRICS:
+        columns[name] = _nullable(table.metrics[name][rows, cols])
+    for i, field in enumerate(KDA_FIELDS):
+        columns[f"kda_{field}"] = _nullable(table.kda[rows, cols, i])
+    columns["last_updated"] = [table.last_updated] * n
+    return columns
+
+
+def matchup_columns(matrices: MatchupMatrices) -> Dict[str, List[Any]]:
+    """Column-wise rows of every pair with matchup or synergy games"""
+    rows, cols = np.nonzero((matrices.matchup_games > 0) | (matrices.synergy_games > 0))
+    n = len(rows)
+    ids = matrices.index.ids
+    types = np.array([*matrices.synergy_types, None], dtype=object)
+    synergy_type = matrices.synergy_type[rows, cols].astype(np.intp)
+    lane = matrices.matchup_role[rows, cols].astype(object)
+    lane[lane == -1] = None
+    columns: Dict[str, List[Any]] = {
+        "patch": [matrices.patch] * n,
+        "rank_tier": [matrices.rank_tier] * n,
+        "role": [matrices.role or ANY_ROLE] * n,
+        "champion_id": ids[rows].tolist(),
+        "opponent_id": ids[cols].tolist(),
+    }
+    for name in MATCHUP_FLOATS:
+        columns[name] = _nullable(getattr(matrices, name)[rows, cols])
+    columns["matchup_games"] = matrices.matchup_games[rows, cols].tolist()
+    columns["matchup_role"] = lane.tolist()
+    columns["synergy_games"] = matrices.synergy_games[rows, cols].tolist()
+    # -1 (no type) indexes the trailing None
+    columns["synergy_type"] = types[synergy_type].tolist()
+    columns["last_updated"] = [matrices.last_updated] * n
+    return columns
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(table: Table, dialect: str):
+    """``INSERT ... ON CONFLICT DO UPDATE``, built once so its compiled form is cached"""
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(table)
+    keys = [c.name for c in table.primary_key.columns]
+    return stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name not in keys},
+    )
+
+
+class StatsRepository:
+    """Bulk writes and reads of stat slices over the pooled async engine"""
+
+    def __init__(self, engine: Optional[AsyncEngine] = None, batch_rows: Optional[int] = None):
+        self._engine = engine
+        self.batch_rows = batch_rows or settings.DB_UPSERT_BATCH_ROWS
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine or get_engine()
+
+    async def create_tables(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+
+    async def _copy_upsert(self, conn: AsyncConnection, table: Table, columns: Dict[str, List[Any]]) -> None:
+        names = list(columns)
+        keys = [c.name for c in table.primary_key.columns]
+        stage = f"stage_{table.name}"
+        await conn.exec_driver_sql(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+            f"(LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            stage, records=list(zip(*columns.values())), columns=names
+        )
+        updates = ", ".join(f"{name} = EXCLUDED.{name}" for name in names if name not in keys)
+        await conn.exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(names)}) "
+            f"SELECT {', '.join(names)} FROM {stage} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}"
+        )
+
+    async def _upsert(
+        self, table: Table, columns: Dict[str, List[Any]], scope: Sequence[Tuple[str, Any]]
+    ) -> int:
+        n = len(columns["last_updated"])
+        # last_updated is the table's own and repeats when a slice is rewritten; this does not
+        write_id = time.time_ns()
+        columns = {**columns, "write_id": [write_id] * n}
+        async with self.engine.begin() as conn:
+            dialect = conn.dialect.name
+            if n and dialect == "postgresql" and conn.dialect.driver == "asyncpg":
+                await self._copy_upsert(conn, table, columns)
+            elif n:
+                stmt = _upsert_statement(table, dialect)
+                names = list(columns)
+                values = list(zip(*columns.values()))
+                for start in range(0, n, self.batch_rows):
+                    batch = [dict(zip(names, row)) for row in values[start:start + self.batch_rows]]
+                    await conn.execute(stmt, batch)
+            # Drop rows of this slice that the new arrays no longer contain
+            condition = and_(*(table.c[name] == value for name, value in scope))
+            await conn.execute(delete(table).where(condition, table.c.write_id != write_id))
+        return n
+
+    async def upsert_stats(self, table: ChampionStatsTable) -> int:
+        """Write one patch x rank stats slice; returns rows written"""
+        return await self._upsert(
+            champion_stats,
+            stats_columns(table),
+            [("patch", table.patch), ("rank_tier", table.rank_tier)],
+        )
+
+    async def upsert_matchups(self, matrices: MatchupMatrices) -> int:
+        """Write one patch x rank x role matchup slice; returns rows written"""
+        return await self._upsert(
+            champion_matchups,
+            matchup_columns(matrices),
+            [
+                ("patch", matrices.patch),
+                ("rank_tier", matrices.rank_tier),
+                ("role", matrices.role or ANY_ROLE),
+            ],
+        )
+
+    async def _fetch(self, table: Table, scope: Sequence[Tuple[str, Any]]) -> Dict[str, list]:
+        query = select(table).where(and_(*(table.c[name] == value for name, value in scope)))
+        async with self.engine.connect() as conn:
+            result = await conn.execute(query)
+            rows = result.all()
+        return {name: [row[i] for row in rows] for i, name in enumerate(table.columns.keys())}
+
+    async def load_stats(self, patch: str, rank_tier: str) -> Optional[ChampionStatsTable]:
+        columns = await self._fetch(champion_stats, [("patch", patch), ("rank_tier", rank_tier)])
+        if not columns["champion_id"]:
+            return None
+        table = ChampionStatsTable(patch, rank_tier, ChampionIndex(columns["champion_id"]))
+        rows = table.index.positions(columns["champion_id"])
+        cols = np.array([STAT_ROLES.index(role) for role in columns["role"]])
+        table.games[rows, cols] = columns["games"]
+        for name in METRICS:
+            table.metrics[name][rows, cols] = np.array(columns[name], dtype=np.float64)
+        for i, field in enumerate(KDA_FIELDS):
+            table.kda[rows, cols, i] = np.array(columns[f"kda_{field}"], dtype=np.float64)
+        table.last_updated = max(columns["last_updated"])
+        return table
+
+    async def load_matchups(
+        self, patch: str, rank_tier: str, role: Optional[str] = None
+    ) -> Optional[MatchupMatrices]:
+        columns = await self._fetch(
+            champion_matchups,
+            [("patch", patch), ("rank_tier", rank_tier), ("role", role or ANY_ROLE)],
+        )
+        if not columns["champion_id"]:
+            return None
+        types = sorted({t for t in columns["synergy_type"] if t is not None})
+        matrices = MatchupMatrices(
+            patch, rank_tier, role,
+            ChampionIndex(columns["champion_id"] + columns["opponent_id"]),
+            synergy_types=types,
+        )
+        rows = matrices.index.positions(columns["champion_id"])
+        cols = matrices.index.positions(columns["opponent_id"])
+        for name in MATCHUP_FLOATS:
+            getattr(matrices, name)[rows, cols] = np.array(columns[name], dtype=np.float64)
+        matrices.matchup_games[rows, cols] = columns["matchup_games"]
+        matrices.synergy_games[rows, cols] = columns["synergy_games"]
+        matrices.matchup_role[rows, cols] = [-1 if r is None else r for r in columns["matchup_role"]]
+        codes = {name: code for code, name in enumerate(types)}
+        matrices.synergy_type[rows, cols] = [codes.get(t, -1) for t in columns["synergy_type"]]
+        matrices.last_updated = max(columns["last_updated"])
+        return matrices
+
+
+stats_repository = StatsRepository()
@@ -0,0 +1,194 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.champion import Champion, ChampionStats
+from app.services.matchup_store import ROLES, ChampionIndex
+
+logger = logging.getLogger(__name__)
+
+# Column holding role-less (all roles) rows
+ALL_ROLES = len(ROLES)
+
+METRICS: Tuple[str, ...] = (
+    "pick_rate",
+    "ban_rate",
+    "win_rate",
+    "average_cs",
+    "average_damage",
+    "average_gold",
+    "early_game_wr",
+    "mid_game_wr",
+    "late_game_wr",
+)
+
+# Keys of ChampionStats.average_kda
+KDA_FIELDS: Tuple[str, ...] = ("kills", "deaths", "assists")
+
+
+class ChampionStatsTable:
+    """Champion x role stat arrays for one patch/rank slice
+
+    Every metric in ``METRICS`` is a float32 array of shape
+    ``(champions, len(ROLES) + 1)``; the last column holds role-less rows.
+    ``kda`` adds a trailing axis over ``KDA_FIELDS``. Missing cells are NaN
+    with zero games. ``arrays`` adopts pre-built ``metrics``/``kda``/``games``
+    arrays, as a memory-mapped snapshot provides.
+    """
+
+    def __init__(
+        self,
+        patch: str,
+        rank_tier: str,
+        index: ChampionIndex,
+        arrays: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        shape = (len(index), len(ROLES) + 1)
+        self.patch = patch
+        self.rank_tier = rank_tier
+        self.index = index
+        self.last_updated = datetime.utcnow()
+        if arrays is not None:
+            self.metrics = {name: arrays[name] for name in METRICS}
+            self.kda = arrays["kda"]
+            self.games = arrays["games"]
+            return
+        self.metrics: Dict[str, np.ndarray] = {
+            name: np.full(shape, np.nan, dtype=np.float32) for name in METRICS
+        }
+        self.kda = np.full(shape + (len(KDA_FIELDS),), np.nan, dtype=np.float32)
+        self.games = np.zeros(shape, dtype=np.int32)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.patch, self.rank_tier)
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.games.nbytes + self.kda.nbytes + sum(a.nbytes for a in self.metrics.values())
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        patch: str,
+        rank_tier: str,
+        stats: Iterable[ChampionStats],
+        champion_ids: Optional[Iterable[int]] = None,
+    ) -> "ChampionStatsTable":
+        """Pack ChampionStats rows into dense arrays"""
+        stats = [s for s in stats if s.patch == patch and s.rank_tier == rank_tier]
+        if champion_ids is None:
+            champion_ids = [s.champion_id for s in stats]
+        table = cls(patch, rank_tier, ChampionIndex(champion_ids))
+        if not stats:
+            return table
+
+        rows = table.index.positions([s.champion_id for s in stats])
+        cols = np.array(
+            [ROLES.index(s.role) if s.role else ALL_ROLES for s in stats], dtype=np.int32
+        )
+        keep = rows >= 0
+        rows, cols = rows[keep], cols[keep]
+        kept = [s for s, k in zip(stats, keep) if k]
+        for name in METRICS:
+            table.metrics[name][rows, cols] = [getattr(s, name) for s in kept]
+        table.kda[rows, cols] = [
+            [s.average_kda.get(field, np.nan) for field in KDA_FIELDS] for s in kept
+        ]
+        table.games[rows, cols] = [s.games_analyzed for s in kept]
+        return table
+
+    def overall(self, name: str) -> np.ndarray:
+        """Per-champion metric: the role-less row, else the games-weighted role average"""
+        values = self.metrics[name]
+        games = self.games[:, :ALL_ROLES]
+        per_role = np.nan_to_num(values[:, :ALL_ROLES]) * games
+        total = games.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weighted = per_role.sum(axis=1) / total
+        return np.where(np.isnan(values[:, ALL_ROLES]), weighted, values[:, ALL_ROLES]).astype(
+            np.float32
+        )
+
+    def role_share(self, champions: Optional[Dict[int, Champion]] = None) -> np.ndarray:
+        """Probability of each champion being played in each role, shape (champions, roles)
+
+        Champions without per-role games fall back to an even split over
+        ``Champion.roles`` when a catalog is given, else over all roles.
+        """
+        games = self.games[:, :ALL_ROLES].astype(np.float32)
+        total = games.sum(axis=1, keepdims=True)
+        share = np.divide(games, total, out=np.zeros_like(games), where=total > 0)
+        for pos in np.flatnonzero(total[:, 0] == 0):
+            champion = champions.get(int(self.index.ids[pos])) if champions else None
+            roles = [ROLES.index(r) for r in champion.roles] if champion and champion.roles else []
+            share[pos, roles or slice(None)] = 1.0 / (len(roles) or len(ROLES))
+        return share
+
+    def to_stats(self, champion_id: int, role: Optional[str] = None) -> Optional[ChampionStats]:
+        """Build a ChampionStats response row"""
+        pos = self.index.position(champion_id)
+        col = ROLES.index(role) if role else ALL_ROLES
+        games = int(self.games[pos, col])
+        if role is None and not games and np.isnan(self.metrics["win_rate"][pos, col]):
+            # No role-less row: aggregate the per-role rows
+            games = int(self.games[pos, :ALL_ROLES].sum())
+            values = {name: float(np.nan_to_num(self.overall(name)[pos])) for name in METRICS}
+            role_games = self.games[pos, :ALL_ROLES]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                kda = (
+                    np.nan_to_num(self.kda[pos, :ALL_ROLES]) * role_games[:, None]
+                ).sum(axis=0) / role_games.sum()
+        else:
+            values = {
+                name: float(np.nan_to_num(self.metrics[name][pos, col])) for name in METRICS
+            }
+            kda = self.kda[pos, col]
+        if not games and not values["win_rate"]:
+            return None
+        return ChampionStats(
+            champion_id=champion_id,
+            patch=self.patch,
+            rank_tier=self.rank_tier,
+            role=role,
+            games_analyzed=games,
+            average_kda=(
+                {f: float(v) for f, v in zip(KDA_FIELDS, kda)} if np.isfinite(kda).all() else {}
+            ),
+            last_updated=self.last_updated,
+            **values,
+        )
+
+
+class StatsStore:
+    """In-memory registry of champion stat tables keyed by (patch, rank_tier)"""
+
+    def __init__(self):
+        self._tables: Dict[Tuple[str, str], ChampionStatsTable] = {}
+        self._lock = threading.Lock()
+
+    def put(self, table: ChampionStatsTable) -> None:
+        with self._lock:
+            self._tables[table.key] = table
+        logger.info(f"Loaded stats table for {table.key}: {len(table.index)} champions")
+
+    def get(self, patch: str, rank_tier: str) -> Optional[ChampionStatsTable]:
+        return self._tables.get((patch, rank_tier))
+
+    def drop_patch(self, patch: str) -> int:
+        with self._lock:
+            stale = [key for key in self._tables if key[0] == patch]
+            for key in stale:
+                del self._tables[key]
+        return len(stale)
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._tables)
+
+
+stats_store = StatsStore()
@@ -0,0 +1,366 @@
+import itertools
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.core.metrics import count_cache, stage
+from app.models.draft import ActionType, DraftPhase, DraftState, DraftSuggestion
+from app.services.champion_catalog import ChampionCatalog, champion_catalog
+from app.services.draft_state import (
+    BLUE_BANS, BLUE_PICKS, PHASES, TEAMS, DraftKey, transposition_cache,
+)
+from app.services.matchup_store import ROLES, ChampionIndex, MatchupMatrices, matchup_store
+from app.services.role_assignment import RoleAssigner
+from app.services.stats_store import ChampionStatsTable, stats_store
+
+logger = logging.getLogger(__name__)
+
+BAN_PHASES = {DraftPhase.BANS_1.value, DraftPhase.BANS_2.value, DraftPhase.BANS_3.value}
+
+TEAM_SIZE = 5
+MAX_BANS = 5
+
+# A perfect counter/synergy is worth this much win rate on top of the champion's own edge
+IMPACT_SCALE = 0.05
+
+# Per-phase flags, indexed by phase code
+IS_BAN_PHASE = np.array([phase in BAN_PHASES for phase in PHASES])
+IS_COMPLETED = np.array([phase == DraftPhase.COMPLETED.value for phase in PHASES])
+
+# Distinguishes rebuilt engines in transposition cache contexts
+_engine_versions = itertools.count(1)
+
+
+class SuggestionWeights(BaseModel):
+    """Linear weights for the suggestion score terms"""
+    counter: float = 0.30
+    synergy: float = 0.20
+    role_fit: float = 0.25
+    pick_rate: float = 0.10
+    ban_rate: float = 0.05
+    win_rate: float = 0.10
+
+
+class DraftStateBatch:
+    """N draft states packed as dense champion positions (-1 = empty slot)
+
+    ``picks`` and ``bans`` have shape ``(N, 2, 5)`` with team 0 = blue;
+    ``phase`` and ``team`` have shape ``(N,)`` and hold codes into
+    ``PHASES`` and ``TEAMS``.
+    """
+
+    def __init__(self, picks: np.ndarray, bans: np.ndarray, phase: np.ndarray, team: np.ndarray):
+        self.picks = picks
+        self.bans = bans
+        self.phase = phase
+        self.team = team
+
+    def __len__(self) -> int:
+        return int(self.phase.size)
+
+    @classmethod
+    def empty(cls, size: int) -> "DraftStateBatch":
+        return cls(
+            picks=np.full((size, 2, TEAM_SIZE), -1, dtype=np.int32),
+            bans=np.full((size, 2, MAX_BANS), -1, dtype=np.int32),
+            phase=np.zeros(size, dtype=np.int8),
+            team=np.zeros(size, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_states(cls, states: Sequence[DraftState], index: ChampionIndex) -> "DraftStateBatch":
+        """Encode DraftState or DraftSession objects against a champion index"""
+        batch = cls.empty(len(states))
+        for i, state in enumerate(states):
+            sides = ((state.blue_picks, state.blue_bans), (state.red_picks, state.red_bans))
+            for t, (picks, bans) in enumerate(sides):
+                picks, bans = picks[:TEAM_SIZE], bans[:MAX_BANS]
+                if picks:
+                    batch.picks[i, t, :len(picks)] = index.positions(picks)
+                if bans:
+                    batch.bans[i, t, :len(bans)] = index.positions(bans)
+            batch.phase[i] = PHASES.index(state.current_phase)
+            batch.team[i] = TEAMS.index(state.current_team)
+        return batch
+
+    @classmethod
+    def from_keys(cls, keys: Sequence[DraftKey], index: ChampionIndex) -> "DraftStateBatch":
+        """Encode DraftKeys with one index lookup for the whole batch"""
+        batch = cls.empty(len(keys))
+        targets = ((batch.picks, BLUE_PICKS, TEAM_SIZE), (batch.bans, BLUE_BANS, MAX_BANS))
+        for array, first_slot, size in targets:
+            where, ids = [], []
+            for i, key in enumerate(keys):
+                for t in range(2):
+                    slot_ids = key.ids(first_slot + t)[:size]
+                    where.extend((i, t, j) for j in range(len(slot_ids)))
+                    ids.extend(slot_ids)
+            if ids:
+                i, t, j = np.array(where).T
+                array[i, t, j] = index.positions(ids)
+        batch.phase[:] = [key.phase for key in keys]
+        batch.team[:] = [key.team for key in keys]
+        return batch
+
+
+def masked_mean(rows: np.ndarray, slots: np.ndarray) -> np.ndarray:
+    """Average ``rows[slot]`` over the filled slots: (N, k) slots -> (N, n)"""
+    valid = slots >= 0
+    gathered = rows[np.where(valid, slots, 0)]
+    gathered *= valid[..., None]
+    count = valid.sum(axis=1, keepdims=True)
+    return gathered.sum(axis=1) / np.maximum(count, 1)
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    peak = float(values.max()) if values.size else 0.0
+    return values / peak if peak > 0 else values
+
+
+class SuggestionEngine:
+    """Vectorized pick/ban scoring over batches of draft states
+
+    Everything champion-level is precomputed once per patch/rank slice:
+
+    - ``counter[c, e]`` / ``synergy[c, a]`` centred to [-1, 1] from the matchup matrices
+    - ``role_share[c, r]`` role probabilities from the stats table, and a
+      ``RoleAssigner`` over them for exact role fit against a team
+    - pick, ban and win rates per champion
+
+    Scoring a batch is then a handful of gathers and reductions over
+    ``(N, 5, champions)`` arrays with no per-state Python work.
+    """
+
+    def __init__(
+        self,
+        matrices: MatchupMatrices,
+        stats: Optional[ChampionStatsTable] = None,
+        catalog: ChampionCatalog = champion_catalog,
+        weights: Optional[SuggestionWeights] = None,
+    ):
+        self.matrices = matrices
+        self.stats = stats
+        self.index = matrices.index
+        self.patch = matrices.patch
+        self.rank_tier = matrices.rank_tier
+        self.catalog = catalog
+        self.weights = weights or SuggestionWeights()
+        self.version = next(_engine_versions)
+        n = len(self.index)
+
+        # Centre the 0-100 scores on 50 so missing pairs contribute nothing
+        self.counter = np.nan_to_num((matrices.counter_strength - 50.0) / 50.0)
+        self.synergy = np.nan_to_num((matrices.synergy_score - 50.0) / 50.0)
+        # Row e of the transposes holds every champion's value against/with e
+        self.counter_t = np.ascontiguousarray(self.counter.T)
+        self.synergy_t = np.ascontiguousarray(self.synergy.T)
+
+        self.role_share = np.full((n, len(ROLES)), 1.0 / len(ROLES), dtype=np.float32)
+        self.pick_rate = np.zeros(n, dtype=np.float32)
+        self.ban_rate = np.zeros(n, dtype=np.float32)
+        self.win_rate = np.full(n, 0.5, dtype=np.float32)
+        if stats is not None:
+            src = stats.index.positions(self.index.ids)
+            found = src >= 0
+            share = stats.role_share({c.id: c for c in catalog.all()})
+            self.role_share[found] = share[src[found]]
+            self.pick_rate[found] = np.nan_to_num(stats.overall("pick_rate")[src[found]])
+            self.ban_rate[found] = np.nan_to_num(stats.overall("ban_rate")[src[found]])
+            # Stats are stored as percentages
+            win_rate = stats.overall("win_rate")[src[found]]
+            self.win_rate[found] = np.where(np.isnan(win_rate), 50.0, win_rate) / 100.0
+        self.pick_term = _normalize(self.pick_rate)
+        self.ban_term = _normalize(self.ban_rate)
+        self.roles = RoleAssigner(self.role_share)
+
+    def __getstate__(self) -> dict:
+        # Ships to search workers: score() needs only the precomputed arrays
+        state = self.__dict__.copy()
+        state.update(matrices=None, stats=None, catalog=None)
+        return state
+
+    def score(self, batch: DraftStateBatch) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Score every champion for every state
+
+        Returns ``(scores, terms)``: ``scores`` has shape ``(N, champions)``
+        with -inf for champions that are already picked/banned, ``terms``
+        holds the ``counter``, ``synergy`` and ``role_fit`` components and
+        the ``role`` each champion would take.
+        Picks reward beating enemy picks and fitting ours; bans reward
+        denying champions that beat our picks or fit theirs.
+        """
+        size, n = len(batch), len(self.index)
+        rows = np.arange(size)
+        acting = batch.team.astype(np.intp)
+        ally = batch.picks[rows, acting]
+        enemy = batch.picks[rows, 1 - acting]
+        is_ban = IS_BAN_PHASE[batch.phase][:, None]
+
+        counter = np.where(
+            is_ban, masked_mean(self.counter_t, ally), masked_mean(self.counter_t, enemy)
+        )
+        synergy = np.where(
+            is_ban, masked_mean(self.synergy_t, enemy), masked_mean(self.synergy_t, ally)
+        )
+        # Role fit against the team the champion would join (theirs for bans)
+        role_fit, role = self.roles.fit(np.where(is_ban, enemy, ally))
+
+        w = self.weights
+        scores = (
+            w.counter * counter
+            + w.synergy * synergy
+            + w.role_fit * role_fit
+            + (w.pick_rate * self.pick_term + w.ban_rate * self.ban_term
+               + w.win_rate * (self.win_rate - 0.5) * 2.0)
+        )
+
+        taken = np.zeros((size, n + 1), dtype=bool)
+        occupied = np.concatenate(
+            [batch.picks.reshape(size, -1), batch.bans.reshape(size, -1)], axis=1
+        )
+        taken[rows[:, None], np.where(occupied >= 0, occupied, n)] = True
+        illegal = taken[:, :n] | IS_COMPLETED[batch.phase][:, None]
+        scores = np.where(illegal, -np.inf, scores).astype(np.float32)
+        terms = {
+            "counter": counter,
+            "synergy": synergy,
+            "role_fit": role_fit,
+            "role": role,
+        }
+        return scores, terms
+
+    def top(self, scores: np.ndarray, limit: int) -> np.ndarray:
+        """Best ``limit`` champion positions per state, best first: (N, limit)"""
+        limit = min(limit, scores.shape[1])
+        part = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1)
+
+    def suggest(self, batch: DraftStateBatch, limit: int = 5) -> List[List[DraftSuggestion]]:
+        """Ranked suggestions per state; response models are built only for the top entries"""
+        scores, terms = self.score(batch)
+        best = self.top(scores, limit)
+
+        # Gather everything the response needs for the (N, limit) winners in one go
+        top_scores = np.take_along_axis(scores, best, axis=1)
+        counter = np.take_along_axis(terms["counter"], best, axis=1)
+        synergy = np.take_along_axis(terms["synergy"], best, axis=1)
+        impact = self.win_rate[best] - 0.5 + IMPACT_SCALE * (counter + synergy) / 2.0
+        columns = {
+            "legal": np.isfinite(top_scores).tolist(),
+            "champion_id": self.index.ids[best].tolist(),
+            "priority": np.clip(50.0 + 50.0 * top_scores, 0.0, 100.0).tolist(),
+            "impact": impact.tolist(),
+            "counter": counter.tolist(),
+            "synergy": synergy.tolist(),
+            "role": np.take_along_axis(terms["role"], best, axis=1).tolist(),
+            "fit": np.take_along_axis(terms["role_fit"], best, axis=1).tolist(),
+        }
+        is_ban = IS_BAN_PHASE[batch.phase].tolist()
+        picks = batch.picks.tolist()
+        acting = batch.team.tolist()
+
+        results = []
+        for i, positions in enumerate(best.tolist()):
+            ally = [p for p in picks[i][acting[i]] if p >= 0]
+            enemy = [p for p in picks[i][1 - acting[i]] if p >= 0]
+            results.append([
+                self._build(columns, i, j, c, is_ban[i], ally, enemy)
+                for j, c in enumerate(positions)
+                if columns["legal"][i][j]
+            ])
+        return results
+
+    def suggest_states(
+        self, states: Sequence[DraftState], limit: int = 5
+    ) -> List[List[DraftSuggestion]]:
+        """``suggest`` for DraftState/DraftSession objects through the transposition cache
+
+        States already seen (in any action order) are served from cache; the
+        rest are scored together in one batch.
+        """
+        keys = [DraftKey.from_state(state) for state in states]
+        context = f"{self.patch}:{self.rank_tier}:{self.version}:{limit}"
+        missed = 0
+
+        def compute(missing: List[int]) -> List[List[DraftSuggestion]]:
+            nonlocal missed
+            missed = len(missing)
+            with stage("suggestions", "score"):
+                batch = DraftStateBatch.from_states([states[i] for i in missing], self.index)
+                return self.suggest(batch, limit)
+
+        suggestions = transposition_cache.get_many("suggestions", context, keys, compute)
+        count_cache("suggestions", True, len(keys) - missed)
+        count_cache("suggestions", False, missed)
+        return suggestions
+
+    def _build(
+        self,
+        columns: Dict[str, list],
+        i: int,
+        j: int,
+        c: int,
+        is_ban: bool,
+        ally: List[int],
+        enemy: List[int],
+    ) -> DraftSuggestion:
+        champion_id = columns["champion_id"][i][j]
+        role = ROLES[columns["role"][i][j]]
+
+        # Bans are explained against the team the banned champion would join
+        countered = ally if is_ban else enemy
+        partners = enemy if is_ban else ally
+        counters = [int(self.index.ids[e]) for e in countered if self.counter[c, e] > 0]
+        synergizes_with = [int(self.index.ids[a]) for a in partners if self.synergy[c, a] > 0]
+
+        reasoning = []
+        if columns["counter"][i][j] > 0.2:
+            reasoning.append("Counters our picks" if is_ban else "Counters enemy picks")
+        if columns["synergy"][i][j] > 0.2:
+            reasoning.append("Synergizes with enemy picks" if is_ban else "Synergizes with team")
+        if columns["fit"][i][j] > 0.5:
+            reasoning.append(f"Fills {'enemy' if is_ban else 'open'} {role} role")
+        if self.pick_term[c] > 0.5:
+            reasoning.append("Popular in current meta")
+        if self.ban_term[c] > 0.5:
+            reasoning.append("Frequently banned")
+        if self.win_rate[c] > 0.52:
+            reasoning.append(f"{self.win_rate[c] * 100:.1f}% win rate")
+        if not reasoning:
+            reasoning.append("Strong overall meta score")
+
+        return DraftSuggestion(
+            champion_id=champion_id,
+            champion_name=self.catalog.name(champion_id),
+            action_type=ActionType.BAN if is_ban else ActionType.PICK,
+            priority_score=columns["priority"][i][j],
+            reasoning=reasoning,
+            counters=counters,
+            synergizes_with=synergizes_with,
+            role_fit=role,
+            win_rate_impact=columns["impact"][i][j],
+            pick_rate=float(self.pick_rate[c]),
+            ban_rate=float(self.ban_rate[c]),
+        )
+
+
+_engines: Dict[Tuple[str, str], SuggestionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_suggestion_engine(patch: str, rank_tier: str) -> SuggestionEngine:
+    """Engine for a patch/rank slice, rebuilt when the underlying stores change"""
+    matrices = matchup_store.get(patch, rank_tier)
+    if matrices is None:
+        raise LookupError(f"No matchup data for patch {patch} ({rank_tier})")
+    stats = stats_store.get(patch, rank_tier)
+    with _engines_lock:
+        engine = _engines.get((patch, rank_tier))
+        if engine is None or engine.matrices is not matrices or engine.stats is not stats:
+            engine = SuggestionEngine(matrices, stats)
+            _engines[(patch, rank_tier)] = engine
+    return engine
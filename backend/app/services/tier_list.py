@@ -0,0 +1,215 @@
+"""Tier lists for every patch x rank tier x role
+
+All slices that need computing are scored in one vectorized pass: the
+stats tables are stacked on a shared champion index into
+``(tables, champions, roles)`` arrays and every step below runs on the
+whole stack at once.
+
+- Win rates are shrunk towards the slice's games-weighted mean win rate
+  with ``PRIOR_GAMES`` pseudo-games, so a 60% win rate over 40 games no
+  longer outranks 53% over 20,000.
+- Pick + ban rate (presence) is blended in through z-scores weighted by
+  ``PRESENCE_WEIGHT``.
+- Champions are bucketed by score percentile within their slice.
+
+Each role column of each table is fingerprinted; ``refresh`` recomputes
+only slices whose fingerprint changed, so republishing a table with the
+same numbers costs a hash. Every produced list carries a slice version
+that response cache keys can use.
+"""
+import hashlib
+import itertools
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models.champion import ChampionTierList
+from app.services.matchup_store import ROLES, ChampionIndex
+from app.services.stats_store import ALL_ROLES, ChampionStatsTable, stats_store
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM_VERSION = "bayes-presence-v1"
+
+# Pseudo-games at the slice mean win rate added to every champion
+PRIOR_GAMES = 1000.0
+# Weight of the presence z-score relative to the shrunk win rate z-score
+PRESENCE_WEIGHT = 0.35
+# Ignore champions with fewer games in the role, or played there this rarely
+MIN_GAMES = 50
+MIN_ROLE_SHARE = 0.05
+# Percentile upper bounds of S, A, B and C tier; the rest is D
+TIER_CUTS = np.array([0.10, 0.30, 0.70, 0.90])
+TIER_FIELDS = ("s_tier", "a_tier", "b_tier", "c_tier", "d_tier")
+
+# (patch, rank_tier, role)
+SliceKey = Tuple[str, str, str]
+
+
+def _fingerprint(table: ChampionStatsTable, col: int) -> bytes:
+    digest = hashlib.blake2b(table.index.ids.tobytes(), digest_size=16)
+    digest.update(np.ascontiguousarray(table.games[:, col]).tobytes())
+    for name in ("win_rate", "pick_rate", "ban_rate"):
+        digest.update(np.ascontiguousarray(table.metrics[name][:, col]).tobytes())
+    return digest.digest()
+
+
+def _zscore(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Standardize along the champion axis over ``mask``ed cells"""
+    count = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+    masked = np.where(mask, values, 0.0)
+    mean = masked.sum(axis=1, keepdims=True) / count
+    var = (np.where(mask, values - mean, 0.0) ** 2).sum(axis=1, keepdims=True) / count
+    std = np.sqrt(var)
+    return np.divide(values - mean, std, out=np.zeros_like(values), where=std > 0)
+
+
+def compute_tier_lists(
+    tables: List[ChampionStatsTable],
+    slices: Optional[Set[SliceKey]] = None,
+) -> Dict[SliceKey, ChampionTierList]:
+    """Tier lists for ``tables``, limited to ``slices`` when given"""
+    if not tables:
+        return {}
+    index = ChampionIndex(np.concatenate([t.index.ids for t in tables]))
+    shape = (len(tables), len(index), ALL_ROLES)
+    games = np.zeros(shape)
+    win_rate = np.full(shape, np.nan)
+    presence = np.zeros(shape)
+    for t, table in enumerate(tables):
+        rows = index.positions(table.index.ids)
+        games[t, rows] = table.games[:, :ALL_ROLES]
+        win_rate[t, rows] = table.metrics["win_rate"][:, :ALL_ROLES]
+        for name in ("pick_rate", "ban_rate"):
+            presence[t, rows] += np.nan_to_num(table.metrics[name][:, :ALL_ROLES])
+
+    total = games.sum(axis=2, keepdims=True)
+    share = np.divide(games, total, out=np.zeros_like(games), where=total > 0)
+    eligible = np.isfinite(win_rate) & (games >= MIN_GAMES) & (share >= MIN_ROLE_SHARE)
+    win_rate = np.where(eligible, win_rate, 0.0)
+
+    # Bayesian shrinkage towards each slice's games-weighted mean
+    weights = np.where(eligible, games, 0.0)
+    weight_sum = weights.sum(axis=1, keepdims=True)
+    prior = np.divide(
+        (win_rate * weights).sum(axis=1, keepdims=True), weight_sum,
+        out=np.full_like(weight_sum, 50.0), where=weight_sum > 0,
+    )
+    shrunk = (win_rate * games + prior * PRIOR_GAMES) / (games + PRIOR_GAMES)
+
+    score = _zscore(shrunk, eligible) + PRESENCE_WEIGHT * _zscore(np.log1p(presence), eligible)
+    score = np.where(eligible, score, -np.inf)
+
+    order = np.argsort(-score, axis=1, kind="stable")
+    count = eligible.sum(axis=1)
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(len(index))[None, :, None], axis=1)
+    percentile = rank / np.maximum(count, 1)[:, None, :]
+    tier = np.searchsorted(TIER_CUTS, percentile, side="right")
+
+    lists = {}
+    for t, table in enumerate(tables):
+        for r, role in enumerate(ROLES):
+            key = (table.patch, table.rank_tier, role)
+            if slices is not None and key not in slices:
+                continue
+            ranked = order[t, :count[t, r], r]
+            bounds = np.searchsorted(tier[t, ranked, r], np.arange(1, len(TIER_FIELDS)))
+            groups = np.split(index.ids[ranked], bounds)
+            lists[key] = ChampionTierList(
+                patch=table.patch,
+                rank_tier=table.rank_tier,
+                role=role,
+                algorithm_version=ALGORITHM_VERSION,
+                **{field: ids.tolist() for field, ids in zip(TIER_FIELDS, groups)},
+            )
+    return lists
+
+
+class TierListEngine:
+    """Tier lists kept current with the stats store
+
+    ``refresh`` is cheap when nothing changed (an identity check per
+    table), so readers call it before every lookup.
+    """
+
+    def __init__(self):
+        self._lists: Dict[SliceKey, Tuple[int, ChampionTierList]] = {}
+        self._fingerprints: Dict[SliceKey, bytes] = {}
+        # Table object and last_updated seen per (patch, rank_tier)
+        self._seen: Dict[Tuple[str, str], Tuple[ChampionStatsTable, object]] = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {"refreshes": 0, "slices_computed": 0, "slices_unchanged": 0}
+
+    def _changed(self, tables: Iterable[ChampionStatsTable]) -> Tuple[List, Set[SliceKey]]:
+        """Tables with at least one changed role column, and the changed slices"""
+        changed, dirty = [], set()
+        for table in tables:
+            if self._seen.get(table.key) == (table, table.last_updated):
+                continue
+            self._seen[table.key] = (table, table.last_updated)
+            for col, role in enumerate(ROLES):
+                key = (table.patch, table.rank_tier, role)
+                fingerprint = _fingerprint(table, col)
+                if self._fingerprints.get(key) == fingerprint and key in self._lists:
+                    self.stats["slices_unchanged"] += 1
+                    continue
+                self._fingerprints[key] = fingerprint
+                dirty.add(key)
+            if any(key[:2] == table.key for key in dirty):
+                changed.append(table)
+        return changed, dirty
+
+    def refresh(self) -> int:
+        """Recompute slices whose stats changed, returns how many were recomputed"""
+        tables = [t for t in (stats_store.get(*key) for key in stats_store.keys()) if t is not None]
+        with self._lock:
+            live = {t.key for t in tables}
+            for key in [k for k in self._seen if k not in live]:
+                del self._seen[key]
+            for key in [k for k in self._lists if k[:2] not in live]:
+                del self._lists[key]
+                self._fingerprints.pop(key, None)
+
+            changed, dirty = self._changed(tables)
+            if not dirty:
+                return 0
+            lists = compute_tier_lists(changed, dirty)
+            for key, tier_list in lists.items():
+                self._lists[key] = (next(self._versions), tier_list)
+            self.stats["refreshes"] += 1
+            self.stats["slices_computed"] += len(lists)
+        logger.info(f"Computed {len(lists)} tier lists over {len(changed)} stats tables")
+        return len(lists)
+
+    def install(self, tier_lists: Iterable[ChampionTierList]) -> int:
+        """Adopt precomputed lists (from a snapshot) for the tables now in the store"""
+        adopted = 0
+        with self._lock:
+            for tier_list in tier_lists:
+                table = stats_store.get(tier_list.patch, tier_list.rank_tier)
+                if table is None or tier_list.algorithm_version != ALGORITHM_VERSION:
+                    continue
+                key = (tier_list.patch, tier_list.rank_tier, tier_list.role)
+                self._fingerprints[key] = _fingerprint(table, ROLES.index(tier_list.role))
+                self._lists[key] = (next(self._versions), tier_list)
+                adopted += 1
+        return adopted
+
+    def get(self, patch: str, rank_tier: str, role: str) -> Optional[Tuple[int, ChampionTierList]]:
+        """``(version, tier list)`` for one slice"""
+        self.refresh()
+        return self._lists.get((patch, rank_tier, role))
+
+    def all(self, patch: str, rank_tier: str) -> Tuple[int, List[ChampionTierList]]:
+        """Every role's list for a patch/rank, with the newest slice version"""
+        self.refresh()
+        entries = [self._lists.get((patch, rank_tier, role)) for role in ROLES]
+        entries = [e for e in entries if e is not None]
+        return max((v for v, _ in entries), default=0), [t for _, t in entries]
+
+
+tier_list_engine = TierListEngine()
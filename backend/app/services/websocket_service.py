@@ -0,0 +1,325 @@
+"""Per-session WebSocket fan-out
+
+Every draft session is a channel. A broadcast is serialized once and the
+same string is queued for every subscriber of the channel; request
+handlers never wait on a client. Each connection drains its own bounded
+queue. A consumer that falls ``WS_SEND_QUEUE_SIZE`` messages behind is
+disconnected, or has messages dropped under the ``drop`` policy.
+
+Messages are deltas keyed by the action ``order``: ``snapshot`` (full
+session, sent once on connect), ``session_created`` and ``action`` (the
+new action plus the fields it changed). A client that sees a gap in
+``order`` refetches the session.
+
+With ``WS_BACKPLANE_URL`` set, broadcasts are also published to Redis so
+subscribers connected to other instances receive them.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Protocol, Set
+
+from app.core.config import settings
+from app.models.draft import DraftAction, DraftSession
+from app.services.draft_state import turn
+
+logger = logging.getLogger(__name__)
+
+# Close code for slow consumers: "try again later"
+CLOSE_SLOW_CONSUMER = 1013
+
+
+class SlowConsumerPolicy(str, Enum):
+    DISCONNECT = "disconnect"
+    DROP = "drop"
+
+
+def encode(message: Dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+def snapshot_message(session: DraftSession) -> Dict[str, Any]:
+    return {
+        "type": "snapshot",
+        "session_id": session.id,
+        "order": len(session.actions),
+        "session": session.model_dump(mode="json"),
+    }
+
+
+def session_created_message(session: DraftSession) -> Dict[str, Any]:
+    return {
+        "type": "session_created",
+        "session_id": session.id,
+        "order": 0,
+        "session": session.model_dump(
+            mode="json",
+            include={"id", "created_at", "blue_team_players", "red_team_players",
+                     "current_phase", "current_team", "is_tournament_draft", "patch_version"},
+        ),
+    }
+
+
+def action_message(action: DraftAction) -> Dict[str, Any]:
+    phase, team = turn(action.order)
+    return {
+        "type": "action",
+        "session_id": action.session_id,
+        "order": action.order,
+        "action": action.model_dump(mode="json", exclude={"session_id"}),
+        "changes": {
+            "current_phase": phase,
+            "current_team": team,
+            "current_action_order": action.order + 1,
+        },
+    }
+
+
+class Subscriber:
+    """One connection: a bounded send queue drained by its own task"""
+
+    def __init__(
+        self,
+        websocket: Any,
+        session_id: str,
+        queue_size: int,
+        policy: SlowConsumerPolicy,
+        on_close: Callable[["Subscriber"], None],
+    ):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.policy = policy
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+        self.closed = False
+        self._on_close = on_close
+        self._task = asyncio.create_task(self._pump())
+
+    def offer(self, payload: str) -> bool:
+        """Queue without waiting; False if the message was not queued"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            if self.policy == SlowConsumerPolicy.DROP:
+                self.dropped += 1
+            else:
+                self.close(CLOSE_SLOW_CONSUMER)
+            return False
+
+    async def _pump(self) -> None:
+        try:
+            while True:
+                payload = await self.queue.get()
+                await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"WebSocket send failed for session {self.session_id}: {e}")
+        finally:
+            if not self.closed:
+                self.closed = True
+                self._on_close(self)
+
+    def close(self, code: int = 1000) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._task.cancel()
+        self._on_close(self)
+        asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+
+class Backplane(Protocol):
+    """Cross-instance pub/sub; ``publish`` must not block the caller"""
+
+    async def start(self, deliver: Callable[[str, str], int]) -> None:
+        ...
+
+    def publish(self, session_id: str, payload: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class RedisBackplane:
+    """Redis pub/sub backplane: one channel per session under ``prefix``
+
+    Published payloads are tagged with this instance's id so an instance
+    ignores its own messages. Outgoing messages go through a bounded
+    outbox drained by one task.
+    """
+
+    def __init__(self, client: Any, prefix: str = "lolws:", outbox_size: int = 10000):
+        self.client = client
+        self.prefix = prefix
+        self.instance_id = uuid.uuid4().hex
+        self._outbox: asyncio.Queue = asyncio.Queue(outbox_size)
+        self._tasks: list = []
+
+    @classmethod
+    def from_url(cls, url: str) -> Optional["RedisBackplane"]:
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("redis package not installed, running without WebSocket backplane")
+            return None
+        return cls(redis_asyncio.from_url(url))
+
+    async def start(self, deliver: Callable[[str, str], int]) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        self._tasks = [
+            asyncio.create_task(self._listen(pubsub, deliver)),
+            asyncio.create_task(self._send()),
+        ]
+
+    def publish(self, session_id: str, payload: str) -> None:
+        try:
+            self._outbox.put_nowait((session_id, payload))
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket backplane outbox full, dropping message for {session_id}")
+
+    async def _send(self) -> None:
+        while True:
+            session_id, payload = await self._outbox.get()
+            try:
+                await self.client.publish(
+                    f"{self.prefix}{session_id}", f"{self.instance_id}\n{payload}"
+                )
+            except Exception as e:
+                logger.warning(f"WebSocket backplane publish failed: {e}")
+
+    async def _listen(self, pubsub: Any, deliver: Callable[[str, str], int]) -> None:
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel, data = message["channel"], message["data"]
+                    if isinstance(channel, bytes):
+                        channel, data = channel.decode(), data.decode()
+                    sender, _, payload = data.partition("\n")
+                    if sender != self.instance_id:
+                        deliver(channel[len(self.prefix):], payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket backplane listener failed, resubscribing: {e}")
+                await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        try:
+            await self.client.close()
+        except Exception:
+            pass
+
+
+class WebSocketHub:
+    """Session channels with once-per-broadcast serialization"""
+
+    def __init__(
+        self,
+        queue_size: int = 64,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DISCONNECT,
+        backplane: Optional[Backplane] = None,
+    ):
+        self.queue_size = queue_size
+        self.policy = SlowConsumerPolicy(policy)
+        self.backplane = backplane
+        self.channels: Dict[str, Set[Subscriber]] = {}
+        self.stats = {"broadcasts": 0, "queued": 0, "rejected": 0, "disconnected": 0}
+
+    @classmethod
+    def from_settings(cls) -> "WebSocketHub":
+        backplane = None
+        if settings.WS_BACKPLANE_URL:
+            backplane = RedisBackplane.from_url(settings.WS_BACKPLANE_URL)
+        return cls(settings.WS_SEND_QUEUE_SIZE, settings.WS_SLOW_CONSUMER_POLICY, backplane)
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subscribers) for subscribers in self.channels.values())
+
+    def subscribe(self, session_id: str, websocket: Any, first: Optional[str] = None) -> Subscriber:
+        """Join a channel; ``first`` is queued before any broadcast can be"""
+        subscriber = Subscriber(
+            websocket, session_id, self.queue_size, self.policy, self._unsubscribe
+        )
+        if first is not None:
+            subscriber.offer(first)
+        self.channels.setdefault(session_id, set()).add(subscriber)
+        return subscriber
+
+    def _unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self.channels.get(subscriber.session_id)
+        if subscribers is None or subscriber not in subscribers:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.channels[subscriber.session_id]
+
+    def deliver(self, session_id: str, payload: str) -> int:
+        """Queue an encoded message for this instance's subscribers"""
+        queued = 0
+        for subscriber in list(self.channels.get(session_id, ())):
+            if subscriber.offer(payload):
+                queued += 1
+            else:
+                self.stats["rejected"] += 1
+                if subscriber.closed:
+                    self.stats["disconnected"] += 1
+        self.stats["queued"] += queued
+        return queued
+
+    def broadcast(self, session_id: str, message: Dict[str, Any]) -> int:
+        """Encode once and fan out locally and through the backplane"""
+        payload = encode(message)
+        self.stats["broadcasts"] += 1
+        if self.backplane is not None:
+            self.backplane.publish(session_id, payload)
+        return self.deliver(session_id, payload)
+
+    async def start(self) -> None:
+        if self.backplane is not None:
+            await self.backplane.start(self.deliver)
+
+    async def close(self) -> None:
+        for subscribers in list(self.channels.values()):
+            for subscriber in list(subscribers):
+                subscriber.close(1001)
+        if self.backplane is not None:
+            await self.backplane.close()
+
+
+websocket_hub = WebSocketHub.from_settings()
+
+
+class WebSocketService:
+    """Draft event broadcasts; callers return as soon as messages are queued"""
+
+    @staticmethod
+    def connect(session: DraftSession, websocket: Any) -> Subscriber:
+        """Subscribe an accepted socket, starting it with a full snapshot"""
+        return websocket_hub.subscribe(session.id, websocket, encode(snapshot_message(session)))
+
+    @staticmethod
+    async def broadcast_session_created(session: DraftSession) -> int:
+        return websocket_hub.broadcast(session.id, session_created_message(session))
+
+    @staticmethod
+    async def broadcast_action(session_id: str, action: DraftAction) -> int:
+        return websocket_hub.broadcast(session_id, action_message(action))
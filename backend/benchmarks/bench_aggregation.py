@@ -0,0 +1,65 @@
+"""Columnar aggregation of participant rows into stats tables and matrices
+
+    python -m benchmarks.bench_aggregation [--rows 10000000] [--chunk 1000000]
+
+Writes synthetic match chunks to a temp directory, then times merging them
+memory-mapped into the running sums and building the ChampionStatsTable
+and every per-role MatchupMatrices for the slice.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.aggregation import PARTICIPANTS, AggregationEngine
+from app.services.matchup_store import ROLES
+from benchmarks.synthetic import PATCH, RANK_TIER, make_match_chunk
+
+
+def run(rows: int, chunk_rows: int) -> None:
+    matches_per_chunk = chunk_rows // PARTICIPANTS
+    chunks = max(1, rows // chunk_rows)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        for i in range(chunks):
+            make_match_chunk(matches_per_chunk, seed=i).save(Path(directory) / f"chunk-{i + 1:06d}")
+        print(f"generated {chunks} chunks x {chunk_rows} rows in "
+              f"{time.perf_counter() - start:.1f}s")
+
+        engine = AggregationEngine(directory)
+        start = time.perf_counter()
+        merged = engine.refresh()
+        merge_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = engine.stats_table(PATCH, RANK_TIER)
+        for role in (None, *ROLES):
+            engine.matchup_matrices(PATCH, RANK_TIER, role)
+        build_time = time.perf_counter() - start
+
+        # Incremental: one more chunk lands
+        make_match_chunk(matches_per_chunk, seed=chunks).save(
+            Path(directory) / f"chunk-{chunks + 1:06d}"
+        )
+        start = time.perf_counter()
+        engine.refresh()
+        increment_time = time.perf_counter() - start
+
+    total_rows = merged * PARTICIPANTS
+    print(f"merged {total_rows:,} participant rows in {merge_time:.2f}s "
+          f"({total_rows / merge_time / 1e6:.1f}M rows/s)")
+    print(f"built stats table ({len(table.index)} champions) and "
+          f"{len(ROLES) + 1} matchup slices in {build_time * 1000:.0f} ms")
+    print(f"incremental merge of {chunk_rows:,} new rows in {increment_time:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Champion catalog refresh: full re-download vs conditional delta refresh
+
+    python -m benchmarks.bench_catalog_refresh [--champions 170] [--changed 3]
+
+Against the local Data Dragon stub, compares the full
+``RiotService.update_champion_data`` with ``CatalogRefresher`` run as a
+background job: first load, no-change refresh (one 304), and a new patch
+with ``--changed`` modified champions. Checks that unchanged champions
+keep their ``last_updated`` and that a no-change refresh leaves the
+catalog version alone.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.services.catalog_refresh import catalog_refresh_jobs
+from app.services.champion_catalog import champion_catalog
+from app.services.riot_service import RiotService
+from benchmarks import synthetic
+from benchmarks.ddragon_stub import DataDragonStub
+
+
+async def timed_job(stub: DataDragonStub):
+    served, bytes_sent = stub.served + stub.not_modified, stub.bytes_sent
+    start = time.perf_counter()
+    job = catalog_refresh_jobs.start()
+    await catalog_refresh_jobs.wait()
+    elapsed = time.perf_counter() - start
+    if job.status != "succeeded":
+        raise SystemExit(f"refresh failed: {job.error}")
+    return job, elapsed, stub.served + stub.not_modified - served, stub.bytes_sent - bytes_sent
+
+
+async def run(n_champions: int, n_changed: int) -> None:
+    settings.DDRAGON_BASE_URL = "http://ddragon.local"
+    stub = DataDragonStub(settings.DDRAGON_REALM)
+    champions = synthetic.make_champions(n_champions)
+    stub.publish("14.19.1", champions)
+    await RiotService.initialize(httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)))
+
+    print(f"{'refresh':>26} {'ms':>8} {'requests':>9} {'bytes':>10} {'changed':>8}")
+    start, before = time.perf_counter(), stub.bytes_sent
+    await RiotService().update_champion_data()
+    print(f"{'full (update_champion_data)':>26} {(time.perf_counter() - start) * 1000:>8.2f} "
+          f"{2:>9} {stub.bytes_sent - before:>10,} {'all':>8}")
+
+    champion_catalog.load([], patch=None)
+    rows = []
+    job, elapsed, requests, sent = await timed_job(stub)
+    rows.append(("delta, first load", job, elapsed, requests, sent))
+    loaded = {c.id: c.last_updated for c in champion_catalog.all()}
+
+    catalog_version = champion_catalog.version
+    job, elapsed, requests, sent = await timed_job(stub)
+    rows.append(("delta, no change", job, elapsed, requests, sent))
+    if champion_catalog.version != catalog_version or not job.not_modified or requests != 1:
+        raise SystemExit("no-change refresh touched the catalog or made extra requests")
+
+    for champion in champions[:n_changed]:
+        champion.tags = champion.tags[::-1] + ["Patched"]
+    stub.publish("14.20.1", champions)
+    job, elapsed, requests, sent = await timed_job(stub)
+    rows.append(("delta, new patch", job, elapsed, requests, sent))
+    kept = sum(
+        1 for c in champion_catalog.all()
+        if c.id not in job.changed and loaded.get(c.id) == c.last_updated
+    )
+    if len(job.changed) != n_changed or kept != n_champions - n_changed:
+        raise SystemExit(f"expected {n_changed} changed champions, got {job.changed} ({kept} kept)")
+
+    for name, job, elapsed, requests, sent in rows:
+        changed = len(job.added) + len(job.changed) + len(job.removed)
+        print(f"{name:>26} {elapsed * 1000:>8.2f} {requests:>9} {sent:>10,} {changed:>8}")
+    await RiotService.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--champions", type=int, default=synthetic.N_CHAMPIONS)
+    parser.add_argument("--changed", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.champions, args.changed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Champion search latency: linear scan vs ChampionSearchIndex
+
+    python -m benchmarks.bench_champion_search [--repeat 2000]
+
+Uses 170 synthetic champions with generated names, the pick rates of the
+synthetic stats table, and a typical pick-search workload: every
+keystroke of a name, with and without role/tag filters and a set of 10
+picked/banned champions to hide, plus typo'd names.
+"""
+import argparse
+import random
+import time
+
+from app.services.champion_search import ChampionSearchIndex, ids_to_bits
+from benchmarks import synthetic
+
+SYLLABLES = ["ka", "ri", "zen", "mor", "ga", "na", "thu", "xe", "lo", "vi", "sha", "dra",
+             "quin", "el", "ya", "suo", "ahr", "ix", "tal", "on"]
+
+
+def make_named_champions(seed: int = 0):
+    rng = random.Random(seed)
+    champions = synthetic.make_champions()
+    names = set()
+    for champion in champions:
+        while True:
+            name = "".join(rng.sample(SYLLABLES, rng.choice([2, 3]))).capitalize()
+            if name not in names:
+                break
+        names.add(name)
+        champion.name, champion.key = name, name
+    return champions
+
+
+def scan(champions, query=None, role=None, tags=(), exclude=()):
+    """The previous implementation plus the new filters, as a baseline"""
+    result = [c for c in champions if c.id not in exclude]
+    if role:
+        result = [c for c in result if role in c.roles]
+    for tag in tags:
+        result = [c for c in result if tag in c.tags]
+    if query:
+        result = [c for c in result if query.lower() in c.name.lower()]
+    return sorted(result, key=lambda c: c.name)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    champions = make_named_champions()
+    stats = synthetic.make_stats_table(champions)
+    start = time.perf_counter()
+    index = ChampionSearchIndex(champions, stats)
+    print(f"index build {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"{len(index.prefixes)} prefixes, {len(index.trigrams)} trigrams")
+
+    rng = random.Random(1)
+    name = champions[7].name
+    taken = rng.sample([c.id for c in champions], 10)
+    typo = name[:2] + name[3] + name[2] + name[4:]
+    cases = [
+        ("no filters", {}),
+        ("role", {"role": "mid"}),
+        ("role + tag + taken", {"role": "mid", "tags": ["Mage"], "exclude": taken}),
+    ]
+    cases += [(f"query {name[:n]!r}", {"query": name[:n]}) for n in (1, 2, 4)]
+    cases += [(f"query {name[:3]!r} + role + taken", {"query": name[:3], "role": "mid", "exclude": taken})]
+    cases += [(f"typo {typo!r}", {"query": typo})]
+
+    print(f"{'case':>36} {'scan us':>8} {'index us':>9} {'results':>8}")
+    for label, kwargs in cases:
+        exclude = kwargs.get("exclude", ())
+        bits = ids_to_bits(exclude)
+        indexed = dict(kwargs, exclude=bits)
+        scan_us = timed(lambda: scan(champions, **kwargs), args.repeat)
+        index_us = timed(lambda: index.search(**indexed, limit=20), args.repeat)
+        found = index.search(**indexed, limit=20)
+        print(f"{label:>36} {scan_us:>8.1f} {index_us:>9.1f} {len(found):>8}")
+    print(f"typo {typo!r} -> {[c.name for c in index.search(typo, limit=3)]}")
+
+
+if __name__ == "__main__":
+    main()
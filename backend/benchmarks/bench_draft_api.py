@@ -0,0 +1,126 @@
+"""End-to-end draft replay through the HTTP API, in process
+
+    python -m benchmarks.bench_draft_api [--drafts 2000] [--concurrency 200] [--output api.json]
+
+Mounts the draft router on a bare FastAPI app (no Riot, no network) with
+synthetic data from ``benchmarks.fakes``, a session backend with a
+simulated round trip and a FakeRiotService answering the player pool
+prefetches. Each draft creates a session, then for all 20
+actions asks ``/session/{id}/suggestions`` for the acting team and posts
+the top suggestion to ``/session/{id}/action``. ``--concurrency`` drafts
+run at once. Reports p50/p99 per endpoint and overall requests/s, and
+checks every draft completed.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import draft
+from app.services.draft_state import DRAFT_ORDER
+from app.services.player_pools import player_pools
+from app.services.session_store import session_store
+from benchmarks import fakes, results, synthetic
+
+PREFIX = "/api/v1/draft"
+PLAYERS = [f"Player{i}#BENCH" for i in range(200)]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(draft.router, prefix=PREFIX)
+    return app
+
+
+async def replay(client: httpx.AsyncClient, latencies: Dict[str, List[float]], rng: random.Random):
+    async def call(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        latencies[name].append(time.perf_counter() - start)
+        response.raise_for_status()
+        return response
+
+    players = rng.sample(PLAYERS, 10)
+    session = (await call("create", "POST", f"{PREFIX}/session", json={
+        "blue_team": players[:5], "red_team": players[5:],
+    })).json()
+    base = f"{PREFIX}/session/{session['id']}"
+    for _, team, action_type in DRAFT_ORDER:
+        suggestions = (await call("suggestions", "GET", f"{base}/suggestions",
+                                  params={"team": team})).json()
+        # Mostly follow the engine, sometimes the runner-up, like a real drafter
+        choice = suggestions[min(len(suggestions) - 1, rng.random() < 0.3)]
+        await call("action", "POST", f"{base}/action", params={
+            "champion_id": choice["champion_id"], "action_type": action_type, "team": team,
+        })
+    return session["id"]
+
+
+async def run(drafts: int, concurrency: int, backend_latency: float) -> Dict[str, Dict[str, float]]:
+    champions = fakes.install()
+    player_pools.riot = fakes.FakeRiotService(
+        champions, synthetic.make_player_fixtures(PLAYERS), latency=backend_latency
+    )
+    session_store.backend = fakes.LatencyBackend(backend_latency)
+    await session_store.start()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    limit = asyncio.Semaphore(concurrency)
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=make_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench.local") as client:
+        async def one():
+            async with limit:
+                return await replay(client, latencies, rng)
+
+        await replay(client, defaultdict(list), rng)
+        start = time.perf_counter()
+        session_ids = await asyncio.gather(*(one() for _ in range(drafts)))
+        elapsed = time.perf_counter() - start
+
+    await session_store.close()
+    archived = sum(1 for session_id in session_ids if session_id in session_store.backend.archive)
+
+    summary = {}
+    requests = sum(len(seconds) for seconds in latencies.values())
+    print(f"drafts={drafts} concurrency={concurrency} requests={requests} "
+          f"wall={elapsed:.2f}s archived={archived}/{drafts}")
+    print(f"{'endpoint':>12} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, seconds in latencies.items():
+        row = results.summarize(seconds)
+        # Per-endpoint rates overlap under concurrency; only overall throughput is meaningful
+        del row["ops_per_s"]
+        summary[f"draft_api.{name}"] = row
+        print(f"{name:>12} {row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+    summary["draft_api.total"] = {
+        "requests_per_s": round(requests / elapsed, 1),
+        "drafts_per_s": round(drafts / elapsed, 2),
+    }
+    print(f"throughput: {requests / elapsed:,.0f} requests/s, {drafts / elapsed:,.1f} drafts/s")
+    if archived != drafts:
+        raise SystemExit(f"only {archived} of {drafts} drafts were archived")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--drafts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--backend-latency", type=float, default=0.005)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+    summary = asyncio.run(run(args.drafts, args.concurrency, args.backend_latency))
+    if args.output:
+        results.write(
+            args.output, "draft_api", summary, drafts=args.drafts,
+            concurrency=args.concurrency, backend_latency=args.backend_latency,
+        )
+
+
+if __name__ == "__main__":
+    main()
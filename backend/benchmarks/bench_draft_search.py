@@ -0,0 +1,88 @@
+"""Lookahead draft search: iterations per budget and subtree reuse
+
+    python -m benchmarks.bench_draft_search [--budget-ms 200] [--drafts 3]
+
+Plays full drafts where blue searches every turn through the process pool
+(one session per draft) and red answers with the highest pick/ban rate.
+Reports per-turn iterations, visits carried over from the previous turn
+and request latency against the budget.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import numpy as np
+
+from app.ml.win_predictor import WinPredictor
+from app.models.draft import DraftState
+from app.services.draft_search import SearchModel, draft_search
+from app.services.draft_state import ACTION_SLOTS, DRAFT_ORDER, DraftKey, turn
+from app.services.suggestion_engine import SuggestionEngine
+from benchmarks import synthetic
+from benchmarks.bench_win_prediction import train
+
+
+async def play(model: SearchModel, budget: float, rows: list) -> None:
+    engine = model.engine
+    session_id = uuid.uuid4().hex
+    phase, team = turn(0)
+    key = DraftKey.from_state(DraftState(current_phase=phase, current_team=team))
+    for order, (_, team, action) in enumerate(DRAFT_ORDER):
+        if team == "blue":
+            start = time.perf_counter()
+            result = await draft_search.search(model, key, session_id, budget, 1)
+            latency = time.perf_counter() - start
+            champion_id = result["moves"][0]["champion_id"]
+            rows.append((order, result["iterations"], result["reused_visits"], latency))
+        else:
+            rates = engine.ban_rate if action == "ban" else engine.pick_rate
+            ranked = engine.index.ids[np.argsort(-rates)]
+            champion_id = next(int(c) for c in ranked if not key.occupied >> int(c) & 1)
+        key = key.apply(ACTION_SLOTS[(action, team)], champion_id, *turn(order + 1))
+
+
+async def run(budget_ms: float, drafts: int) -> None:
+    champions = synthetic.make_champions()
+    engine = SuggestionEngine(
+        synthetic.make_matrices(champions),
+        synthetic.make_stats_table(champions),
+        synthetic.make_catalog(champions),
+    )
+    predictor = WinPredictor.from_artifact(train())
+    model = SearchModel(engine, predictor, branching=8)
+
+    start = time.perf_counter()
+    draft_search.start()
+    await draft_search.search(model, DraftKey.from_state(
+        DraftState(current_phase=turn(0)[0], current_team=turn(0)[1])
+    ), None, 0.001, 1)
+    print(f"worker startup + model shipping {time.perf_counter() - start:.2f} s")
+
+    rows = []
+    for _ in range(drafts):
+        await play(model, budget_ms / 1000.0, rows)
+    draft_search.shutdown()
+
+    print(f"{'action':>6} {'iterations':>10} {'reused':>8} {'latency ms':>11}")
+    by_order = {}
+    for order, iterations, reused, latency in rows:
+        by_order.setdefault(order, []).append((iterations, reused, latency))
+    for order, values in sorted(by_order.items()):
+        iterations, reused, latency = np.mean(values, axis=0)
+        print(f"{order:>6} {iterations:>10.0f} {reused:>8.0f} {latency * 1000:>11.1f}")
+    latencies = np.array([r[3] for r in rows]) * 1000
+    print(f"latency p50 {np.percentile(latencies, 50):.1f} ms, "
+          f"p99 {np.percentile(latencies, 99):.1f} ms (budget {budget_ms:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    parser.add_argument("--drafts", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.budget_ms, args.drafts))
+
+
+if __name__ == "__main__":
+    main()
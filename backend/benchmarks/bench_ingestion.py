@@ -0,0 +1,84 @@
+"""Match-v5 ingestion throughput and crash/resume against the local stub
+
+    python -m benchmarks.bench_ingestion [--players 50] [--matches 20]
+
+Crawls synthetic match histories through the rate-limited RiotService,
+kills the first run part-way through, resumes from the checkpoint and
+checks every unique match was aggregated exactly once.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from app.core.config import settings
+from app.services.ingestion import IngestionPipeline, ListSink
+from app.services.riot_service import RiotService
+from benchmarks.riot_stub import RiotStub
+from benchmarks.synthetic import RANK_TIER, make_match_fixtures
+
+
+async def crawl(stub: RiotStub, checkpoint_dir: str, seeds, sink, matches: int, stop_after=None):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub))
+    await RiotService.initialize(client)
+    pipeline = IngestionPipeline(
+        RiotService(), sink, checkpoint_dir, RANK_TIER,
+        matches_per_player=matches, checkpoint_every=50,
+    )
+    task = asyncio.create_task(pipeline.run(seeds))
+    try:
+        if stop_after is None:
+            return await task
+        while pipeline.stats["processed"] < stop_after and not task.done():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return pipeline.progress()
+    finally:
+        await RiotService.cleanup()
+
+
+async def run(players: int, matches: int, latency: float) -> None:
+    settings.RIOT_BURST_RATE_LIMIT = 500
+    settings.RIOT_RATE_LIMIT = 30000
+    settings.RIOT_REGION_URL = "http://riot.local/{region}"
+    fixtures = make_match_fixtures(players, matches)
+    unique = sum(1 for path in fixtures if not path.endswith("/ids"))
+    seeds = [f"puuid-{p}" for p in range(players)]
+    stub = RiotStub(app_limits=[(500, 1.0), (30000, 120.0)], latency=latency)
+    stub.fixtures = fixtures
+    sink = ListSink()
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        start = time.perf_counter()
+        first = await crawl(stub, checkpoint_dir, seeds, sink, matches, stop_after=unique // 2)
+        print(f"run 1 killed after {first['processed']} matches")
+        second = await crawl(stub, checkpoint_dir, seeds, sink, matches)
+        elapsed = time.perf_counter() - start
+
+    counts = Counter(m.match_id for m in sink.matches)
+    repeated = sum(c - 1 for c in counts.values())
+    print(f"run 2 processed {second['processed']} matches, "
+          f"{second['duplicates']} duplicate ids dropped at discovery")
+    print(f"unique={unique} aggregated={len(counts)} re-aggregated_after_crash={repeated}")
+    print(f"elapsed={elapsed:.2f}s throughput={len(sink.matches) / elapsed:.0f} matches/s "
+          f"requests={stub.served} rejected_429={stub.rejected}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+    asyncio.run(run(args.players, args.matches, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Micro-benchmarks for the suggestion path building blocks
+
+    python -m benchmarks.bench_micro [--repeat 200] [--output micro.json]
+
+Cases, each reported as p50/p99 per call and calls/s:
+
+- ``suggestions.score_1000``: scoring 1,000 draft states + top-k
+- ``suggestions.single_state_cached``: one ``suggest_states`` call as /suggestions
+  makes it, answered from the transposition cache after the first run
+- ``role_assignment.fit_1000``: exact role fit of every champion against 1,000 teams
+- ``composition.replay_10_picks``: a session's accumulators rebuilt from its actions
+- ``composition.analysis``: ``TeamComposition`` for one team
+- ``serialization.*``: FastJSONResponse bodies for a draft session and suggestions
+
+Write ``--output`` files from two commits and diff them with
+``python -m benchmarks.results compare``.
+"""
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from app.api.responses import FastJSONResponse
+from app.models.draft import DraftSession, DraftState, DraftSuggestion
+from app.services.composition import SessionComposition, get_composition_profiles
+from app.services.suggestion_engine import get_suggestion_engine
+from benchmarks import fakes, results, synthetic
+from benchmarks.bench_serialization import completed_session
+
+
+def timings(fn: Callable[[], object], repeat: int) -> List[float]:
+    fn()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def run(repeat: int, states: int) -> Dict[str, Dict[str, float]]:
+    champions = fakes.install()
+    engine = get_suggestion_engine(synthetic.PATCH, synthetic.RANK_TIER)
+    batch = synthetic.make_draft_batch(len(engine.index), states)
+    session = completed_session(champions)
+    profiles = get_composition_profiles(synthetic.PATCH, synthetic.RANK_TIER)
+    composition = SessionComposition(profiles)
+    for action in session.actions:
+        composition.apply(action)
+    state = DraftState(
+        blue_picks=session.blue_picks[:3], red_picks=session.red_picks[:2],
+        blue_bans=session.blue_bans, red_bans=session.red_bans,
+        current_phase="picks_2", current_team="red",
+    )
+    suggestions = engine.suggest_states([state])[0]
+
+    def score():
+        scores, _ = engine.score(batch)
+        engine.top(scores, 5)
+
+    def replay():
+        rebuilt = SessionComposition(profiles)
+        for action in session.actions:
+            rebuilt.apply(action)
+
+    def analysis():
+        # Drop the cached composition so the analysis is rebuilt
+        composition.teams["blue"]._cached = None
+        composition.analysis("blue")
+
+    team_picks = batch.picks[:, 0]
+    cases = {
+        "suggestions.score_1000": (score, max(1, repeat // 10)),
+        "suggestions.single_state_cached": (lambda: engine.suggest_states([state]), repeat),
+        "role_assignment.fit_1000": (lambda: engine.roles.fit(team_picks), max(1, repeat // 10)),
+        "composition.replay_10_picks": (replay, repeat),
+        "composition.analysis": (analysis, repeat),
+        "serialization.draft_session": (lambda: FastJSONResponse(session, DraftSession).body, repeat),
+        "serialization.suggestions": (
+            lambda: FastJSONResponse(suggestions, List[DraftSuggestion]).body, repeat
+        ),
+    }
+    summary = {}
+    print(f"{'case':>30} {'p50 ms':>9} {'p99 ms':>9} {'calls/s':>10}")
+    for name, (fn, runs) in cases.items():
+        summary[name] = results.summarize(timings(fn, runs))
+        row = summary[name]
+        print(f"{name:>30} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f} {row['ops_per_s']:>10,.0f}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--states", type=int, default=1000)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+    summary = run(args.repeat, args.states)
+    if args.output:
+        results.write(args.output, "micro", summary, repeat=args.repeat, states=args.states)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Sustained Riot API throughput at the rate limit against the local stub
+
+    python -m benchmarks.bench_riot_scheduler [--requests 300]
+
+Uses scaled-down windows (10/1s, 40/5s) so the long window is exercised in
+seconds. Reports achieved rate vs the limit, 429s seen, and queue wait for
+live-draft vs background requests.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+from app.core.config import settings
+from app.services.riot_service import Priority, RiotService
+from benchmarks.riot_stub import RiotStub
+
+
+async def run(total: int, live_every: int) -> None:
+    settings.RIOT_BURST_RATE_LIMIT = 10
+    settings.RIOT_RATE_LIMIT = 40
+    settings.RIOT_RATE_LIMIT_WINDOW = 5
+    settings.RIOT_REGION_URL = "http://riot.local/{region}"
+    stub = RiotStub(
+        app_limits=[(10, 1.0), (40, 5.0)],
+        method_limits={"/lol/match/v5/matches/": [(30, 5.0)]},
+    )
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub))
+    await RiotService.initialize(client)
+    service = RiotService()
+
+    async def timed(i: int, priority: Priority):
+        start = time.perf_counter()
+        method = "match-v5.getMatch" if i % 2 else "match-v5.getMatchIds"
+        path = f"/lol/match/v5/matches/NA1_{i}" if i % 2 else f"/lol/match/v5/by-puuid/p{i}/ids"
+        await service.request(path, method, priority=priority)
+        return priority, time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        timed(i, Priority.LIVE_DRAFT if i % live_every == 0 else Priority.BACKGROUND)
+        for i in range(total)
+    ])
+    elapsed = time.perf_counter() - start
+    await RiotService.cleanup()
+
+    live = np.array([t for p, t in results if p == Priority.LIVE_DRAFT]) * 1000
+    background = np.array([t for p, t in results if p == Priority.BACKGROUND]) * 1000
+    print(f"requests={total} elapsed={elapsed:.2f}s rate={total / elapsed:.2f}/s "
+          f"(limit 40 per 5 s window)")
+    print(f"served={stub.served} rejected_429={stub.rejected}")
+    print(f"live p50={np.percentile(live, 50):.0f} ms p99={np.percentile(live, 99):.0f} ms")
+    print(f"background p50={np.percentile(background, 50):.0f} ms "
+          f"p99={np.percentile(background, 99):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=120)
+    parser.add_argument("--live-every", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.live_every))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Role assignment: batched bitmask DP vs brute-force permutations
+
+    python -m benchmarks.bench_role_assignment [--teams 1000] [--output roles.json]
+
+For ``--teams`` random partial teams, scores every champion as the next
+pick (the suggestion path's role fit) with ``RoleAssigner.fit`` and,
+on a sample, with per-candidate permutation search, checking both agree.
+Also times ``expected_roles`` (the enemy's role distribution) and single
+team ``assign``.
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from app.services.role_assignment import N_ROLES, RoleAssigner
+from benchmarks import results, synthetic
+
+
+def brute_force_fit(assigner: RoleAssigner, team: list) -> np.ndarray:
+    """Fit of every champion by trying every role permutation per candidate"""
+    log_share = assigner.log_share
+
+    def best(members):
+        return max(
+            sum(log_share[c, r] for c, r in zip(members, roles))
+            for roles in itertools.permutations(range(N_ROLES), len(members))
+        )
+
+    if len(team) >= N_ROLES:
+        return np.zeros(len(log_share))
+    alone = best(team)
+    return np.exp([best(team + [c]) - alone for c in range(len(log_share))])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=20, help="teams checked by brute force")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    champions = synthetic.make_champions()
+    table = synthetic.make_stats_table(champions)
+    assigner = RoleAssigner(table.role_share({c.id: c for c in champions}))
+    picks = synthetic.make_draft_batch(len(champions), args.teams).picks[:, 0]
+
+    def timed(fn, repeat):
+        fn()
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            seconds.append(time.perf_counter() - start)
+        return seconds
+
+    summary = {
+        "role_assignment.fit": results.summarize(timed(lambda: assigner.fit(picks), args.repeat)),
+        "role_assignment.expected_roles": results.summarize(
+            timed(lambda: assigner.expected_roles(picks), args.repeat)
+        ),
+        "role_assignment.assign_one": results.summarize(
+            timed(lambda: assigner.assign([p for p in picks[0] if p >= 0]), args.repeat * 20)
+        ),
+    }
+
+    sample = [[int(p) for p in row if p >= 0] for row in picks[:args.sample]]
+    start = time.perf_counter()
+    expected = [brute_force_fit(assigner, team) for team in sample]
+    brute_seconds = (time.perf_counter() - start) / len(sample)
+    fit, _ = assigner.fit(picks[:args.sample])
+    error = max(float(np.abs(fit[i] - expected[i]).max()) for i in range(len(sample)))
+    summary["role_assignment.brute_force"] = {"per_team_ms": round(brute_seconds * 1000, 4)}
+
+    dp = summary["role_assignment.fit"]
+    print(f"teams={args.teams} champions={len(champions)}")
+    print(f"DP fit, all teams x champions: p50={dp['p50_ms']:.2f} ms p99={dp['p99_ms']:.2f} ms "
+          f"({dp['p50_ms'] * 1000 / args.teams:.1f} us/team)")
+    print(f"brute force: {brute_seconds * 1000:.1f} ms/team "
+          f"(~{brute_seconds * args.teams:.1f} s for all teams), max |diff| {error:.2e}")
+    for name in ("expected_roles", "assign_one"):
+        row = summary[f"role_assignment.{name}"]
+        print(f"{name}: p50={row['p50_ms']:.3f} ms p99={row['p99_ms']:.3f} ms")
+    if error > 1e-4:
+        raise SystemExit("DP and brute force disagree")
+    if args.output:
+        results.write(args.output, "role_assignment", summary, teams=args.teams)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Analytics rollups: cube reads vs stats table scans, incremental refresh, export
+
+    python -m benchmarks.bench_rollups [--patches 24] [--ranks 4] [--champions 170] [--output rollups.json]
+
+Fills the stats store with ``--patches`` x ``--ranks`` synthetic tables and
+measures:
+
+- ``trend.scan`` / ``trend.cube``: one champion's per-patch stats for a
+  rank, from ``ChampionStatsTable.to_stats`` on every patch vs a cube read;
+- ``refresh.full`` / ``refresh.one_table``: building every cube vs
+  refreshing after one table was republished;
+- ``export.ndjson``: streaming every all-ranks rollup row (``ops_per_s``
+  is rows per second).
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from app.services.rollups import ALL_RANKS, RollupStore, ndjson_stream
+from app.services.stats_store import stats_store
+from benchmarks import results, synthetic
+
+RANK_TIERS = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND", "MASTER"]
+
+
+def timings(fn: Callable[[], object], repeat: int) -> List[float]:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def run(n_patches: int, n_ranks: int, n_champions: int, repeat: int, output: str) -> None:
+    champions = synthetic.make_champions(n_champions)
+    patches = [f"14.{i + 1}" for i in range(n_patches)]
+    ranks = RANK_TIERS[:n_ranks]
+    for p, patch in enumerate(patches):
+        for r, rank in enumerate(ranks):
+            table = synthetic.make_stats_table(champions, seed=p * len(ranks) + r)
+            table.patch, table.rank_tier = patch, rank
+            stats_store.put(table)
+    rank, champion_id = ranks[-1], champions[0].id
+
+    cases = {}
+
+    def scan():
+        return [stats_store.get(patch, rank).to_stats(champion_id) for patch in patches]
+
+    store = RollupStore()
+    store.refresh()
+    cases["trend.scan"] = results.summarize(timings(scan, repeat))
+    cases["trend.cube"] = results.summarize(timings(lambda: store.cube(rank).trend(champion_id), repeat))
+
+    cases["refresh.full"] = results.summarize(timings(lambda: RollupStore().refresh(), repeat))
+
+    def republish():
+        table = stats_store.get(patches[-1], rank)
+        table.last_updated = table.last_updated.replace(microsecond=(table.last_updated.microsecond + 1) % 10**6)
+        store.refresh()
+
+    cases["refresh.one_table"] = results.summarize(timings(republish, repeat))
+
+    cube = store.cube(ALL_RANKS)
+    rows = int((cube.games > 0).sum())
+
+    def export():
+        for _ in ndjson_stream(cube.export_chunks()):
+            pass
+
+    cases[f"export.ndjson_{rows}_rows"] = results.summarize(timings(export, repeat), rows)
+
+    print(f"{n_patches} patches x {n_ranks} ranks x {n_champions} champions")
+    print(f"{'case':>32} {'p50 ms':>10} {'p99 ms':>10} {'ops/s':>12}")
+    for case, summary in cases.items():
+        print(f"{case:>32} {summary['p50_ms']:>10.3f} {summary['p99_ms']:>10.3f} {summary['ops_per_s']:>12,.0f}")
+    if output:
+        results.write(output, "rollups", cases, patches=n_patches, ranks=n_ranks,
+                      champions=n_champions, repeat=repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patches", type=int, default=24)
+    parser.add_argument("--ranks", type=int, default=4, choices=range(1, len(RANK_TIERS) + 1))
+    parser.add_argument("--champions", type=int, default=synthetic.N_CHAMPIONS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    run(args.patches, args.ranks, args.champions, args.repeat, args.output)
+
+
+if __name__ == "__main__":
+    main()
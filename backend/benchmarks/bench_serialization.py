@@ -0,0 +1,106 @@
+"""Response serialization: FastAPI's default path vs the fast path
+
+    python -m benchmarks.bench_serialization [--repeat 500]
+
+For a 170-champion list and a completed 20-action DraftSession, times
+FastAPI's response_model validation + jsonable_encoder + JSONResponse
+against FastJSONResponse (pydantic-core, no re-validation) and, for the
+champion list, a pre-encoded EncodedCache hit with an ETag check.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from starlette.requests import Request
+
+from app.api.responses import EncodedCache, FastJSONResponse
+from app.models.champion import Champion
+from app.models.draft import DraftAction, DraftSession, TeamComposition, WinPrediction
+from app.services.draft_state import ACTION_SLOTS, DRAFT_ORDER, SLOT_FIELDS, turn
+from benchmarks import synthetic
+
+
+def completed_session(champions: List[Champion]) -> DraftSession:
+    session = DraftSession(id=str(uuid.uuid4()), blue_team_players=["a"] * 5, red_team_players=["b"] * 5)
+    for order, ((_, team, action_type), champion) in enumerate(zip(DRAFT_ORDER, champions), start=1):
+        session.actions.append(DraftAction(
+            id=str(uuid.uuid4()), session_id=session.id, champion_id=champion.id,
+            champion_name=champion.name, action_type=action_type, team=team, order=order,
+        ))
+        getattr(session, SLOT_FIELDS[ACTION_SLOTS[(action_type, team)]]).append(champion.id)
+    session.current_phase, session.current_team = turn(len(DRAFT_ORDER))
+    for team in ("blue", "red"):
+        setattr(session, f"{team}_composition", TeamComposition(
+            team=team, champions=getattr(session, f"{team}_picks"),
+            roles_filled={"top": 1, "jungle": 1, "middle": 1, "bottom": 1, "support": 1},
+            damage_distribution={"physical": 0.5, "magical": 0.4, "true": 0.1},
+            synergy_reasons=["Strong engage"], vulnerabilities=["Weak early game"],
+        ))
+    session.win_prediction = WinPrediction(
+        blue_team_win_rate=0.53, red_team_win_rate=0.47, confidence=0.06,
+        key_factors=["Blue team favored by the model"], model_version="bench-1",
+    )
+    return session
+
+
+def request(etag: str = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def default_path(field, content) -> bytes:
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+
+    champions = synthetic.make_champions()
+    session = completed_session(champions)
+    cases = [
+        ("170 champions", List[Champion], champions),
+        ("20-action draft", DraftSession, session),
+    ]
+    print(f"{'payload':>16} {'bytes':>7} {'default us':>11} {'fast us':>8} {'speedup':>8}")
+    for name, annotation, content in cases:
+        field = create_response_field("response", annotation, mode="serialization")
+        size = len(FastJSONResponse(content, annotation).body)
+        default = timed(lambda: loop.run_until_complete(default_path(field, content)), args.repeat)
+        fast = timed(lambda: FastJSONResponse(content, annotation).body, args.repeat)
+        print(f"{name:>16} {size:>7} {default:>11.0f} {fast:>8.0f} {default / fast:>7.1f}x")
+
+    cache = EncodedCache()
+
+    async def produce():
+        return champions
+
+    encoded = loop.run_until_complete(cache.get_or_encode("champions", produce, List[Champion]))
+    hit = timed(
+        lambda: loop.run_until_complete(
+            cache.get_or_encode("champions", produce, List[Champion])
+        ).response(request()),
+        args.repeat,
+    )
+    revalidated = timed(lambda: encoded.response(request(encoded.etag)), args.repeat)
+    print(f"champion list from EncodedCache: {hit:.0f} us (200), {revalidated:.0f} us (304)")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
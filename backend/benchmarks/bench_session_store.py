@@ -0,0 +1,82 @@
+"""Per-action latency and backend writes: write-through vs write-behind sessions
+
+    python -m benchmarks.bench_session_store [--sessions 200] [--backend sqlite]
+
+Runs full 20-action drafts for many concurrent sessions through
+DraftService, once flushing to the backend after every action and once
+with the write-behind SessionStore, on a temporary SQLite file.
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.champion_catalog import champion_catalog
+from app.services.draft_service import DraftService
+from app.services.draft_state import DRAFT_ORDER
+from app.services.session_store import MemoryBackend, SessionStore, SQLiteBackend
+from benchmarks import synthetic
+
+
+class WriteThroughStore(SessionStore):
+    """Baseline: every action is written before the call returns"""
+
+    async def create(self, session):
+        await super().create(session)
+        await self.flush()
+
+    async def append(self, session, action):
+        await super().append(session, action)
+        await self.flush()
+
+
+async def drive(store: SessionStore, sessions: int, seed: int = 0):
+    rng = random.Random(seed)
+    service = DraftService()
+    service.store = store
+    ids = champion_catalog.ids()
+    latencies = []
+
+    async def draft():
+        session = await service.create_session([], [])
+        free = rng.sample(ids, len(DRAFT_ORDER))
+        for (_, team, action), champion_id in zip(DRAFT_ORDER, free):
+            start = time.perf_counter()
+            await service.add_action(session.id, champion_id, action, team)
+            latencies.append(time.perf_counter() - start)
+            # Players take a moment between actions
+            await asyncio.sleep(rng.random() * 0.01)
+
+    await store.start()
+    start = time.perf_counter()
+    await asyncio.gather(*[draft() for _ in range(sessions)])
+    await store.close()
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+async def run(sessions: int, backend: str) -> None:
+    champion_catalog.load(synthetic.make_champions(), patch=synthetic.PATCH)
+    print(f"{'mode':>14} {'total s':>8} {'p50 ms':>8} {'p99 ms':>8} {'writes':>7}")
+    for name, store_class in (("write-through", WriteThroughStore), ("write-behind", SessionStore)):
+        with tempfile.TemporaryDirectory() as directory:
+            db = SQLiteBackend(f"{directory}/sessions.db") if backend == "sqlite" else MemoryBackend()
+            store = store_class(db)
+            elapsed, p50, p99 = await drive(store, sessions)
+            print(f"{name:>14} {elapsed:>8.2f} {p50:>8.3f} {p99:>8.3f} {db.writes:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--backend", choices=["sqlite", "memory"], default="sqlite")
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.backend))
+
+
+if __name__ == "__main__":
+    main()
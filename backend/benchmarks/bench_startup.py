@@ -0,0 +1,70 @@
+"""Cold import time of the application, with the startup profiler's breakdown
+
+    python -m benchmarks.bench_startup [--module app.main] [--runs 5] [--top 15] [--output startup.json]
+
+Imports ``--module`` (repeatable) in ``--runs`` fresh interpreters with
+``STARTUP_PROFILE=1`` and reports the import wall time (p50/p99) and the
+modules with the highest self time in the median run. Run it from two
+commits and compare the ``--output`` files to track cold start.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks import results
+
+CHILD = """
+import importlib, json, sys, time
+start = time.perf_counter()
+from app.core.startup import startup_profiler
+for name in sys.argv[2:]:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": len(startup_profiler.imports),
+    "slowest": startup_profiler.slowest_imports(int(sys.argv[1])),
+}))
+"""
+
+
+def cold_import(modules: List[str], top: int) -> Dict[str, Any]:
+    env = dict(os.environ, STARTUP_PROFILE="1")
+    env.setdefault("RIOT_API_KEY", "benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD, str(top), *modules],
+        capture_output=True, text=True, env=env,
+    )
+    if completed.returncode:
+        raise SystemExit(f"import failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", action="append")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    modules = args.module or ["app.main"]
+
+    runs = [cold_import(modules, args.top) for _ in range(args.runs)]
+    runs.sort(key=lambda run: run["seconds"])
+    median = runs[len(runs) // 2]
+    summary = results.summarize([run["seconds"] for run in runs])
+
+    print(f"{', '.join(modules)}: {median['modules']} modules, "
+          f"p50 {summary['p50_ms']:.1f} ms, p99 {summary['p99_ms']:.1f} ms over {args.runs} runs")
+    print(f"{'module':>48} {'self ms':>9} {'total ms':>9}")
+    for entry in median["slowest"]:
+        print(f"{entry['module']:>48} {entry['self_ms']:>9.2f} {entry['total_ms']:>9.2f}")
+    if args.output:
+        results.write(args.output, "startup", {"import": summary}, modules=modules, runs=args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Bulk upsert throughput of stat slices through the async database layer
+
+    python -m benchmarks.bench_stats_db [--url sqlite+aiosqlite:///stats.db] [--repeat 5]
+        [--champions 170] [--batch-rows 5000] [--output stats_db.json]
+
+Writes synthetic ``ChampionStatsTable`` and all-roles ``MatchupMatrices``
+slices with ``StatsRepository``: the first write of a slice (inserts),
+then rewrites with a new ``last_updated`` (every row hits the conflict
+path). ``ops_per_s`` is rows per second. By default the database is a
+temporary SQLite file; pass a ``postgresql://`` ``--url`` to measure the
+COPY path. Every slice is read back and compared with what was written.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, List
+
+import numpy as np
+
+from app.core.database import create_engine, health_check
+from app.services.stats_repository import StatsRepository, matchup_columns, metadata, stats_columns
+from benchmarks import results, synthetic
+
+
+async def timed(write: Callable[[], Awaitable[int]], repeat: int) -> List[float]:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await write()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def same(a: np.ndarray, b: np.ndarray) -> bool:
+    return np.allclose(a, b, equal_nan=True)
+
+
+async def run(url: str, n_champions: int, repeat: int, batch_rows: int, output: str) -> None:
+    engine = create_engine(url)
+    repository = StatsRepository(engine, batch_rows=batch_rows)
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await repository.create_tables()
+    print(f"database: {engine.url.render_as_string(hide_password=True)} {await health_check(engine)}")
+
+    champions = synthetic.make_champions(n_champions)
+    table = synthetic.make_stats_table(champions)
+    matrices = synthetic.make_matrices(champions)
+    sizes = {"stats": len(stats_columns(table)["games"]), "matchups": len(matchup_columns(matrices)["win_rate"])}
+
+    async def insert(kind: str) -> int:
+        async with engine.begin() as conn:
+            await conn.execute(metadata.tables[f"champion_{kind}"].delete())
+        return await rewrite(kind)
+
+    async def rewrite(kind: str) -> int:
+        if kind == "stats":
+            table.last_updated += timedelta(seconds=1)
+            return await repository.upsert_stats(table)
+        matrices.last_updated += timedelta(seconds=1)
+        return await repository.upsert_matchups(matrices)
+
+    cases = {}
+    for kind in ("stats", "matchups"):
+        for mode, write in (("insert", insert), ("upsert", rewrite)):
+            seconds = await timed(lambda: write(kind), repeat)
+            cases[f"{kind}.{mode}_{sizes[kind]}_rows"] = results.summarize(seconds, sizes[kind])
+
+    loaded = await repository.load_stats(table.patch, table.rank_tier)
+    if not (same(loaded.games, table.games) and same(loaded.kda, table.kda)
+            and all(same(loaded.metrics[m], table.metrics[m]) for m in table.metrics)):
+        raise SystemExit("stats slice read back differs from the one written")
+    back = await repository.load_matchups(matrices.patch, matrices.rank_tier)
+    if not (same(back.counter_strength, matrices.counter_strength)
+            and same(back.synergy_type, matrices.synergy_type)
+            and same(back.matchup_role, matrices.matchup_role)):
+        raise SystemExit("matchup slice read back differs from the one written")
+    await engine.dispose()
+
+    print(f"{'case':>32} {'p50 ms':>10} {'p99 ms':>10} {'rows/s':>12}")
+    for case, summary in cases.items():
+        print(f"{case:>32} {summary['p50_ms']:>10.2f} {summary['p99_ms']:>10.2f} {summary['ops_per_s']:>12,.0f}")
+    if output:
+        results.write(output, "stats_db", cases, url=url.split("://")[0], champions=n_champions,
+                      repeat=repeat, batch_rows=batch_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url")
+    parser.add_argument("--champions", type=int, default=synthetic.N_CHAMPIONS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-rows", type=int, default=5000)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'stats.db')}"
+        asyncio.run(run(url, args.champions, args.repeat, args.batch_rows, args.output))
+
+
+if __name__ == "__main__":
+    main()
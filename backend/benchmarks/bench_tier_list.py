@@ -0,0 +1,100 @@
+"""Tier list computation: one pass over every slice vs slice by slice, and refreshes
+
+    python -m benchmarks.bench_tier_list [--patches 3] [--ranks 10]
+
+Registers synthetic stats tables for every patch x rank tier, then times
+computing all patch x rank x role tier lists in one stacked pass against
+one call per slice, and ``TierListEngine.refresh`` when nothing changed,
+when a table is republished with identical numbers and when one table's
+stats change.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services import tier_list
+from app.services.stats_store import ChampionStatsTable, StatsStore
+from app.services.tier_list import TierListEngine, compute_tier_lists
+from benchmarks import synthetic
+
+RANKS = [
+    "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM",
+    "EMERALD", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER",
+]
+
+
+def make_table(champions, patch: str, rank_tier: str, seed: int) -> ChampionStatsTable:
+    table = synthetic.make_stats_table(champions, seed)
+    table.patch, table.rank_tier = patch, rank_tier
+    return table
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(patches: int, ranks: int, repeat: int) -> None:
+    champions = synthetic.make_champions()
+    store = StatsStore()
+    tier_list.stats_store = store
+    tables = [
+        make_table(champions, f"14.{19 - p}", rank, seed=p * 100 + r)
+        for p in range(patches)
+        for r, rank in enumerate(RANKS[:ranks])
+    ]
+    for table in tables:
+        store.put(table)
+    slices = len(tables) * 5
+    print(f"{len(tables)} stats tables, {slices} tier lists, {len(champions)} champions")
+
+    one_pass = timed(lambda: compute_tier_lists(tables), repeat)
+    keys = [(t.patch, t.rank_tier, role) for t in tables for role in tier_list.ROLES]
+    per_slice = timed(
+        lambda: [compute_tier_lists([store.get(*key[:2])], {key}) for key in keys], repeat
+    )
+    print(f"one pass    {one_pass:8.2f} ms  ({one_pass / slices * 1000:.0f} us/slice)")
+    print(f"per slice   {per_slice:8.2f} ms  ({per_slice / one_pass:.1f}x slower)")
+
+    engine = TierListEngine()
+    engine.refresh()
+    print(f"refresh, nothing changed       {timed(engine.refresh, repeat * 10) * 1000:8.1f} us")
+
+    def republish():
+        table = tables[0]
+        copy = ChampionStatsTable(table.patch, table.rank_tier, table.index, {
+            **table.metrics, "kda": table.kda, "games": table.games,
+        })
+        store.put(copy)
+        return engine.refresh()
+
+    print(f"refresh, republished unchanged {timed(republish, repeat) * 1000:8.1f} us")
+
+    rng = np.random.default_rng(0)
+    updates = iter([
+        make_table(champions, table.patch, table.rank_tier, seed=1000 + i)
+        for i, table in enumerate(tables[i] for i in rng.integers(len(tables), size=repeat))
+    ])
+
+    def update():
+        store.put(next(updates))
+        return engine.refresh()
+
+    print(f"refresh, one table changed     {timed(update, repeat) * 1000:8.1f} us")
+    print(f"engine stats {engine.stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patches", type=int, default=3)
+    parser.add_argument("--ranks", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.patches, args.ranks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""WebSocket fan-out load test with 10k in-process connections
+
+    python -m benchmarks.bench_websocket_hub [--connections 10000] [--sessions 1000]
+
+Subscribes fake sockets (the send_text/close surface of a Starlette
+WebSocket) spread over draft sessions; a fraction of them are slow
+consumers. Every session then plays a full 20-action draft through
+WebSocketService. Reports the time a request handler spends
+broadcasting, delivery latency, delta vs full-session payload size and
+how many slow consumers were disconnected.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import numpy as np
+
+from app.models.draft import DraftAction, DraftSession
+from app.services import websocket_service
+from app.services.draft_state import DRAFT_ORDER
+from app.services.websocket_service import (
+    WebSocketHub, WebSocketService, action_message, encode, snapshot_message,
+)
+
+
+class FakeSocket:
+    def __init__(self, delay: float, sent_at: dict, latencies: list):
+        self.delay = delay
+        self.sent_at = sent_at
+        self.latencies = latencies
+        self.closed_with = None
+
+    async def send_text(self, payload: str) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        sent = self.sent_at.get(payload)
+        if sent is not None:
+            self.latencies.append(time.perf_counter() - sent)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def run(connections: int, sessions: int, slow_fraction: float, queue_size: int) -> None:
+    rng = random.Random(0)
+    hub = WebSocketHub(queue_size=queue_size)
+    websocket_service.websocket_hub = hub
+    sent_at: dict = {}
+    latencies: list = []
+
+    drafts = [DraftSession(id=str(uuid.uuid4())) for _ in range(sessions)]
+    sockets = []
+    for i in range(connections):
+        slow = rng.random() < slow_fraction
+        socket = FakeSocket(0.05 if slow else 0.0, sent_at, latencies)
+        sockets.append(socket)
+        WebSocketService.connect(drafts[i % sessions], socket)
+    print(f"{hub.connections} connections on {len(hub.channels)} sessions "
+          f"({slow_fraction:.0%} slow, queue {queue_size})")
+
+    # Let every snapshot drain before timing broadcasts
+    await asyncio.sleep(0.5)
+    latencies.clear()
+
+    broadcast_times = []
+    sample = None
+    start = time.perf_counter()
+    for order, (_, team, action_type) in enumerate(DRAFT_ORDER, start=1):
+        for draft in drafts:
+            action = DraftAction(
+                id=str(uuid.uuid4()), session_id=draft.id, champion_id=order,
+                champion_name=f"Champion {order}", action_type=action_type, team=team,
+                order=order,
+            )
+            draft.actions.append(action)
+            sample = action
+            # Key delivery stamps by payload; encode() is deterministic
+            sent_at[encode(action_message(action))] = t0 = time.perf_counter()
+            await WebSocketService.broadcast_action(draft.id, action)
+            broadcast_times.append(time.perf_counter() - t0)
+        await asyncio.sleep(0)
+    while any(not s.queue.empty() for subs in hub.channels.values() for s in subs):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    broadcast_us = np.array(broadcast_times) * 1e6
+    delivery_ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    delta = len(encode(action_message(sample)))
+    full = len(encode(snapshot_message(drafts[-1])))
+    print(f"broadcasts {hub.stats['broadcasts']}, messages queued {hub.stats['queued']} "
+          f"in {elapsed:.2f} s ({hub.stats['queued'] / elapsed:,.0f} msg/s)")
+    print(f"handler time per broadcast p50 {np.percentile(broadcast_us, 50):.0f} us, "
+          f"p99 {np.percentile(broadcast_us, 99):.0f} us")
+    print(f"delivery p50 {np.percentile(delivery_ms, 50):.1f} ms, "
+          f"p99 {np.percentile(delivery_ms, 99):.1f} ms")
+    print(f"payload: delta {delta} B vs full session {full} B at 20 actions")
+    print(f"slow consumers disconnected {hub.stats['disconnected']}, "
+          f"rejected messages {hub.stats['rejected']}")
+    await hub.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--slow-fraction", type=float, default=0.01)
+    parser.add_argument("--queue-size", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.sessions, args.slow_fraction, args.queue_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Win prediction throughput and latency, per-call vs micro-batched
+
+    python -m benchmarks.bench_win_prediction [--requests 2000]
+
+Trains a LogisticRegression on synthetic drafts, then drives it from 1, 10
+and 100 concurrent callers, once calling predict_proba per draft (in the
+default thread pool) and once through WinPredictionService's batcher.
+The transposition cache is cleared before each run.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from app.core.config import settings
+from app.ml.model_manager import ModelManager
+from app.ml.win_predictor import MODEL_NAME, WinPredictionService, WinPredictor
+from app.models.draft import DraftState
+from app.services.draft_state import transposition_cache
+from benchmarks.synthetic import N_CHAMPIONS, make_draft_batch
+
+
+def train(seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    champion_ids = list(range(1, N_CHAMPIONS + 1))
+    strength = rng.normal(0, 0.3, N_CHAMPIONS)
+    x = np.zeros((20000, N_CHAMPIONS), dtype=np.float32)
+    for row in x:
+        drawn = rng.choice(N_CHAMPIONS, 10, replace=False)
+        row[drawn[:5]], row[drawn[5:]] = 1.0, -1.0
+    y = rng.random(len(x)) < 1 / (1 + np.exp(-(x @ strength)))
+    estimator = LogisticRegression(max_iter=500).fit(x, y)
+    return {"estimator": estimator, "champion_ids": champion_ids, "version": "bench-1"}
+
+
+def make_states(count: int) -> list:
+    batch = make_draft_batch(N_CHAMPIONS, count)
+    return [
+        DraftState(
+            blue_picks=[int(c) + 1 for c in batch.picks[i, 0] if c >= 0],
+            red_picks=[int(c) + 1 for c in batch.picks[i, 1] if c >= 0],
+            current_phase="picks_2",
+            current_team="blue",
+        )
+        for i in range(count)
+    ]
+
+
+async def drive(predict, states, concurrency: int):
+    latencies = []
+    per_caller = len(states) // concurrency
+
+    async def caller(offset: int):
+        for state in states[offset:offset + per_caller]:
+            start = time.perf_counter()
+            await predict(state)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[caller(i * per_caller) for i in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+async def run(requests: int) -> None:
+    artifact = train()
+    with tempfile.TemporaryDirectory() as directory:
+        joblib.dump(artifact, f"{directory}/{MODEL_NAME}.joblib")
+        settings.MODEL_DIR = directory
+        await ModelManager.load_models()
+        await ModelManager.get(MODEL_NAME)
+        predictor = WinPredictor.from_artifact(artifact)
+        states = make_states(requests)
+        loop = asyncio.get_running_loop()
+
+        async def unbatched(state):
+            return await loop.run_in_executor(None, predictor.predict, [state])
+
+        print(f"{'callers':>8} {'mode':>10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for concurrency in (1, 10, 100):
+            for mode, predict in (("per-call", unbatched), ("batched", WinPredictionService.predict)):
+                # Every state is new to the model: measure inference, not the cache
+                transposition_cache.clear()
+                rate, p50, p99 = await drive(predict, states, concurrency)
+                print(f"{concurrency:>8} {mode:>10} {rate:>9.0f} {p50:>8.2f} {p99:>8.2f}")
+        batcher = WinPredictionService._batcher
+        print(f"mean batch size {batcher.mean_batch_size:.1f} "
+              f"(max_batch={batcher.max_batch}, max_wait={batcher.max_wait * 1000:.0f} ms)")
+        await ModelManager.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
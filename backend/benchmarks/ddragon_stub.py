@@ -0,0 +1,83 @@
+"""Local stand-in for Data Dragon with ETag / Last-Modified revalidation
+
+Serves the realm manifest (``/realms/{realm}.json``), ``/api/versions.json``
+and ``/cdn/{version}/data/en_US/champion.json`` for synthetic champions,
+answering 304 to a matching ``If-None-Match`` or ``If-Modified-Since``.
+``publish`` swaps in a new version. Use it in-process through
+``httpx.ASGITransport``.
+"""
+import hashlib
+import json
+from email.utils import formatdate
+from typing import Any, Dict, List
+
+from app.models.champion import Champion
+
+
+def ddragon_entry(champion: Champion) -> Dict[str, Any]:
+    """A ``champion.json`` entry shaped like Data Dragon's"""
+    return {
+        "id": champion.key,
+        "key": str(champion.id),
+        "name": champion.name,
+        "title": champion.title,
+        "tags": champion.tags,
+        "info": {"attack": 7, "defense": 4, "magic": 2, "difficulty": champion.difficulty},
+        "image": {"full": f"{champion.key}.png"},
+        "stats": {"attackrange": champion.attack_range},
+    }
+
+
+class DataDragonStub:
+    """ASGI app; ``published`` counts versions, ``served`` / ``not_modified`` count answers"""
+
+    def __init__(self, realm: str = "na"):
+        self.realm = realm
+        self.documents: Dict[str, bytes] = {}
+        self.published = 0
+        self.served = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._modified: Dict[str, str] = {}
+
+    def _put(self, path: str, document: Any) -> None:
+        body = json.dumps(document).encode()
+        if self.documents.get(path) != body:
+            self.documents[path] = body
+            self._modified[path] = formatdate(usegmt=True)
+
+    def publish(self, version: str, champions: List[Champion]) -> None:
+        self.published += 1
+        self._put(f"/realms/{self.realm}.json", {"v": version, "n": {"champion": version}})
+        self._put("/api/versions.json", [version])
+        self._put(f"/cdn/{version}/data/en_US/champion.json", {
+            "type": "champion",
+            "version": version,
+            "data": {c.key: ddragon_entry(c) for c in champions},
+        })
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        headers = dict(scope["headers"])
+        body = self.documents.get(path)
+        if body is None:
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'.encode()
+        modified = self._modified[path].encode()
+        response_headers = [(b"etag", etag), (b"last-modified", modified)]
+        if headers.get(b"if-none-match") == etag or (
+            b"if-none-match" not in headers and headers.get(b"if-modified-since") == modified
+        ):
+            self.not_modified += 1
+            await send({"type": "http.response.start", "status": 304, "headers": response_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        self.served += 1
+        self.bytes_sent += len(body)
+        response_headers.append((b"content-type", b"application/json"))
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
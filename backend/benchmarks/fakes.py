@@ -0,0 +1,91 @@
+"""In-process fakes for running the services without external dependencies
+
+- ``FakeRiotService`` answers ``RiotService`` calls from fixtures, with no
+  network, scheduler or rate limits.
+- ``LatencyBackend`` is the in-memory session backend plus a simulated
+  round trip per batch, standing in for a remote database.
+- ``install`` loads a synthetic catalog, stats table and matchup
+  matrices into the process-wide stores the endpoints read.
+
+The tree has no Firestore, SQL or Vertex AI clients in use: sessions
+persist through ``SessionBackend`` and models load from local artifacts
+(see ``bench_win_prediction.train``), so those are the seams faked here.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.models.champion import Champion
+from app.models.draft import DraftAction, DraftSession
+from app.services.champion_catalog import champion_catalog
+from app.services.matchup_store import matchup_store
+from app.services.riot_service import DEFAULT_REGION, Priority, RiotAPIError, RiotService
+from app.services.session_store import MemoryBackend
+from app.services.stats_store import stats_store
+from benchmarks import synthetic
+
+
+class FakeRiotService(RiotService):
+    """RiotService serving fixtures (path -> JSON) and a fixed champion list"""
+
+    def __init__(
+        self,
+        champions: List[Champion],
+        fixtures: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+    ):
+        self.champions = champions
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.requests = 0
+
+    async def request(
+        self,
+        path: str,
+        method: str,
+        region: str = DEFAULT_REGION,
+        priority: Priority = Priority.BACKGROUND,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if path not in self.fixtures:
+            raise RiotAPIError(404, f"No fixture for {path}")
+        return self.fixtures[path]
+
+    async def update_champion_data(self) -> List[Champion]:
+        champion_catalog.load(self.champions, patch=synthetic.PATCH)
+        return list(self.champions)
+
+
+class LatencyBackend(MemoryBackend):
+    """MemoryBackend that waits ``latency`` seconds per batch, like a remote store"""
+
+    def __init__(self, latency: float = 0.005):
+        super().__init__()
+        self.latency = latency
+
+    async def save_sessions(self, sessions: List[DraftSession]) -> None:
+        await asyncio.sleep(self.latency)
+        await super().save_sessions(sessions)
+
+    async def append_actions(self, actions: List[DraftAction]) -> None:
+        await asyncio.sleep(self.latency)
+        await super().append_actions(actions)
+
+    async def archive_sessions(self, sessions: List[DraftSession]) -> None:
+        await asyncio.sleep(self.latency)
+        await super().archive_sessions(sessions)
+
+    async def load_session(self, session_id: str) -> Optional[DraftSession]:
+        await asyncio.sleep(self.latency)
+        return await super().load_session(session_id)
+
+
+def install(n_champions: int = synthetic.N_CHAMPIONS, seed: int = 0) -> List[Champion]:
+    """Load synthetic data for ``synthetic.PATCH`` / ``RANK_TIER`` into the global stores"""
+    champions = synthetic.make_champions(n_champions, seed)
+    champion_catalog.load(champions, patch=synthetic.PATCH)
+    stats_store.put(synthetic.make_stats_table(champions, seed))
+    matchup_store.put(synthetic.make_matrices(champions, seed=seed))
+    return champions
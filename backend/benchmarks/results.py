@@ -0,0 +1,105 @@
+"""Benchmark results as JSON, comparable across commits
+
+    python -m benchmarks.results compare BASE.json HEAD.json [--threshold 0.1]
+
+Benchmarks run with ``--output PATH`` write
+``{"meta": {...}, "results": {case: {metric: value}}}``, where ``meta``
+records the git commit, Python version, platform and time of the run.
+``compare`` prints every metric the two files share and exits 1 when a
+latency metric (``*_ms``) grew, or a throughput metric (``*_per_s``)
+shrank, by more than ``--threshold``.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+Results = Dict[str, Dict[str, float]]
+
+
+def summarize(seconds: List[float], operations: int = 1) -> Dict[str, float]:
+    """p50/p99 in milliseconds and operations per second from per-run timings"""
+    ms = np.array(seconds) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "ops_per_s": round(operations * len(seconds) / float(np.sum(seconds)), 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(benchmark: str, **params) -> Dict[str, object]:
+    return {
+        "benchmark": benchmark,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "params": params,
+    }
+
+
+def write(path: str, benchmark: str, results: Results, **params) -> None:
+    document = {"meta": metadata(benchmark, **params), "results": results}
+    Path(path).write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    print(f"wrote {path}")
+
+
+def load(path: str) -> Results:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def _regressed(metric: str, change: float, threshold: float) -> bool:
+    if metric.endswith("_ms"):
+        return change > threshold
+    if metric.endswith("_per_s"):
+        return change < -threshold
+    return False
+
+
+def compare(base: Results, head: Results, threshold: float) -> int:
+    """Print shared metrics side by side; number of regressions beyond ``threshold``"""
+    regressions = 0
+    print(f"{'case':>36} {'metric':>15} {'base':>11} {'head':>11} {'change':>8}")
+    for case in sorted(base.keys() & head.keys()):
+        for metric in sorted(base[case].keys() & head[case].keys()):
+            old, new = base[case][metric], head[case][metric]
+            change = (new - old) / old if old else 0.0
+            flag = ""
+            if _regressed(metric, change, threshold):
+                regressions += 1
+                flag = "  REGRESSED"
+            print(f"{case:>36} {metric:>15} {old:>11.4g} {new:>11.4g} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    diff = commands.add_parser("compare")
+    diff.add_argument("base")
+    diff.add_argument("head")
+    diff.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    regressions = compare(load(args.base), load(args.head), args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Local stand-in for the Riot API that enforces and reports rate limits
+
+Serves any GET path with an empty JSON object (or a registered fixture)
+and applies Riot-style fixed-window application and method limits per
+region, answering with the same ``X-App-Rate-Limit*``,
+``X-Method-Rate-Limit*``, ``Retry-After`` and ``X-Rate-Limit-Type``
+headers. Use it in-process through ``httpx.ASGITransport``.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+Limits = List[Tuple[int, float]]
+
+
+def _format(limits: Limits, counts: Optional[List[int]] = None) -> str:
+    if counts is None:
+        return ",".join(f"{count}:{int(window)}" for count, window in limits)
+    return ",".join(f"{used}:{int(window)}" for used, (_, window) in zip(counts, limits))
+
+
+class _Windows:
+    """Fixed windows, one per (count, seconds) pair"""
+
+    def __init__(self, limits: Limits):
+        self.limits = limits
+        self.started = [0.0] * len(limits)
+        self.counts = [0] * len(limits)
+
+    def blocked(self, now: float) -> Optional[float]:
+        """Seconds until the blocking window resets, None if a request fits"""
+        for i, (_, window) in enumerate(self.limits):
+            if now - self.started[i] >= window:
+                self.started[i], self.counts[i] = now, 0
+        for i, (count, window) in enumerate(self.limits):
+            if self.counts[i] >= count:
+                return window - (now - self.started[i])
+        return None
+
+    def count(self) -> None:
+        for i in range(len(self.limits)):
+            self.counts[i] += 1
+
+
+class RiotStub:
+    """ASGI app; the first path segment is the region (see ``RIOT_REGION_URL``)"""
+
+    def __init__(
+        self,
+        app_limits: Limits = ((20, 1.0), (100, 120.0)),
+        method_limits: Optional[Dict[str, Limits]] = None,
+        latency: float = 0.0,
+    ):
+        self.app_limits = list(app_limits)
+        self.method_limits = method_limits or {}
+        self.latency = latency
+        self.fixtures: Dict[str, Any] = {}
+        self._app_windows: Dict[str, _Windows] = {}
+        self._method_windows: Dict[Tuple[str, str], _Windows] = {}
+        self.served = 0
+        self.rejected = 0
+
+    def method_for(self, path: str) -> str:
+        """Map a path onto a method-limit key: the longest registered prefix"""
+        matches = [prefix for prefix in self.method_limits if path.startswith(prefix)]
+        return max(matches, key=len) if matches else ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        region, _, path = scope["path"].lstrip("/").partition("/")
+        path = "/" + path
+        method = self.method_for(path)
+        now = time.monotonic()
+        app = self._app_windows.setdefault(region, _Windows(self.app_limits))
+        windows = self._method_windows.setdefault(
+            (region, method), _Windows(self.method_limits.get(method, []))
+        )
+
+        status, body = 200, self.fixtures.get(path, {})
+        headers = {}
+        # A request only counts against the windows when every layer admits it
+        retry = app.blocked(now)
+        limit_type = "application"
+        if retry is None:
+            retry = windows.blocked(now)
+            limit_type = "method"
+        if retry is None:
+            app.count()
+            windows.count()
+        headers["X-App-Rate-Limit"] = _format(app.limits)
+        headers["X-App-Rate-Limit-Count"] = _format(app.limits, app.counts)
+        if windows.limits:
+            headers["X-Method-Rate-Limit"] = _format(windows.limits)
+            headers["X-Method-Rate-Limit-Count"] = _format(windows.limits, windows.counts)
+        if retry is not None:
+            status, body = 429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}
+            headers["Retry-After"] = str(max(1, int(retry + 0.999)))
+            headers["X-Rate-Limit-Type"] = limit_type
+            self.rejected += 1
+        elif path not in self.fixtures and self.fixtures:
+            status, body = 404, {"status": {"message": "Data not found", "status_code": 404}}
+        else:
+            self.served += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        payload = json.dumps(body).encode()
+        raw_headers = [(b"content-type", b"application/json")]
+        raw_headers += [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": payload})
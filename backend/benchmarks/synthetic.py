@@ -0,0 +1,246 @@
+"""Synthetic champion, stats and matchup data generated from the app models"""
+import random
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import numpy as np
+
+from app.models.champion import Champion, ChampionStats, DamageType, Role
+from app.services.aggregation import MatchChunk
+from app.services.champion_catalog import ChampionCatalog
+from app.services.matchup_store import ROLES, ChampionIndex, MatchupMatrices
+from app.services.stats_store import ChampionStatsTable
+from app.services.suggestion_engine import PHASES, DraftStateBatch
+
+PATCH = "14.19"
+RANK_TIER = "PLATINUM"
+N_CHAMPIONS = 170
+
+
+def make_champions(count: int = N_CHAMPIONS, seed: int = 0) -> List[Champion]:
+    rng = random.Random(seed)
+    roles = list(Role)
+    champions = []
+    for i in range(count):
+        champion_id = i + 1
+        champions.append(
+            Champion(
+                id=champion_id,
+                key=f"Champion{champion_id}",
+                name=f"Champion {champion_id}",
+                title=f"the Synthetic {champion_id}",
+                roles=rng.sample(roles, rng.choice([1, 1, 2])),
+                difficulty=rng.randint(1, 10),
+                damage_type=rng.choice(list(DamageType)),
+                attack_range=rng.choice([125, 175, 500, 550, 650]),
+                tags=rng.sample(["Fighter", "Tank", "Mage", "Assassin", "Marksman", "Support"], 2),
+                icon_url=f"https://example.invalid/icon/{champion_id}.png",
+                splash_url=f"https://example.invalid/splash/{champion_id}.jpg",
+            )
+        )
+    return champions
+
+
+def make_catalog(champions: List[Champion]) -> ChampionCatalog:
+    catalog = ChampionCatalog()
+    catalog.load(champions, patch=PATCH)
+    return catalog
+
+
+def make_matrices(
+    champions: List[Champion], role: Optional[str] = None, seed: int = 0
+) -> MatchupMatrices:
+    """Dense random matrices, skipping the pydantic row path"""
+    rng = np.random.default_rng(seed)
+    matrices = MatchupMatrices(PATCH, RANK_TIER, role, ChampionIndex(c.id for c in champions))
+    n = len(matrices.index)
+    shape = (n, n)
+    strength = rng.normal(50.0, 12.0, shape).clip(0, 100).astype(np.float32)
+    matrices.counter_strength[:] = strength
+    matrices.win_rate[:] = 0.5 + (strength - 50.0) / 500.0
+    matrices.difficulty_score[:] = 100.0 - strength
+    matrices.matchup_games[:] = rng.integers(0, 2000, shape)
+    matrices.matchup_role[:] = rng.integers(0, len(ROLES), shape)
+    synergy = rng.normal(50.0, 12.0, shape).clip(0, 100).astype(np.float32)
+    matrices.synergy_score[:] = (synergy + synergy.T) / 2.0
+    matrices.synergy_win_rate[:] = 0.5 + (matrices.synergy_score - 50.0) / 500.0
+    matrices.synergy_pick_rate[:] = rng.random(shape, dtype=np.float32) / 10.0
+    matrices.synergy_games[:] = rng.integers(0, 2000, shape)
+    matrices.synergy_types = ["engage", "poke", "protect"]
+    matrices.synergy_type[:] = rng.integers(0, 3, shape)
+    np.fill_diagonal(matrices.counter_strength, np.nan)
+    np.fill_diagonal(matrices.synergy_score, np.nan)
+    return matrices
+
+
+def make_stats(champions: List[Champion], seed: int = 0) -> List[ChampionStats]:
+    rng = random.Random(seed)
+    stats = []
+    for champion in champions:
+        for role in champion.roles:
+            stats.append(
+                ChampionStats(
+                    champion_id=champion.id,
+                    patch=PATCH,
+                    rank_tier=RANK_TIER,
+                    role=role,
+                    pick_rate=rng.uniform(0.5, 15.0),
+                    ban_rate=rng.uniform(0.0, 30.0),
+                    win_rate=rng.gauss(50.0, 2.0),
+                    average_kda={"kills": 5.0, "deaths": 5.0, "assists": 7.0},
+                    average_cs=rng.uniform(1.0, 9.0),
+                    average_damage=rng.uniform(8000, 30000),
+                    average_gold=rng.uniform(250, 450),
+                    early_game_wr=rng.gauss(50.0, 3.0),
+                    mid_game_wr=rng.gauss(50.0, 3.0),
+                    late_game_wr=rng.gauss(50.0, 3.0),
+                    games_analyzed=rng.randint(100, 50000),
+                )
+            )
+    return stats
+
+
+def make_stats_table(champions: List[Champion], seed: int = 0) -> ChampionStatsTable:
+    return ChampionStatsTable.from_records(
+        PATCH, RANK_TIER, make_stats(champions, seed), [c.id for c in champions]
+    )
+
+
+POSITIONS = ["TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY"]
+
+
+def make_match_payload(
+    match_id: str, n_champions: int = N_CHAMPIONS, queue_id: int = 420, seed: int = 0
+) -> Dict[str, Any]:
+    """Match-v5 ``/matches/{id}`` payload with the fields ingestion reads"""
+    rng = random.Random(f"{seed}:{match_id}")
+    drawn = rng.sample(range(1, n_champions + 1), 20)
+    blue_wins = rng.random() < 0.5
+    participants = []
+    for slot, champion_id in enumerate(drawn[:10]):
+        team_id = 100 if slot < 5 else 200
+        participants.append({
+            "championId": champion_id,
+            "teamId": team_id,
+            "teamPosition": POSITIONS[slot % 5],
+            "win": blue_wins == (team_id == 100),
+            "kills": rng.randint(0, 15),
+            "deaths": rng.randint(0, 12),
+            "assists": rng.randint(0, 20),
+            "totalMinionsKilled": rng.randint(0, 300),
+            "neutralMinionsKilled": rng.randint(0, 150),
+            "goldEarned": rng.randint(5000, 20000),
+            "totalDamageDealtToChampions": rng.randint(3000, 50000),
+        })
+    return {
+        "metadata": {"matchId": match_id},
+        "info": {
+            "gameVersion": f"{PATCH}.612.3456",
+            "queueId": queue_id,
+            "gameDuration": rng.randint(900, 2700),
+            "participants": participants,
+            "teams": [
+                {"teamId": 100, "bans": [{"championId": c} for c in drawn[10:15]]},
+                {"teamId": 200, "bans": [{"championId": c} for c in drawn[15:20]]},
+            ],
+        },
+    }
+
+
+def make_match_fixtures(
+    players: int, matches_per_player: int, overlap: float = 0.3, seed: int = 0
+) -> Dict[str, Any]:
+    """Riot API fixtures (path -> JSON) for a crawl over ``players`` seeds
+
+    About ``overlap`` of each player's match history is shared with other
+    players, so discovery has duplicates to drop.
+    """
+    rng = random.Random(seed)
+    fixtures: Dict[str, Any] = {}
+    pool: List[str] = []
+    for p in range(players):
+        ids = []
+        for m in range(matches_per_player):
+            if pool and rng.random() < overlap:
+                ids.append(rng.choice(pool))
+            else:
+                match_id = f"NA1_{p * matches_per_player + m}"
+                pool.append(match_id)
+                ids.append(match_id)
+                fixtures[f"/lol/match/v5/matches/{match_id}"] = make_match_payload(
+                    match_id, seed=seed
+                )
+        fixtures[f"/lol/match/v5/matches/by-puuid/puuid-{p}/ids"] = list(dict.fromkeys(ids))
+    return fixtures
+
+
+def make_player_fixtures(
+    players: List[str], n_champions: int = N_CHAMPIONS, matches: int = 5, seed: int = 0
+) -> Dict[str, Any]:
+    """Riot API fixtures for player pools: account, top mastery and recent matches
+
+    Players are Riot IDs (``name#tag``); each recent match has the player
+    as its first participant.
+    """
+    rng = random.Random(seed)
+    fixtures: Dict[str, Any] = {}
+    for player in players:
+        game_name, _, tag_line = player.partition("#")
+        puuid = f"puuid-{player}"
+        fixtures[f"/riot/account/v1/accounts/by-riot-id/{quote(game_name)}/{quote(tag_line)}"] = {
+            "puuid": puuid, "gameName": game_name, "tagLine": tag_line,
+        }
+        fixtures[f"/lol/champion-mastery/v4/champion-masteries/by-puuid/{puuid}/top"] = [
+            {"puuid": puuid, "championId": champion_id, "championPoints": rng.randint(10000, 500000)}
+            for champion_id in rng.sample(range(1, n_champions + 1), 10)
+        ]
+        ids = [f"NA1_{player}_{m}" for m in range(matches)]
+        fixtures[f"/lol/match/v5/matches/by-puuid/{puuid}/ids"] = ids
+        for match_id in ids:
+            payload = make_match_payload(match_id, n_champions, seed=seed)
+            payload["info"]["participants"][0]["puuid"] = puuid
+            fixtures[f"/lol/match/v5/matches/{match_id}"] = payload
+    return fixtures
+
+
+def make_match_chunk(
+    matches: int, n_champions: int = N_CHAMPIONS, seed: int = 0
+) -> MatchChunk:
+    """Columnar chunk of random 5v5 matches, generated without Python loops"""
+    rng = np.random.default_rng(seed)
+    drawn = np.argsort(rng.random((matches, n_champions), dtype=np.float32), axis=1)[:, :20] + 1
+    blue_wins = rng.random(matches) < 0.5
+    team = np.repeat([[0] * 5 + [1] * 5], matches, axis=0).astype(np.int8)
+    columns = {
+        "champion": drawn[:, :10].astype(np.int16),
+        "role": np.tile(np.arange(5, dtype=np.int8), (matches, 2)),
+        "team": team,
+        "win": (team == 0) == blue_wins[:, None],
+        "kills": rng.integers(0, 16, (matches, 10), dtype=np.int16),
+        "deaths": rng.integers(0, 13, (matches, 10), dtype=np.int16),
+        "assists": rng.integers(0, 21, (matches, 10), dtype=np.int16),
+        "cs": rng.integers(0, 450, (matches, 10), dtype=np.int32),
+        "gold": rng.integers(5000, 20000, (matches, 10), dtype=np.int32),
+        "damage": rng.integers(3000, 50000, (matches, 10), dtype=np.int32),
+        "patch": np.zeros(matches, dtype=np.int16),
+        "rank_tier": np.zeros(matches, dtype=np.int16),
+        "duration": rng.uniform(900, 2700, matches).astype(np.float32),
+        "bans": drawn[:, 10:].astype(np.int16),
+    }
+    return MatchChunk(columns, [PATCH], [RANK_TIER])
+
+
+def make_draft_batch(n_champions: int, size: int, seed: int = 0) -> DraftStateBatch:
+    """Random mid-draft states: 0-5 picks and bans per team, no duplicates"""
+    rng = np.random.default_rng(seed)
+    batch = DraftStateBatch.empty(size)
+    for i in range(size):
+        drawn = rng.choice(n_champions, size=20, replace=False)
+        picks, bans = rng.integers(0, 6, 2), rng.integers(0, 6, 2)
+        batch.picks[i, 0, :picks[0]] = drawn[:picks[0]]
+        batch.picks[i, 1, :picks[1]] = drawn[5:5 + picks[1]]
+        batch.bans[i, 0, :bans[0]] = drawn[10:10 + bans[0]]
+        batch.bans[i, 1, :bans[1]] = drawn[15:15 + bans[1]]
+    batch.phase[:] = rng.integers(0, len(PHASES) - 1, size)
+    batch.team[:] = rng.integers(0, 2, size)
+    return batch
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings require a Riot key at import time; tests never reach the real API
+os.environ.setdefault("RIOT_API_KEY", "test")
+
+BACKEND = Path(__file__).resolve().parent.parent
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
@@ -0,0 +1,165 @@
+import asyncio
+from typing import Dict, Optional
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.services.cache import LocalCache, RedisCache, TieredCache
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRedis:
+    """The slice of redis.asyncio the cache uses, backed by a dict"""
+
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+        self.expiries: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: Optional[int] = None) -> None:
+        self.data[key] = value
+        self.expiries[key] = ex
+
+    async def incr(self, key: str) -> int:
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    async def close(self) -> None:
+        pass
+
+
+def tiered(redis: Optional[FakeRedis] = None, **kwargs) -> TieredCache:
+    remote = RedisCache(redis, ttl=60) if redis is not None else None
+    return TieredCache(LocalCache(max_entries=100, ttl=60), remote, **kwargs)
+
+
+async def test_concurrent_misses_share_one_fetch():
+    cache = tiered(FakeRedis())
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    values = await asyncio.gather(*(cache.get_or_fetch("k", fetch, TypeAdapter(int)) for _ in range(10)))
+
+    assert values == [42] * 10
+    assert len(calls) == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["coalesced"] == 9
+    assert await cache.get_or_fetch("k", fetch) == 42
+    assert cache.stats["local_hits"] == 1
+
+
+async def test_fetch_error_reaches_followers_and_is_not_cached():
+    cache = tiered()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+    results = await asyncio.gather(
+        *(cache.get_or_fetch("k", failing) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert len(calls) == 1
+    assert cache._inflight == {}
+
+    async def fetch():
+        return "ok"
+
+    assert await cache.get_or_fetch("k", fetch) == "ok"
+
+
+async def test_none_is_not_cached():
+    redis = FakeRedis()
+    cache = tiered(redis)
+    calls = []
+
+    async def missing():
+        calls.append(1)
+        return None
+
+    assert await cache.get_or_fetch("k", missing, TypeAdapter(Optional[int])) is None
+    assert await cache.get_or_fetch("k", missing, TypeAdapter(Optional[int])) is None
+    assert len(calls) == 2
+    assert redis.data == {}
+
+
+async def test_zero_ttl_is_not_stored():
+    redis = FakeRedis()
+    cache = tiered(redis)
+
+    async def fetch():
+        return 1
+
+    await cache.get_or_fetch("k", fetch, TypeAdapter(int), ttl=0)
+
+    assert len(cache.local) == 0
+    assert redis.data == {}
+
+
+async def test_remote_tier_serves_other_instances():
+    redis = FakeRedis()
+    first, second = tiered(redis), tiered(redis)
+    adapter = TypeAdapter(Dict[str, int])
+
+    async def fetch():
+        return {"games": 10}
+
+    async def unreachable():
+        raise AssertionError("should be served from Redis")
+
+    await first.get_or_fetch("k", fetch, adapter, ttl=30)
+
+    assert redis.expiries["k"] == 30
+    assert await second.get_or_fetch("k", unreachable, adapter) == {"games": 10}
+    assert second.stats["remote_hits"] == 1
+
+
+async def test_invalidate_retires_only_its_namespace():
+    cache = tiered(FakeRedis())
+    stats_key = await cache.make_key("stats", ["champion_id=1"], ["stats", "patch:current"])
+    catalog_key = await cache.make_key("champion", ["champion_id=1"], ["catalog"])
+
+    await cache.invalidate("stats")
+
+    assert await cache.make_key("stats", ["champion_id=1"], ["stats", "patch:current"]) != stats_key
+    assert await cache.make_key("champion", ["champion_id=1"], ["catalog"]) == catalog_key
+
+
+async def test_generation_bump_reaches_other_instances():
+    redis = FakeRedis()
+    first = tiered(redis, generation_ttl=0.0)
+    second = tiered(redis, generation_ttl=0.0)
+    before = await second.make_key("stats", [], ["stats"])
+
+    await first.invalidate("stats")
+
+    assert await first.generation("stats") == 1
+    assert await second.generation("stats") == 1
+    assert await second.make_key("stats", [], ["stats"]) != before
+
+
+async def test_invalidated_entries_are_refetched():
+    cache = tiered()
+    versions = iter(["old", "new"])
+
+    async def fetch():
+        return next(versions)
+
+    key = await cache.make_key("stats", [], ["stats"])
+    assert await cache.get_or_fetch(key, fetch) == "old"
+    assert await cache.get_or_fetch(key, fetch) == "old"
+
+    await cache.invalidate("stats")
+    key = await cache.make_key("stats", [], ["stats"])
+    assert await cache.get_or_fetch(key, fetch) == "new"
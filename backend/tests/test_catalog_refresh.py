@@ -0,0 +1,144 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.champion import CatalogRefreshJob
+from app.services.cache import champion_cache
+from app.services.catalog_refresh import CatalogRefresher, CatalogRefreshJobs
+from app.services.champion_catalog import ChampionCatalog
+from app.services.champion_service import CATALOG_NAMESPACE
+from app.services.riot_service import RiotService
+from benchmarks import synthetic
+from benchmarks.ddragon_stub import DataDragonStub
+
+pytestmark = pytest.mark.asyncio
+
+N_CHAMPIONS = 12
+
+
+@pytest.fixture(autouse=True)
+def ddragon_url(monkeypatch):
+    monkeypatch.setattr(settings, "DDRAGON_BASE_URL", "http://ddragon.local")
+
+
+@pytest.fixture
+def stub():
+    stub = DataDragonStub("na")
+    stub.publish("14.19.1", synthetic.make_champions(N_CHAMPIONS))
+    return stub
+
+
+def client(stub: DataDragonStub) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=stub))
+
+
+async def refresh(refresher: CatalogRefresher, stub: DataDragonStub) -> CatalogRefreshJob:
+    async with client(stub) as http:
+        return await refresher.refresh(http, CatalogRefreshJob(id="test"))
+
+
+async def test_first_refresh_loads_every_champion(stub):
+    catalog = ChampionCatalog()
+    job = await refresh(CatalogRefresher(catalog), stub)
+
+    assert job.version == "14.19.1"
+    assert job.requests == 2
+    assert len(job.added) == N_CHAMPIONS
+    assert not job.not_modified
+    assert len(catalog) == N_CHAMPIONS
+    assert catalog.patch == "14.19"
+
+
+async def test_unchanged_manifest_is_a_single_304(stub):
+    catalog = ChampionCatalog()
+    refresher = CatalogRefresher(catalog)
+    await refresh(refresher, stub)
+    champions, version = catalog.all(), catalog.version
+
+    job = await refresh(refresher, stub)
+
+    assert job.not_modified
+    assert job.requests == 1
+    assert stub.not_modified == 1
+    assert job.unchanged == N_CHAMPIONS
+    assert catalog.version == version
+    assert all(a is b for a, b in zip(catalog.all(), champions))
+
+
+async def test_new_version_with_the_same_data_keeps_champions(stub):
+    catalog = ChampionCatalog()
+    refresher = CatalogRefresher(catalog)
+    await refresh(refresher, stub)
+    before = {c.id: c for c in catalog.all()}
+
+    stub.publish("14.19.2", synthetic.make_champions(N_CHAMPIONS))
+    job = await refresh(refresher, stub)
+
+    assert job.version == "14.19.2"
+    assert (job.added, job.changed, job.removed) == ([], [], [])
+    assert job.unchanged == N_CHAMPIONS
+    for champion in catalog.all():
+        assert champion.last_updated == before[champion.id].last_updated
+        assert "14.19.2" in champion.icon_url
+    # Nothing but the asset URLs moved; a later identical refresh is a 304 again
+    assert (await refresh(refresher, stub)).requests == 1
+
+
+async def test_changed_champions_are_diffed(stub):
+    catalog = ChampionCatalog()
+    refresher = CatalogRefresher(catalog)
+    await refresh(refresher, stub)
+    before = {c.id: c for c in catalog.all()}
+    generation = await champion_cache.generation(CATALOG_NAMESPACE)
+
+    champions = synthetic.make_champions(N_CHAMPIONS + 1)
+    retitled, dropped, new = champions[0], champions[1], champions[-1]
+    retitled.title = "the Reworked"
+    stub.publish("14.20.1", [c for c in champions if c is not dropped])
+    job = await refresh(refresher, stub)
+
+    assert job.changed == [retitled.id]
+    assert job.removed == [dropped.id]
+    assert job.added == [new.id]
+    assert job.unchanged == N_CHAMPIONS - 2
+    assert catalog.patch == "14.20"
+    assert dropped.id not in catalog
+    assert catalog.get(retitled.id).title == "the Reworked"
+    assert catalog.get(retitled.id).last_updated > before[retitled.id].last_updated
+    kept = [c for c in catalog.all() if c.id not in (retitled.id, new.id)]
+    assert all(c.last_updated == before[c.id].last_updated for c in kept)
+    assert await champion_cache.generation(CATALOG_NAMESPACE) == generation + 1
+
+
+async def test_refresh_jobs_run_one_at_a_time(stub):
+    await RiotService.initialize(client(stub))
+    try:
+        jobs = CatalogRefreshJobs(CatalogRefresher(ChampionCatalog()))
+        job = jobs.start()
+        assert jobs.start() is job
+        await jobs.wait()
+        assert job.status == "succeeded"
+        assert job.finished_at is not None
+
+        second = jobs.start()
+        await jobs.wait()
+    finally:
+        await RiotService.cleanup()
+
+    assert second is not job
+    assert second.not_modified
+    assert jobs.get(job.id) is job
+
+
+async def test_failed_refresh_is_reported(stub):
+    stub.documents.clear()
+    await RiotService.initialize(client(stub))
+    try:
+        jobs = CatalogRefreshJobs(CatalogRefresher(ChampionCatalog()))
+        job = jobs.start()
+        await jobs.wait()
+    finally:
+        await RiotService.cleanup()
+
+    assert job.status == "failed"
+    assert "404" in job.error
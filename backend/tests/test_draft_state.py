@@ -0,0 +1,44 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.models.draft import CHAMPION_ID_LIMIT, DraftPhase, Team
+from app.services.draft_state import BLUE_PICKS, RED_BANS, DraftKey
+
+pytestmark = pytest.mark.asyncio
+
+PICKS_1, BLUE = DraftPhase.PICKS_1.value, Team.BLUE.value
+OUT_OF_RANGE = [-1, CHAMPION_ID_LIMIT, 4_000_000_000]
+
+
+async def test_key_ignores_order_within_a_slot():
+    key = DraftKey.from_sets([[3, 1], [], [7], []], PICKS_1, BLUE)
+
+    assert key == DraftKey.from_sets([[1, 3], [], [7], []], PICKS_1, BLUE)
+    assert key.apply(RED_BANS, 9, PICKS_1, BLUE) == DraftKey.from_sets(
+        [[1, 3], [], [7], [9]], PICKS_1, BLUE
+    )
+
+
+@pytest.mark.parametrize("champion_id", OUT_OF_RANGE)
+async def test_out_of_range_ids_are_rejected(champion_id):
+    with pytest.raises(ValueError, match="outside"):
+        DraftKey.from_sets([[champion_id], [], [], []], PICKS_1, BLUE)
+    with pytest.raises(ValueError, match="outside"):
+        DraftKey.from_sets([[], [], [], []], PICKS_1, BLUE).apply(BLUE_PICKS, champion_id, PICKS_1, BLUE)
+
+
+@pytest.mark.parametrize("champion_id", OUT_OF_RANGE)
+@pytest.mark.parametrize("path, body", [
+    ("/draft/suggestions:batch", lambda state: {"states": [state]}),
+    ("/draft/search", lambda state: {"state": state}),
+    ("/predictions/win", lambda state: state),
+])
+async def test_api_rejects_out_of_range_ids(path, body, champion_id):
+    state = {"blue_picks": [champion_id], "current_phase": PICKS_1, "current_team": BLUE}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as client:
+        response = await client.post(f"{settings.API_V1_STR}{path}", json=body(state))
+
+    assert response.status_code == 422
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from app.services import ingestion
+from app.services.ingestion import Checkpoint, IngestionPipeline, ListSink
+from app.services.riot_service import RiotAPIError
+
+pytestmark = pytest.mark.asyncio
+
+FIXTURES = json.loads((Path(__file__).parent / "fixtures" / "ingestion_matches.json").read_text())
+SEEDS = list(FIXTURES["match_ids"])
+# EUW1_1006 is a normal-draft game, EUW1_1007 has no participants, EUW1_1008 is not served
+RANKED = {"EUW1_1001", "EUW1_1002", "EUW1_1003", "EUW1_1004", "EUW1_1005"}
+PROCESSED = RANKED | {"EUW1_1006"}
+FAILED = {"EUW1_1007", "EUW1_1008"}
+RANK_TIER = "PLATINUM"
+
+
+class FixtureRiot:
+    """The RiotService calls the pipeline makes, answered from the JSON fixtures"""
+
+    def __init__(self, fixtures: Dict[str, Any]):
+        self.fixtures = fixtures
+        self.fetched: Counter = Counter()
+
+    async def get_match_ids(self, puuid: str, **kwargs):
+        return self.fixtures["match_ids"][puuid]
+
+    async def get_match(self, match_id: str, **kwargs):
+        self.fetched[match_id] += 1
+        await asyncio.sleep(0)
+        if match_id not in self.fixtures["matches"]:
+            raise RiotAPIError(404, "Data not found")
+        return self.fixtures["matches"][match_id]
+
+
+class FailingSink(ListSink):
+    """Raises on the ``fail_at``-th match, as a full disk or a dead database would"""
+
+    def __init__(self, fail_at: int):
+        super().__init__()
+        self.fail_at = fail_at
+        self.added = 0
+        self.flushed = []
+
+    def add(self, match):
+        self.added += 1
+        if self.added == self.fail_at:
+            raise RuntimeError("sink unavailable")
+        super().add(match)
+
+    def flush(self):
+        self.flushed.extend(m.match_id for m in self.matches[len(self.flushed):])
+
+
+def pipeline(riot, sink, checkpoint_dir, **kwargs) -> IngestionPipeline:
+    options = dict(fetch_concurrency=2, queue_size=1, checkpoint_every=2, report_interval=60)
+    options.update(kwargs)
+    return IngestionPipeline(riot, sink, checkpoint_dir, RANK_TIER, **options)
+
+
+async def test_crawl_aggregates_every_match_once(tmp_path):
+    riot, sink = FixtureRiot(FIXTURES), ListSink()
+
+    progress = await asyncio.wait_for(pipeline(riot, sink, tmp_path).run(SEEDS), 5)
+
+    assert sorted(m.match_id for m in sink.matches) == sorted(RANKED)
+    assert progress["processed"] == len(PROCESSED)
+    assert progress["duplicates"] == 3
+    assert progress["skipped_queue"] == 1
+    assert progress["failed"] == len(FAILED)
+    assert all(count == 1 for count in riot.fetched.values())
+
+    checkpoint = Checkpoint(tmp_path)
+    assert checkpoint.processed == PROCESSED
+    assert checkpoint.failed == FAILED
+    assert checkpoint.pending == []
+    assert checkpoint.state["seed_index"] == len(SEEDS)
+    checkpoint.close()
+
+
+async def test_parsed_match_fields(tmp_path):
+    sink = ListSink()
+    await asyncio.wait_for(pipeline(FixtureRiot(FIXTURES), sink, tmp_path).run(SEEDS[:1]), 5)
+
+    match = next(m for m in sink.matches if m.match_id == "EUW1_1001")
+    payload = FIXTURES["matches"]["EUW1_1001"]["info"]
+    assert match.patch == "14.19"
+    assert match.queue_id == 420
+    assert [p.champion_id for p in match.participants] == [p["championId"] for p in payload["participants"]]
+    assert [p.role for p in match.participants] == ["top", "jungle", "top", "jungle"]
+    assert match.bans == [b["championId"] for team in payload["teams"] for b in team["bans"]]
+
+
+async def test_sink_failure_stops_the_crawl_and_resume_finishes_it(tmp_path):
+    first_riot, failing = FixtureRiot(FIXTURES), FailingSink(fail_at=4)
+
+    with pytest.raises(RuntimeError, match="sink unavailable"):
+        await asyncio.wait_for(pipeline(first_riot, failing, tmp_path).run(SEEDS), 5)
+
+    checkpoint = Checkpoint(tmp_path)
+    committed, failed = set(checkpoint.processed), set(checkpoint.failed)
+    checkpoint.close()
+    # Exactly what the sink flushed is recorded as processed (plus the skipped normal game)
+    assert committed - {"EUW1_1006"} == set(failing.flushed)
+    assert len(failing.flushed) == 3
+
+    second_riot, sink = FixtureRiot(FIXTURES), ListSink()
+    await asyncio.wait_for(pipeline(second_riot, sink, tmp_path).run(SEEDS), 5)
+
+    aggregated = Counter(failing.flushed) + Counter(m.match_id for m in sink.matches)
+    assert set(aggregated) == RANKED
+    assert not set(second_riot.fetched) & (committed | failed)
+
+    checkpoint = Checkpoint(tmp_path)
+    assert checkpoint.processed == PROCESSED
+    assert checkpoint.pending == []
+    checkpoint.close()
+
+
+async def test_failed_matches_are_not_retried_on_resume(tmp_path):
+    riot = FixtureRiot(FIXTURES)
+    await asyncio.wait_for(pipeline(riot, ListSink(), tmp_path).run(SEEDS), 5)
+
+    # A later crawl that rediscovers nothing must not refetch the permanent failures
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.save_state(seed_index=0)
+    checkpoint.close()
+    again = FixtureRiot(FIXTURES)
+    progress = await asyncio.wait_for(pipeline(again, ListSink(), tmp_path).run(SEEDS), 5)
+
+    assert again.fetched == Counter()
+    assert progress["duplicates"] == sum(len(ids) for ids in FIXTURES["match_ids"].values())
+
+
+async def test_transient_fetch_errors_stay_pending(tmp_path):
+    class FlakyRiot(FixtureRiot):
+        async def get_match(self, match_id: str, **kwargs):
+            if match_id == "EUW1_1002":
+                raise ConnectionError("reset by peer")
+            return await super().get_match(match_id, **kwargs)
+
+    await asyncio.wait_for(pipeline(FlakyRiot(FIXTURES), ListSink(), tmp_path).run(SEEDS), 5)
+
+    checkpoint = Checkpoint(tmp_path)
+    assert checkpoint.pending == ["EUW1_1002"]
+    checkpoint.close()
+
+    riot, sink = FixtureRiot(FIXTURES), ListSink()
+    await asyncio.wait_for(pipeline(riot, sink, tmp_path).run(SEEDS), 5)
+    assert [m.match_id for m in sink.matches] == ["EUW1_1002"]
+
+
+async def test_parser_crash_is_raised_instead_of_hanging(tmp_path, monkeypatch):
+    def crash(payload, rank_tier):
+        raise RuntimeError("parser bug")
+
+    monkeypatch.setattr(ingestion, "parse_match", crash)
+
+    with pytest.raises(RuntimeError, match="parser bug"):
+        await asyncio.wait_for(pipeline(FixtureRiot(FIXTURES), ListSink(), tmp_path).run(SEEDS), 5)
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.rate_limiter import RateLimiter, RequestScheduler, RetryAfter
+from app.services.riot_service import Priority, RiotAPIError, RiotService
+from benchmarks.riot_stub import RiotStub
+
+pytestmark = pytest.mark.asyncio
+
+MATCHES = "/lol/match/v5/matches/"
+
+
+@pytest.fixture(autouse=True)
+def local_limits(monkeypatch):
+    """Client-side app limits well above the stub's, so the stub's 429s drive the tests"""
+    monkeypatch.setattr(settings, "RIOT_BURST_RATE_LIMIT", 100)
+    monkeypatch.setattr(settings, "RIOT_RATE_LIMIT", 1000)
+    monkeypatch.setattr(settings, "RIOT_RATE_LIMIT_WINDOW", 10)
+    monkeypatch.setattr(settings, "RIOT_REGION_URL", "http://riot.local/{region}")
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    """Drops the first ``failures`` requests with a connection reset"""
+
+    def __init__(self, stub: RiotStub, failures: int):
+        self.transport = httpx.ASGITransport(app=stub)
+        self.failures = failures
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ReadError("connection reset by peer", request=request)
+        return await self.transport.handle_async_request(request)
+
+
+@asynccontextmanager
+async def riot(stub: RiotStub, failures: int = 0):
+    """RiotService routed to ``stub`` through the shared scheduler"""
+    await RiotService.initialize(httpx.AsyncClient(transport=FlakyTransport(stub, failures)))
+    try:
+        yield RiotService()
+    finally:
+        await RiotService.cleanup()
+
+
+async def test_method_429_is_retried_after_retry_after():
+    stub = RiotStub(app_limits=[(100, 1.0)], method_limits={MATCHES: [(2, 1.0)]})
+    async with riot(stub) as service:
+        start = time.monotonic()
+        results = await asyncio.gather(*(
+            service.request(f"{MATCHES}EUW1_{i}", "match-v5.getMatch", region="europe")
+            for i in range(4)
+        ))
+        elapsed = time.monotonic() - start
+        retried = RiotService._scheduler.stats["retried"]
+
+    assert results == [{}] * 4
+    assert stub.rejected >= 1
+    assert stub.served == 4
+    assert retried == stub.rejected
+    # Retry-After is whole seconds; nothing went out again before the window reset
+    assert elapsed >= 1.0
+
+
+async def test_method_429_does_not_block_other_methods():
+    stub = RiotStub(app_limits=[(100, 1.0)], method_limits={MATCHES: [(1, 1.0)]})
+    async with riot(stub) as service:
+        await service.request(f"{MATCHES}EUW1_0", "match-v5.getMatch", region="europe")
+        throttled = asyncio.ensure_future(
+            service.request(f"{MATCHES}EUW1_1", "match-v5.getMatch", region="europe")
+        )
+        await asyncio.sleep(0.05)
+
+        start = time.monotonic()
+        await service.request(
+            "/lol/summoner/v4/summoners/by-puuid/p", "summoner-v4.getByPUUID", region="europe"
+        )
+        assert time.monotonic() - start < 0.5
+        assert not throttled.done()
+        assert await throttled == {}
+
+
+async def test_application_429_blocks_the_region():
+    stub = RiotStub(app_limits=[(3, 1.0)])
+    async with riot(stub) as service:
+        start = time.monotonic()
+        await asyncio.gather(*(
+            service.request(f"/method-{i}/x", f"method-{i}", region="europe") for i in range(6)
+        ))
+        elapsed = time.monotonic() - start
+        learned = [(b.capacity, b.window) for b in RiotService._limiter.region("europe").buckets]
+
+    assert stub.served == 6
+    assert stub.rejected >= 1
+    assert elapsed >= 1.0
+    assert learned == [(3, 1.0)]
+
+
+async def test_client_errors_are_not_retried():
+    stub = RiotStub()
+    stub.fixtures = {f"{MATCHES}EUW1_1": {"metadata": {}}}
+    async with riot(stub) as service:
+        with pytest.raises(RiotAPIError) as error:
+            await service.request(f"{MATCHES}EUW1_2", "match-v5.getMatch", region="europe")
+        retried = RiotService._scheduler.stats["retried"]
+
+    assert error.value.status_code == 404
+    assert retried == 0
+
+
+async def test_transport_errors_are_retried():
+    stub = RiotStub()
+    async with riot(stub, failures=1) as service:
+        result = await service.request(f"{MATCHES}EUW1_1", "match-v5.getMatch", region="europe")
+        retried = RiotService._scheduler.stats["retried"]
+
+    assert result == {}
+    assert stub.served == 1
+    assert retried == 1
+
+
+async def test_transport_errors_give_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "RIOT_MAX_ATTEMPTS", 2)
+    stub = RiotStub()
+    async with riot(stub, failures=2) as service:
+        with pytest.raises(RetryAfter, match="ReadError") as error:
+            await service.request(f"{MATCHES}EUW1_1", "match-v5.getMatch", region="europe")
+
+    assert isinstance(error.value.__cause__, httpx.ReadError)
+    assert stub.served == 0
+
+
+async def test_retries_give_up_after_max_attempts():
+    scheduler = RequestScheduler(RateLimiter([(100, 1.0)]), max_attempts=3)
+    attempts = []
+
+    async def send():
+        attempts.append(1)
+        raise RetryAfter(0.01, "method", "429 from test")
+
+    with pytest.raises(RetryAfter):
+        await scheduler.submit(Priority.BACKGROUND, "europe", "test", send)
+    await scheduler.stop()
+
+    assert len(attempts) == 3
+    assert scheduler.stats["retried"] == 2
+
+
+async def test_most_urgent_request_with_tokens_goes_first():
+    limiter = RateLimiter([(100, 1.0)], method_limits={"slow": [(1, 10.0)]})
+    scheduler = RequestScheduler(limiter)
+    order = []
+
+    def send(tag):
+        async def call():
+            order.append(tag)
+            return tag
+        return call
+
+    slow_first = scheduler.submit(Priority.BACKGROUND, "europe", "slow", send("slow-1"))
+    cancelled = scheduler.submit(Priority.BACKGROUND, "europe", "slow", send("slow-2"))
+    scheduler.submit(Priority.BACKGROUND, "europe", "slow", send("slow-3"))
+    fast = scheduler.submit(Priority.BACKGROUND, "europe", "fast", send("fast"))
+    live = scheduler.submit(Priority.LIVE_DRAFT, "europe", "fast", send("live"))
+    cancelled.cancel()
+    await asyncio.gather(slow_first, fast, live)
+
+    # slow-3 waits for the 10 s window; the cancelled request is dropped
+    assert order == ["live", "slow-1", "fast"]
+    assert len(scheduler) == 1
+    await scheduler.stop()
+    assert len(scheduler) == 0
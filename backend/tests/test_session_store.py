@@ -0,0 +1,233 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.models.draft import DraftAction, DraftPhase, DraftSession
+from app.services.draft_state import ACTION_SLOTS, DRAFT_ORDER, SLOT_FIELDS, turn
+from app.services.session_store import MemoryBackend, SessionStore, SQLiteBackend
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backends(request, tmp_path):
+    """Factory of backends over the same storage, to read back what a closed store wrote"""
+    if request.param == "memory":
+        backend = MemoryBackend()
+        return lambda: backend
+    path = str(tmp_path / "sessions.db")
+    return lambda: SQLiteBackend(path)
+
+
+class FailingBackend:
+    """Delegates to ``backend`` but fails the next ``failures`` calls of ``method``"""
+
+    def __init__(self, backend, method: str, failures: int = 1):
+        self.backend = backend
+        self.method = method
+        self.failures = failures
+
+    def __getattr__(self, name):
+        call = getattr(self.backend, name)
+        if name != self.method:
+            return call
+
+        async def failing(*args, **kwargs):
+            # Yield like a real write would, so callers can run meanwhile
+            await asyncio.sleep(0)
+            if self.failures:
+                self.failures -= 1
+                raise OSError("database is locked")
+            return await call(*args, **kwargs)
+
+        return failing
+
+
+def new_session() -> DraftSession:
+    return DraftSession(id=str(uuid.uuid4()), patch_version="14.19")
+
+
+async def play(store: SessionStore, session: DraftSession, count: int) -> None:
+    """Apply the next ``count`` draft actions the way DraftService does"""
+    for _ in range(count):
+        order = len(session.actions)
+        _, team, action_type = DRAFT_ORDER[order]
+        champion_id = order + 1
+        action = DraftAction(
+            id=str(uuid.uuid4()),
+            session_id=session.id,
+            champion_id=champion_id,
+            champion_name=f"Champion {champion_id}",
+            action_type=action_type,
+            team=team,
+            order=session.current_action_order,
+        )
+        getattr(session, SLOT_FIELDS[ACTION_SLOTS[(action_type, team)]]).append(champion_id)
+        session.actions.append(action)
+        session.current_phase, session.current_team = turn(order + 1)
+        session.current_action_order += 1
+        await store.append(session, action)
+
+
+async def test_writes_are_buffered_until_flush(backends):
+    backend = backends()
+    store = SessionStore(backend)
+    session = new_session()
+    await store.create(session)
+    await play(store, session, 3)
+
+    assert await store.get(session.id) is session
+    assert await backend.load_session(session.id) is None
+    assert store.pending == 4
+
+    await store.flush()
+
+    stored = await backend.load_session(session.id)
+    assert store.pending == 0
+    assert stored.current_action_order == session.current_action_order
+    assert [a.champion_id for a in stored.actions] == [1, 2, 3]
+    assert store.stats["hot_hits"] == 1
+    await store.close()
+
+
+async def test_flush_writes_one_batch_per_kind(backends):
+    backend = backends()
+    store = SessionStore(backend)
+    sessions = [new_session() for _ in range(20)]
+    for session in sessions:
+        await store.create(session)
+        await play(store, session, 4)
+
+    await store.flush()
+
+    assert backend.writes == 2
+    assert store.stats["sessions_written"] == 20
+    assert store.stats["actions_written"] == 80
+    for session in sessions:
+        assert len((await backend.load_session(session.id)).actions) == 4
+    await store.close()
+
+
+@pytest.mark.parametrize("method", ["save_sessions", "append_actions"])
+async def test_failed_flush_requeues_everything(backends, method):
+    backend = backends()
+    store = SessionStore(FailingBackend(backend, method))
+    session = new_session()
+    await store.create(session)
+    await play(store, session, 2)
+
+    await store.flush()
+
+    assert store.stats["failed_flushes"] == 1
+    assert store.pending == 3
+    # Buffered behind the requeued batch, still written in draft order
+    await play(store, session, 2)
+    await store.flush()
+
+    stored = await backend.load_session(session.id)
+    assert store.pending == 0
+    assert [a.champion_id for a in stored.actions] == [1, 2, 3, 4]
+    assert stored.current_action_order == session.current_action_order
+    await store.close()
+
+
+async def test_sessions_in_a_failed_flush_stay_hot(backends):
+    backend = backends()
+    store = SessionStore(FailingBackend(backend, "save_sessions"), max_hot=1)
+    first, second = new_session(), new_session()
+    await store.create(first)
+    await play(store, first, 2)
+
+    flushing = asyncio.ensure_future(store.flush())
+    await asyncio.sleep(0)
+    # Pushes ``first`` out of a one-session hot set while its write is in flight
+    await store.create(second)
+    await play(store, second, 1)
+    await flushing
+
+    assert store.stats["failed_flushes"] == 1
+    assert await store.get(first.id) is first
+    await play(store, first, 1)
+    await store.flush()
+
+    stored = await backend.load_session(first.id)
+    assert [a.champion_id for a in stored.actions] == [1, 2, 3]
+    assert stored.current_action_order == first.current_action_order
+    await store.close()
+
+
+async def test_failed_archive_is_retried(backends):
+    backend = backends()
+    store = SessionStore(FailingBackend(backend, "archive_sessions"))
+    session = new_session()
+    await store.create(session)
+    await play(store, session, len(DRAFT_ORDER))
+
+    await store.flush()
+    assert store.stats["failed_flushes"] == 1
+    assert await store.get(session.id) is session
+
+    await store.flush()
+    assert store.stats["archived"] == 1
+    assert len((await backend.load_session(session.id)).actions) == len(DRAFT_ORDER)
+    await store.close()
+
+
+async def test_completed_sessions_are_archived_and_leave_memory(backends):
+    backend = backends()
+    store = SessionStore(backend)
+    session = new_session()
+    await store.create(session)
+    await play(store, session, len(DRAFT_ORDER) - 1)
+    await store.flush()
+    await play(store, session, 1)
+
+    assert session.current_phase == DraftPhase.COMPLETED.value
+    await store.flush()
+
+    stored = await store.get(session.id)
+    assert stored is not session
+    assert stored.current_phase == DraftPhase.COMPLETED.value
+    assert [a.order for a in stored.actions] == [a.order for a in session.actions]
+    assert store.stats["archived"] == 1
+    assert store.stats["backend_loads"] == 1
+    await store.close()
+
+
+async def test_flush_loop_and_close_persist_buffered_writes(backends):
+    store = SessionStore(backends(), flush_interval=0.02)
+    await store.start()
+    flushed, closing = new_session(), new_session()
+    await store.create(flushed)
+    await play(store, flushed, 1)
+    await asyncio.sleep(0.1)
+    assert store.stats["flushes"] >= 1
+
+    store.flush_interval = 60.0
+    await asyncio.sleep(0.05)
+    await store.create(closing)
+    await play(store, closing, 2)
+    await store.close()
+
+    reopened = backends()
+    assert len((await reopened.load_session(flushed.id)).actions) == 1
+    assert len((await reopened.load_session(closing.id)).actions) == 2
+    await reopened.close()
+
+
+async def test_full_action_buffer_wakes_the_flusher(backends):
+    store = SessionStore(backends(), flush_interval=60.0, max_pending=5)
+    await store.start()
+    await asyncio.sleep(0)
+    session = new_session()
+    await store.create(session)
+    await play(store, session, 5)
+
+    for _ in range(50):
+        if store.stats["flushes"]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert store.stats["actions_written"] == 5
+    await store.close()
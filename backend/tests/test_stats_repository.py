@@ -0,0 +1,139 @@
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+from app.core.database import create_engine
+from app.services.stats_repository import StatsRepository, matchup_columns, stats_columns
+from benchmarks import synthetic
+
+pytestmark = pytest.mark.asyncio
+
+N_CHAMPIONS = 15
+
+
+@asynccontextmanager
+async def repository(tmp_path, batch_rows: int = 7):
+    """Repository on a fresh SQLite file; small batches so every write spans several"""
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+    repo = StatsRepository(engine, batch_rows=batch_rows)
+    await repo.create_tables()
+    try:
+        yield repo
+    finally:
+        await engine.dispose()
+
+
+def rows(columns: Dict[str, List[Any]], keys: Tuple[str, ...]) -> Dict[tuple, tuple]:
+    """Column-wise rows keyed by ``keys``, for order-independent comparison"""
+    names = list(columns)
+    return {
+        tuple(row[names.index(k)] for k in keys): row
+        for row in zip(*columns.values())
+    }
+
+
+def stats_rows(table) -> Dict[tuple, tuple]:
+    return rows(stats_columns(table), ("champion_id", "role"))
+
+
+def matchup_rows(matrices) -> Dict[tuple, tuple]:
+    return rows(matchup_columns(matrices), ("champion_id", "opponent_id"))
+
+
+@pytest.fixture
+def champions():
+    return synthetic.make_champions(N_CHAMPIONS)
+
+
+async def test_stats_round_trip(tmp_path, champions):
+    table = synthetic.make_stats_table(champions)
+    async with repository(tmp_path) as repo:
+        written = await repo.upsert_stats(table)
+        loaded = await repo.load_stats(table.patch, table.rank_tier)
+
+    assert written == len(stats_columns(table)["champion_id"]) > 7
+    assert stats_rows(loaded) == stats_rows(table)
+    assert loaded.last_updated == table.last_updated
+
+
+@pytest.mark.parametrize("role", [None, "mid"])
+async def test_matchup_round_trip(tmp_path, champions, role):
+    matrices = synthetic.make_matrices(champions, role=role)
+    async with repository(tmp_path, batch_rows=50) as repo:
+        await repo.upsert_matchups(matrices)
+        loaded = await repo.load_matchups(matrices.patch, matrices.rank_tier, role)
+        other_role = await repo.load_matchups(matrices.patch, matrices.rank_tier, "top")
+
+    assert matchup_rows(loaded) == matchup_rows(matrices)
+    assert loaded.synergy_types == matrices.synergy_types
+    assert other_role is None
+
+
+async def test_rewrite_updates_values_in_place(tmp_path, champions):
+    table = synthetic.make_stats_table(champions)
+    async with repository(tmp_path) as repo:
+        await repo.upsert_stats(table)
+        table.metrics["win_rate"][:] += 1.0
+        table.games[:] *= 2
+        await repo.upsert_stats(table)
+        loaded = await repo.load_stats(table.patch, table.rank_tier)
+
+    assert stats_rows(loaded) == stats_rows(table)
+
+
+async def test_cleared_cell_of_the_same_table_is_deleted(tmp_path, champions):
+    table = synthetic.make_stats_table(champions)
+    async with repository(tmp_path) as repo:
+        before = await repo.upsert_stats(table)
+        # Same object, same last_updated: only the cell is gone
+        cleared = table.index.ids[0]
+        row = table.index.position(cleared)
+        table.games[row, :] = 0
+        table.metrics["win_rate"][row, :] = np.nan
+        after = await repo.upsert_stats(table)
+        loaded = await repo.load_stats(table.patch, table.rank_tier)
+
+    assert after < before
+    assert cleared not in loaded.index
+    assert stats_rows(loaded) == stats_rows(table)
+
+
+async def test_champions_missing_from_a_new_slice_are_deleted(tmp_path, champions):
+    async with repository(tmp_path) as repo:
+        await repo.upsert_stats(synthetic.make_stats_table(champions))
+        smaller = synthetic.make_stats_table(champions[:5], seed=1)
+        await repo.upsert_stats(smaller)
+        loaded = await repo.load_stats(smaller.patch, smaller.rank_tier)
+
+    assert sorted(loaded.index.ids.tolist()) == sorted(c.id for c in champions[:5])
+    assert stats_rows(loaded) == stats_rows(smaller)
+
+
+async def test_writes_only_touch_their_own_slice(tmp_path, champions):
+    current = synthetic.make_stats_table(champions)
+    previous = synthetic.make_stats_table(champions, seed=1)
+    previous.patch = "14.18"
+    lane = synthetic.make_matrices(champions, role="mid")
+    overall = synthetic.make_matrices(champions)
+    async with repository(tmp_path, batch_rows=100) as repo:
+        await repo.upsert_stats(previous)
+        await repo.upsert_stats(current)
+        await repo.upsert_matchups(lane)
+        await repo.upsert_matchups(overall)
+        overall.matchup_games[:] = 0
+        overall.synergy_games[:] = 0
+        assert await repo.upsert_matchups(overall) == 0
+
+        assert stats_rows(await repo.load_stats("14.18", previous.rank_tier)) == stats_rows(previous)
+        assert stats_rows(await repo.load_stats(current.patch, current.rank_tier)) == stats_rows(current)
+        assert matchup_rows(await repo.load_matchups(lane.patch, lane.rank_tier, "mid")) == matchup_rows(lane)
+        # An empty write clears its slice
+        assert await repo.load_matchups(overall.patch, overall.rank_tier) is None
+
+
+async def test_unknown_slice_loads_as_none(tmp_path):
+    async with repository(tmp_path) as repo:
+        assert await repo.load_stats("13.1", "IRON") is None
+        assert await repo.load_matchups("13.1", "IRON", "support") is None